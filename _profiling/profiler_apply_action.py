@@ -0,0 +1,140 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the time spent in `PandaPowerBackend.apply_action`.
+
+It compares the (vectorized) implementation of `PandaPowerBackend.apply_action` with the previous implementation
+that looped through each element modified, and reports the time spent to apply the actions per step
+(`env._time_apply_act`).
+"""
+
+import numpy as np
+
+from grid2op import make
+from grid2op.Agent import BaseAgent
+from grid2op.Parameters import Parameters
+from grid2op.Rules import AlwaysLegal
+from grid2op.Backend import PandaPowerBackend
+
+from utils_benchmark import run_env
+
+ENV_NAME = "rte_case118_example"
+MAX_TS = 1000
+
+
+class LegacyApplyActPandaPowerBackend(PandaPowerBackend):
+    """
+    Implementation of `apply_action` that loops through every element (as it was done in grid2op <= 0.9.3), only
+    kept here as a reference for the benchmark.
+    """
+    def apply_action(self, backendAction=None):
+        nb_bus_before = self._PandaPowerBackend__nb_bus_before
+        nb_powerline = self._PandaPowerBackend__nb_powerline
+        active_bus, (prod_p, prod_v, load_p, load_q), topo__, shunts__ = backendAction()
+        tmp = self._get_vector_inj["prod_p"](self._grid)
+        for gen_id, new_p in prod_p:
+            tmp.iloc[gen_id] = new_p
+
+        tmp = self._get_vector_inj["prod_v"](self._grid)
+        for gen_id, new_v in prod_v:
+            tmp.iloc[gen_id] = new_v / self.prod_pu_to_kv[gen_id]
+            if self._id_bus_added is not None:
+                if gen_id == self._id_bus_added:
+                    self._grid["ext_grid"]["vm_pu"] = tmp[gen_id]
+
+        tmp = self._get_vector_inj["load_p"](self._grid)
+        for gen_id, new_p in load_p:
+            tmp.iloc[gen_id] = new_p
+
+        tmp = self._get_vector_inj["load_q"](self._grid)
+        for gen_id, new_q in load_q:
+            tmp.iloc[gen_id] = new_q
+
+        if self.shunts_data_available:
+            shunt_p, shunt_q, shunt_bus = shunts__
+            for sh_id, new_p in shunt_p:
+                self._grid.shunt["p_mw"].iloc[sh_id] = new_p
+            for sh_id, new_q in shunt_q:
+                self._grid.shunt["q_mvar"].iloc[sh_id] = new_q
+
+        for id_el, new_bus in topo__:
+            id_el_backend, type_obj = self._convert_id_topo(id_el)
+            if type_obj == "load":
+                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_load[id_el_backend])
+                self._grid.load["bus"].iloc[id_el_backend] = new_bus_backend
+            elif type_obj == "gen":
+                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_gen[id_el_backend])
+                self._grid.gen["bus"].iloc[id_el_backend] = new_bus_backend
+                if self._iref_slack is not None:
+                    if id_el_backend == self._grid.gen.shape[0] - 1:
+                        self._grid.ext_grid["bus"].iloc[0] = new_bus_backend
+            elif type_obj == "lineor":
+                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_lor[id_el_backend])
+                if id_el_backend < nb_powerline:
+                    self.change_bus_powerline_or(id_el_backend, new_bus_backend)
+                else:
+                    self.change_bus_trafo_hv(id_el_backend - nb_powerline, new_bus_backend)
+            elif type_obj == "lineex":
+                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_lex[id_el_backend])
+                if id_el_backend < nb_powerline:
+                    self.change_bus_powerline_ex(id_el_backend, new_bus_backend)
+                else:
+                    self.change_bus_trafo_lv(id_el_backend - nb_powerline, new_bus_backend)
+        bus_is = self._grid.bus["in_service"]
+        for i, (bus1_status, bus2_status) in enumerate(active_bus):
+            bus_is[i] = bus1_status
+            bus_is[i + nb_bus_before] = bus2_status
+
+
+class SetAllBusAgent(BaseAgent):
+    """
+    Agent that sets, one step out of two, every element of the grid to the bus 1, and does nothing the other steps.
+    This way both the injections and the topology part of `apply_action` are used.
+    """
+    def __init__(self, action_space):
+        BaseAgent.__init__(self, action_space)
+        self.set_all = action_space({"set_bus": np.ones(action_space.dim_topo, dtype=np.int)})
+        self.do_nothing = action_space()
+        self.nb_call = 0
+
+    def act(self, obs, reward, done=False):
+        self.nb_call += 1
+        if self.nb_call % 2:
+            return self.set_all
+        return self.do_nothing
+
+
+def main(max_ts, name):
+    param = Parameters()
+    param.init_from_dict({"NO_OVERFLOW_DISCONNECTION": True})
+
+    res = {}
+    for nm_, backend_cls in [("before (loop)", LegacyApplyActPandaPowerBackend),
+                             ("after (vectorized)", PandaPowerBackend)]:
+        env = make(name, backend=backend_cls(), param=param, gamerules_class=AlwaysLegal, test=True)
+        agent = SetAllBusAgent(env.action_space)
+        nb_ts, total_time, aor, *_ = run_env(env, max_ts, agent)
+        res[nm_] = aor
+        print("{}: {} time steps in {:.2f}s".format(nm_, nb_ts, total_time))
+        print("\tTime apply act: {:.2f}ms / step".format(1000. * env._time_apply_act / nb_ts))
+        print("\tTime powerflow: {:.2f}ms / step".format(1000. * env._time_powerflow / nb_ts))
+        env.close()
+    aor_before, aor_after = res.values()
+    print("Absolute value of the difference for aor: {}".format(np.max(np.abs(aor_before - aor_after))))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the time spent in PandaPowerBackend.apply_action')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name to be used for the benchmark.')
+    parser.add_argument('--number', type=int, default=MAX_TS,
+                        help='Maximum number of time steps for which the benchamark will be run.')
+    args = parser.parse_args()
+    main(int(args.number), str(args.name))
@@ -0,0 +1,78 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the number of steps per second of an environment using the `SparseBackend`
+(powerflows computed on precomputed sparse matrices) compared to the same environment using the `PandaPowerBackend`.
+
+The same actions are performed with both backends: "do nothing" steps, and steps where a random powerline is
+disconnected (and reconnected the step after) which require an update of the matrices of the `SparseBackend`.
+The time spent in the powerflows only (`backend.runpf()`) is reported too.
+"""
+
+import time
+import warnings
+import numpy as np
+
+from grid2op import make
+from grid2op.Backend import PandaPowerBackend, SparseBackend
+from grid2op.Parameters import Parameters
+from grid2op.Rules import AlwaysLegal
+
+ENV_NAMES = ["rte_case14_realistic", "rte_case118_example"]
+NB_STEP = 300
+
+
+def main(name, nb_step, backend_class):
+    param = Parameters()
+    param.NO_OVERFLOW_DISCONNECTION = True
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name, test=True, param=param, backend=backend_class(), gamerules_class=AlwaysLegal)
+    env.seed(0)
+    env.reset()
+    np.random.seed(0)
+    lines = np.random.randint(env.n_line, size=nb_step)
+    nb_done = 0
+    beg_ = time.time()
+    for i in range(nb_step):
+        if i % 2:
+            act = env.action_space({"set_line_status": [(lines[i - 1], +1)]})
+        elif i % 4 == 0:
+            act = env.action_space({"set_line_status": [(lines[i], -1)]})
+        else:
+            act = env.action_space()
+        obs, reward, done, info = env.step(act)
+        if done:
+            nb_done += 1
+            env.reset()
+    time_step = time.time() - beg_
+
+    beg_ = time.time()
+    for _ in range(nb_step):
+        env.backend.runpf()
+    time_pf = time.time() - beg_
+    print("{} on \"{}\" ({} game over):".format(backend_class.__name__, name, nb_done))
+    print("\tenv.step(): {:.1f} steps / s".format(nb_step / time_step))
+    print("\tbackend.runpf(): {:.2f}ms / call".format(1000. * time_pf / nb_step))
+    env.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the number of steps per second with the SparseBackend '
+                                                 'and the PandaPowerBackend')
+    parser.add_argument('--name', default=None, type=str,
+                        help='Environment name to be used for the benchmark (default: {}).'.format(ENV_NAMES))
+    parser.add_argument('--number', type=int, default=NB_STEP,
+                        help='Number of steps performed.')
+    args = parser.parse_args()
+    names = ENV_NAMES if args.name is None else [str(args.name)]
+    for name in names:
+        for backend_class in [PandaPowerBackend, SparseBackend]:
+            main(name, int(args.number), backend_class)
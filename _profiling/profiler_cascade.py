@@ -0,0 +1,95 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the time spent to compute the cascading failures in `backend.next_grid_state`
+when the flows of each round are predicted with the line outage distribution factors (`FAST_CASCADE` parameter)
+compared to when a powerflow is computed after each round.
+
+The thermal limits of the powerlines are drawn at random (such that one powerline is on hard overflow) and the same
+cascading failures are simulated with both methods. The number of powerflows computed, and the number of cascading
+failures for which both methods do not disconnect the same powerlines, are reported.
+"""
+
+import time
+import warnings
+import numpy as np
+
+from grid2op import make
+from grid2op.Backend import SparseBackend
+from grid2op.Exceptions import DivergingPowerFlow
+
+ENV_NAME = "rte_case118_example"
+NB_CASCADE = 200
+
+
+def main(name, nb_cascade, margin):
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name, test=True, backend=SparseBackend())
+    backend = env.backend
+    runpf = backend.runpf
+    nb_pf = [0]
+
+    def runpf_counted(is_dc=False):
+        nb_pf[0] += 1
+        return runpf(is_dc=is_dc)
+    backend.runpf = runpf_counted
+
+    a_or = env.get_obs().a_or
+    rng = np.random.RandomState(0)
+    all_limits = []
+    for _ in range(nb_cascade):
+        rho = rng.uniform(0.3, 0.9, size=env.n_line)
+        rho[rng.choice(env.n_line)] = 2.5
+        all_limits.append(a_or / rho)
+    env.nb_timestep_overflow_allowed[:] = 0
+    env.fast_cascade_margin = margin
+    init_state = backend.get_state()
+
+    res = {}
+    for fast_cascade in [False, True]:
+        env.fast_cascade = fast_cascade
+        nb_pf[0] = 0
+        total_time = 0.
+        res[fast_cascade] = []
+        for limits in all_limits:
+            backend.set_state(init_state)
+            backend.set_thermal_limit(limits)
+            beg_ = time.time()
+            try:
+                disc, _ = backend.next_grid_state(env)
+            except DivergingPowerFlow:
+                disc = None
+            total_time += time.time() - beg_
+            res[fast_cascade].append(disc)
+        print("{} cascading failures ({}):".format(nb_cascade, "fast" if fast_cascade else "exact"))
+        print("\tNumber of powerflows: {}".format(nb_pf[0]))
+        print("\tTime next_grid_state: {:.2f}ms / call".format(1000. * total_time / nb_cascade))
+    nb_diff = 0
+    for disc_exact, disc_fast in zip(res[False], res[True]):
+        if disc_exact is None or disc_fast is None:
+            nb_diff += int((disc_exact is None) != (disc_fast is None))
+        else:
+            nb_diff += int(np.any(disc_exact != disc_fast))
+    print("Number of cascading failures with different results: {}".format(nb_diff))
+    env.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the computation of the cascading failures with the line '
+                                                 'outage distribution factors')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--number', type=int, default=NB_CASCADE,
+                        help='Number of cascading failures simulated.')
+    parser.add_argument('--margin', type=float, default=0.05,
+                        help='Value of the FAST_CASCADE_MARGIN parameter.')
+    args = parser.parse_args()
+    main(str(args.name), int(args.number), float(args.margin))
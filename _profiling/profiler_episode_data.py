@@ -0,0 +1,70 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the time and memory needed to load an episode saved by the `Runner` with
+`EpisodeData.from_disk`, when the episode is saved at the end (".npz" files) or by chunk (".npy" files), and when it
+is loaded entirely or lazily (`lazy=True`).
+"""
+
+import time
+import tempfile
+import tracemalloc
+import warnings
+
+from grid2op import make
+from grid2op.Runner import Runner
+from grid2op.Episode import EpisodeData
+from grid2op.Parameters import Parameters
+
+ENV_NAME = "rte_case14_realistic"
+MAX_ITER = 1000
+CHUNK_SIZE = 100
+
+
+def main(name, max_iter, chunk_size):
+    param = Parameters()
+    param.NO_OVERFLOW_DISCONNECTION = True
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name, test=True, param=param)
+    for episode_chunk_size in [None, chunk_size]:
+        path_save = tempfile.mkdtemp()
+        runner = Runner(**env.get_params_for_runner(), episode_chunk_size=episode_chunk_size)
+        beg_ = time.time()
+        _, episode_name, _, nb_time_step, _ = runner.run(nb_episode=1, max_iter=max_iter, path_save=path_save)[0]
+        time_run = time.time() - beg_
+        print("episode_chunk_size={}: {} steps played in {:.2f}s".format(episode_chunk_size, nb_time_step, time_run))
+        for lazy in [False, True]:
+            tracemalloc.start()
+            beg_ = time.time()
+            episode_data = EpisodeData.from_disk(path_save, episode_name, lazy=lazy)
+            time_load = time.time() - beg_
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            beg_ = time.time()
+            episode_data.observations[len(episode_data.observations) - 1]
+            time_access = time.time() - beg_
+            print("\tlazy={}:".format(lazy))
+            print("\t\tTime EpisodeData.from_disk: {:.2f}s".format(time_load))
+            print("\t\tMemory allocated: {:.2f}MB".format(memory / 1024 ** 2))
+            print("\t\tTime to access the last observation: {:.2f}ms".format(1000. * time_access))
+    env.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the time and memory used to load an episode')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--max_iter', type=int, default=MAX_ITER,
+                        help='Maximum number of steps of the episode.')
+    parser.add_argument('--chunk_size', type=int, default=CHUNK_SIZE,
+                        help='Number of steps written at once when the episode is saved by chunk.')
+    args = parser.parse_args()
+    main(str(args.name), int(args.max_iter), int(args.chunk_size))
@@ -0,0 +1,101 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the memory used by the `IdToAct` converter and the time spent to build it.
+
+It compares the matrix representation of all the actions with the list of `BaseAction` objects (built when
+`converter.all_actions` is accessed) and the time to initialize the converter from the ".npy" file saved with
+`converter.save` (memory mapped) for each representation.
+
+It also compares the time spent to enumerate all the unitary topologies of the grid as a matrix
+(`get_all_unitary_topologies_set_vect`) and as a list of actions (`get_all_unitary_topologies_set`).
+"""
+
+import os
+import time
+import tempfile
+import tracemalloc
+import warnings
+
+from grid2op import make
+from grid2op.Converter import IdToAct
+from grid2op.tests.helper_path_test import PATH_DATA_TEST
+
+ENV_NAME = os.path.join(PATH_DATA_TEST, "ieee118_R2subgrid_wcci_test_maintenance")
+NB_CONVERT = 1000
+
+
+def main(name, nb_convert):
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name)
+    path_ = tempfile.mkdtemp()
+
+    converter = IdToAct(env.action_space)
+    beg_ = time.time()
+    converter.init_converter()
+    time_init = time.time() - beg_
+    converter.save(path_, "all_actions.npy")
+    print("{} actions, built in {:.2f}s".format(converter.n, time_init))
+
+    for materialize in [False, True]:
+        tracemalloc.start()
+        beg_ = time.time()
+        converter = IdToAct(env.action_space)
+        converter.init_converter(all_actions=os.path.join(path_, "all_actions.npy"))
+        if materialize:
+            # build all the actions as objects
+            converter.all_actions
+        time_load = time.time() - beg_
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # the first call to convert_act for an id builds the action, the next ones retrieve it
+        all_ids = [converter.sample() for _ in range(nb_convert)]
+        time_convert = []
+        for _ in range(2):
+            beg_ = time.time()
+            for id_ in all_ids:
+                converter.convert_act(id_)
+            time_convert.append(time.time() - beg_)
+        print("{}:".format("list of BaseAction" if materialize else "matrix (memory mapped)"))
+        print("\tTime to load the converter: {:.2f}s".format(time_load))
+        print("\tMemory allocated: {:.2f}MB".format(memory / 1024 ** 2))
+        print("\tTime convert_act (first call): {:.2f}us / call".format(1e6 * time_convert[0] / nb_convert))
+        print("\tTime convert_act (next calls): {:.2f}us / call".format(1e6 * time_convert[1] / nb_convert))
+    env.close()
+
+
+def main_topologies(name):
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name)
+    action_space = env.action_space
+    beg_ = time.time()
+    all_topos = action_space.get_all_unitary_topologies_set_vect(action_space)
+    time_vect = time.time() - beg_
+    beg_ = time.time()
+    all_acts = action_space.get_all_unitary_topologies_set(action_space)
+    time_list = time.time() - beg_
+    print("{} unitary topologies:".format(all_topos.shape[0]))
+    print("\tas a matrix: {:.2f}s".format(time_vect))
+    print("\tas a list of actions: {:.2f}s".format(time_list))
+    env.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the memory and time used by the IdToAct converter')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--number', type=int, default=NB_CONVERT,
+                        help='Number of calls to convert_act.')
+    args = parser.parse_args()
+    main_topologies(str(args.name))
+    main(str(args.name), int(args.number))
@@ -0,0 +1,149 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the time spent to generate the maintenance in
+`GridStateFromFileWithForecastsWithMaintenance` (and more generally the time spent in `env.reset()`).
+
+It compares the (vectorized) implementation of `_generate_maintenance` with the previous implementation that looped
+through each day of the chronics, on the 118 buses "maintenance" environment used in the tests.
+
+It also compares the computation of the time to the next maintenance and of the maintenance durations for a year long
+chronics (5 minutes time steps) with one call per powerline (`GridValue.get_maintenance_time_1d` and
+`GridValue.get_maintenance_duration_1d`) and with a single call for the whole matrix
+(`GridValue.get_maintenance_time_2d` and `GridValue.get_maintenance_duration_2d`).
+"""
+
+import os
+import time
+import warnings
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+
+from grid2op import make
+from grid2op.Parameters import Parameters
+from grid2op.Chronics import GridValue, GridStateFromFileWithForecastsWithMaintenance
+from grid2op.tests.helper_path_test import PATH_DATA_TEST
+
+ENV_NAME = os.path.join(PATH_DATA_TEST, "ieee118_R2subgrid_wcci_test_maintenance")
+NB_RESET = 10
+NB_TS_YEAR = 365 * 288
+
+
+class LegacyGSFFWFWM(GridStateFromFileWithForecastsWithMaintenance):
+    """
+    Implementation of `_generate_maintenance` that loops through every day of the chronics (as it was done in
+    grid2op <= 0.9.3), only kept here as a reference for the benchmark.
+    """
+    def _generate_maintenance(self):
+        columnsNames = self.name_line
+        nbTimesteps = self.n_
+        res = np.zeros((nbTimesteps, len(self.name_line)))
+        idx_line_maintenance = np.array([el in self.line_to_maintenance for el in columnsNames])
+        nb_line_maint = np.sum(idx_line_maintenance)
+        if nb_line_maint == 0:
+            return res
+
+        freq = str(int(self.time_interval.total_seconds())) + "s"
+        datelist = pd.date_range(self.start_datetime, periods=nbTimesteps, freq=freq)
+        datelist = np.unique(np.array([el.date() for el in datelist]))
+        datelist = datelist[:-1]
+        n_lines_maintenance = len(self.line_to_maintenance)
+        nb_rows = int(86400 / self.time_interval.total_seconds())
+        selected_rows_beg = int(self.maintenance_starting_hour * 3600 / self.time_interval.total_seconds())
+        selected_rows_end = int(self.maintenance_ending_hour * 3600 / self.time_interval.total_seconds())
+        for nb_day_since_beg, this_day in enumerate(datelist):
+            dayOfWeek = this_day.weekday()
+            if dayOfWeek < 5:
+                month = this_day.month
+                maintenance_me = np.zeros((nb_rows, nb_line_maint))
+                maintenance_daily_proba = self.daily_proba_per_month_maintenance[(month - 1)]
+                maxDailyMaintenance = self.max_daily_number_per_month_maintenance[(month - 1)]
+                are_lines_in_maintenance = self.space_prng.choice([False, True],
+                                                                  p=[(1. - maintenance_daily_proba),
+                                                                     maintenance_daily_proba],
+                                                                  size=n_lines_maintenance)
+                n_Generated_Maintenance = np.sum(are_lines_in_maintenance)
+                if (n_Generated_Maintenance > maxDailyMaintenance):
+                    not_chosen = self.space_prng.choice(n_Generated_Maintenance,
+                                                        replace=False,
+                                                        size=n_Generated_Maintenance - maxDailyMaintenance)
+                    are_lines_in_maintenance[np.where(are_lines_in_maintenance)[0][not_chosen]] = False
+                maintenance_me[selected_rows_beg:selected_rows_end, are_lines_in_maintenance] = 1.0
+                n_max = res[(nb_day_since_beg*nb_rows):((nb_day_since_beg+1) * nb_rows), idx_line_maintenance].shape[0]
+                res[(nb_day_since_beg*nb_rows):((nb_day_since_beg+1) * nb_rows), idx_line_maintenance] = \
+                    maintenance_me[:n_max, :]
+        return res
+
+
+def main(nb_reset, name):
+    param = Parameters()
+    param.init_from_dict({"NO_OVERFLOW_DISCONNECTION": True})
+    for nm_, gridvalue_cls in [("before (loop)", LegacyGSFFWFWM),
+                               ("after (vectorized)", GridStateFromFileWithForecastsWithMaintenance)]:
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            env = make(name, param=param, data_feeding_kwargs={"gridvalueClass": gridvalue_cls})
+        env.seed(0)
+        data = env.chronics_handler.real_data.data
+        time_reset = 0.
+        time_generate = 0.
+        nb_maint = 0.
+        for _ in range(nb_reset):
+            beg_ = time.time()
+            env.reset()
+            time_reset += time.time() - beg_
+            beg_ = time.time()
+            maintenance = data._generate_maintenance()
+            time_generate += time.time() - beg_
+            nb_maint += np.sum(maintenance)
+        print("{}: {} resets".format(nm_, nb_reset))
+        print("\tTime env.reset(): {:.2f}ms / reset".format(1000. * time_reset / nb_reset))
+        print("\tTime _generate_maintenance: {:.2f}ms / call".format(1000. * time_generate / nb_reset))
+        print("\tAverage number of time steps in maintenance: {:.1f}".format(nb_maint / nb_reset))
+        env.close()
+
+
+def main_1d_2d(nb_ts, n_line, n_line_maintenance=10, seed=0):
+    prng = np.random.RandomState(seed)
+    maintenance = np.zeros((nb_ts, n_line), dtype=np.float)
+    # 8h maintenance, once every ~20 days, for some powerlines only
+    for line_id in prng.choice(n_line, size=n_line_maintenance, replace=False):
+        for beg_ in prng.choice(nb_ts - 96, size=nb_ts // (20 * 288)):
+            maintenance[beg_:(beg_ + 96), line_id] = 1.
+
+    beg_ = time.time()
+    maintenance_time = np.zeros((nb_ts, n_line), dtype=np.int)
+    maintenance_duration = np.zeros((nb_ts, n_line), dtype=np.int)
+    for line_id in range(n_line):
+        maintenance_time[:, line_id] = GridValue.get_maintenance_time_1d(maintenance[:, line_id])
+        maintenance_duration[:, line_id] = GridValue.get_maintenance_duration_1d(maintenance[:, line_id])
+    time_1d = time.time() - beg_
+
+    beg_ = time.time()
+    maintenance_time_2d = GridValue.get_maintenance_time_2d(maintenance)
+    maintenance_duration_2d = GridValue.get_maintenance_duration_2d(maintenance)
+    time_2d = time.time() - beg_
+    print("Maintenance time and duration for {} time steps and {} powerlines:".format(nb_ts, n_line))
+    print("\tone call per powerline: {:.2f}ms".format(1000. * time_1d))
+    print("\tone call for all powerlines: {:.2f}ms".format(1000. * time_2d))
+    print("\tsame results: {}".format(np.all(maintenance_time == maintenance_time_2d) and
+                                       np.all(maintenance_duration == maintenance_duration_2d)))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the time spent to generate the maintenance')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--number', type=int, default=NB_RESET,
+                        help='Number of reset performed.')
+    args = parser.parse_args()
+    main(int(args.number), str(args.name))
+    main_1d_2d(NB_TS_YEAR, n_line=186)
@@ -0,0 +1,58 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the time spent in `MultiEnvironment.step` when the data are pickled and sent
+through pipes (default) compared to when they are exchanged through shared memory (`use_shared_memory=True`).
+"""
+
+import time
+import warnings
+
+from grid2op import make
+from grid2op.Environment import MultiEnvironment
+from grid2op.Parameters import Parameters
+
+ENV_NAME = "rte_case5_example"
+NB_ENV = 4
+NB_STEP = 500
+
+
+def main(nb_env, nb_step, name, use_shared_memory, return_info):
+    param = Parameters()
+    param.NO_OVERFLOW_DISCONNECTION = True
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name, test=True, param=param)
+    multi_envs = MultiEnvironment(env=env, nb_env=nb_env,
+                                  use_shared_memory=use_shared_memory, return_info=return_info)
+    multi_envs.reset()
+    actions = [env.action_space() for _ in range(nb_env)]
+    beg_ = time.time()
+    for _ in range(nb_step):
+        multi_envs.step(actions)
+    time_step = time.time() - beg_
+    multi_envs.close()
+    env.close()
+    print("use_shared_memory={}, return_info={}: {} environments".format(use_shared_memory, return_info, nb_env))
+    print("\tTime MultiEnvironment.step(): {:.2f}ms / step".format(1000. * time_step / nb_step))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the time spent in MultiEnvironment.step() with and '
+                                                 'without shared memory')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--nb_env', type=int, default=NB_ENV,
+                        help='Number of environments running in parallel.')
+    parser.add_argument('--nb_step', type=int, default=NB_STEP,
+                        help='Number of steps performed.')
+    args = parser.parse_args()
+    for use_shared_memory, return_info in [(False, True), (True, True), (True, False)]:
+        main(int(args.nb_env), int(args.nb_step), str(args.name), use_shared_memory, return_info)
@@ -0,0 +1,62 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the time spent in `env.reset()` when the next episodes are loaded in the
+background (`Multifolder` with `prefetch` > 0) compared to when they are loaded in `env.reset()`.
+
+Between two resets, a few "do nothing" steps are performed, which represents the time spent by the agent in an episode.
+"""
+
+import time
+import warnings
+
+from grid2op import make
+from grid2op.Parameters import Parameters
+
+ENV_NAME = "rte_case14_realistic"
+NB_EPISODE = 6
+NB_STEP = 100
+
+
+def main(nb_episode, nb_step, name, prefetch):
+    param = Parameters()
+    param.NO_OVERFLOW_DISCONNECTION = True
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name, test=True, param=param, data_feeding_kwargs={"prefetch": prefetch})
+    env.seed(0)
+    time_reset = 0.
+    time_step = 0.
+    for _ in range(nb_episode):
+        beg_ = time.time()
+        env.reset()
+        time_reset += time.time() - beg_
+        beg_ = time.time()
+        for _ in range(nb_step):
+            env.step(env.action_space())
+        time_step += time.time() - beg_
+    print("prefetch={}: {} episodes of {} steps".format(prefetch, nb_episode, nb_step))
+    print("\tTime env.reset(): {:.2f}ms / reset".format(1000. * time_reset / nb_episode))
+    print("\tTime env.step(): {:.2f}ms / step".format(1000. * time_step / (nb_episode * nb_step)))
+    env.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the time spent in env.reset() with and without '
+                                                 'prefetching the next episodes')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--number', type=int, default=NB_EPISODE,
+                        help='Number of episodes played.')
+    parser.add_argument('--nb_step', type=int, default=NB_STEP,
+                        help='Number of steps performed in each episode.')
+    args = parser.parse_args()
+    for prefetch in [0, 1]:
+        main(int(args.number), int(args.nb_step), str(args.name), prefetch)
@@ -0,0 +1,62 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the time spent by the `Runner` to play a lot of short episodes in parallel, when
+new processes (and environments) are created at each call to `runner.run` compared to when a persistent pool of
+processes is used (see `runner.start_pool`).
+"""
+
+import time
+import warnings
+
+from grid2op import make
+from grid2op.Runner import Runner
+
+ENV_NAME = "rte_case14_realistic"
+NB_EPISODE = 8
+NB_CALL = 3
+MAX_ITER = 5
+NB_PROCESS = 2
+
+
+def main(name, nb_episode, nb_call, max_iter, nb_process, use_pool):
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore")
+        env = make(name, test=True)
+    runner = Runner(**env.get_params_for_runner())
+    beg_ = time.time()
+    if use_pool:
+        runner.start_pool(nb_process)
+    for _ in range(nb_call):
+        runner.run(nb_episode=nb_episode, nb_process=nb_process, max_iter=max_iter)
+    runner.close_pool()
+    total_time = time.time() - beg_
+    env.close()
+    print("use_pool={}: {} calls of {} episodes of {} steps on {} processes".format(use_pool, nb_call, nb_episode,
+                                                                                  max_iter, nb_process))
+    print("\tTotal time: {:.2f}s ({:.2f}s / call)".format(total_time, total_time / nb_call))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the time spent by the Runner to play short episodes in '
+                                                 'parallel, with and without a persistent pool of processes')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--number', type=int, default=NB_EPISODE,
+                        help='Number of episodes played at each call to runner.run.')
+    parser.add_argument('--nb_call', type=int, default=NB_CALL,
+                        help='Number of calls to runner.run.')
+    parser.add_argument('--max_iter', type=int, default=MAX_ITER,
+                        help='Maximum number of steps of each episode.')
+    parser.add_argument('--nb_process', type=int, default=NB_PROCESS,
+                        help='Number of processes used.')
+    args = parser.parse_args()
+    for use_pool in [False, True]:
+        main(str(args.name), int(args.number), int(args.nb_call), int(args.max_iter), int(args.nb_process), use_pool)
@@ -0,0 +1,77 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This file should be used to assess the benefit of the cache of the voltages used to initialize the AC powerflows
+of the `PandaPowerBackend` (argument `warm_start_cache_size`).
+
+An agent toggling between a few topologies is simulated, with and without the cache, and the number of Newton-Raphson
+iterations as well as the time spent in `backend.runpf` are reported.
+"""
+
+import time
+import warnings
+import numpy as np
+
+from grid2op import make
+from grid2op.Backend import PandaPowerBackend
+from grid2op.Parameters import Parameters
+from grid2op.Rules import AlwaysLegal
+
+ENV_NAME = "rte_case14_realistic"
+NB_STEP = 200
+
+
+def main(name, nb_step, cache_size):
+    param = Parameters()
+    param.NO_OVERFLOW_DISCONNECTION = True
+    for size in [0, cache_size]:
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            env = make(name, test=True, backend=PandaPowerBackend(warm_start_cache_size=size),
+                       gamerules_class=AlwaysLegal, param=param)
+        backend = env.backend
+        runpf = backend.runpf
+        time_pf = [0.]
+
+        def runpf_timed(is_dc=False):
+            beg_ = time.time()
+            res = runpf(is_dc=is_dc)
+            time_pf[0] += time.time() - beg_
+            return res
+        backend.runpf = runpf_timed
+
+        # the agent alternates between the reference topology and a few others
+        rng = np.random.RandomState(0)
+        actions = [env.action_space()]
+        for line_id in rng.choice(env.n_line, size=3, replace=False):
+            actions.append(env.action_space({"set_line_status": [(line_id, -1)]}))
+            actions.append(env.action_space({"set_line_status": [(line_id, 1)]}))
+        nb_iter_init = backend.nb_iter_total
+        for i in range(nb_step):
+            obs, reward, done, info = env.step(actions[i % len(actions)])
+            if done:
+                env.reset()
+        print("Warm start cache of size {}:".format(size))
+        print("\tNumber of Newton-Raphson iterations: {}".format(backend.nb_iter_total - nb_iter_init))
+        print("\tCache hits: {}, cache misses: {}".format(backend.nb_cache_hit, backend.nb_cache_miss))
+        print("\tTime runpf: {:.2f}ms / step".format(1000. * time_pf[0] / nb_step))
+        env.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark the cache of voltages used to initialize the powerflows')
+    parser.add_argument('--name', default=ENV_NAME, type=str,
+                        help='Environment name (or path) to be used for the benchmark.')
+    parser.add_argument('--number', type=int, default=NB_STEP,
+                        help='Number of steps performed.')
+    parser.add_argument('--cache_size', type=int, default=16,
+                        help='Size of the cache benchmarked.')
+    args = parser.parse_args()
+    main(str(args.name), int(args.number), int(args.cache_size))
@@ -196,6 +196,9 @@ class BaseAction(GridObjects):
     attr_list_set = set(attr_list_vect)
     shunt_added = False
 
+    # substation id of each element of the topology vector, computed once per class (see _get_topo_vect_to_sub)
+    _topo_vect_to_sub = None
+
     def __init__(self):
         """
         This is used to create an BaseAction instance. Preferably, :class:`BaseAction` should be created with
@@ -233,6 +236,7 @@ class BaseAction(GridObjects):
         self._vectorized = None
         self._lines_impacted = None
         self._subs_impacted = None
+        self._impact_powerline_status = None
 
         # shunts
         if self.shunts_data_available:
@@ -269,6 +273,8 @@ class BaseAction(GridObjects):
         return res
 
     def _assign_attr_from_name(self, attr_nm, vect):
+        # the action is modified
+        self._reset_vect()
         if hasattr(self, attr_nm):
             super()._assign_attr_from_name(attr_nm, vect)
         else:
@@ -442,6 +448,17 @@ class BaseAction(GridObjects):
 
         return True
 
+    @classmethod
+    def _get_topo_vect_to_sub(cls):
+        """
+        Id of the substation of each element of the topology vector. It is computed once for each class (each
+        powergrid).
+        """
+        if cls._topo_vect_to_sub is None or cls._topo_vect_to_sub[0] is not cls.sub_info:
+            res = np.repeat(np.arange(len(cls.sub_info), dtype=dt_int), repeats=cls.sub_info)
+            cls._topo_vect_to_sub = (cls.sub_info, res)
+        return cls._topo_vect_to_sub[1]
+
     def get_topological_impact(self, powerline_status=None):
         """
         Gives information about the element being impacted by this action.
@@ -466,6 +483,16 @@ class BaseAction(GridObjects):
         Any such "change" that would be illegal is declared as "illegal" regardless of the real impact of this action
         on the powergrid.
 
+        **NB** The results are stored until the action is modified. If `powerline_status` is not provided, the
+        results of the last call are returned (if any).
+
+        Parameters
+        ----------
+        powerline_status: :class:`numpy.array`, dtype:dt_bool
+            The status of the powerlines (``True``: connected, ``False``: disconnected) used to know whether the
+            powerlines are reconnected by this action. If not provided, all the powerlines are considered
+            disconnected.
+
 
         Returns
         -------
@@ -480,66 +507,31 @@ class BaseAction(GridObjects):
             :attr:`BaseAction._subs_impacted` for more information.
 
         """
-        recompute = powerline_status is not None
         if powerline_status is None:
+            if self._lines_impacted is not None and self._subs_impacted is not None:
+                # use the last results computed
+                return self._lines_impacted, self._subs_impacted
             powerline_status = np.full(self.n_line, fill_value=False, dtype=dt_bool)
-        not_powerline_status = ~(powerline_status)
-
-        if self._lines_impacted is None or recompute:
-            self._lines_impacted = self._switch_line_status | (self._set_line_status != 0 & not_powerline_status)
-
-        if self._subs_impacted is None or recompute:
-            self._subs_impacted = np.full(shape=self.sub_info.shape, fill_value=False, dtype=dt_bool)
-
-            # Mask of powerlines reconnected by set
-            powerlines_set_reco = self._set_line_status == 1
-            # Mask of powerlines reconnected by change
-            powerlines_change_reco = self._switch_line_status
-            # all the id of the powerlines reconnected
-            powerlines_reco = np.array(list(range(self.n_line)))
-            powerlines_reco = powerlines_reco[
-                np.logical_or(
-                    np.logical_and(powerlines_set_reco, not_powerline_status),
-                    np.logical_and(powerlines_change_reco, not_powerline_status)
-                )
-            ]
-            # all the reconnected lines origin substation id
-            sub_or_id = self.line_or_to_subid[powerlines_reco]
-            # all the reconnected lines extremity substation id
-            sub_ex_id = self.line_ex_to_subid[powerlines_reco]
-
-            # Group by sub_id => {sub_id: reconnected_count}
-            sub_id = np.concatenate((sub_or_id, sub_ex_id))
-            sub_id_unique, sub_counts = np.unique(sub_id, return_counts=True)
-            sub_reco_counts = dict(zip(sub_id_unique, sub_counts))
-            
-            # Loop over all substations
-            beg_ = 0
-            end_ = 0
-            for sub_id, nb_obj in enumerate(self.sub_info):
-                nb_obj = int(nb_obj)
-                end_ += nb_obj
-
-                # Handle change action
-                if np.any(self._change_bus_vect[beg_:end_]):
-                    # change always impact the substations
-                    self._subs_impacted[sub_id] = True
-
-                # Handle set action
-                nb_set = np.sum(self._set_topo_vect[beg_:end_] != 0)
-                if nb_set > 0:
-                    # We have some lines reconnections, special case
-                    if sub_id in sub_reco_counts:
-                        if nb_set > sub_reco_counts[sub_id]:
-                            # Substation has other sets than line reconnections 
-                            self._subs_impacted[sub_id] = True
-                        else:
-                            # Substation set is only from line reconnections: do not impact it
-                            self._subs_impacted[sub_id] = False
-                    else: # Any other set operations will impact the substation
-                        self._subs_impacted[sub_id] = True
-
-                beg_ += nb_obj
+        elif self._impact_powerline_status is not None and \
+                np.array_equal(powerline_status, self._impact_powerline_status):
+            # this has already been computed, and the action has not been modified since
+            return self._lines_impacted, self._subs_impacted
+
+        self._impact_powerline_status = np.array(powerline_status, dtype=dt_bool)
+        not_powerline_status = ~self._impact_powerline_status
+        self._lines_impacted = self._switch_line_status | (self._set_line_status != 0 & not_powerline_status)
+
+        # number of powerlines reconnected (by set or by change) at each substation
+        powerlines_reco = (self._switch_line_status | (self._set_line_status == 1)) & not_powerline_status
+        sub_reco_counts = np.bincount(self.line_or_to_subid[powerlines_reco], minlength=self.n_sub)
+        sub_reco_counts += np.bincount(self.line_ex_to_subid[powerlines_reco], minlength=self.n_sub)
+
+        topo_vect_to_sub = self._get_topo_vect_to_sub()
+        # change always impact the substations
+        sub_changed = np.bincount(topo_vect_to_sub[self._change_bus_vect], minlength=self.n_sub) > 0
+        # set impacts the substations, unless all the elements set are the ends of reconnected powerlines
+        nb_set = np.bincount(topo_vect_to_sub[self._set_topo_vect != 0], minlength=self.n_sub)
+        self._subs_impacted = np.where(nb_set > 0, nb_set > sub_reco_counts, sub_changed)
 
         return self._lines_impacted, self._subs_impacted
 
@@ -572,6 +564,7 @@ class BaseAction(GridObjects):
         self._vectorized = None
         self._lines_impacted = None
         self._subs_impacted = None
+        self._impact_powerline_status = None
 
         # shunts
         if self.shunts_data_available:
@@ -694,6 +687,7 @@ class BaseAction(GridObjects):
             shunt_bus[ok_ind] = val[ok_ind]
             self._assign_iadd_or_warn("shunt_bus", shunt_bus)
 
+        self._reset_vect()
         return self
 
     def __call__(self):
@@ -809,6 +803,9 @@ class BaseAction(GridObjects):
         if "set_bus" in dict_:
             if isinstance(dict_["set_bus"], np.ndarray):
                 # complete nodal topology vector is already provided
+                if dict_["set_bus"].shape != (self.dim_topo,):
+                    raise AmbiguousAction("The \"set_bus\" vector should have {} elements (one per element of the "
+                                          "grid), it has shape {}".format(self.dim_topo, dict_["set_bus"].shape))
                 self._set_topo_vect = dict_["set_bus"]
             elif isinstance(dict_["set_bus"], dict):
                 ddict_ = dict_["set_bus"]
@@ -871,6 +868,10 @@ class BaseAction(GridObjects):
         if "change_bus" in dict_:
             if isinstance(dict_["change_bus"], np.ndarray):
                 # topology vector is already provided
+                if dict_["change_bus"].shape != (self.dim_topo,):
+                    raise AmbiguousAction("The \"change_bus\" vector should have {} elements (one per element of "
+                                          "the grid), it has shape {}".format(self.dim_topo,
+                                                                              dict_["change_bus"].shape))
                 self._change_bus_vect = dict_["change_bus"]
             elif isinstance(dict_["change_bus"], dict):
                 ddict_ = dict_["change_bus"]
@@ -1071,6 +1072,7 @@ class BaseAction(GridObjects):
         self._vectorized = None
         self._subs_impacted = None
         self._lines_impacted = None
+        self._impact_powerline_status = None
 
     def update(self, dict_):
         """
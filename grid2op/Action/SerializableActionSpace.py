@@ -7,7 +7,6 @@
 # This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
 
 import numpy as np
-import itertools
 
 from grid2op.dtypes import dt_int, dt_float, dt_bool
 from grid2op.Exceptions import AmbiguousAction, Grid2OpException
@@ -398,13 +397,63 @@ class SerializableActionSpace(SerializableSpace):
         return res
 
     @staticmethod
-    def get_all_unitary_topologies_change(action_space):
+    def _get_sub_bits(num_el, first_bits):
+        """
+        Bits (as a matrix of 0 and 1) of the elements of a substation with `num_el` elements, one row per integer in
+        `first_bits`. The first element of the substation is the most significant bit (so rows are in the same
+        order as in `itertools.product([0, 1], repeat=num_el)`).
+        """
+        shifts = np.arange(num_el - 1, -1, -1, dtype=np.int64)
+        return (first_bits.reshape(-1, 1) >> shifts) & 1
+
+    @staticmethod
+    def _get_sub_topologies_set(num_el, lines_pos):
+        """
+        Computes all the topologies with 2 buses of a substation with `num_el` elements that have at least one
+        powerline (at position `lines_pos` in the substation) connected to each bus.
+
+        Topologies are represented by integers, the "i"-th bit representing the element "i" of the substation (0:
+        connected to bus 2, 1: connected to bus 1). To break the symmetry, the first element is always connected to
+        bus 2.
+
+        Returns
+        -------
+        res: ``numpy.ndarray``, dtype:dt_int
+            One row per topology, with the bus (1 or 2) of each element of the substation.
+
+        """
+        nb_bits = num_el - 1
+        if nb_bits <= 0:
+            return np.zeros((0, num_el), dtype=dt_int)
+        all_bits = (1 << nb_bits) - 1
+        lines_bits = np.int64(0)
+        for pos in np.unique(lines_pos):
+            if pos > 0:
+                lines_bits |= np.int64(1) << (num_el - 1 - pos)
+        line_first = np.any(lines_pos == 0)
+
+        res = []
+        # topologies are processed by chunk to limit the memory used for big substations
+        chunk_size = 1 << 20
+        for beg_ in range(0, all_bits + 1, chunk_size):
+            topos = np.arange(beg_, min(beg_ + chunk_size, all_bits + 1), dtype=np.int64)
+            line_bus_1 = (topos & lines_bits) != 0
+            line_bus_2 = ((~topos & all_bits) & lines_bits) != 0
+            if line_first:
+                line_bus_2[:] = True
+            topos = topos[line_bus_1 & line_bus_2]
+            res.append(2 - SerializableActionSpace._get_sub_bits(num_el, topos).astype(dt_int))
+        return np.concatenate(res, axis=0)
+
+    @staticmethod
+    def get_all_unitary_topologies_change_vect(action_space):
         """
         This methods allows to compute and return all the unitary topological changes that can be performed on a
-        powergrid.
+        powergrid, as a matrix (no action is created).
 
-        The changes will be performed using the "change_bus" method. The "do nothing" action will be counted only
-        once.
+        Each row of this matrix is a "change_bus" vector (see :func:`grid2op.Action.BaseAction.update`) that changes
+        the topology of a single substation. They are in the same order as the actions returned by
+        :func:`SerializableActionSpace.get_all_unitary_topologies_change`.
 
         Parameters
         ----------
@@ -413,37 +462,36 @@ class SerializableActionSpace(SerializableSpace):
 
         Returns
         -------
-        res: ``list``
-            The list of all the topological actions that can be performed.
+        res: ``numpy.ndarray``, dtype:dt_bool
+            The matrix of all the topological changes that can be performed, with one row per action and
+            `action_space.dim_topo` columns.
 
         """
         res = []
-        S = [0, 1]
+        beg_ = 0
         for sub_id, num_el in enumerate(action_space.sub_info):
-            already_set = set()
-            for tup_ in itertools.product(S, repeat=num_el):
-                if tup_ not in already_set:
-                    indx = np.full(shape=num_el, fill_value=False, dtype=dt_bool)
-                    # tup = np.array((0, *tup)).astype(dt_bool)  # add a zero to first element -> break symmetry
-                    tup = np.array(tup_).astype(dt_bool)  # add a zero to first element -> break symmetry
-                    indx[tup] = True
-                    action = action_space({"change_bus": {"substations_id": [(sub_id, indx)]}})
-                    already_set.add(tup_)
-                    already_set.add(tuple([1-el for el in tup_]))
-                    res.append(action)
-                # otherwise, the change has already beend added (NB by symmetry , if there are A, B, C and D in
-                # a substation, changing A,B or changing C,D always has the same effect.
-        return res
+            num_el = int(num_el)
+            # changing all the elements of a substation or none of them has the same effect: only the changes that
+            # do not affect the first element are kept
+            changes = SerializableActionSpace._get_sub_bits(num_el, np.arange(1 << (num_el - 1), dtype=np.int64))
+            tmp = np.full((changes.shape[0], action_space.dim_topo), fill_value=False, dtype=dt_bool)
+            tmp[:, beg_:(beg_ + num_el)] = changes
+            res.append(tmp)
+            beg_ += num_el
+        return np.concatenate(res, axis=0)
 
     @staticmethod
-    def get_all_unitary_topologies_set(action_space):
+    def get_all_unitary_topologies_change(action_space):
         """
         This methods allows to compute and return all the unitary topological changes that can be performed on a
         powergrid.
 
-        The changes will be performed using the "set_bus" method. The "do nothing" action will be counted once
+        The changes will be performed using the "change_bus" method. The "do nothing" action will be counted once
         per substation in the grid.
 
+        See :func:`SerializableActionSpace.get_all_unitary_topologies_change_vect` to get them as a matrix, without
+        creating the actions.
+
         Parameters
         ----------
         action_space: :class:`grid2op.BaseAction.ActionHelper`
@@ -455,50 +503,76 @@ class SerializableActionSpace(SerializableSpace):
             The list of all the topological actions that can be performed.
 
         """
-        res = []
-        S = [0, 1]
-        for sub_id, num_el in enumerate(action_space.sub_info):
-            tmp = []
-            new_topo = np.full(shape=num_el, fill_value=1, dtype=dt_int)
-            # perform the action "set everything on bus 1"
-            action = action_space({"set_bus": {"substations_id": [(sub_id, new_topo)]}})
-            tmp.append(action)
+        all_changes = SerializableActionSpace.get_all_unitary_topologies_change_vect(action_space)
+        return [action_space({"change_bus": el.copy()}) for el in all_changes]
+
+    @staticmethod
+    def get_all_unitary_topologies_set_vect(action_space):
+        """
+        This methods allows to compute and return all the unitary topological changes that can be performed on a
+        powergrid, as a matrix (no action is created).
+
+        Each row of this matrix is a "set_bus" vector (see :func:`grid2op.Action.BaseAction.update`) that sets the
+        topology of a single substation, with 2 buses at most, each bus having at least one powerline connected to it.
+        They are in the same order as the actions returned by
+        :func:`SerializableActionSpace.get_all_unitary_topologies_set`.
+
+        Parameters
+        ----------
+        action_space: :class:`grid2op.BaseAction.ActionHelper`
+            The action space used.
 
+        Returns
+        -------
+        res: ``numpy.ndarray``, dtype:dt_int
+            The matrix of all the topologies that can be set, with one row per action and `action_space.dim_topo`
+            columns.
+
+        """
+        res = [np.zeros((0, action_space.dim_topo), dtype=dt_int)]
+        beg_ = 0
+        for sub_id, num_el in enumerate(action_space.sub_info):
+            num_el = int(num_el)
             powerlines_or_id = action_space.line_or_to_sub_pos[action_space.line_or_to_subid == sub_id]
             powerlines_ex_id = action_space.line_ex_to_sub_pos[action_space.line_ex_to_subid == sub_id]
             powerlines_id = np.concatenate((powerlines_or_id, powerlines_ex_id))
-
-            # computes all the topologies at 2 buses for this substation
-            for tup in itertools.product(S, repeat=num_el - 1):
-                indx = np.full(shape=num_el, fill_value=False, dtype=dt_bool)
-                tup = np.array((0, *tup)).astype(dt_bool)  # add a zero to first element -> break symmetry
-                indx[tup] = True
-                if np.sum(indx) >= 2 and np.sum(~indx) >= 2:
-                    # i need 2 elements on each bus at least (almost all the times, except when a powerline
-                    # is alone on its bus)
-                    new_topo = np.full(shape=num_el, fill_value=1, dtype=dt_int)
-                    new_topo[~indx] = 2
-
-                    if np.sum(indx[powerlines_id]) == 0 or np.sum(~indx[powerlines_id]) == 0:
-                        # if there is a "node" without a powerline, the topology is not valid
-                        continue
-
-                    action = action_space({"set_bus": {"substations_id": [(sub_id, new_topo)]}})
-                    tmp.append(action)
-                else:
-                    # i need to take into account the case where 1 powerline is alone on a bus too
-                    if np.sum(indx[powerlines_id]) >= 1 and np.sum(~indx[powerlines_id]) >= 1:
-                        new_topo = np.full(shape=num_el, fill_value=1, dtype=dt_int)
-                        new_topo[~indx] = 2
-                        action = action_space({"set_bus": {"substations_id": [(sub_id, new_topo)]}})
-                        tmp.append(action)
-
-            if len(tmp) >= 2:
+            topos = SerializableActionSpace._get_sub_topologies_set(num_el, powerlines_id)
+            if topos.shape[0] >= 1:
                 # if i have only one single topology on this substation, it doesn't make any action
                 # i cannot change the topology is there is only one.
-                res += tmp
+                tmp = np.zeros((topos.shape[0] + 1, action_space.dim_topo), dtype=dt_int)
+                # the action "set everything on bus 1"
+                tmp[0, beg_:(beg_ + num_el)] = 1
+                tmp[1:, beg_:(beg_ + num_el)] = topos
+                res.append(tmp)
+            beg_ += num_el
+        return np.concatenate(res, axis=0)
 
-        return res
+    @staticmethod
+    def get_all_unitary_topologies_set(action_space):
+        """
+        This methods allows to compute and return all the unitary topological changes that can be performed on a
+        powergrid.
+
+        The changes will be performed using the "set_bus" method. The "do nothing" action will be counted once
+        per substation in the grid.
+
+        See :func:`SerializableActionSpace.get_all_unitary_topologies_set_vect` to get them as a matrix, without
+        creating the actions.
+
+        Parameters
+        ----------
+        action_space: :class:`grid2op.BaseAction.ActionHelper`
+            The action space used.
+
+        Returns
+        -------
+        res: ``list``
+            The list of all the topological actions that can be performed.
+
+        """
+        all_topos = SerializableActionSpace.get_all_unitary_topologies_set_vect(action_space)
+        return [action_space({"set_bus": el.copy()}) for el in all_topos]
 
     @staticmethod
     def get_all_unitary_redispatch(action_space):
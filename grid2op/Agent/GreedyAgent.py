@@ -9,7 +9,6 @@
 from abc import abstractmethod
 import numpy as np
 from grid2op.Agent.BaseAgent import BaseAgent
-from grid2op.dtypes import dt_float
 
 
 class GreedyAgent(BaseAgent):
@@ -21,10 +20,14 @@ class GreedyAgent(BaseAgent):
 
     This class is an abstract class (object of this class cannot be created). To create "GreedyAgent" one must
     override this class. Examples are provided with :class:`PowerLineSwitch` and :class:`TopologyGreedy`.
+
+    All the actions are simulated with :func:`grid2op.Observation.BaseObservation.simulate_batch`, possibly on
+    `nb_process` processes.
     """
-    def __init__(self, action_space):
+    def __init__(self, action_space, nb_process=1):
         BaseAgent.__init__(self, action_space)
         self.tested_action = None
+        self.nb_process = nb_process
 
     def act(self, observation, reward, done=False):
         """
@@ -53,10 +56,7 @@ class GreedyAgent(BaseAgent):
         """
         self.tested_action = self._get_tested_action(observation)
         if len(self.tested_action) > 1:
-            all_rewards = np.full(shape=len(self.tested_action), fill_value=np.NaN, dtype=dt_float)
-            for i, action in enumerate(self.tested_action):
-                simul_obs, simul_reward, simul_has_error, simul_info = observation.simulate(action)
-                all_rewards[i] = simul_reward
+            all_rewards, *_ = observation.simulate_batch(self.tested_action, nb_process=self.nb_process)
             reward_idx = int(np.argmax(all_rewards))  # rewards.index(max(rewards))
             best_action = self.tested_action[reward_idx]
         else:
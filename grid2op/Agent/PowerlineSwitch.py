@@ -24,8 +24,8 @@ class PowerLineSwitch(GreedyAgent):
 
     """
 
-    def __init__(self, action_space):
-        GreedyAgent.__init__(self, action_space)
+    def __init__(self, action_space, nb_process=1):
+        GreedyAgent.__init__(self, action_space, nb_process=nb_process)
 
     def _get_tested_action(self, observation):
         res = [self.action_space({})]  # add the do nothing
@@ -21,8 +21,8 @@ class TopologyGreedy(GreedyAgent):
     To choose, it will simulate the outcome of all actions, and then chose the action leading to the best rewards.
 
     """
-    def __init__(self, action_space):
-        GreedyAgent.__init__(self, action_space)
+    def __init__(self, action_space, nb_process=1):
+        GreedyAgent.__init__(self, action_space, nb_process=nb_process)
         self.li_actions = None
 
     def _get_tested_action(self, observation):
@@ -10,6 +10,7 @@ import copy
 import os
 import warnings
 import json
+import multiprocessing
 
 from abc import ABC, abstractmethod
 import numpy as np
@@ -20,6 +21,17 @@ from grid2op.Exceptions import *
 from grid2op.Space import GridObjects
 from grid2op.Action import CompleteAction
 
+# backend and state used by the (forked) worker processes of "contingency_analysis_ac"
+_CONTINGENCY_AC_DATA = None
+
+
+def _aux_contingency_ac(line_id):
+    """compute the flows after the disconnection of powerline `line_id` in a worker process of
+    :func:`Backend.contingency_analysis_ac`"""
+    backend, state = _CONTINGENCY_AC_DATA
+    return backend._contingency_rho_ac(state, line_id)
+
+
 # TODO: if chronics are "loop through" multiple times, only last results are saved. :-/
 
 
@@ -84,6 +96,10 @@ class Backend(GridObjects, ABC):
         # thermal limit setting, in ampere, at the same "side" of the powerline than self.get_line_overflow
         self.thermal_limit_a = None
 
+        # whether the user has been warned that this backend cannot compute the line outage distribution factors
+        # (see :func:`Backend.next_grid_state`)
+        self._lodf_warning_issued = False
+
     def assert_grid_correct_after_powerflow(self):
         """
         This method is called by the environment. It ensure that the backend remains consistent even after a powerflow
@@ -231,6 +247,30 @@ class Backend(GridObjects, ABC):
         """
         pass
 
+    def get_state(self):
+        """
+        Retrieve a snapshot of the part of the backend that can be modified by an action or by a powerflow, that can
+        later be given to :func:`Backend.set_state` to restore the backend in this exact state.
+
+        This is meant to be much lighter than :func:`Backend.copy` as the static part of the powergrid (line
+        parameters, names, etc.) is not stored. By default, it falls back to a copy of the whole backend, so backends
+        are encouraged to overload it (see :func:`grid2op.Backend.PandaPowerBackend.get_state` for an example).
+
+        :return: The state of the backend. Its type depends on the backend, it should only be used with
+          :func:`Backend.set_state`.
+        """
+        return self.copy()
+
+    def set_state(self, state):
+        """
+        Restore the backend in the state given by :func:`Backend.get_state`. The state can be used multiple times.
+
+        :param state: the state to restore, as returned by :func:`Backend.get_state`
+
+        :return: ``None``
+        """
+        self.__dict__.update(state.copy().__dict__)
+
     def save_file(self, full_path):
         """
         Save the current power _grid in a human readable format supported by the backend.
@@ -563,6 +603,135 @@ class Backend(GridObjects, ABC):
         """
         pass
 
+    def _disconnect_lines(self, ids):
+        """
+        Disconnect all the powerlines whose ids are given. By default :func:`Backend._disconnect_line` is called
+        for each of them, backends are encouraged to overload it to disconnect them at once.
+
+        :param ids: ids of the powerlines to be disconnected
+        :type ids: :class:`numpy.ndarray`, dtype:int
+
+        :return: ``None``
+        """
+        for id_ in ids:
+            self._disconnect_line(id_)
+
+    def get_lodf(self):
+        """
+        Optionnal method that computes the Line Outage Distribution Factors of the current topology (DC
+        approximation). It is used to speed up the computation of the cascading failures (see
+        :func:`Backend.next_grid_state`).
+
+        :return: a matrix of shape (n_line, n_line) such that ``lodf[l, k]`` is the part of the active power flowing
+          on powerline `k` that is transferred to powerline `l` if powerline `k` is disconnected, with ``-1.`` on its
+          diagonal, ``0.`` in the columns of the powerlines disconnected and ``NaN`` in the columns of the powerlines
+          whose disconnection would split the grid.
+        :rtype: :class:`numpy.ndarray`, dtype:float
+        """
+        raise Grid2OpException("This backend doesn't allow to compute the line outage distribution factors.")
+
+    @staticmethod
+    def _flows_in_amps(p_or, q_or, v_or):
+        """
+        Compute the flows in amps from the active (MW) and reactive (MVAr) flows and the voltages (kV).
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            res = np.sqrt(p_or ** 2 + q_or ** 2) / (np.sqrt(3.) * v_or) * 1000.
+        return res
+
+    def contingency_analysis_dc(self, lines=None):
+        """
+        Estimate the relative flows (see :func:`Backend.get_relative_flow`) after the disconnection of each of the
+        given powerlines, one at a time, from the results of the last powerflow and the Line Outage Distribution
+        Factors of the grid (see :func:`Backend.get_lodf`).
+
+        The active flows are given by the line outage distribution factors, the reactive flows and the voltages are
+        supposed not to change.
+
+        :param lines: ids of the powerlines whose disconnection is studied (all the powerlines by default)
+        :type lines: :class:`numpy.ndarray`, dtype:int
+
+        :return: the relative flows, with a row per powerline disconnected and a column per powerline of the grid.
+          The rows of the powerlines whose disconnection would split the grid are filled with ``NaN``.
+        :rtype: :class:`numpy.ndarray`, dtype:float
+        """
+        if lines is None:
+            lines = np.arange(self.n_line, dtype=dt_int)
+        lines = np.array(lines, dtype=dt_int)
+        lodf = self.get_lodf()[:, lines]
+        p_or, q_or, v_or, _ = self.lines_or_info()
+        p_or = p_or.astype(np.float64)
+        p_post = p_or + lodf.T * p_or[lines][:, np.newaxis]
+        a_post = self._flows_in_amps(p_post, q_or, v_or)
+        a_post[:, ~self.get_line_status()] = 0.
+        a_post[np.arange(lines.shape[0]), lines] = 0.
+        res = (a_post / self.get_thermal_limit()).astype(dt_float)
+        res[np.any(np.isnan(lodf), axis=0)] = np.NaN
+        return res
+
+    def _contingency_rho_ac(self, state, line_id):
+        """
+        Compute the relative flows after the disconnection of powerline `line_id` from the state `state`
+        (see :func:`Backend.get_state`). Returns ``None`` if the powerflow diverges.
+        """
+        self.set_state(state)
+        self._disconnect_line(line_id)
+        try:
+            self._runpf_with_diverging_exception(is_dc=False)
+        except DivergingPowerFlow:
+            return None
+        return self.get_relative_flow()
+
+    def contingency_analysis_ac(self, lines=None, nb_process=1):
+        """
+        Compute the relative flows (see :func:`Backend.get_relative_flow`) after the disconnection of each of the
+        given powerlines, one at a time, with an AC powerflow. The backend is restored in its current state
+        afterwards.
+
+        :param lines: ids of the powerlines whose disconnection is studied (all the powerlines by default)
+        :type lines: :class:`numpy.ndarray`, dtype:int
+
+        :param nb_process: Number of processes used to compute the powerflows. If ``1`` (default) everything is done
+          in the current process. Otherwise the powerflows are dispatched on a pool of local processes (this requires
+          the "fork" start method of multiprocessing, if it is not available, everything is done in the current
+          process).
+        :type nb_process: int
+
+        :return: the relative flows, with a row per powerline disconnected and a column per powerline of the grid.
+          The rows of the powerlines whose disconnection makes the powerflow diverge are filled with ``NaN``.
+        :rtype: :class:`numpy.ndarray`, dtype:float
+        """
+        global _CONTINGENCY_AC_DATA
+
+        if lines is None:
+            lines = np.arange(self.n_line, dtype=dt_int)
+        lines = np.array(lines, dtype=dt_int)
+        nb_cont = lines.shape[0]
+        state = self.get_state()
+        try:
+            if nb_process > 1 and nb_cont > 1:
+                if "fork" in multiprocessing.get_all_start_methods():
+                    _CONTINGENCY_AC_DATA = (self, state)
+                    try:
+                        with multiprocessing.get_context("fork").Pool(min(nb_process, nb_cont)) as pool:
+                            all_rho = pool.map(_aux_contingency_ac, lines)
+                    finally:
+                        _CONTINGENCY_AC_DATA = None
+                else:
+                    warnings.warn("The \"fork\" start method of multiprocessing is not available on your system. "
+                                  "All powerflows are computed in the current process.")
+                    all_rho = [self._contingency_rho_ac(state, l_id) for l_id in lines]
+            else:
+                all_rho = [self._contingency_rho_ac(state, l_id) for l_id in lines]
+        finally:
+            self.set_state(state)
+
+        res = np.full((nb_cont, self.n_line), fill_value=np.NaN, dtype=dt_float)
+        for i, rho in enumerate(all_rho):
+            if rho is not None:
+                res[i, :] = rho
+        return res
+
     def _runpf_with_diverging_exception(self, is_dc):
         """
         Computes a power flow on the _grid and raises an exception in case of diverging power flow, or any other
@@ -589,6 +758,15 @@ class Backend(GridObjects, ABC):
 
         Note that it **DOESNT** update the environment with the disconnected lines.
 
+        If :attr:`grid2op.Environment.BaseEnv.fast_cascade` is ``True`` (see
+        :attr:`grid2op.Parameters.Parameters.FAST_CASCADE`) the flows after each round of disconnections are predicted
+        with the Line Outage Distribution Factors (see :func:`Backend.get_lodf`) of the last state computed by a
+        powerflow. A powerflow is only computed once the cascading failure stops according to these predictions, or
+        when a predicted flow is too close to a threshold to decide whether the powerline is disconnected (see
+        :attr:`grid2op.Parameters.Parameters.FAST_CASCADE_MARGIN`). A powerflow is computed after each round if
+        :attr:`Backend.detailed_infos_for_cascading_failures` is ``True``, or if the backend does not implement
+        :func:`Backend.get_lodf`.
+
         Attributes
         ----------
         env: :class:`grid2op.Environment.Environment`
@@ -610,21 +788,54 @@ class Backend(GridObjects, ABC):
 
         """
         infos = []
-        # print("\t\t gen p_mw {}".format(np.sum(self._grid.gen["p_mw"])))  # OK
-        # print("\t\t gen vm_pu {}".format(np.sum(self._grid.gen["vm_pu"])))  # OK
-        # print("\t\t load p_mw {}".format(np.sum(self._grid.load["p_mw"])))  # OK
-        # print("\t\t line in_service {}".format(np.sum(self._grid.line["in_service"])))  # OK
-        # print("\t\t shunt in_service {}".format(np.sum(self._grid.shunt["in_service"])))  # OK
-        # print("\t\t shunt q {}".format(np.sum(self._grid.shunt["q_mvar"])))  # OK
-        # print("\t\t load q_mvar {}".format(np.sum(self._grid.load["q_mvar"])))  # OK
-        # print("slack bus {}".format(self._grid["ext_grid"]))  # OK
-        # print("slack p {}".format(self._grid._ppc["gen"][self._iref_slack, 1]))
-        # self._nb_bus_before = None
         self._runpf_with_diverging_exception(is_dc)
 
-        disconnected_during_cf = np.full(self.n_line, fill_value=False, dtype=dt_bool)
         if env.no_overflow_disconnection:
+            disconnected_during_cf = np.full(self.n_line, fill_value=False, dtype=dt_bool)
             return disconnected_during_cf, infos
+
+        if not env.fast_cascade or self.detailed_infos_for_cascading_failures:
+            disconnected_during_cf = self._next_grid_state_exact(env, is_dc, infos)
+        elif env.fast_cascade_check:
+            state = self.get_state()
+            try:
+                disc_fast = self._next_grid_state_fast(env, is_dc)
+            except DivergingPowerFlow:
+                disc_fast = None
+            self.set_state(state)
+            disconnected_during_cf = self._next_grid_state_exact(env, is_dc, infos)
+            if disc_fast is None:
+                warnings.warn("The fast computation of the cascading failure diverged whereas the exact one did not.")
+            elif np.any(disc_fast != disconnected_during_cf):
+                warnings.warn("The fast computation of the cascading failure did not disconnect the same powerlines "
+                              "as the exact one (powerlines {} instead of {}). You can increase the parameter "
+                              "\"FAST_CASCADE_MARGIN\" to improve its accuracy."
+                              "".format(np.where(disc_fast)[0], np.where(disconnected_during_cf)[0]))
+        else:
+            disconnected_during_cf = self._next_grid_state_fast(env, is_dc)
+        return disconnected_during_cf, infos
+
+    @staticmethod
+    def _lines_to_disconnect(env, lines_flows, thermal_limits, lines_status, timestep_overflow):
+        """
+        Compute the powerlines disconnected by the protections during a round of a cascading failure, given the flows
+        of the powerlines. The number of timesteps each powerline is on overflow, `timestep_overflow`, is updated
+        inplace.
+        """
+        # a) disconnect lines on hard overflow
+        to_disc = lines_flows > env.hard_overflow_threshold * thermal_limits
+
+        # b) deals with soft overflow
+        timestep_overflow[(lines_flows >= thermal_limits) & lines_status] += 1
+        to_disc[timestep_overflow > env.nb_timestep_overflow_allowed] = True
+        return to_disc
+
+    def _next_grid_state_exact(self, env, is_dc, infos):
+        """
+        Simulate the cascading failure by running a powerflow after each round of disconnections (see
+        :func:`Backend.next_grid_state`).
+        """
+        disconnected_during_cf = np.full(self.n_line, fill_value=False, dtype=dt_bool)
         # the environment disconnect some
         init_time_step_overflow = copy.deepcopy(env.timestep_overflow)
         while True:
@@ -632,13 +843,8 @@ class Backend(GridObjects, ABC):
             lines_flows = self.get_line_flow()
             thermal_limits = self.get_thermal_limit()
             lines_status = self.get_line_status()
-
-            # a) disconnect lines on hard overflow
-            to_disc = lines_flows > env.hard_overflow_threshold * thermal_limits
-
-            # b) deals with soft overflow
-            init_time_step_overflow[ (lines_flows >= thermal_limits) & (lines_status)] += 1
-            to_disc[init_time_step_overflow > env.nb_timestep_overflow_allowed] = True
+            to_disc = self._lines_to_disconnect(env, lines_flows, thermal_limits, lines_status,
+                                                init_time_step_overflow)
 
             # disconnect the current power lines
             if np.sum(to_disc[lines_status]) == 0:
@@ -646,13 +852,106 @@ class Backend(GridObjects, ABC):
                 break
             disconnected_during_cf[to_disc] = True
             # perform the disconnection action
-            [self._disconnect_line(i) for i, el in enumerate(to_disc) if el]
+            self._disconnect_lines(np.where(to_disc)[0])
 
             # start a powerflow on this new state
             self._runpf_with_diverging_exception(is_dc)
             if self.detailed_infos_for_cascading_failures:
                 infos.append(self.copy())
-        return disconnected_during_cf, infos
+        return disconnected_during_cf
+
+    def _next_grid_state_fast(self, env, is_dc):
+        """
+        Simulate the cascading failure by predicting the flows after each round of disconnections with the line
+        outage distribution factors of the last state computed by a powerflow (see :func:`Backend.next_grid_state`).
+        """
+        disconnected_during_cf = np.full(self.n_line, fill_value=False, dtype=dt_bool)
+        init_time_step_overflow = copy.deepcopy(env.timestep_overflow)
+        thermal_limits = self.get_thermal_limit()
+        thresholds = np.array([1., env.hard_overflow_threshold], dtype=dt_float)
+        lines_status = copy.deepcopy(self.get_line_status())
+        lines_flows = self.get_line_flow()
+        # flows and line outage distribution factors of the last state computed by a powerflow
+        base = None
+        while True:
+            predicted = base is not None
+            timestep_overflow = copy.deepcopy(init_time_step_overflow)
+            to_disc = self._lines_to_disconnect(env, lines_flows, thermal_limits, lines_status, timestep_overflow)
+            stop = np.sum(to_disc[lines_status]) == 0
+            if predicted:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    rho = lines_flows[lines_status] / thermal_limits[lines_status]
+                ambiguous = np.abs(rho[:, np.newaxis] - thresholds) <= env.fast_cascade_margin * thresholds
+                if stop or np.any(ambiguous):
+                    # this round is decided on the flows computed by a powerflow
+                    self._runpf_with_diverging_exception(is_dc)
+                    lines_status = copy.deepcopy(self.get_line_status())
+                    lines_flows = self.get_line_flow()
+                    base = None
+                    continue
+            init_time_step_overflow = timestep_overflow
+            if stop:
+                break
+            disconnected_during_cf[to_disc] = True
+            if base is None and self._can_compute_lodf():
+                try:
+                    lodf = self.get_lodf()
+                except DivergingPowerFlow:
+                    lodf = None
+                if lodf is not None:
+                    p_or, q_or, v_or, _ = self.lines_or_info()
+                    base = (copy.deepcopy(lines_status), lodf, 1. * p_or, 1. * q_or, 1. * v_or)
+            self._disconnect_lines(np.where(to_disc)[0])
+            lines_status &= ~to_disc
+
+            if base is not None:
+                lines_flows = self._predict_line_flows(base, lines_status)
+                if lines_flows is not None:
+                    continue
+            # the flows cannot be predicted: a powerflow is computed on this new state
+            self._runpf_with_diverging_exception(is_dc)
+            lines_status = copy.deepcopy(self.get_line_status())
+            lines_flows = self.get_line_flow()
+            base = None
+        return disconnected_during_cf
+
+    def _can_compute_lodf(self):
+        """
+        Whether this backend implements :func:`Backend.get_lodf`. If it does not, the user is warned the first time
+        (for this backend) that a powerflow is computed after each round of the cascading failures instead.
+        """
+        if type(self).get_lodf is not Backend.get_lodf:
+            return True
+        if not getattr(self, "_lodf_warning_issued", False):
+            warnings.warn("This backend cannot compute the line outage distribution factors, a powerflow is "
+                          "computed after each round of the cascading failure.")
+            self._lodf_warning_issued = True
+        return False
+
+    @staticmethod
+    def _predict_line_flows(base, lines_status):
+        """
+        Predict the flows (in amps) of the powerlines after the disconnection of all the powerlines connected in the
+        `base` state but not in `lines_status`, from the line outage distribution factors of the `base` state. The
+        reactive flows and the voltages are supposed not to change.
+
+        Returns ``None`` if the flows cannot be predicted (for example if these disconnections split the grid).
+        """
+        status_base, lodf, p_or, q_or, v_or = base
+        outaged = np.where(status_base & ~lines_status)[0]
+        lodf_out = lodf[:, outaged]
+        if not np.all(np.isfinite(lodf_out)):
+            return None
+        # the flows transferred by the disconnected powerlines are such that their flows are 0. after the outages
+        mat = -lodf_out[outaged]
+        if np.linalg.cond(mat) >= 1e8:
+            return None
+        p_pred = p_or + lodf_out.dot(np.linalg.solve(mat, p_or[outaged]))
+        res = Backend._flows_in_amps(p_pred, q_or, v_or)
+        res[~lines_status] = 0.
+        if not np.all(np.isfinite(res)):
+            return None
+        return res.astype(dt_float)
 
     def check_kirchoff(self):
         """
@@ -682,63 +981,39 @@ class Backend(GridObjects, ABC):
         p_ex, q_ex, v_ex, *_ = self.lines_ex_info()
         p_gen, q_gen, v_gen = self.generators_info()
         p_load, q_load, v_load = self.loads_info()
-
-        # fist check the "substation law" : nothing is created at any substation
-        p_subs = np.zeros(self.n_sub)
-        q_subs = np.zeros(self.n_sub)
-
-        # check for each bus
-        p_bus = np.zeros((self.n_sub, 2))
-        q_bus = np.zeros((self.n_sub, 2))
         topo_vect = self.get_topo_vect()
 
-        for i in range(self.n_line):
-            # for substations
-            p_subs[self.line_or_to_subid[i]] += p_or[i]
-            p_subs[self.line_ex_to_subid[i]] += p_ex[i]
-
-            q_subs[self.line_or_to_subid[i]] += q_or[i]
-            q_subs[self.line_ex_to_subid[i]] += q_ex[i]
-
-            # for bus
-            p_bus[self.line_or_to_subid[i], topo_vect[self.line_or_pos_topo_vect[i]] - 1] += p_or[i]
-            q_bus[self.line_or_to_subid[i], topo_vect[self.line_or_pos_topo_vect[i]] - 1] += q_or[i]
-
-            p_bus[self.line_ex_to_subid[i], topo_vect[self.line_ex_pos_topo_vect[i]] - 1] += p_ex[i]
-            q_bus[self.line_ex_to_subid[i], topo_vect[self.line_ex_pos_topo_vect[i]] - 1] += q_ex[i]
-
-        for i in range(self.n_gen):
-            # for substations
-            p_subs[self.gen_to_subid[i]] -= p_gen[i]
-            q_subs[self.gen_to_subid[i]] -= q_gen[i]
-
-            # for bus
-            p_bus[self.gen_to_subid[i],  topo_vect[self.gen_pos_topo_vect[i]]-1] -= p_gen[i]
-            q_bus[self.gen_to_subid[i],  topo_vect[self.gen_pos_topo_vect[i]]-1] -= q_gen[i]
-
-        for i in range(self.n_load):
-            # for substations
-            p_subs[self.load_to_subid[i]] += p_load[i]
-            q_subs[self.load_to_subid[i]] += q_load[i]
-
-            # for buses
-            p_bus[self.load_to_subid[i],  topo_vect[self.load_pos_topo_vect[i]]-1] += p_load[i]
-            q_bus[self.load_to_subid[i],  topo_vect[self.load_pos_topo_vect[i]]-1] += q_load[i]
+        # all the power injected at each element (generators produce the power the other elements absorb)
+        subid = [self.line_or_to_subid, self.line_ex_to_subid, self.gen_to_subid, self.load_to_subid]
+        bus = [topo_vect[self.line_or_pos_topo_vect], topo_vect[self.line_ex_pos_topo_vect],
+               topo_vect[self.gen_pos_topo_vect], topo_vect[self.load_pos_topo_vect]]
+        p = [p_or, p_ex, -p_gen, p_load]
+        q = [q_or, q_ex, -q_gen, q_load]
 
         if self.shunts_data_available:
             p_s, q_s, v_s, bus_s = self.shunt_info()
-            for i in range(self.n_shunt):
-                # for substations
-                p_subs[self.shunt_to_subid[i]] += p_s[i]
-                q_subs[self.shunt_to_subid[i]] += q_s[i]
-
-                # for buses
-                p_bus[self.shunt_to_subid[i], bus_s[i] - 1] += p_s[i]
-                q_bus[self.shunt_to_subid[i], bus_s[i] - 1] += q_s[i]
+            subid.append(self.shunt_to_subid)
+            bus.append(bus_s)
+            p.append(p_s)
+            q.append(q_s)
         else:
             warnings.warn("Backend.check_kirchoff Impossible to get shunt information. Reactive information might be "
                           "incorrect.")
 
+        # index of the bus of each element in the (flatten) matrices p_bus and q_bus. The "% 2" keeps the behaviour of
+        # indexing a matrix of 2 columns with "bus - 1" (negative indexes included): disconnected elements (bus -1)
+        # are counted on the first bus.
+        bus_id = 2 * np.concatenate(subid).astype(dt_int) + (np.concatenate(bus).astype(dt_int) - 1) % 2
+        nb_bus = 2 * self.n_sub
+
+        # check for each bus
+        p_bus = np.bincount(bus_id, weights=np.concatenate(p), minlength=nb_bus).reshape(self.n_sub, 2)
+        q_bus = np.bincount(bus_id, weights=np.concatenate(q), minlength=nb_bus).reshape(self.n_sub, 2)
+
+        # then check the "substation law" : nothing is created at any substation
+        p_subs = p_bus.sum(axis=1)
+        q_subs = q_bus.sum(axis=1)
+
         return p_subs, q_subs, p_bus, q_bus
 
     def load_redispacthing_data(self, path, name='prods_charac.csv'):
@@ -18,12 +18,18 @@ import os  # load the python os default module
 import sys  # laod the python sys default module
 import copy
 import warnings
+from collections import OrderedDict
 
 import numpy as np
 import pandas as pd
 
 import pandapower as pp
 import scipy
+import scipy.sparse.csgraph
+from pandapower.pypower.idx_bus import BUS_I, BUS_TYPE, NONE, REF
+from pandapower.pypower.idx_brch import F_BUS, T_BUS, BR_STATUS
+from pandapower.pypower.makePTDF import makePTDF
+from pandapower.pypower.makeLODF import makeLODF
 
 from grid2op.dtypes import dt_int, dt_float, dt_bool
 from grid2op.Backend.Backend import Backend
@@ -83,8 +89,52 @@ class PandaPowerBackend(Backend):
     v_ex: :class:`numpy.array`, dtype:float
         The voltage magnitude at the extremity bus of the powerline
 
+    warm_start_cache_size: ``int``
+        Maximum number of converged states kept to initialize the AC powerflows (see :func:`PandaPowerBackend.runpf`).
+        ``0`` deactivates the cache.
+
+    nb_cache_hit: ``int``
+        Number of AC powerflows initialized from a cached state with the same topology
+
+    nb_cache_miss: ``int``
+        Number of AC powerflows for which no cached state with the same topology was available (they are
+        initialized from the cached state with the closest topology, if any)
+
+    nb_iter: ``int``
+        Number of iterations performed by the Newton-Raphson algorithm during the last AC powerflow
+
+    nb_iter_total: ``int``
+        Total number of iterations performed by the Newton-Raphson algorithm
+
+    _warm_start_cache: :class:`collections.OrderedDict`
+        The cache of converged states, from the least to the most recently used. The keys are built from the
+        topology vector and the status of the powerlines, the values are the topology vector, the voltage magnitudes
+        and the voltage angles of the buses.
+
+    _state_columns: ``tuple``
+        For each pandapower table, the columns that are saved by :func:`PandaPowerBackend.get_state`
+
+    _state_vectors: ``tuple``
+        The attributes of the backend (results of the powerflow) saved by :func:`PandaPowerBackend.get_state`
+
     """
-    def __init__(self, detailed_infos_for_cascading_failures=False):
+    _state_columns = (("load", ("p_mw", "q_mvar", "bus", "in_service")),
+                      ("gen", ("p_mw", "vm_pu", "bus", "in_service")),
+                      ("line", ("from_bus", "to_bus", "in_service")),
+                      ("trafo", ("hv_bus", "lv_bus", "in_service")),
+                      ("shunt", ("p_mw", "q_mvar", "bus", "in_service")),
+                      ("ext_grid", ("bus", "vm_pu")),
+                      ("bus", ("in_service",)))
+    _state_vectors = ("p_or", "q_or", "v_or", "a_or", "p_ex", "q_ex", "v_ex", "a_ex",
+                      "load_p", "load_q", "load_v", "prod_p", "prod_q", "prod_v",
+                      "line_status", "thermal_limit_a", "_topo_vect")
+
+    # attributes that are not restored by reset: the cache of converged states and its counters (and whether the user
+    # has been warned that the line outage distribution factors cannot be computed, see Backend.next_grid_state)
+    _warm_start_attrs = ("_warm_start_cache", "nb_cache_hit", "nb_cache_miss", "nb_iter", "nb_iter_total",
+                         "_lodf_warning_issued")
+
+    def __init__(self, detailed_infos_for_cascading_failures=False, warm_start_cache_size=16):
         Backend.__init__(self, detailed_infos_for_cascading_failures=detailed_infos_for_cascading_failures)
         self.prod_pu_to_kv = None
         self.load_pu_to_kv = None
@@ -127,6 +177,18 @@ class PandaPowerBackend(Backend):
         self._vars_action_set = BaseAction.attr_list_vect
         self.cst_1 = dt_float(1.0)
         self._topo_vect = None
+        self._topo_changed = True
+        self._bus_pos_in_df = None
+        self._init_load_in_service = None
+        self._init_gen_in_service = None
+
+        # converged states used to initialize the AC powerflows
+        self.warm_start_cache_size = warm_start_cache_size
+        self._warm_start_cache = OrderedDict()
+        self.nb_cache_hit = 0
+        self.nb_cache_miss = 0
+        self.nb_iter = 0
+        self.nb_iter_total = 0
 
         # self._time_topo_vect = 0.
 
@@ -165,7 +227,10 @@ class PandaPowerBackend(Backend):
         """
         # Assign the content of itself as saved at the end of load_grid
         # This overide all the attributes with the attributes from the copy in __pp_backend_initial_state
+        # (except the cache of converged states, that remains valid, see _warm_start_attrs)
+        warm_start = {attr_nm: getattr(self, attr_nm) for attr_nm in self._warm_start_attrs}
         self.__dict__.update(copy.deepcopy(self.__pp_backend_initial_state).__dict__)
+        self.__dict__.update(warm_start)
 
     def load_grid(self, path=None, filename=None):
         """
@@ -236,6 +301,10 @@ class PandaPowerBackend(Backend):
         self._init_bus_lor = np.concatenate((self._init_bus_lor, t_for)).astype(np.int)
         self._init_bus_lex = np.concatenate((self._init_bus_lex, t_fex)).astype(np.int)
 
+        # loads and generators in service in the original grid: disconnecting one of them is a game over
+        self._init_load_in_service = self._grid.load["in_service"].values.astype(dt_bool)
+        self._init_gen_in_service = self._grid.gen["in_service"].values.astype(dt_bool)
+
         self._grid["ext_grid"]["va_degree"] = 0.0
 
         # this has the effect to divide by 2 the active power in the added generator, if this generator and the "slack bus"
@@ -369,6 +438,8 @@ class PandaPowerBackend(Backend):
         add_topo.index += add_topo.shape[0]
         add_topo["in_service"] = False
         self._grid.bus = pd.concat((self._grid.bus, add_topo))
+        # position (in the dataframe) of the bus with label i (bus labels are not always sorted)
+        self._bus_pos_in_df = self._grid.bus.index.get_indexer(np.arange(self._grid.bus.shape[0]))
 
         self.load_pu_to_kv = self._grid.bus["vn_kv"][self.load_to_subid].values.astype(dt_float)
         self.prod_pu_to_kv = self._grid.bus["vn_kv"][self.gen_to_subid].values.astype(dt_float)
@@ -422,6 +493,7 @@ class PandaPowerBackend(Backend):
             self._big_topo_to_obj[pos_big_topo] = (l_id, nm_)
 
         self._topo_vect = self._get_topo_vect()
+        self._topo_changed = False
         # Create a deep copy of itself in the initial state
         pp_backend_initial_state = copy.deepcopy(self)
         # Store it under super private attribute
@@ -440,85 +512,108 @@ class PandaPowerBackend(Backend):
     def apply_action(self, backendAction=None):
         """
         Specific implementation of the method to apply an action modifying a powergrid in the pandapower format.
+
+        Everything is vectorized: the "changed" masks and the values stored in the
+        :class:`grid2op.Action._BackendAction.ValueStore` are used to write whole columns of the underlying pandapower
+        dataframes (one numpy assignment per column) instead of looping through each element.
         """
         active_bus, (prod_p, prod_v, load_p, load_q), topo__, shunts__ = backendAction()
-        k = "prod_p"
-        tmp = self._get_vector_inj[k](self._grid)
-        for gen_id, new_p in prod_p:
-            tmp.iloc[gen_id] = new_p
-
-        k = "prod_v"
-        tmp = self._get_vector_inj[k](self._grid)
-        for gen_id, new_v in prod_v:
-            tmp.iloc[gen_id] = new_v / self.prod_pu_to_kv[gen_id]
+
+        # injections
+        if np.any(prod_p.changed):
+            tmp = self._get_vector_inj["prod_p"](self._grid)
+            tmp.values[prod_p.changed] = prod_p.values[prod_p.changed]
+
+        if np.any(prod_v.changed):
+            tmp = self._get_vector_inj["prod_v"](self._grid)
             # convert values back to pu
-            if self._id_bus_added is not None:
+            tmp.values[prod_v.changed] = prod_v.values[prod_v.changed] / self.prod_pu_to_kv[prod_v.changed]
+            if self._id_bus_added is not None and prod_v.changed[self._id_bus_added]:
                 # in this case the slack bus where not modeled as an independant generator in the
-                # original data
-                if gen_id == self._id_bus_added:
-                    # handling of the slack bus, where "2" generators are present.
-                    self._grid["ext_grid"]["vm_pu"] = tmp[gen_id]
+                # original data: handling of the slack bus, where "2" generators are present.
+                self._grid["ext_grid"]["vm_pu"] = tmp.values[self._id_bus_added]
 
-        k = "load_p"
-        tmp = self._get_vector_inj[k](self._grid)
-        for gen_id, new_p in load_p:
-            tmp.iloc[gen_id] = new_p
+        if np.any(load_p.changed):
+            tmp = self._get_vector_inj["load_p"](self._grid)
+            tmp.values[load_p.changed] = load_p.values[load_p.changed]
 
-        k = "load_q"
-        tmp = self._get_vector_inj[k](self._grid)
-        for gen_id, new_q in load_q:
-            tmp.iloc[gen_id] = new_q
+        if np.any(load_q.changed):
+            tmp = self._get_vector_inj["load_q"](self._grid)
+            tmp.values[load_q.changed] = load_q.values[load_q.changed]
 
         if self.shunts_data_available:
             shunt_p, shunt_q, shunt_bus = shunts__
-            for sh_id, new_p in shunt_p:
-                self._grid.shunt["p_mw"].iloc[sh_id] = new_p
-            for sh_id, new_q in shunt_q:
-                self._grid.shunt["q_mvar"].iloc[sh_id] = new_q
-
-            for sh_id, new_bus in shunt_bus:
-                if new_bus == -1:
-                    self._grid.shunt["in_service"].iloc[sh_id] = False
-                elif new_bus == 1:
-                    self._grid.shunt["in_service"].iloc[sh_id] = True
-                    self._grid.shunt["bus"] = self.shunt_to_subid[sh_id]
-                elif new_bus == 2:
-                    self._grid.shunt["in_service"].iloc[sh_id] = True
-                    self._grid.shunt["bus"] = self.shunt_to_subid[sh_id] + self.__nb_bus_before
-
-        # i made at least a real change, so i implement it in the backend
-        for id_el, new_bus in topo__:
-            id_el_backend, type_obj = self._convert_id_topo(id_el)
-            if type_obj == "load":
-                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_load[id_el_backend])
-                self._grid.load["bus"].iloc[id_el_backend] = new_bus_backend
-            elif type_obj == "gen":
-                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_gen[id_el_backend])
-                self._grid.gen["bus"].iloc[id_el_backend] = new_bus_backend
-                if self._iref_slack is not None:
-                    # remember in this case slack bus is actually 2 generators for pandapower !
-                    if id_el_backend == self._grid.gen.shape[0] -1:
-                        self._grid.ext_grid["bus"].iloc[0] = new_bus_backend
-            elif type_obj == "lineor":
-                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_lor[id_el_backend])
-                if id_el_backend < self.__nb_powerline:
-                    # it's a powerline
-                    self.change_bus_powerline_or(id_el_backend, new_bus_backend)
-                else:
-                    # it's a trafo
-                    self.change_bus_trafo_hv(id_el_backend - self.__nb_powerline, new_bus_backend)
-            elif type_obj == "lineex":
-                new_bus_backend = self._pp_bus_from_grid2op_bus(new_bus, self._init_bus_lex[id_el_backend])
-                if id_el_backend < self.__nb_powerline:
-                    # it's a powerline
-                    self.change_bus_powerline_ex(id_el_backend, new_bus_backend)
-                else:
-                    # it's a trafo
-                    self.change_bus_trafo_lv(id_el_backend - self.__nb_powerline, new_bus_backend)
-        bus_is = self._grid.bus["in_service"]
-        for i, (bus1_status, bus2_status) in enumerate(active_bus):
-            bus_is[i] = bus1_status  # no iloc for bus, don't ask me why please :-/
-            bus_is[i + self.__nb_bus_before] = bus2_status
+            if np.any(shunt_p.changed):
+                self._grid.shunt["p_mw"].values[shunt_p.changed] = shunt_p.values[shunt_p.changed]
+            if np.any(shunt_q.changed):
+                self._grid.shunt["q_mvar"].values[shunt_q.changed] = shunt_q.values[shunt_q.changed]
+            if np.any(shunt_bus.changed):
+                new_bus = shunt_bus.values[shunt_bus.changed]
+                self._grid.shunt["in_service"].values[shunt_bus.changed] = new_bus > 0
+                connected = np.zeros(self.n_shunt, dtype=dt_bool)
+                connected[shunt_bus.changed] = new_bus > 0
+                self._grid.shunt["bus"].values[connected] = \
+                    self.shunt_to_subid[connected] + (shunt_bus.values[connected] == 2) * self.__nb_bus_before
+
+        # topology
+        if np.any(topo__.changed):
+            self._apply_topo_vect(topo__.values, topo__.changed)
+            self._topo_changed = True
+
+        bus_is = self._grid.bus["in_service"].values
+        bus_is[self._bus_pos_in_df[:self.__nb_bus_before]] = active_bus[:, 0]
+        bus_is[self._bus_pos_in_df[self.__nb_bus_before:]] = active_bus[:, 1]
+
+    def _apply_topo_vect(self, topo_vect, changed):
+        """
+        Set the buses of all the objects whose position in the topology vector is flagged as changed. This writes
+        the "bus" (or "from_bus", "to_bus", "hv_bus", "lv_bus") and "in_service" columns of the pandapower
+        dataframes with one numpy assignment each.
+        """
+        # loads
+        chg_load = changed[self.load_pos_topo_vect]
+        if np.any(chg_load):
+            new_bus = self._pp_bus_from_grid2op_bus_vect(topo_vect[self.load_pos_topo_vect][chg_load],
+                                                         self._init_bus_load[chg_load])
+            self._set_bus_and_status(self._grid.load, "bus", chg_load, new_bus)
+
+        # generators
+        chg_gen = changed[self.gen_pos_topo_vect]
+        if np.any(chg_gen):
+            new_bus = self._pp_bus_from_grid2op_bus_vect(topo_vect[self.gen_pos_topo_vect][chg_gen],
+                                                         self._init_bus_gen[chg_gen])
+            self._set_bus_and_status(self._grid.gen, "bus", chg_gen, new_bus)
+            if self._iref_slack is not None and chg_gen[-1] and new_bus[-1] >= 0:
+                # remember in this case slack bus is actually 2 generators for pandapower !
+                self._grid.ext_grid["bus"].values[0] = new_bus[-1]
+
+        # powerlines and transformers, origin side then extremity side
+        nb_line = self.__nb_powerline
+        for pos_topo_vect, init_bus, col_line, col_trafo in [(self.line_or_pos_topo_vect, self._init_bus_lor,
+                                                              "from_bus", "hv_bus"),
+                                                             (self.line_ex_pos_topo_vect, self._init_bus_lex,
+                                                              "to_bus", "lv_bus")]:
+            chg_l = changed[pos_topo_vect]
+            if not np.any(chg_l):
+                continue
+            new_bus = np.full(self.n_line, fill_value=-1, dtype=dt_int)
+            new_bus[chg_l] = self._pp_bus_from_grid2op_bus_vect(topo_vect[pos_topo_vect][chg_l], init_bus[chg_l])
+            self._set_bus_and_status(self._grid.line, col_line, chg_l[:nb_line], new_bus[:nb_line][chg_l[:nb_line]])
+            self._set_bus_and_status(self._grid.trafo, col_trafo, chg_l[nb_line:], new_bus[nb_line:][chg_l[nb_line:]])
+
+    @staticmethod
+    def _set_bus_and_status(df, col_bus, changed, new_bus):
+        """
+        For the elements of the dataframe `df` flagged in `changed`, disconnects the ones with a negative `new_bus`,
+        and connects the others to the bus `new_bus` (stored in the column `col_bus`).
+        """
+        if not np.any(changed):
+            return
+        connected = new_bus >= 0
+        df["in_service"].values[changed] = connected
+        if np.any(connected):
+            ids = np.where(changed)[0][connected]
+            df[col_bus].values[ids] = new_bus[connected]
 
     def change_bus_powerline_or(self, id_powerline_backend, new_bus_backend):
         if new_bus_backend < 0:
@@ -548,6 +643,17 @@ class PandaPowerBackend(Backend):
             self._grid.trafo["in_service"].iloc[id_powerline_backend] = True
             self._grid.trafo["lv_bus"].iloc[id_powerline_backend] = new_bus_backend
 
+    def _pp_bus_from_grid2op_bus_vect(self, grid2op_bus, grid2op_bus_init):
+        """vectorized version of :func:`PandaPowerBackend._pp_bus_from_grid2op_bus`"""
+        is_bus_1 = grid2op_bus == 1
+        is_bus_2 = grid2op_bus == 2
+        if np.any(~(is_bus_1 | is_bus_2 | (grid2op_bus == -1))):
+            raise BackendError("grid2op bus must be -1, 1 or 2")
+        res = np.full(grid2op_bus.shape, fill_value=-1, dtype=dt_int)
+        res[is_bus_1] = grid2op_bus_init[is_bus_1]
+        res[is_bus_2] = grid2op_bus_init[is_bus_2] + self.__nb_bus_before
+        return res
+
     def _pp_bus_from_grid2op_bus(self, grid2op_bus, grid2op_bus_init):
         if grid2op_bus == 1:
             res = grid2op_bus_init
@@ -563,16 +669,91 @@ class PandaPowerBackend(Backend):
         res = np.concatenate((self._grid.res_line[colname1].values, self._grid.res_trafo[colname2].values))
         return res
 
+    def _get_warm_start(self, cache_key, topo_vect):
+        """
+        Get the voltages (magnitudes and angles of all the buses) used to initialize the AC powerflow: the ones of the
+        cached state with the same topology or, if there is none, with the closest topology (the buses that were not
+        in service in this state are initialized with the voltages of the other bus of their substation).
+
+        Returns ``None`` if the cache is empty.
+        """
+        if cache_key in self._warm_start_cache:
+            self.nb_cache_hit += 1
+            self._warm_start_cache.move_to_end(cache_key)
+            _, vm_pu, va_degree = self._warm_start_cache[cache_key]
+            return vm_pu, va_degree
+
+        self.nb_cache_miss += 1
+        if not self._warm_start_cache:
+            return None
+        _, vm_pu, va_degree = min(self._warm_start_cache.values(), key=lambda el: np.sum(el[0] != topo_vect))
+        # voltages ordered by bus id: bus i + n_sub is the second bus of substation i
+        vm_pu = vm_pu[self._bus_pos_in_df]
+        va_degree = va_degree[self._bus_pos_in_df]
+        for bus_id, other_bus_id in [(slice(None, self.n_sub), slice(self.n_sub, None)),
+                                     (slice(self.n_sub, None), slice(None, self.n_sub))]:
+            not_init = ~np.isfinite(vm_pu[bus_id])
+            vm_pu[bus_id][not_init] = vm_pu[other_bus_id][not_init]
+            va_degree[bus_id][not_init] = va_degree[other_bus_id][not_init]
+        not_init = ~np.isfinite(vm_pu) | ~np.isfinite(va_degree)
+        vm_pu[not_init] = 1.
+        va_degree[not_init] = 0.
+        res_vm_pu = np.empty_like(vm_pu)
+        res_va_degree = np.empty_like(va_degree)
+        res_vm_pu[self._bus_pos_in_df] = vm_pu
+        res_va_degree[self._bus_pos_in_df] = va_degree
+        return res_vm_pu, res_va_degree
+
+    def _runpp(self, cache_key, topo_vect):
+        """
+        Run the AC powerflow, initialized from the cache of converged states (see
+        :func:`PandaPowerBackend._get_warm_start`) if it is used. If it does not converge from this state, it is
+        run again from the DC solution.
+        """
+        init_v = None
+        if self.warm_start_cache_size > 0:
+            init_v = self._get_warm_start(cache_key, topo_vect)
+        if init_v is None:
+            pp.runpp(self._grid, check_connectivity=False, init=self._pf_init, numba=numba_)
+        else:
+            try:
+                pp.runpp(self._grid, check_connectivity=False, init_vm_pu=init_v[0], init_va_degree=init_v[1],
+                         numba=numba_)
+            except pp.powerflow.LoadflowNotConverged:
+                pp.runpp(self._grid, check_connectivity=False, init="dc", numba=numba_)
+        self.nb_iter = int(self._grid._ppc["iterations"])
+        self.nb_iter_total += self.nb_iter
+
+    def _store_warm_start(self, cache_key, topo_vect):
+        """
+        Store the voltages of the AC powerflow that just converged in the cache of converged states, removing the
+        least recently used state if the cache is full.
+        """
+        self._warm_start_cache[cache_key] = (1 * topo_vect,
+                                             1. * self._grid.res_bus["vm_pu"].values,
+                                             1. * self._grid.res_bus["va_degree"].values)
+        self._warm_start_cache.move_to_end(cache_key)
+        while len(self._warm_start_cache) > self.warm_start_cache_size:
+            self._warm_start_cache.popitem(last=False)
+
     def runpf(self, is_dc=False):
         """
         Run a power flow on the underlying _grid. This implements an optimization of the powerflow
         computation: if the number of
         buses has not changed between two calls, the previous results are re used. This speeds up the computation
         in case of "do nothing" action applied.
+
+        The AC powerflows are initialized with the voltages of the last converged state with the same topology (same
+        topology vector and same status of the powerlines), or the closest one, if any, among the
+        :attr:`PandaPowerBackend.warm_start_cache_size` last topologies encountered. The number of times such a state
+        was found is counted in :attr:`PandaPowerBackend.nb_cache_hit` (and the number of times it was not in
+        :attr:`PandaPowerBackend.nb_cache_miss`).
         """
         # print("I called runpf")
         conv = True
         nb_bus = self.get_nb_active_bus()
+        topo_vect = None
+        cache_key = None
         try:
             with warnings.catch_warnings():
                 # remove the warning if _grid non connex. And it that case load flow as not converged
@@ -588,13 +769,21 @@ class PandaPowerBackend(Backend):
                     pp.rundcpp(self._grid, check_connectivity=False)
                     self._nb_bus_before = None  # if dc i start normally next time i call an ac powerflow
                 else:
-                    pp.runpp(self._grid, check_connectivity=False, init=self._pf_init, numba=numba_)
+                    topo_vect = self._get_topo_vect() if self._topo_changed else self._topo_vect
+                    cache_key = topo_vect.tobytes() + self._get_line_status().tobytes()
+                    self._runpp(cache_key, topo_vect)
 
                 if self._grid.res_gen.isnull().values.any():
                     # TODO see if there is a better way here
                     # sometimes pandapower does not detect divergence and put Nan.
                     raise pp.powerflow.LoadflowNotConverged
 
+                if np.any(self._init_load_in_service & ~self._grid.load["in_service"].values) or \
+                        np.any(self._init_gen_in_service & ~self._grid.gen["in_service"].values):
+                    # some loads or generators have been disconnected (by an action): it's a game over case!
+                    # (elements already out of service in the original grid are not considered)
+                    raise pp.powerflow.LoadflowNotConverged
+
                 self.load_p[:], self.load_q[:], self.load_v[:] = self._loads_info()
                 if not is_dc:
                     if not np.all(np.isfinite(self.load_v)):
@@ -632,7 +821,12 @@ class PandaPowerBackend(Backend):
 
                 self._nb_bus_before = None
                 self._grid._ppc["gen"][self._iref_slack, 1] = 0.
-                self._topo_vect[:] = self._get_topo_vect()
+                if not is_dc and self.warm_start_cache_size > 0:
+                    self._store_warm_start(cache_key, topo_vect)
+                if self._topo_changed:
+                    # the topology vector is only rebuilt if a bus or a status has been modified
+                    self._topo_vect[:] = self._get_topo_vect() if topo_vect is None else topo_vect
+                    self._topo_changed = False
                 return self._grid.converged
 
         except pp.powerflow.LoadflowNotConverged:
@@ -663,6 +857,46 @@ class PandaPowerBackend(Backend):
         res = copy.deepcopy(self)
         return res
 
+    def get_state(self):
+        """
+        Retrieve the state of the backend without copying the whole pandapower network: only the columns of the
+        pandapower dataframes that can be modified by an action (injections, buses and status of the elements,
+        see :attr:`PandaPowerBackend._state_columns`) and the vectors holding the results of the last powerflow
+        (see :attr:`PandaPowerBackend._state_vectors`) are copied.
+
+        Returns
+        -------
+        res: ``dict``
+            The state of the backend, to be used with :func:`PandaPowerBackend.set_state`
+        """
+        res = {"grid": {(table, col): self._grid[table][col].values.copy()
+                        for table, cols in self._state_columns for col in cols},
+               "vect": {attr_nm: copy.deepcopy(getattr(self, attr_nm)) for attr_nm in self._state_vectors},
+               "_topo_changed": self._topo_changed,
+               "_nb_bus_before": self._nb_bus_before}
+        return res
+
+    def set_state(self, state):
+        """
+        Restore the backend in the state returned by :func:`PandaPowerBackend.get_state`. The pandapower dataframes
+        and the result vectors are modified inplace, and `state` is not modified (it can be restored multiple times).
+
+        Parameters
+        ----------
+        state: ``dict``
+            The state to restore, as returned by :func:`PandaPowerBackend.get_state`
+
+        """
+        for (table, col), values in state["grid"].items():
+            self._grid[table][col].values[:] = values
+        for attr_nm, values in state["vect"].items():
+            if values is None:
+                setattr(self, attr_nm, None)
+            else:
+                getattr(self, attr_nm)[:] = values
+        self._topo_changed = state["_topo_changed"]
+        self._nb_bus_before = state["_nb_bus_before"]
+
     def close(self):
         """
         Called when the :class:`grid2op;Environment` has terminated, this function only reset the grid to a state
@@ -701,58 +935,177 @@ class PandaPowerBackend(Backend):
             self._grid.line["in_service"].iloc[id] = False
         else:
             self._grid.trafo["in_service"].iloc[id - self._number_true_line] = False
+        self._topo_changed = True
+
+    def _disconnect_lines(self, ids):
+        ids = np.asarray(ids, dtype=dt_int)
+        is_line = ids < self._number_true_line
+        self._grid.line["in_service"].values[ids[is_line]] = False
+        self._grid.trafo["in_service"].values[ids[~is_line] - self._number_true_line] = False
+        self._topo_changed = True
+
+    def _get_ptdf_ppc(self):
+        """
+        Compute, with pandapower, the Power Transfer Distribution Factors of the grid used by the last powerflow
+        (stored in the "_ppc" of the pandapower network), restricted to its buses and branches in service.
+
+        Returns
+        -------
+        ptdf: :class:`numpy.array`, dtype:float
+            The Power Transfer Distribution Factors of the branches (rows) and buses (columns) in service
+
+        branch: :class:`numpy.array`
+            The branches in service (in the pypower format), with their buses numbered as the columns of `ptdf`
+
+        lines_on: :class:`numpy.array`, dtype:int
+            The ids of the powerlines whose flows are given by the rows of `ptdf` (in the same order)
+
+        buses_on: :class:`numpy.array`, dtype:int
+            The ids of the buses (see :func:`PandaPowerBackend.get_ptdf`) whose injections are given by the columns
+            of `ptdf`
+
+        cols: :class:`numpy.array`, dtype:int
+            The column of `ptdf` of each bus of `buses_on`
+
+        Raises
+        ------
+        DivergingPowerFlow
+            If the grid is not connex, or if it has no reference bus.
+        """
+        ppc = self._grid._ppc
+        lookups = self._grid._pd2ppc_lookups
+        bus = ppc["bus"].real
+        branch = ppc["branch"]
+
+        # ppc branch of each powerline: the powerlines first, then the transformers
+        branch_ids = np.concatenate([np.arange(*lookups["branch"][table]) for table in ["line", "trafo"]
+                                     if table in lookups["branch"]])
+        bus_active = bus[:, BUS_TYPE] != NONE
+        br_f = branch[:, F_BUS].real.astype(dt_int)
+        br_t = branch[:, T_BUS].real.astype(dt_int)
+        br_on = (branch[:, BR_STATUS].real != 0.) & bus_active[br_f] & bus_active[br_t]
+
+        # the buses in service are numbered consecutively, as required by pandapower
+        new_bus_id = np.full(bus.shape[0], fill_value=-1, dtype=dt_int)
+        new_bus_id[bus_active] = np.arange(np.sum(bus_active))
+        bus_on = bus[bus_active]
+        bus_on[:, BUS_I] = np.arange(bus_on.shape[0])
+        branch_on = branch[br_on].copy()
+        branch_on[:, F_BUS] = new_bus_id[br_f[br_on]]
+        branch_on[:, T_BUS] = new_bus_id[br_t[br_on]]
+        if not np.any(bus_on[:, BUS_TYPE] == REF):
+            raise DivergingPowerFlow("There is no reference bus in the powergrid.")
+        nb_bus_on = bus_on.shape[0]
+        adjacency = scipy.sparse.csr_matrix((np.ones(branch_on.shape[0]),
+                                             (branch_on[:, F_BUS].real.astype(dt_int),
+                                              branch_on[:, T_BUS].real.astype(dt_int))),
+                                            shape=(nb_bus_on, nb_bus_on))
+        nb_comp, _ = scipy.sparse.csgraph.connected_components(adjacency, directed=False)
+        if nb_comp > 1:
+            raise DivergingPowerFlow("The powergrid is not connex.")
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            ptdf = makePTDF(ppc["baseMVA"], bus_on, branch_on)
+
+        # position of the powerlines (and of the buses) of grid2op in the ptdf
+        row_of_branch = np.full(branch.shape[0], fill_value=-1, dtype=dt_int)
+        row_of_branch[br_on] = np.arange(np.sum(br_on))
+        rows = row_of_branch[branch_ids]
+        lines_on = np.where(rows >= 0)[0]
+        ptdf = ptdf[rows[lines_on]]
+        cols = new_bus_id[lookups["bus"][np.arange(2 * self.n_sub)]]
+        buses_on = np.where(cols >= 0)[0]
+        return ptdf, branch_on[rows[lines_on]], lines_on, buses_on, cols[buses_on]
+
+    def get_ptdf(self):
+        """
+        Compute the Power Transfer Distribution Factors (DC approximation) of the grid used by the last powerflow
+        computed.
+
+        Returns
+        -------
+        ptdf: :class:`numpy.array`, dtype:float
+            Matrix of shape (n_line, 2 * n_sub): ``ptdf[l, b]`` is the variation of the active power flowing (at the
+            origin side) on powerline `l` when one MW is injected at bus `b` (and withdrawn at the reference bus).
+            Bus `b` is the bus 1 of substation `b` if ``b < n_sub`` and the bus 2 of substation ``b - n_sub``
+            otherwise. The rows of the powerlines disconnected (and the columns of the buses out of service) are filled
+            with ``0.``.
+
+        Raises
+        ------
+        DivergingPowerFlow
+            If the grid is not connex
+        """
+        ptdf_on, _, lines_on, buses_on, cols = self._get_ptdf_ppc()
+        ptdf = np.zeros((self.n_line, 2 * self.n_sub))
+        ptdf[np.ix_(lines_on, buses_on)] = ptdf_on[:, cols]
+        return ptdf
+
+    def get_lodf(self):
+        """
+        Compute the Line Outage Distribution Factors (DC approximation) of the grid used by the last powerflow
+        computed.
+
+        Returns
+        -------
+        lodf: :class:`numpy.array`, dtype:float
+            Matrix of shape (n_line, n_line): ``lodf[l, k]`` is the part of the active power flowing on powerline `k`
+            that is transferred to powerline `l` if powerline `k` is disconnected (``lodf[k, k]`` is ``-1.``). The
+            columns of the powerlines already disconnected are filled with ``0.`` and the ones of the powerlines
+            whose disconnection would split the grid with ``NaN``.
+
+        Raises
+        ------
+        DivergingPowerFlow
+            If the grid is not connex
+        """
+        ptdf_on, branch_on, lines_on, _, _ = self._get_ptdf_ppc()
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            lodf_on = np.asarray(makeLODF(branch_on, ptdf_on))
+        # the disconnection of a powerline splits the grid if all its flow comes from its origin bus
+        br_f = branch_on[:, F_BUS].real.astype(dt_int)
+        br_t = branch_on[:, T_BUS].real.astype(dt_int)
+        h_diag = ptdf_on[np.arange(lines_on.shape[0]), br_f] - ptdf_on[np.arange(lines_on.shape[0]), br_t]
+        lodf = np.zeros((self.n_line, self.n_line))
+        lodf[np.ix_(lines_on, lines_on)] = lodf_on
+        lodf[:, lines_on[np.abs(1. - h_diag) <= 1e-8]] = np.NaN
+        return lodf
 
     def _reconnect_line(self, id):
         if id < self._number_true_line:
             self._grid.line["in_service"].iloc[id] = True
         else:
             self._grid.trafo["in_service"].iloc[id - self._number_true_line] = True
+        self._topo_changed = True
 
     def get_topo_vect(self):
         return self._topo_vect
 
     def _get_topo_vect(self):
-        res = np.full(self.dim_topo, fill_value=np.NaN, dtype=dt_int)
-
-        line_status = self.get_line_status()
+        """
+        Compute the topology vector from the pandapower dataframes.
 
-        i = 0
-        for row in self._grid.line[["from_bus", "to_bus"]].values:
-            bus_or_id = row[0]
-            bus_ex_id = row[1]
-            if line_status[i]:
-                res[self.line_or_pos_topo_vect[i]] = 1 if bus_or_id == self.line_or_to_subid[i] else 2
-                res[self.line_ex_pos_topo_vect[i]] = 1 if bus_ex_id == self.line_ex_to_subid[i] else 2
-            else:
-                res[self.line_or_pos_topo_vect[i]] = -1
-                res[self.line_ex_pos_topo_vect[i]] = -1
-            i += 1
-
-        nb = self._number_true_line
-        i = 0
-        for row in self._grid.trafo[["hv_bus", "lv_bus"]].values:
-            bus_or_id = row[0]
-            bus_ex_id = row[1]
-
-            j = i + nb
-            if line_status[j]:
-                res[self.line_or_pos_topo_vect[j]] = 1 if bus_or_id == self.line_or_to_subid[j] else 2
-                res[self.line_ex_pos_topo_vect[j]] = 1 if bus_ex_id == self.line_ex_to_subid[j] else 2
-            else:
-                res[self.line_or_pos_topo_vect[j]] = -1
-                res[self.line_ex_pos_topo_vect[j]] = -1
-            i += 1
+        This only uses the position arrays (:attr:`grid2op.Space.GridObjects.line_or_pos_topo_vect` etc.) and the
+        "\*_to_subid" arrays computed once in :func:`PandaPowerBackend.load_grid`: an element is on bus 1 if the
+        pandapower bus it is connected to is the one of its substation, on bus 2 otherwise and "-1" if it is
+        disconnected.
+        """
+        res = np.full(self.dim_topo, fill_value=-1, dtype=dt_int)
 
-        i = 0
-        for bus_id in self._grid.gen["bus"].values:
-            res[self.gen_pos_topo_vect[i]] = 1 if bus_id == self.gen_to_subid[i] else 2
-            i += 1
+        line_status = self._get_line_status()
+        bus_or = np.concatenate((self._grid.line["from_bus"].values, self._grid.trafo["hv_bus"].values))
+        bus_ex = np.concatenate((self._grid.line["to_bus"].values, self._grid.trafo["lv_bus"].values))
+        res[self.line_or_pos_topo_vect] = np.where(bus_or == self.line_or_to_subid, 1, 2)
+        res[self.line_ex_pos_topo_vect] = np.where(bus_ex == self.line_ex_to_subid, 1, 2)
+        res[self.line_or_pos_topo_vect[~line_status]] = -1
+        res[self.line_ex_pos_topo_vect[~line_status]] = -1
 
-        i = 0
-        for bus_id in self._grid.load["bus"].values:
-            res[self.load_pos_topo_vect[i]] = 1 if bus_id == self.load_to_subid[i] else 2
-            i += 1
+        res[self.gen_pos_topo_vect] = np.where(self._grid.gen["bus"].values == self.gen_to_subid, 1, 2)
+        res[self.gen_pos_topo_vect[~self._grid.gen["in_service"].values]] = -1
 
+        res[self.load_pos_topo_vect] = np.where(self._grid.load["bus"].values == self.load_to_subid, 1, 2)
+        res[self.load_pos_topo_vect[~self._grid.load["in_service"].values]] = -1
         return res
 
     def _gens_info(self):
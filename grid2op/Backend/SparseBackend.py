@@ -0,0 +1,759 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+"""
+This module presents a :class:`grid2op.Backend.Backend` that computes the powerflows directly on numpy arrays and
+`scipy.sparse` matrices, instead of calling "pandapower" at each step.
+
+The powergrid is read from the same pandapower json file as :class:`PandaPowerBackend` (and the actions modify the
+same pandapower dataframes) but the admittance matrices of the grid are built only once, when the grid is loaded,
+and are then updated incrementally when the status or the bus of a powerline changes. The AC powerflow is solved with
+a Newton-Raphson algorithm (warm started from the previous results) and the DC powerflow reuses the factorization
+of the susceptance matrix as long as the topology does not change.
+
+This backend has the same limitations as :class:`PandaPowerBackend` (no 3 winding transformers and other exotic
+objects) and the loads are modeled with a constant power, the reactive limits of the generators being ignored
+(this is the default behaviour of `pandapower.runpp`).
+"""
+
+import copy
+import warnings
+
+import numpy as np
+import scipy
+import scipy.sparse
+import scipy.sparse.linalg
+from scipy.sparse.csgraph import connected_components
+
+from grid2op.dtypes import dt_int, dt_float, dt_bool
+from grid2op.Backend.PandaPowerBackend import PandaPowerBackend
+from grid2op.Exceptions import *
+
+# columns of the "branch" table of the pandapower / matpower internal representation
+_BR_R, _BR_X, _BR_B, _TAP, _SHIFT, _BR_R_ASYM, _BR_X_ASYM = 2, 3, 4, 8, 9, 21, 22
+
+
+class SparseBackend(PandaPowerBackend):
+    """
+    Implementation of a :class:`grid2op.Backend.Backend` that solves the powerflows "natively" (with numpy and
+    `scipy.sparse`) on matrices precomputed from a pandapower network.
+
+    Everything related to the loading of the grid, the naming of the elements and the application of the actions is
+    inherited from :class:`PandaPowerBackend`: the pandapower dataframes still hold the state of the grid. Only
+    :func:`SparseBackend.runpf` is different: it does not call `pandapower.runpp` (and the conversion of the
+    dataframes to the internal pandapower format) but:
+
+    - compares the buses and the status of the powerlines with the ones used to build the matrices, and updates only
+      the terms of the bus admittance matrix (and of the DC susceptance matrix) of the powerlines that have changed
+    - solves the AC powerflow with a Newton-Raphson algorithm, starting from the voltages of the last powerflow
+      computed, or the DC powerflow with the (cached) LU factorization of the susceptance matrix.
+
+    It also gives access to the Power Transfer Distribution Factors (:func:`SparseBackend.get_ptdf`) and the Line
+    Outage Distribution Factors (:func:`SparseBackend.get_lodf`) of the current topology.
+
+    Examples
+    --------
+    It can be used as any other backend:
+
+    .. code-block:: python
+
+        import grid2op
+        from grid2op.Backend import SparseBackend
+        env = grid2op.make("rte_case14_realistic", backend=SparseBackend())
+
+    Attributes
+    ----------
+    tol: ``float``
+        Tolerance (on the power mismatch, in pair unit) of the Newton-Raphson algorithm
+
+    max_iter: ``int``
+        Maximum number of iterations of the Newton-Raphson algorithm
+
+    nb_iter: ``int``
+        Number of iterations performed by the Newton-Raphson algorithm during the last AC powerflow
+
+    _ybus: :class:`scipy.sparse.csr_matrix`, dtype:complex
+        The bus admittance matrix (powerlines and transformers only, shunts are added in
+        :func:`SparseBackend.runpf`), for all the possible buses of the grid (2 per substation)
+
+    _bbus: :class:`scipy.sparse.csr_matrix`, dtype:float
+        The susceptance matrix used for the DC approximation
+
+    _br_or: :class:`numpy.array`, dtype:int
+        For each powerline, the bus of its origin side in :attr:`SparseBackend._ybus` and
+        :attr:`SparseBackend._bbus`
+
+    _br_ex: :class:`numpy.array`, dtype:int
+        For each powerline, the bus of its extremity side in :attr:`SparseBackend._ybus` and
+        :attr:`SparseBackend._bbus`
+
+    _br_status: :class:`numpy.array`, dtype:bool
+        For each powerline, whether it is taken into account in :attr:`SparseBackend._ybus` and
+        :attr:`SparseBackend._bbus`
+
+    """
+    # attributes that depend on the topology of the grid, restored to their value after load_grid by reset
+    _sparse_model_attrs = ("_br_or", "_br_ex", "_br_status", "_ybus", "_bbus", "_topo_version", "_v_init",
+                           "_v", "_ac_cache", "_dc_cache", "_ptdf_cache")
+
+    def __init__(self, detailed_infos_for_cascading_failures=False, tol=1e-8, max_iter=10):
+        PandaPowerBackend.__init__(self, detailed_infos_for_cascading_failures=detailed_infos_for_cascading_failures)
+        self.tol = tol
+        self.max_iter = max_iter
+        self.nb_iter = 0
+
+        # powerlines parameters, in pair unit
+        self._base_mva = 1.
+        self._yff = None
+        self._yft = None
+        self._ytf = None
+        self._ytt = None
+        self._b_dc = None
+        self._p_shift_dc = None
+        self._bus_vn_kv = None
+        self._nb_bus_total = 0
+
+        # matrices, and the topology they represent
+        self._br_or = None
+        self._br_ex = None
+        self._br_status = None
+        self._ybus = None
+        self._bbus = None
+        self._topo_version = 0
+        self._v_init = None
+        self._v = None
+        self._ac_cache = None
+        self._dc_cache = None
+        self._ptdf_cache = None
+        self._sparse_model_init = None
+
+    def __getstate__(self):
+        res = self.__dict__.copy()
+        # the LU factorization computed by scipy can be neither copied nor pickled
+        res["_dc_cache"] = None
+        return res
+
+    def load_grid(self, path=None, filename=None):
+        """
+        Load the grid with :func:`PandaPowerBackend.load_grid` and build the admittance matrices of the powergrid
+        from the pandapower network.
+        """
+        PandaPowerBackend.load_grid(self, path, filename)
+        for table in ["trafo3w", "impedance", "ward", "xward", "dcline", "storage", "switch"]:
+            if table in self._grid and self._grid[table].shape[0]:
+                raise BackendError("The SparseBackend does not support grids with \"{}\" (found {} in the grid)."
+                                   "".format(table, self._grid[table].shape[0]))
+        self._init_branch_parameters()
+
+        self._nb_bus_total = 2 * self.n_sub
+        self._br_or = np.full(self.n_line, fill_value=-1, dtype=dt_int)
+        self._br_ex = np.full(self.n_line, fill_value=-1, dtype=dt_int)
+        self._br_status = np.zeros(self.n_line, dtype=dt_bool)
+        self._ybus = scipy.sparse.csr_matrix((self._nb_bus_total, self._nb_bus_total), dtype=complex)
+        self._bbus = scipy.sparse.csr_matrix((self._nb_bus_total, self._nb_bus_total), dtype=float)
+        self._topo_version = 0
+        self._v = None
+        self._ac_cache = None
+        self._dc_cache = None
+        self._ptdf_cache = None
+        self._update_matrices()
+
+        # voltages used to initialize the Newton-Raphson algorithm: results of pandapower on the initial grid
+        self._v_init = np.ones(self._nb_bus_total, dtype=complex)
+        res_bus = self._grid.res_bus.loc[np.arange(self.n_sub)]
+        self._v_init[:self.n_sub] = res_bus["vm_pu"].values * np.exp(1j * np.deg2rad(res_bus["va_degree"].values))
+        self._v_init[self.n_sub:] = self._v_init[:self.n_sub]
+        self._v = self._v_init.copy()
+        self._sparse_model_init = copy.deepcopy({attr_nm: getattr(self, attr_nm)
+                                                 for attr_nm in self._sparse_model_attrs})
+
+    def reset(self, path=None, filename=None):
+        """
+        Reload the grid with :func:`PandaPowerBackend.reset` and restore the matrices (and the voltages used to
+        initialize the Newton-Raphson algorithm) in the state they were after :func:`SparseBackend.load_grid`.
+        """
+        static_attrs = {attr_nm: getattr(self, attr_nm)
+                        for attr_nm in ["_base_mva", "_yff", "_yft", "_ytf", "_ytt", "_b_dc", "_p_shift_dc",
+                                        "_bus_vn_kv", "_nb_bus_total", "_sparse_model_init"]}
+        PandaPowerBackend.reset(self, path, filename)
+        self.__dict__.update(static_attrs)
+        self.__dict__.update(copy.deepcopy(self._sparse_model_init))
+
+    def _init_branch_parameters(self):
+        """
+        Compute the admittances (in pair unit) of the powerlines and transformers, from the internal representation
+        of the pandapower network (computed by the powerflow performed in :func:`PandaPowerBackend.load_grid`).
+
+        These parameters do not depend on the buses the powerlines are connected to (both buses of a substation
+        have the same nominal voltage), they are computed once and for all.
+        """
+        ppc = self._grid._ppc
+        lookup = self._grid._pd2ppc_lookups["branch"]
+        rows = [np.arange(*lookup[table]) for table in ["line", "trafo"] if table in lookup]
+        branch = ppc["branch"][np.concatenate(rows)]
+        self._base_mva = float(ppc["baseMVA"])
+
+        br_r = branch[:, _BR_R].real
+        br_x = branch[:, _BR_X].real
+        br_b = branch[:, _BR_B]
+        tap = branch[:, _TAP].real.copy()
+        tap[tap == 0.] = 1.
+        shift = np.deg2rad(branch[:, _SHIFT].real)
+        r_asym = x_asym = 0.
+        if branch.shape[1] > _BR_X_ASYM:
+            r_asym = branch[:, _BR_R_ASYM].real
+            x_asym = branch[:, _BR_X_ASYM].real
+
+        ys_f = 1. / (br_r + 1j * br_x)
+        ys_t = 1. / ((br_r + r_asym) + 1j * (br_x + x_asym))
+        tap_cplx = tap * np.exp(1j * shift)
+        self._yff = (ys_f + 1j * br_b / 2.) / (tap_cplx * np.conj(tap_cplx))
+        self._yft = - ys_f / np.conj(tap_cplx)
+        self._ytf = - ys_t / tap_cplx
+        self._ytt = ys_t + 1j * br_b / 2.
+
+        self._b_dc = 1. / (br_x * tap)
+        self._p_shift_dc = - self._b_dc * shift
+        self._bus_vn_kv = self._grid.bus["vn_kv"].values[self._bus_pos_in_df].astype(float)
+
+    def _get_branch_state(self):
+        """buses (labels of the pandapower buses) of both sides of all the powerlines, and their status"""
+        line = self._grid.line
+        trafo = self._grid.trafo
+        bus_or = np.concatenate((line["from_bus"].values, trafo["hv_bus"].values)).astype(dt_int)
+        bus_ex = np.concatenate((line["to_bus"].values, trafo["lv_bus"].values)).astype(dt_int)
+        return bus_or, bus_ex, self._get_line_status()
+
+    def _branch_matrices(self, bus_or, bus_ex, mask):
+        """the terms of the bus admittance and susceptance matrices of the powerlines in `mask`"""
+        bus_or = bus_or[mask]
+        bus_ex = bus_ex[mask]
+        rows = np.concatenate((bus_or, bus_or, bus_ex, bus_ex))
+        cols = np.concatenate((bus_or, bus_ex, bus_or, bus_ex))
+        shape = (self._nb_bus_total, self._nb_bus_total)
+        y_vals = np.concatenate((self._yff[mask], self._yft[mask], self._ytf[mask], self._ytt[mask]))
+        b_dc = self._b_dc[mask]
+        b_vals = np.concatenate((b_dc, -b_dc, -b_dc, b_dc))
+        ybus = scipy.sparse.coo_matrix((y_vals, (rows, cols)), shape=shape).tocsr()
+        bbus = scipy.sparse.coo_matrix((b_vals, (rows, cols)), shape=shape).tocsr()
+        return ybus, bbus
+
+    def _update_matrices(self):
+        """
+        Update the bus admittance matrix and the DC susceptance matrix with the current buses and status of the
+        powerlines. Only the terms of the powerlines that have been modified since the last call are updated: their
+        former contribution is removed and the new one is added.
+
+        Returns
+        -------
+        bus_or: :class:`numpy.array`, dtype:int
+            The bus of the origin side of each powerline
+
+        bus_ex: :class:`numpy.array`, dtype:int
+            The bus of the extremity side of each powerline
+
+        status: :class:`numpy.array`, dtype:bool
+            The status of each powerline
+
+        """
+        bus_or, bus_ex, status = self._get_branch_state()
+        changed = (bus_or != self._br_or) | (bus_ex != self._br_ex) | (status != self._br_status)
+        if np.any(changed):
+            removed = changed & self._br_status
+            added = changed & status
+            ybus_add, bbus_add = self._branch_matrices(bus_or, bus_ex, added)
+            self._ybus = self._ybus + ybus_add
+            self._bbus = self._bbus + bbus_add
+            if np.any(removed):
+                ybus_rem, bbus_rem = self._branch_matrices(self._br_or, self._br_ex, removed)
+                self._ybus = self._ybus - ybus_rem
+                self._bbus = self._bbus - bbus_rem
+            self._br_or[:] = bus_or
+            self._br_ex[:] = bus_ex
+            self._br_status[:] = status
+            self._topo_version += 1
+        return bus_or, bus_ex, status
+
+    def _get_injections(self):
+        """
+        Retrieve, from the pandapower dataframes, the data (in pair unit) needed to compute a powerflow.
+
+        Returns
+        -------
+        res: ``dict``
+            With keys "active" (mask of the buses in service), "ref" (reference buses), "pv" (buses with a voltage
+            set point), "pq" (other buses in service), "s_bus" (complex power injected at each bus), "v_set" (voltage
+            magnitude set point of each bus), "va_ref" (voltage angle of the reference buses), "y_shunt" (shunt
+            admittance at each bus), "gen_bus", "gen_on", "gen_p", "slack_gen", "load_bus", "load_on", "load_p",
+            "load_q",
+            "sgen_p", "sgen_q" and "shunt_on".
+
+        Raises
+        ------
+        DivergingPowerFlow
+            If a load or a generator has been disconnected (the ones out of service in the original grid are not
+            considered), or if there is no reference bus.
+
+        """
+        grid = self._grid
+        nb_bus = self._nb_bus_total
+        active = grid.bus["in_service"].values[self._bus_pos_in_df].astype(dt_bool)
+
+        load_on = grid.load["in_service"].values.astype(dt_bool)
+        gen_on = grid.gen["in_service"].values.astype(dt_bool)
+        if np.any(self._init_load_in_service & ~load_on) or np.any(self._init_gen_in_service & ~gen_on):
+            # some loads or generators have been disconnected (by an action): it's a game over case!
+            # (elements already out of service in the original grid are not considered)
+            raise DivergingPowerFlow("Some loads or generators are disconnected.")
+        load_bus = grid.load["bus"].values.astype(dt_int)
+        gen_bus = grid.gen["bus"].values.astype(dt_int)
+        if not np.all(active[load_bus[load_on]]) or not np.all(active[gen_bus[gen_on]]):
+            raise DivergingPowerFlow("Some loads or generators are connected to a bus out of service.")
+        # the loads and generators out of service neither consume nor produce anything
+        load_p = grid.load["p_mw"].values * grid.load["scaling"].values * load_on
+        load_q = grid.load["q_mvar"].values * grid.load["scaling"].values * load_on
+        gen_p = grid.gen["p_mw"].values * grid.gen["scaling"].values * gen_on
+        gen_vm = grid.gen["vm_pu"].values
+        gen_bus_on = gen_bus[gen_on]
+
+        sgen = grid.sgen
+        sgen_on = sgen["in_service"].values & active[sgen["bus"].values]
+        sgen_bus = sgen["bus"].values[sgen_on].astype(dt_int)
+        sgen_p = sgen["p_mw"].values[sgen_on] * sgen["scaling"].values[sgen_on]
+        sgen_q = sgen["q_mvar"].values[sgen_on] * sgen["scaling"].values[sgen_on]
+
+        s_bus = np.bincount(gen_bus, weights=gen_p, minlength=nb_bus) + \
+            np.bincount(sgen_bus, weights=sgen_p, minlength=nb_bus) - \
+            np.bincount(load_bus, weights=load_p, minlength=nb_bus) + \
+            1j * (np.bincount(sgen_bus, weights=sgen_q, minlength=nb_bus) -
+                  np.bincount(load_bus, weights=load_q, minlength=nb_bus))
+        s_bus /= self._base_mva
+
+        v_set = np.ones(nb_bus)
+        v_set[gen_bus_on] = gen_vm[gen_on]
+        slack_gen = grid.gen["slack"].values.astype(dt_bool) & gen_on
+        ref = gen_bus[slack_gen]
+        va_ref = np.zeros(ref.shape[0])
+        ext_grid = grid.ext_grid
+        ext_on = ext_grid["in_service"].values
+        if np.any(ext_on):
+            ext_bus = ext_grid["bus"].values[ext_on].astype(dt_int)
+            v_set[ext_bus] = ext_grid["vm_pu"].values[ext_on]
+            ref = np.concatenate((ext_bus, ref))
+            va_ref = np.concatenate((np.deg2rad(ext_grid["va_degree"].values[ext_on]), va_ref))
+        ref, ref_pos = np.unique(ref, return_index=True)
+        va_ref = va_ref[ref_pos]
+        if ref.shape[0] == 0 or not np.all(active[ref]):
+            raise DivergingPowerFlow("There is no reference bus in the powergrid.")
+
+        is_pv = np.zeros(nb_bus, dtype=dt_bool)
+        is_pv[gen_bus_on] = True
+        is_pv[ref] = False
+        is_pq = active.copy()
+        is_pq[gen_bus_on] = False
+        is_pq[ref] = False
+
+        shunt = grid.shunt
+        shunt_bus = shunt["bus"].values.astype(dt_int)
+        shunt_on = shunt["in_service"].values & active[shunt_bus]
+        v_ratio = (self._bus_vn_kv[shunt_bus] / shunt["vn_kv"].values) ** 2
+        fact = shunt["step"].values * v_ratio * shunt_on
+        y_shunt = np.bincount(shunt_bus, weights=shunt["p_mw"].values * fact, minlength=nb_bus) - \
+            1j * np.bincount(shunt_bus, weights=shunt["q_mvar"].values * fact, minlength=nb_bus)
+        y_shunt /= self._base_mva
+
+        return {"active": active, "ref": ref, "pv": np.where(is_pv)[0], "pq": np.where(is_pq)[0],
+                "s_bus": s_bus, "v_set": v_set, "va_ref": va_ref, "y_shunt": y_shunt,
+                "gen_bus": gen_bus, "gen_on": gen_on, "gen_p": gen_p, "slack_gen": slack_gen,
+                "load_bus": load_bus, "load_on": load_on, "load_p": load_p, "load_q": load_q,
+                "sgen_bus": sgen_bus, "sgen_p": sgen_p, "sgen_q": sgen_q, "shunt_on": shunt_on}
+
+    def _check_connectivity(self, bus_or, bus_ex, status, active, ref):
+        """
+        Check that all the buses in service are connected (through powerlines in service) to a reference bus.
+
+        Raises
+        ------
+        DivergingPowerFlow
+            If the grid is not connex.
+        """
+        nb_bus = self._nb_bus_total
+        graph = scipy.sparse.coo_matrix((np.ones(np.sum(status)), (bus_or[status], bus_ex[status])),
+                                        shape=(nb_bus, nb_bus))
+        _, labels = connected_components(graph, directed=False)
+        if np.any(~np.isin(labels[active], labels[ref])):
+            raise DivergingPowerFlow("The powergrid is not connex.")
+        if np.any(~active[bus_or[status]]) or np.any(~active[bus_ex[status]]):
+            raise DivergingPowerFlow("Some powerlines are connected to a bus out of service.")
+
+    def _get_dc_solver(self, active, ref):
+        """
+        Get the LU factorization of the susceptance matrix (restricted to the buses in service, without the
+        reference buses). It is computed again only if the topology has changed since the last call.
+        """
+        key = (self._topo_version, active.tobytes(), ref.tobytes())
+        if self._dc_cache is None or self._dc_cache[0] != key:
+            is_var = active.copy()
+            is_var[ref] = False
+            var = np.where(is_var)[0]
+            bbus_var = self._bbus[var]
+            lu = scipy.sparse.linalg.splu(bbus_var[:, var].tocsc())
+            self._dc_cache = (key, var, lu, bbus_var[:, ref])
+        return self._dc_cache[1:]
+
+    def _solve_dc(self, inj):
+        """
+        Solve the DC powerflow, returns the (complex) voltages at each bus. As in pandapower, their magnitudes are
+        the set points of the generators (or ``1.`` pair unit for the buses without generator).
+        """
+        var, lu, bbus_ref = self._get_dc_solver(inj["active"], inj["ref"])
+        p_bus = inj["s_bus"].real - inj["y_shunt"].real - \
+            np.bincount(self._br_or, weights=self._p_shift_dc * self._br_status, minlength=self._nb_bus_total) + \
+            np.bincount(self._br_ex, weights=self._p_shift_dc * self._br_status, minlength=self._nb_bus_total)
+        va = np.zeros(self._nb_bus_total)
+        va[inj["ref"]] = inj["va_ref"]
+        va[var] = lu.solve(p_bus[var] - bbus_ref @ inj["va_ref"])
+        if not np.all(np.isfinite(va)):
+            raise DivergingPowerFlow("The DC powerflow has diverged.")
+        vm = np.ones(self._nb_bus_total)
+        vm[inj["pv"]] = inj["v_set"][inj["pv"]]
+        vm[inj["ref"]] = inj["v_set"][inj["ref"]]
+        return vm * np.exp(1j * va)
+
+    def _get_ac_matrices(self, active, y_shunt):
+        """
+        Get the bus admittance matrix (shunts included) restricted to the buses in service. It is computed again
+        only if the topology or the shunts have changed since the last call.
+        """
+        key = (self._topo_version, active.tobytes(), y_shunt.tobytes())
+        if self._ac_cache is None or self._ac_cache[0] != key:
+            bus = np.where(active)[0]
+            ybus = (self._ybus + scipy.sparse.diags(y_shunt))[bus][:, bus].tocsr()
+            ybus.sort_indices()
+            pos = np.full(self._nb_bus_total, fill_value=-1, dtype=dt_int)
+            pos[bus] = np.arange(bus.shape[0])
+            self._ac_cache = (key, bus, pos, ybus)
+        return self._ac_cache[1:]
+
+    @staticmethod
+    def _jacobian(ybus, v, pvpq, pq):
+        """the jacobian matrix of the power mismatch with respect to the voltage angles and magnitudes"""
+        i_bus = ybus @ v
+        diag_v = scipy.sparse.diags(v)
+        diag_i = scipy.sparse.diags(i_bus)
+        diag_vnorm = scipy.sparse.diags(v / np.abs(v))
+        ds_dvm = diag_v @ (ybus @ diag_vnorm).conj() + diag_i.conj() @ diag_vnorm
+        ds_dva = 1j * diag_v @ (diag_i - ybus @ diag_v).conj()
+        ds_dva = ds_dva.tocsr()
+        ds_dvm = ds_dvm.tocsr()
+        ds_dva_pvpq = ds_dva[:, pvpq]
+        ds_dvm_pq = ds_dvm[:, pq]
+        jac = scipy.sparse.bmat([[ds_dva_pvpq[pvpq].real, ds_dvm_pq[pvpq].real],
+                                 [ds_dva_pvpq[pq].imag, ds_dvm_pq[pq].imag]], format="csc")
+        return jac
+
+    def _newton_raphson(self, ybus, s_bus, v0, pv, pq):
+        """
+        Solve the AC powerflow equations with a Newton-Raphson algorithm.
+
+        Returns
+        -------
+        v: :class:`numpy.array`, dtype:complex
+            The voltages at each bus
+
+        converged: ``bool``
+            Whether the algorithm has converged
+
+        """
+        pvpq = np.concatenate((pv, pq))
+        n_pvpq = pvpq.shape[0]
+        v = v0.copy()
+        va = np.angle(v)
+        vm = np.abs(v)
+
+        mis = v * np.conj(ybus @ v) - s_bus
+        f = np.concatenate((mis[pvpq].real, mis[pq].imag))
+        converged = f.shape[0] == 0 or np.max(np.abs(f)) < self.tol
+        self.nb_iter = 0
+        while not converged and self.nb_iter < self.max_iter:
+            self.nb_iter += 1
+            jac = self._jacobian(ybus, v, pvpq, pq)
+            dx = scipy.sparse.linalg.spsolve(jac, -f)
+            if not np.all(np.isfinite(dx)):
+                break
+            va[pvpq] += dx[:n_pvpq]
+            vm[pq] += dx[n_pvpq:]
+            v = vm * np.exp(1j * va)
+            mis = v * np.conj(ybus @ v) - s_bus
+            f = np.concatenate((mis[pvpq].real, mis[pq].imag))
+            converged = np.max(np.abs(f)) < self.tol
+        return v, converged
+
+    def _solve_ac(self, inj):
+        """
+        Solve the AC powerflow, starting from the voltages of the last powerflow computed. If it does not converge,
+        it is started again from the DC approximation.
+
+        Returns
+        -------
+        v: :class:`numpy.array`, dtype:complex
+            The voltages at each bus (``1.`` for the buses out of service)
+
+        """
+        active = inj["active"]
+        bus, pos, ybus = self._get_ac_matrices(active, inj["y_shunt"])
+        pv = pos[inj["pv"]]
+        pq = pos[inj["pq"]]
+        ref = inj["ref"]
+        has_v_set = active & ~np.isin(np.arange(self._nb_bus_total), inj["pq"])
+
+        v_dc = None
+        for v_start in ["previous", "dc"]:
+            if v_start == "previous":
+                v0 = self._v.copy()
+                # buses that were not in service use the voltage of the first bus of their substation
+                new_bus = active & (self._v == 0.)
+                v0[new_bus] = v0[np.where(new_bus)[0] % self.n_sub]
+                v0[new_bus & (v0 == 0.)] = 1.
+            else:
+                v_dc = self._solve_dc(inj)
+                v0 = v_dc
+            v0[has_v_set] = inj["v_set"][has_v_set] * np.exp(1j * np.angle(v0[has_v_set]))
+            v0[ref] = inj["v_set"][ref] * np.exp(1j * inj["va_ref"])
+            v_res, converged = self._newton_raphson(ybus, inj["s_bus"][bus], v0[bus], pv, pq)
+            if converged and np.all(np.isfinite(v_res)):
+                v = np.zeros(self._nb_bus_total, dtype=complex)
+                v[bus] = v_res
+                return v
+        raise DivergingPowerFlow("The Newton-Raphson algorithm has not converged.")
+
+    def _set_results(self, v, inj, bus_or, bus_ex, status, is_dc):
+        """compute the flows in the powerlines and the productions from the voltages, and store them"""
+        base_mva = self._base_mva
+        nb_bus = self._nb_bus_total
+        vm = np.abs(v)
+        v_or = v[bus_or]
+        v_ex = v[bus_ex]
+        if is_dc:
+            va = np.angle(v)
+            p_or = (self._b_dc * (va[bus_or] - va[bus_ex]) + self._p_shift_dc) * base_mva
+            s_or = (p_or * status).astype(complex)
+            s_ex = - s_or
+            s_bus = np.bincount(bus_or, weights=s_or.real, minlength=nb_bus) + \
+                np.bincount(bus_ex, weights=s_ex.real, minlength=nb_bus) + inj["y_shunt"].real * base_mva
+        else:
+            s_or = v_or * np.conj(self._yff * v_or + self._yft * v_ex) * base_mva * status
+            s_ex = v_ex * np.conj(self._ytf * v_or + self._ytt * v_ex) * base_mva * status
+            s_bus = v * np.conj(self._ybus @ v + inj["y_shunt"] * v) * base_mva
+
+        self.line_status[:] = status
+        self.p_or[:] = s_or.real
+        self.q_or[:] = s_or.imag
+        self.p_ex[:] = s_ex.real
+        self.q_ex[:] = s_ex.imag
+        self.v_or[:] = vm[bus_or] * self.lines_or_pu_to_kv
+        self.v_ex[:] = vm[bus_ex] * self.lines_ex_pu_to_kv
+        self.v_or[~status] = 0.
+        self.v_ex[~status] = 0.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.a_or[:] = np.abs(s_or) * 1000. / (np.sqrt(3) * self.v_or)
+            self.a_ex[:] = np.abs(s_ex) * 1000. / (np.sqrt(3) * self.v_ex)
+        self.a_or[~np.isfinite(self.a_or)] = 0.
+        self.a_ex[~np.isfinite(self.a_ex)] = 0.
+
+        load_bus = inj["load_bus"]
+        self.load_p[:] = inj["load_p"]
+        self.load_q[:] = inj["load_q"]
+        self.load_v[:] = vm[load_bus] * self.load_pu_to_kv
+
+        # power produced by the generators of each bus
+        gen_bus = inj["gen_bus"]
+        sgen_bus = inj["sgen_bus"]
+        p_gen_bus = s_bus.real + np.bincount(load_bus, weights=inj["load_p"], minlength=nb_bus) - \
+            np.bincount(sgen_bus, weights=inj["sgen_p"], minlength=nb_bus)
+        q_gen_bus = s_bus.imag + np.bincount(load_bus, weights=inj["load_q"], minlength=nb_bus) - \
+            np.bincount(sgen_bus, weights=inj["sgen_q"], minlength=nb_bus)
+
+        # the generators of the reference buses share the active power not produced by the other generators
+        prod_p = inj["gen_p"].copy()
+        gen_on = inj["gen_on"]
+        is_slack = inj["slack_gen"] | (np.isin(gen_bus, inj["ref"]) & gen_on)
+        p_others = np.bincount(gen_bus[~is_slack], weights=prod_p[~is_slack], minlength=nb_bus)
+        nb_slack = np.bincount(gen_bus[is_slack], minlength=nb_bus)
+        prod_p[is_slack] = (p_gen_bus - p_others)[gen_bus[is_slack]] / nb_slack[gen_bus[is_slack]]
+        self.prod_p[:] = prod_p
+        self.prod_v[:] = vm[gen_bus] * self.prod_pu_to_kv * gen_on
+        if is_dc:
+            self.prod_q[:] = 0.
+        else:
+            self.prod_q[:] = self._share_q(q_gen_bus, gen_bus, inj["slack_gen"], gen_on)
+
+    def _share_q(self, q_gen_bus, gen_bus, slack_gen, gen_on):
+        """
+        Share the reactive power produced at each bus between its generators in service, proportionally to their
+        reactive range (as done by pandapower). The reactive range of the external grid is given to the slack
+        generator.
+        """
+        nb_bus = self._nb_bus_total
+        q_min = np.where(gen_on, self._grid.gen["min_q_mvar"].values.astype(float), 0.)
+        q_max = np.where(gen_on, self._grid.gen["max_q_mvar"].values.astype(float), 0.)
+        ext_grid = self._grid.ext_grid
+        if ext_grid.shape[0] and "min_q_mvar" in ext_grid and np.any(slack_gen):
+            ext_on = ext_grid["in_service"].values
+            id_slack = np.where(slack_gen)[0][0]
+            on_same_bus = ext_on & (ext_grid["bus"].values == gen_bus[id_slack])
+            q_min[id_slack] += np.sum(ext_grid["min_q_mvar"].values[on_same_bus])
+            q_max[id_slack] += np.sum(ext_grid["max_q_mvar"].values[on_same_bus])
+        nb_gen_bus = np.bincount(gen_bus, weights=gen_on, minlength=nb_bus)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            q_gen = q_gen_bus[gen_bus] / nb_gen_bus[gen_bus]
+        q_min_bus = np.bincount(gen_bus, weights=q_min, minlength=nb_bus)[gen_bus]
+        q_max_bus = np.bincount(gen_bus, weights=q_max, minlength=nb_bus)[gen_bus]
+        with np.errstate(invalid="ignore"):
+            use_range = np.isfinite(q_min_bus) & np.isfinite(q_max_bus) & (q_min_bus != q_max_bus) & \
+                (nb_gen_bus[gen_bus] > 1)
+        eps = np.finfo(float).eps
+        q_gen[use_range] = q_min[use_range] + (q_gen_bus[gen_bus][use_range] - q_min_bus[use_range]) / \
+            (q_max_bus[use_range] - q_min_bus[use_range] + eps) * (q_max[use_range] - q_min[use_range])
+        q_gen[~gen_on] = 0.
+        return q_gen
+
+    def runpf(self, is_dc=False):
+        """
+        Run a powerflow on the grid, without calling pandapower.
+
+        The bus admittance matrix (and the susceptance matrix) are first updated with the powerlines that have been
+        modified since the last call, then the AC powerflow is solved with a Newton-Raphson algorithm (or the DC
+        approximation is solved with the LU factorization of the susceptance matrix, that is reused as long as
+        the topology does not change).
+        """
+        try:
+            with warnings.catch_warnings():
+                # remove the warnings if the jacobian is singular. And it that case load flow as not converged
+                warnings.filterwarnings("ignore", category=scipy.sparse.linalg.MatrixRankWarning)
+                warnings.filterwarnings("ignore", category=RuntimeWarning)
+                bus_or, bus_ex, status = self._update_matrices()
+                inj = self._get_injections()
+                self._check_connectivity(bus_or, bus_ex, status, inj["active"], inj["ref"])
+                if is_dc:
+                    v = self._solve_dc(inj)
+                else:
+                    v = self._solve_ac(inj)
+                    self._v = v
+                self._set_results(v, inj, bus_or, bus_ex, status, is_dc)
+        except (DivergingPowerFlow, RuntimeError):
+            # RuntimeError is raised by scipy when the susceptance matrix is singular
+            for attr_nm in ["p_or", "q_or", "v_or", "a_or", "p_ex", "q_ex", "v_ex", "a_ex",
+                            "prod_p", "prod_q", "prod_v", "load_p", "load_q", "load_v"]:
+                getattr(self, attr_nm)[:] = np.NaN
+            self._v = self._v_init.copy()
+            return False
+
+        if self._topo_changed:
+            # the topology vector is only rebuilt if a bus or a status has been modified
+            self._topo_vect[:] = self._get_topo_vect()
+            self._topo_changed = False
+        return True
+
+    def shunt_info(self):
+        shunt = self._grid.shunt
+        shunt_bus = shunt["bus"].values.astype(dt_int)
+        vm = np.abs(self._v[shunt_bus])
+        fact = vm ** 2 * shunt["step"].values * (self._bus_vn_kv[shunt_bus] / shunt["vn_kv"].values) ** 2
+        fact *= shunt["in_service"].values
+        shunt_p = (shunt["p_mw"].values * fact).astype(dt_float)
+        shunt_q = (shunt["q_mvar"].values * fact).astype(dt_float)
+        shunt_v = (vm * self._bus_vn_kv[shunt_bus]).astype(dt_float)
+        shunt_bus = (1 * (shunt_bus < self.n_sub)).astype(dt_int)
+        return shunt_p, shunt_q, shunt_v, shunt_bus
+
+    def _get_ptdf_x(self):
+        """
+        Get the inverse of the DC susceptance matrix (restricted to the buses in service, without the reference
+        buses, and filled with zeros for the other buses) of the current topology.
+
+        If only the status of some powerlines has changed since the last call, it is updated with a rank one
+        (Sherman-Morrison) formula for each of these powerlines, otherwise it is computed from the LU factorization
+        of the susceptance matrix.
+        """
+        bus_or, bus_ex, status = self._update_matrices()
+        inj = self._get_injections()
+        self._check_connectivity(bus_or, bus_ex, status, inj["active"], inj["ref"])
+        active = inj["active"]
+        ref = inj["ref"]
+        cache = self._ptdf_cache
+        if cache is not None and np.array_equal(cache["active"], active) and np.array_equal(cache["ref"], ref) \
+                and np.array_equal(cache["bus_or"][status], bus_or[status]) \
+                and np.array_equal(cache["bus_ex"][status], bus_ex[status]):
+            x_mat = cache["x"]
+            changed = np.where(cache["status"] != status)[0]
+            for l_id in changed:
+                # reconnection of powerline l_id adds b * a.a^T to the susceptance matrix, its disconnection removes it
+                b_l = self._b_dc[l_id] if status[l_id] else -self._b_dc[l_id]
+                x_a = x_mat[:, bus_or[l_id]] - x_mat[:, bus_ex[l_id]]
+                denom = 1. + b_l * (x_a[bus_or[l_id]] - x_a[bus_ex[l_id]])
+                if abs(denom) <= 1e-10:
+                    raise DivergingPowerFlow("The powergrid is not connex.")
+                x_mat -= (b_l / denom) * np.outer(x_a, x_a)
+        else:
+            var, lu, _ = self._get_dc_solver(active, ref)
+            x_mat = np.zeros((self._nb_bus_total, self._nb_bus_total))
+            x_mat[np.ix_(var, var)] = lu.solve(np.eye(var.shape[0]))
+        self._ptdf_cache = {"active": active, "ref": ref, "bus_or": bus_or, "bus_ex": bus_ex, "status": status,
+                            "x": x_mat}
+        return x_mat, bus_or, bus_ex, status
+
+    def get_ptdf(self):
+        """
+        Compute the Power Transfer Distribution Factors of the current topology (DC approximation).
+
+        Returns
+        -------
+        ptdf: :class:`numpy.array`, dtype:float
+            Matrix of shape (n_line, 2 * n_sub): ``ptdf[l, b]`` is the variation of the active power flowing (at the
+            origin side) on powerline `l` when one MW is injected at bus `b` (and withdrawn at the reference bus).
+            Bus `b` is the bus 1 of substation `b` if ``b < n_sub`` and the bus 2 of substation ``b - n_sub``
+            otherwise. The rows of the powerlines disconnected are filled with ``0.``.
+
+        Raises
+        ------
+        DivergingPowerFlow
+            If the grid is not connex (or if a load or a generator is disconnected)
+        """
+        x_mat, bus_or, bus_ex, status = self._get_ptdf_x()
+        ptdf = (self._b_dc * status)[:, np.newaxis] * (x_mat[bus_or] - x_mat[bus_ex])
+        return ptdf
+
+    def get_lodf(self):
+        """
+        Compute the Line Outage Distribution Factors of the current topology (DC approximation).
+
+        Returns
+        -------
+        lodf: :class:`numpy.array`, dtype:float
+            Matrix of shape (n_line, n_line): ``lodf[l, k]`` is the part of the active power flowing on powerline `k`
+            that is transferred to powerline `l` if powerline `k` is disconnected (``lodf[k, k]`` is ``-1.``). The
+            columns of the powerlines already disconnected are filled with ``0.`` and the ones of the powerlines
+            whose disconnection would split the grid with ``NaN``.
+
+        Raises
+        ------
+        DivergingPowerFlow
+            If the grid is not connex (or if a load or a generator is disconnected)
+        """
+        ptdf = self.get_ptdf()
+        status = self._br_status
+        h_mat = ptdf[:, self._br_or] - ptdf[:, self._br_ex]
+        denom = 1. - np.diag(h_mat)
+        islanding = np.abs(denom) <= 1e-8
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lodf = h_mat / denom
+        lodf[np.arange(self.n_line), np.arange(self.n_line)] = -1.
+        lodf[:, islanding] = np.NaN
+        lodf[:, ~status] = 0.
+        return lodf
@@ -1,7 +1,9 @@
 __all__ = [
     "Backend", 
-    "PandaPowerBackend"
+    "PandaPowerBackend",
+    "SparseBackend"
 ]
 
 from grid2op.Backend.Backend import Backend
 from grid2op.Backend.PandaPowerBackend import PandaPowerBackend
+from grid2op.Backend.SparseBackend import SparseBackend
@@ -227,6 +227,15 @@ class ChronicsHandler(RandomObject):
         self.max_iter = max_iter
         self.real_data.max_iter = max_iter
 
+    def close(self):
+        """
+        Release the resources used by the :class:`GridValue` that generates the chronics.
+
+        See definition of :func:`GridValue.close` for more information about this method.
+
+        """
+        self.real_data.close()
+
     def fast_forward(self, nb_timestep):
         """
         This method allows you to skip some time step at the beginning of the chronics.
@@ -8,11 +8,10 @@
 import os
 import json
 import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
 
 
-from grid2op.dtypes import dt_bool, dt_int
+from grid2op.dtypes import dt_bool, dt_int, dt_float
 from grid2op.Exceptions import Grid2OpException
 from grid2op.Chronics.GridStateFromFileWithForecasts import GridStateFromFileWithForecasts
 
@@ -76,13 +75,8 @@ class GridStateFromFileWithForecastsWithMaintenance(GridStateFromFileWithForecas
 
         ##########
         # same as before in GridStateFromFileWithForecasts
-        self.maintenance_time = np.zeros(shape=(self.maintenance.shape[0], self.n_line), dtype=dt_int) - 1
-        self.maintenance_duration = np.zeros(shape=(self.maintenance.shape[0], self.n_line), dtype=dt_int)
-
-        # test that with chunk size
-        for line_id in range(self.n_line):
-            self.maintenance_time[:, line_id] = self.get_maintenance_time_1d(self.maintenance[:, line_id])
-            self.maintenance_duration[:, line_id] = self.get_maintenance_duration_1d(self.maintenance[:, line_id])
+        self.maintenance_time = self.get_maintenance_time_2d(self.maintenance)
+        self.maintenance_duration = self.get_maintenance_duration_2d(self.maintenance)
 
         # there are _maintenance and hazards only if the value in the file is not 0.
         self.maintenance = self.maintenance != 0.
@@ -106,53 +100,41 @@ class GridStateFromFileWithForecastsWithMaintenance(GridStateFromFileWithForecas
                                    "are\n{}\nCheck that all lines in maintenance are in the grid."
                                    "".format(self.line_to_maintenance, self.name_line))
 
-        # identify the timestamps of the chronics to find out the month and day of the week
-        freq = str(
-            int(self.time_interval.total_seconds())) + "s"  # should be in the timedelta frequency format in pandas
-        datelist = pd.date_range(self.start_datetime, periods=nbTimesteps, freq=freq)
-
-        datelist = np.unique(np.array([el.date() for el in datelist]))
-        datelist = datelist[:-1]
-
-        n_lines_maintenance = len(self.line_to_maintenance)
+        # identify the days of the chronics (the last one is not used) to find out the month and day of the week
+        first_day = np.datetime64(self.start_datetime.date(), "D")
+        last_ts = self.start_datetime + (nbTimesteps - 1) * self.time_interval
+        days = np.arange(first_day, np.datetime64(last_ts.date(), "D"), dtype="datetime64[D]")
+        nb_days = days.shape[0]
+        if nb_days == 0:
+            return res
+        # 1970-01-01 was a thursday (weekday 3), careful: month start at 1 but indices start at 0 in python
+        day_of_week = (days.astype(np.int64) + 3) % 7
+        month_id = days.astype("datetime64[M]").astype(np.int64) % 12
 
-        _24_h = timedelta(seconds=86400)
         nb_rows = int(86400 / self.time_interval.total_seconds())
         selected_rows_beg = int(self.maintenance_starting_hour * 3600 / self.time_interval.total_seconds())
         selected_rows_end = int(self.maintenance_ending_hour * 3600 / self.time_interval.total_seconds())
 
-        # TODO this is INSANELY slow for now. find a way to make it faster
-        # HINT: vectorize everything into one single numpy array, everything can be vectorized there...
-        for nb_day_since_beg, this_day in enumerate(datelist):
-            dayOfWeek = this_day.weekday()
-            if dayOfWeek < 5:  # only maintenance starting on working days
-                month = this_day.month
-
-                maintenance_me = np.zeros((nb_rows, nb_line_maint))
-                # Careful: month start at 1 but inidces start at 0 in python
-                maintenance_daily_proba = self.daily_proba_per_month_maintenance[(month - 1)]
-                maxDailyMaintenance = self.max_daily_number_per_month_maintenance[(month - 1)]
-
-                # now for each line in self.line_to_maintenance, sample to know if we generate a maintenance
-                # for line in self.line_to_maintenance:
-                are_lines_in_maintenance = self.space_prng.choice([False, True],
-                                                                  p=[(1. - maintenance_daily_proba),
-                                                                     maintenance_daily_proba],
-                                                                  size=n_lines_maintenance)
-
-                n_Generated_Maintenance = np.sum(are_lines_in_maintenance)
-                # check if the number of maintenance is not above the max allowed. otherwise randomly pick up the right
-                # number
-                if (n_Generated_Maintenance > maxDailyMaintenance):
-                    # we pick up only maxDailyMaintenance elements
-                    not_chosen = self.space_prng.choice(n_Generated_Maintenance,
-                                                        replace=False,
-                                                        size=n_Generated_Maintenance - maxDailyMaintenance)
-                    are_lines_in_maintenance[np.where(are_lines_in_maintenance)[0][not_chosen]] = False
-                maintenance_me[selected_rows_beg:selected_rows_end, are_lines_in_maintenance] = 1.0
-
-                # handle last iteration
-                n_max = res[(nb_day_since_beg*nb_rows):((nb_day_since_beg+1) * nb_rows), idx_line_maintenance].shape[0]
-                res[(nb_day_since_beg*nb_rows):((nb_day_since_beg+1) * nb_rows), idx_line_maintenance] = \
-                    maintenance_me[:n_max, :]
-        return res
\ No newline at end of file
+        # draw, for every day and every line that can be in maintenance, whether a maintenance happens
+        maintenance_daily_proba = np.array(self.daily_proba_per_month_maintenance, dtype=dt_float)[month_id]
+        max_daily_maintenance = np.array(self.max_daily_number_per_month_maintenance, dtype=dt_int)[month_id]
+        are_lines_in_maintenance = self.space_prng.random_sample((nb_days, nb_line_maint))
+        are_lines_in_maintenance = are_lines_in_maintenance < maintenance_daily_proba.reshape(-1, 1)
+        # only maintenance starting on working days
+        are_lines_in_maintenance[day_of_week >= 5, :] = False
+
+        # check if the number of maintenance is not above the max allowed. otherwise randomly pick up the right
+        # number: the lines in maintenance are ranked randomly, and only the first "max_daily_maintenance" are kept
+        priority = self.space_prng.random_sample((nb_days, nb_line_maint))
+        priority[~are_lines_in_maintenance] = 2.
+        rank = np.argsort(np.argsort(priority, axis=1), axis=1)
+        are_lines_in_maintenance &= rank < max_daily_maintenance.reshape(-1, 1)
+
+        # and now write all the maintenance in the resulting matrix
+        day_id, line_id = np.nonzero(are_lines_in_maintenance)
+        rows = day_id.reshape(-1, 1) * nb_rows + np.arange(selected_rows_beg, selected_rows_end).reshape(1, -1)
+        cols = np.broadcast_to(np.nonzero(idx_line_maintenance)[0][line_id].reshape(-1, 1), rows.shape)
+        # handle last day
+        in_chronics = rows < nbTimesteps
+        res[rows[in_chronics], cols[in_chronics]] = 1.0
+        return res
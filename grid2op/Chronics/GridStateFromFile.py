@@ -8,6 +8,7 @@
 
 import os
 import copy
+import json
 import numpy as np
 import pandas as pd
 import warnings
@@ -338,26 +339,8 @@ class GridStateFromFile(GridValue):
         self._order_backend_prods = order_backend_prods
         self._order_backend_lines = order_backend_lines
 
-        self.names_chronics_to_backend = copy.deepcopy(names_chronics_to_backend)
-        if self.names_chronics_to_backend is None:
-            self.names_chronics_to_backend = {}
-        if not "loads" in self.names_chronics_to_backend:
-            self.names_chronics_to_backend["loads"] = {k: k for k in order_backend_loads}
-        else:
-            self._assert_correct(self.names_chronics_to_backend["loads"], order_backend_loads)
-        if not "prods" in self.names_chronics_to_backend:
-            self.names_chronics_to_backend["prods"] = {k: k for k in order_backend_prods}
-        else:
-            self._assert_correct(self.names_chronics_to_backend["prods"], order_backend_prods)
-        if not "lines" in self.names_chronics_to_backend:
-            self.names_chronics_to_backend["lines"] = {k: k for k in order_backend_lines}
-        else:
-            self._assert_correct(self.names_chronics_to_backend["lines"], order_backend_lines)
-        if not "subs" in self.names_chronics_to_backend:
-            self.names_chronics_to_backend["subs"] = {k: k for k in order_backend_subs}
-        else:
-            self._assert_correct(self.names_chronics_to_backend["subs"], order_backend_subs)
-
+        self._init_names_chronics_to_backend(order_backend_loads, order_backend_prods, order_backend_lines,
+                                             order_backend_subs, names_chronics_to_backend)
         self._init_date_time()
 
         # read the data
@@ -461,6 +444,28 @@ class GridStateFromFile(GridValue):
 
         self.curr_iter = 0
 
+    def _init_names_chronics_to_backend(self, order_backend_loads, order_backend_prods, order_backend_lines,
+                                        order_backend_subs, names_chronics_to_backend):
+        self.names_chronics_to_backend = copy.deepcopy(names_chronics_to_backend)
+        if self.names_chronics_to_backend is None:
+            self.names_chronics_to_backend = {}
+        if not "loads" in self.names_chronics_to_backend:
+            self.names_chronics_to_backend["loads"] = {k: k for k in order_backend_loads}
+        else:
+            self._assert_correct(self.names_chronics_to_backend["loads"], order_backend_loads)
+        if not "prods" in self.names_chronics_to_backend:
+            self.names_chronics_to_backend["prods"] = {k: k for k in order_backend_prods}
+        else:
+            self._assert_correct(self.names_chronics_to_backend["prods"], order_backend_prods)
+        if not "lines" in self.names_chronics_to_backend:
+            self.names_chronics_to_backend["lines"] = {k: k for k in order_backend_lines}
+        else:
+            self._assert_correct(self.names_chronics_to_backend["lines"], order_backend_lines)
+        if not "subs" in self.names_chronics_to_backend:
+            self.names_chronics_to_backend["subs"] = {k: k for k in order_backend_subs}
+        else:
+            self._assert_correct(self.names_chronics_to_backend["subs"], order_backend_subs)
+
     @staticmethod
     def _file_len(fname, ext_):
         # i = -1
@@ -498,21 +503,14 @@ class GridStateFromFile(GridValue):
         if hazards is not None:
             # hazards and maintenance cannot be computed by chunk. So we need to differenciate their behaviour
             self.hazards = copy.deepcopy(hazards.values[:, self._order_hazards])
-            self.hazard_duration = np.zeros(shape=(self.hazards.shape[0], self.n_line), dtype=dt_int)
-            for line_id in range(self.n_line):
-                self.hazard_duration[:, line_id] = self.get_hazard_duration_1d(self.hazards[:, line_id])
+            self.hazard_duration = self.get_hazard_duration_2d(self.hazards)
 
             self.hazards = self.hazards != 0.
 
         if maintenance is not None:
             self.maintenance = copy.deepcopy(maintenance.values[:, self._order_maintenance])
-            self.maintenance_time = np.zeros(shape=(self.maintenance.shape[0], self.n_line), dtype=dt_int) - 1
-            self.maintenance_duration = np.zeros(shape=(self.maintenance.shape[0], self.n_line), dtype=dt_int)
-
-            # test that with chunk size
-            for line_id in range(self.n_line):
-                self.maintenance_time[:, line_id] = self.get_maintenance_time_1d(self.maintenance[:, line_id])
-                self.maintenance_duration[:, line_id] = self.get_maintenance_duration_1d(self.maintenance[:, line_id])
+            self.maintenance_time = self.get_maintenance_time_2d(self.maintenance)
+            self.maintenance_duration = self.get_maintenance_duration_2d(self.maintenance)
 
             # there are _maintenance and hazards only if the value in the file is not 0.
             self.maintenance = self.maintenance != 0.
@@ -737,12 +735,18 @@ class GridStateFromFile(GridValue):
         else:
             return var[self.current_index,:]
 
-    def _save_array(self, array_, path_out, name, colnames):
+    def _save_array(self, array_, path_out, name, colnames, file_format="csv"):
         if array_ is None:
             return
-        tmp = pd.DataFrame(array_)
-        tmp.columns = colnames
-        tmp.to_csv(os.path.join(path_out, name), index=False, sep=self.sep)
+        if file_format == "npy":
+            # binary format: the array is saved as is, and the name of its columns in a separate json file
+            np.save(os.path.join(path_out, "{}.npy".format(name)), array_)
+            with open(os.path.join(path_out, "{}_columns.json".format(name)), "w", encoding="utf-8") as f:
+                json.dump([str(el) for el in colnames], fp=f)
+        else:
+            tmp = pd.DataFrame(array_)
+            tmp.columns = colnames
+            tmp.to_csv(os.path.join(path_out, name), index=False, sep=self.sep)
 
     def _init_res_split(self, nb_rows):
         res_prod_p = None
@@ -804,7 +808,32 @@ class GridStateFromFile(GridValue):
                 self._order_backend_loads, self._order_backend_loads,
                 self._order_backend_lines, self._order_backend_lines]
 
-    def split_and_save(self, datetime_beg, datetime_end, path_out):
+    def split_and_save(self, datetime_beg, datetime_end, path_out, file_format="csv"):
+        """
+        Save the chronics between `datetime_beg` and `datetime_end` in the directory `path_out`. The columns are
+        saved in the order of the backend.
+
+        Parameters
+        ----------
+        datetime_beg: ``str`` or ``datetime.datetime``
+            First datetime to save, in the "%Y-%m-%d %H:%M" format if given as a string.
+
+        datetime_end: ``str`` or ``datetime.datetime``
+            Last datetime to save, in the "%Y-%m-%d %H:%M" format if given as a string.
+
+        path_out: ``str``
+            Path of the directory where the data are stored (created if it does not exist).
+
+        file_format: ``str``
+            Either "csv" (default): the data are saved as compressed csv files that can be read by this class, or
+            "npy": the data are saved in numpy binary format (one ".npy" file per array, and the names of the
+            columns in a json file) that can be read by :class:`grid2op.Chronics.GridStateFromNpy`. In that case
+            the time of the next maintenance, the durations of the maintenance and of the hazards are saved too.
+
+        """
+        if file_format not in ["csv", "npy"]:
+            raise ChronicsError("Unknown file format \"{}\". Chronics can only be saved in \"csv\" or "
+                                "\"npy\" formats.".format(file_format))
         # work on a copy of myself
         tmp = copy.deepcopy(self)
         datetime_beg = self._convert_datetime(datetime_beg)
@@ -829,7 +858,8 @@ class GridStateFromFile(GridValue):
                           "will be ignored".format(curr_dt))
         # in the chronics we load the first row to initialize the data, so here we stop just a bit before that
         datetime_start = datetime_beg - self.time_interval
-        while curr_dt < datetime_start:
+        while curr_dt < datetime_start or tmp.current_index < 0:
+            # the first row of the chronics need to be loaded before it can be extracted
             curr_dt, *_ = tmp.load_next()
         real_init_dt = curr_dt
 
@@ -849,8 +879,21 @@ class GridStateFromFile(GridValue):
         for el, nm, colnames in zip(arrays,
                                     nms,
                                     orders_columns):
-            nm = "{}{}".format(nm, ".csv.bz2")
-            self._save_array(el, path_out, nm, colnames)
+            if file_format == "csv":
+                nm = "{}{}".format(nm, ".csv.bz2")
+            self._save_array(el, path_out, nm, colnames, file_format=file_format)
+
+        if file_format == "npy":
+            # save also the information computed from the maintenance and the hazards
+            arrays = dict(zip(nms, arrays))
+            if arrays["maintenance"] is not None:
+                self._save_array(self.get_maintenance_time_2d(arrays["maintenance"]), path_out,
+                                 "maintenance_time", self._order_backend_lines, file_format=file_format)
+                self._save_array(self.get_maintenance_duration_2d(arrays["maintenance"]), path_out,
+                                 "maintenance_duration", self._order_backend_lines, file_format=file_format)
+            if arrays["hazards"] is not None:
+                self._save_array(self.get_hazard_duration_2d(arrays["hazards"]), path_out,
+                                 "hazard_duration", self._order_backend_lines, file_format=file_format)
 
         with open(os.path.join(path_out, "start_datetime.info"), "w") as f:
             f.write("{:%Y-%m-%d %H:%M}\n".format(real_init_dt))
@@ -0,0 +1,184 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+import os
+import json
+import numpy as np
+from datetime import timedelta
+
+from grid2op.dtypes import dt_bool, dt_int
+from grid2op.Exceptions import ChronicsError
+from grid2op.Chronics.GridStateFromFile import GridStateFromFile
+from grid2op.Chronics.GridStateFromFileWithForecasts import GridStateFromFileWithForecasts
+
+
+class GridStateFromNpy(GridStateFromFileWithForecasts):
+    """
+    Read the injections values (and the forecasts if any) from numpy binary files (".npy") stored on the hard drive.
+
+    Compared to :class:`GridStateFromFile` (that reads csv files), the data are not parsed: they are memory
+    mapped (see `numpy.load` with `mmap_mode="r"`) so that switching from one episode to another is almost free,
+    the values being read from the hard drive only when they are used.
+
+    The data can be generated with the :func:`GridStateFromFile.split_and_save` method (or
+    :func:`grid2op.Chronics.Multifolder.split_and_save` to convert all the chronics of an environment) with the
+    `file_format="npy"` argument, for example:
+
+    .. code-block:: python
+
+        import grid2op
+        from grid2op.Chronics import GridStateFromNpy
+        env = grid2op.make("rte_case14_realistic")
+        env.chronics_handler.real_data.split_and_save("2019-01-05 00:00", "2019-01-12 00:00",
+                                                      path_out, file_format="npy")
+
+        env_npy = grid2op.make("rte_case14_realistic", chronics_path=path_out,
+                               data_feeding_kwargs={"gridvalueClass": GridStateFromNpy})
+
+    The folder located at :attr:`GridStateFromFile.path` can contain the files "load_p.npy", "load_q.npy",
+    "prod_p.npy", "prod_v.npy", "maintenance.npy", "hazards.npy" (and their "\\*_forecasted.npy" counterparts
+    for the forecasts). Each of these files comes with a "\\*_columns.json" file storing the names of the
+    elements, in the order of the columns of the array. If these names are in the same order as in the backend, the
+    arrays are used as is (without any copy), otherwise the columns are reordered when the data are loaded.
+
+    If present, the files "maintenance_time.npy", "maintenance_duration.npy" and "hazard_duration.npy" are used,
+    otherwise this information is computed from the maintenance and hazards arrays.
+
+    The "start_datetime.info" and "time_interval.info" files are read the same way as in
+    :class:`GridStateFromFile`.
+
+    Data are never read by chunk: :attr:`GridStateFromFile.chunk_size` is ignored.
+    """
+    def __init__(self, path, sep=";", time_interval=timedelta(minutes=5), max_iter=-1, chunk_size=None):
+        GridStateFromFileWithForecasts.__init__(self, path, sep=sep, time_interval=time_interval,
+                                                max_iter=max_iter, chunk_size=None)
+
+    def _get_array(self, data_name, order_backend, key):
+        """
+        Load the array stored in "data_name.npy" (memory mapped), with its columns in the order of the backend.
+        Returns ``None`` if the file does not exist.
+        """
+        full_path = os.path.join(self.path, "{}.npy".format(data_name))
+        if not os.path.exists(full_path):
+            return None
+        res = np.load(full_path, mmap_mode="r")
+        if self.max_iter > 0:
+            res = res[:(self.max_iter + 1)]
+
+        with open(os.path.join(self.path, "{}_columns.json".format(data_name)), "r", encoding="utf-8") as f:
+            columns = json.load(f)
+        self._assert_correct_second_stage(columns, self.names_chronics_to_backend, key, data_name)
+        order_backend = np.array([order_backend[self.names_chronics_to_backend[key][el]]
+                                  for el in columns]).astype(dt_int)
+        if np.any(order_backend != np.arange(order_backend.shape[0])):
+            # columns are not in the order of the backend, a copy need to be made
+            res = res[:, np.argsort(order_backend)]
+        return res
+
+    def initialize(self, order_backend_loads, order_backend_prods, order_backend_lines, order_backend_subs,
+                   names_chronics_to_backend=None):
+        """
+        In this function, the numpy arrays are memory mapped from the ".npy" files.
+
+        Parameters
+        ----------
+        See help of :func:`GridValue.initialize` for a detailed help about the parameters.
+
+        Returns
+        -------
+        ``None``
+
+        """
+        self.n_gen = len(order_backend_prods)
+        self.n_load = len(order_backend_loads)
+        self.n_line = len(order_backend_lines)
+
+        self._order_backend_loads = order_backend_loads
+        self._order_backend_prods = order_backend_prods
+        self._order_backend_lines = order_backend_lines
+
+        self._init_names_chronics_to_backend(order_backend_loads, order_backend_prods, order_backend_lines,
+                                             order_backend_subs, names_chronics_to_backend)
+        self._init_date_time()
+
+        order_backend_loads = {el: i for i, el in enumerate(order_backend_loads)}
+        order_backend_prods = {el: i for i, el in enumerate(order_backend_prods)}
+        order_backend_lines = {el: i for i, el in enumerate(order_backend_lines)}
+
+        self.load_p = self._get_array("load_p", order_backend_loads, "loads")
+        self.load_q = self._get_array("load_q", order_backend_loads, "loads")
+        self.prod_p = self._get_array("prod_p", order_backend_prods, "prods")
+        self.prod_v = self._get_array("prod_v", order_backend_prods, "prods")
+
+        self.hazards = self._get_array("hazards", order_backend_lines, "lines")
+        self.hazard_duration = None
+        if self.hazards is not None:
+            self.hazard_duration = self._get_array("hazard_duration", order_backend_lines, "lines")
+            if self.hazard_duration is None:
+                self.hazard_duration = self.get_hazard_duration_2d(self.hazards)
+            self.hazards = self.hazards != 0.
+
+        self.maintenance = self._get_array("maintenance", order_backend_lines, "lines")
+        self.maintenance_time = None
+        self.maintenance_duration = None
+        if self.maintenance is not None:
+            self.maintenance_time = self._get_array("maintenance_time", order_backend_lines, "lines")
+            if self.maintenance_time is None:
+                self.maintenance_time = self.get_maintenance_time_2d(self.maintenance)
+            self.maintenance_duration = self._get_array("maintenance_duration", order_backend_lines, "lines")
+            if self.maintenance_duration is None:
+                self.maintenance_duration = self.get_maintenance_duration_2d(self.maintenance)
+            self.maintenance = (self.maintenance != 0.).astype(dt_bool)
+
+        self.load_p_forecast = self._get_array("load_p_forecasted", order_backend_loads, "loads")
+        self.load_q_forecast = self._get_array("load_q_forecasted", order_backend_loads, "loads")
+        self.prod_p_forecast = self._get_array("prod_p_forecasted", order_backend_prods, "prods")
+        self.prod_v_forecast = self._get_array("prod_v_forecasted", order_backend_prods, "prods")
+        self.maintenance_forecast = self._get_array("maintenance_forecasted", order_backend_lines, "lines")
+        if self.maintenance_forecast is not None:
+            self.maintenance_forecast = (self.maintenance_forecast != 0.).astype(dt_bool)
+
+        # retrieve total number of rows
+        self.n_ = None
+        for arr in [self.load_p, self.load_q, self.prod_p, self.prod_v, self.maintenance, self.hazards]:
+            if arr is not None:
+                self.n_ = arr.shape[0]
+                break
+        if self.n_ is None:
+            raise ChronicsError("No files are found in directory \"{}\". If you don't want to load any chronics,"
+                                " use  \"ChangeNothing\" and not \"{}\" to load chronics."
+                                "".format(self.path, type(self)))
+        self.tmp_max_index = self.n_
+        if self.max_iter <= 0:
+            # see GridStateFromFile.initialize for the "-1"
+            self.max_iter = self.n_ - 1
+        self.curr_iter = 0
+
+    def _has_forecasts(self):
+        return self.load_p_forecast is not None or self.load_q_forecast is not None or \
+               self.prod_p_forecast is not None or self.prod_v_forecast is not None or \
+               self.maintenance_forecast is not None
+
+    def _data_in_memory(self):
+        # all the data are memory mapped, there is no need to read them by chunk
+        self._data_already_in_mem = True
+        return True
+
+    def set_chunk_size(self, new_chunk_size):
+        # data are memory mapped, they are never read by chunk
+        pass
+
+    def forecasts(self):
+        if not self._has_forecasts():
+            return []
+        return super().forecasts()
+
+    def check_validity(self, backend):
+        if self._has_forecasts():
+            super().check_validity(backend)
+        else:
+            GridStateFromFile.check_validity(self, backend)
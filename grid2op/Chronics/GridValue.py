@@ -442,6 +442,149 @@ class GridValue(RandomObject, ABC):
         res[prev_:] = 0
         return res
 
+    @staticmethod
+    def _next_index_2d(mask):
+        """
+        For each time step (row) and each powerline (column) of the 2d boolean array `mask`, compute the index of the
+        first row (greater or equal than the current one) where `mask` is ``True``. It is equal to the number of rows
+        if `mask` is never ``True`` afterwards.
+        """
+        nb_ts = mask.shape[0]
+        res = np.where(mask, np.arange(nb_ts, dtype=dt_int).reshape(-1, 1), dt_int(nb_ts))
+        # reverse cumulative minimum along the time axis
+        np.minimum.accumulate(res[::-1, :], axis=0, out=res[::-1, :])
+        return res
+
+    @staticmethod
+    def get_maintenance_time_2d(maintenance):
+        """
+        Vectorized version of :func:`GridValue.get_maintenance_time_1d` that computes the "next maintenance time" of
+        all the powerlines at once.
+
+        Parameters
+        ----------
+        maintenance: ``numpy.ndarray``
+            2 dimensional array of shape (number of time steps, number of powerlines) representing the time series of
+            the maintenance (0 there is no maintenance, anything else there is a maintenance at this time step)
+
+        Returns
+        -------
+        maintenance_time: ``numpy.ndarray``
+            Array with the same shape as `maintenance` representing the time series of the time of the next
+            maintenance of each powerline (see :func:`GridValue.get_maintenance_time_1d`).
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            maintenance = np.array([[0,0,0,0,0,1,1,1,0,0,0,0,1,1,0,0,0],
+                                    [0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]]).T
+            maintenance_time = GridValue.get_maintenance_time_2d(maintenance)
+            assert np.all(maintenance_time[:, 0] == np.array([5,4,3,2,1,0,0,0,4,3,2,1,0,0,-1,-1,-1]))
+            assert np.all(maintenance_time[:, 1] == -1)
+
+        """
+        nb_ts = maintenance.shape[0]
+        maintenance = maintenance != 0
+        # the computation is only performed for the powerlines that have at least one maintenance
+        res = np.full(maintenance.shape, fill_value=-1, dtype=dt_int)
+        has_maintenance = np.any(maintenance, axis=0)
+        next_maintenance = GridValue._next_index_2d(maintenance[:, has_maintenance])
+        tmp = next_maintenance - np.arange(nb_ts, dtype=dt_int).reshape(-1, 1)
+        # no maintenance are planned in the forseeable future
+        tmp[next_maintenance == nb_ts] = -1
+        res[:, has_maintenance] = tmp
+        return res
+
+    @staticmethod
+    def get_maintenance_duration_2d(maintenance):
+        """
+        Vectorized version of :func:`GridValue.get_maintenance_duration_1d` that computes the "next maintenance
+        duration" of all the powerlines at once.
+
+        Parameters
+        ----------
+        maintenance: ``numpy.ndarray``
+            2 dimensional array of shape (number of time steps, number of powerlines) representing the time series of
+            the maintenance (0 there is no maintenance, anything else there is a maintenance at this time step)
+
+        Returns
+        -------
+        maintenance_duration: ``numpy.ndarray``
+            Array with the same shape as `maintenance` representing the time series of the duration of the next
+            maintenance of each powerline (see :func:`GridValue.get_maintenance_duration_1d`).
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            maintenance = np.array([[0,0,0,0,0,1,1,1,0,0,0,0,1,1,0,0,0],
+                                    [0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]]).T
+            maintenance_duration = GridValue.get_maintenance_duration_2d(maintenance)
+            assert np.all(maintenance_duration[:, 0] == np.array([3,3,3,3,3,3,2,1,2,2,2,2,2,1,0,0,0]))
+            assert np.all(maintenance_duration[:, 1] == 0)
+
+        """
+        nb_ts = maintenance.shape[0]
+        maintenance = maintenance != 0
+        # the computation is only performed for the powerlines that have at least one maintenance
+        res = np.zeros(maintenance.shape, dtype=dt_int)
+        has_maintenance = np.any(maintenance, axis=0)
+        maintenance = maintenance[:, has_maintenance]
+        next_beg = GridValue._next_index_2d(maintenance)
+        next_end = GridValue._next_index_2d(~maintenance)
+        # during a maintenance: number of time steps before its end
+        tmp = next_end - np.arange(nb_ts, dtype=dt_int).reshape(-1, 1)
+        # otherwise: total duration of the next maintenance, and 0 if there are none
+        end_next_maintenance = np.take_along_axis(next_end, np.minimum(next_beg, nb_ts - 1), axis=0)
+        tmp = np.where(maintenance, tmp, end_next_maintenance - next_beg)
+        tmp[next_beg == nb_ts] = 0
+        res[:, has_maintenance] = tmp
+        return res
+
+    @staticmethod
+    def get_hazard_duration_2d(hazard):
+        """
+        Vectorized version of :func:`GridValue.get_hazard_duration_1d` that computes the "hazard duration" of all
+        the powerlines at once.
+
+        Parameters
+        ----------
+        hazard: ``numpy.ndarray``
+            2 dimensional array of shape (number of time steps, number of powerlines) representing the time series of
+            the hazards (0 there is no hazard, anything else there is a hazard at this time step)
+
+        Returns
+        -------
+        hazard_duration: ``numpy.ndarray``
+            Array with the same shape as `hazard` representing the time series of the duration of the hazards
+            of each powerline (see :func:`GridValue.get_hazard_duration_1d`).
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            hazard = np.array([[0,0,0,0,0,1,1,1,0,0,0,0,1,1,0,0,0],
+                               [0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]]).T
+            hazard_duration = GridValue.get_hazard_duration_2d(hazard)
+            assert np.all(hazard_duration[:, 0] == np.array([0,0,0,0,0,3,2,1,0,0,0,0,2,1,0,0,0]))
+            assert np.all(hazard_duration[:, 1] == 0)
+
+        """
+        nb_ts = hazard.shape[0]
+        hazard = hazard != 0
+        # the computation is only performed for the powerlines that have at least one hazard
+        res = np.zeros(hazard.shape, dtype=dt_int)
+        has_hazard = np.any(hazard, axis=0)
+        hazard = hazard[:, has_hazard]
+        tmp = GridValue._next_index_2d(~hazard) - np.arange(nb_ts, dtype=dt_int).reshape(-1, 1)
+        tmp[~hazard] = 0
+        res[:, has_hazard] = tmp
+        return res
+
     @abstractmethod
     def load_next(self):
         """
@@ -630,6 +773,14 @@ class GridValue(RandomObject, ABC):
         """
         pass
 
+    def close(self):
+        """
+        Called when the :class:`grid2op.Environment.Environment` is closed, to release the resources (for example
+        the threads) used to generate the data. By default it does nothing.
+
+        """
+        pass
+
     def fast_forward(self, nb_timestep):
         """
         This method allows you to skip some time step at the beginning of the chronics.
@@ -7,7 +7,10 @@
 # This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
 
 import os
+import copy
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
 
 from grid2op.dtypes import dt_int
@@ -50,13 +53,27 @@ class Multifolder(GridValue):
 
     id_chron_folder_current: ``int``
         Id (in :attr:`MultiFolder.subpaths`) for which data are generated in the current episode.
+
+    prefetch: ``int``
+        Number of episodes that are loaded in advance, in a background thread, while the current episode is being
+        played (default to ``0``: everything is loaded when :func:`Multifolder.initialize` is called). When the
+        episode set up by :func:`Multifolder.next_chronics` has been prefetched, :func:`Multifolder.initialize` only
+        swaps it in instead of reading the data from the hard drive.
+
+        The episodes prefetched are the next ones in :attr:`Multifolder.subpaths` (so after
+        :func:`Multifolder.shuffle` has been called, they follow the shuffled order). If another episode is asked for
+        (for example with :func:`Multifolder.tell_id`) the prefetched data are discarded and the episode is
+        loaded as usual. The chronics are seeded the same way whether they are prefetched or not.
+
+        It can be set with: ``grid2op.make(..., data_feeding_kwargs={"prefetch": 1})``
     """
     def __init__(self, path,
                  time_interval=timedelta(minutes=5),
                  start_datetime=datetime(year=2019, month=1, day=1),
                  gridvalueClass=GridStateFromFile,
                  sep=";", max_iter=-1,
-                 chunk_size=None):
+                 chunk_size=None,
+                 prefetch=0):
         GridValue.__init__(self, time_interval=time_interval, max_iter=max_iter, chunk_size=chunk_size,
                            start_datetime=start_datetime)
         self.gridvalueClass = gridvalueClass
@@ -85,8 +102,124 @@ class Multifolder(GridValue):
         self._order_backend_subs = None
         self._names_chronics_to_backend = None
 
+        # for prefetching
+        try:
+            self.prefetch = int(prefetch)
+        except (TypeError, ValueError):
+            raise ChronicsError("\"prefetch\" should be an integer, it is currently \"{}\"".format(prefetch))
+        if self.prefetch < 0:
+            raise ChronicsError("\"prefetch\" should be a positive integer, it is currently "
+                                "\"{}\"".format(self.prefetch))
+        self._prefetch_executor = None
+        self._prefetched = deque()  # (key, seed, future) of the episodes being loaded, in the order they will be used
+        self._prefetch_seeds = deque()  # seeds drawn but not used yet (eg. because a prefetched episode was discarded)
+
+    def __getstate__(self):
+        # threads can neither be copied nor pickled: the copy will load its episodes again
+        res = copy.copy(self.__dict__)
+        res["_prefetch_executor"] = None
+        res["_prefetched"] = deque()
+        res["_prefetch_seeds"] = deque([seed for _, seed, _ in self._prefetched] + list(self._prefetch_seeds))
+        return res
+
+    def _next_seed(self):
+        """draw the seed of the next episode loaded, reusing the ones of the discarded episodes first"""
+        if self._prefetch_seeds:
+            return self._prefetch_seeds.popleft()
+        max_int = np.iinfo(dt_int).max
+        return self.space_prng.randint(max_int)
+
+    def _get_data_key(self, id_chron_folder):
+        """everything that defines the data loaded for a given episode"""
+        return id_chron_folder, self.subpaths[id_chron_folder], self.max_iter, self.chunk_size
+
+    def _load_data(self, key, seed_chronics):
+        """build and initialize the data of an episode. This might be called from the prefetching thread."""
+        _, path, max_iter, chunk_size = key
+        res = self.gridvalueClass(time_interval=self.time_interval,
+                                  sep=self.sep,
+                                  path=path,
+                                  max_iter=max_iter,
+                                  chunk_size=chunk_size)
+        res.seed(seed_chronics)
+        res.initialize(self._order_backend_loads, self._order_backend_prods, self._order_backend_lines,
+                       self._order_backend_subs, names_chronics_to_backend=self._names_chronics_to_backend)
+        return res
+
+    def _clear_prefetch(self, keep_seeds=True):
+        """discard all the episodes prefetched"""
+        seeds = []
+        while self._prefetched:
+            _, seed, future = self._prefetched.popleft()
+            future.cancel()
+            seeds.append(seed)
+        if keep_seeds:
+            # seeds of the discarded episodes have been drawn before the ones still stored
+            self._prefetch_seeds.extendleft(reversed(seeds))
+        else:
+            self._prefetch_seeds.clear()
+
+    def close(self):
+        """
+        Discard the episodes being prefetched and stop the thread loading them. The data of the current episode
+        are closed too.
+        """
+        self._clear_prefetch()
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=True)
+            self._prefetch_executor = None
+        if self.data is not None:
+            self.data.close()
+
+    def _get_prefetched(self, key):
+        """retrieve the prefetched data for the episode `key`, or ``None`` if it has not been prefetched"""
+        if not self._prefetched:
+            return None
+        key_prefetched, _, future = self._prefetched[0]
+        if key_prefetched != key:
+            # another episode is asked (tell_id, shuffle, max_iter modified etc.)
+            self._clear_prefetch()
+            return None
+        self._prefetched.popleft()
+        return future.result()
+
+    def _prefetch_next(self):
+        """start loading the next episodes in the background"""
+        if self.prefetch <= 0:
+            return
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        if self._prefetched:
+            last_id = self._prefetched[-1][0][0]
+        else:
+            last_id = self.id_chron_folder_current
+        while len(self._prefetched) < self.prefetch:
+            last_id = (last_id + 1) % len(self.subpaths)
+            key = self._get_data_key(last_id)
+            seed_chronics = self._next_seed()
+            future = self._prefetch_executor.submit(self._load_data, key, seed_chronics)
+            self._prefetched.append((key, seed_chronics, future))
+
+    @staticmethod
+    def _same_order(order_1, order_2):
+        if order_1 is None or order_2 is None:
+            return order_1 is order_2
+        return len(order_1) == len(order_2) and np.all([el1 == el2 for el1, el2 in zip(order_1, order_2)])
+
+    def seed(self, seed):
+        # episodes being prefetched have been seeded with the previous seed
+        self._clear_prefetch(keep_seeds=False)
+        return super().seed(seed)
+
     def initialize(self, order_backend_loads, order_backend_prods, order_backend_lines, order_backend_subs,
                    names_chronics_to_backend=None):
+        if not (self._same_order(order_backend_loads, self._order_backend_loads) and
+                self._same_order(order_backend_prods, self._order_backend_prods) and
+                self._same_order(order_backend_lines, self._order_backend_lines) and
+                self._same_order(order_backend_subs, self._order_backend_subs) and
+                names_chronics_to_backend == self._names_chronics_to_backend):
+            # data that are prefetched do not match the backend
+            self._clear_prefetch()
 
         self._order_backend_loads = order_backend_loads
         self._order_backend_prods = order_backend_prods
@@ -97,18 +230,13 @@ class Multifolder(GridValue):
         self.n_gen = len(order_backend_prods)
         self.n_load = len(order_backend_loads)
         self.n_line = len(order_backend_lines)
-        self.data = self.gridvalueClass(time_interval=self.time_interval,
-                                        sep=self.sep,
-                                        path=self.subpaths[self.id_chron_folder_current],
-                                        max_iter=self.max_iter,
-                                        chunk_size=self.chunk_size)
-        if self.seed is not None:
-            max_int = np.iinfo(dt_int).max
-            seed_chronics = self.space_prng.randint(max_int)
-            self.data.seed(seed_chronics)
-
-        self.data.initialize(order_backend_loads, order_backend_prods, order_backend_lines, order_backend_subs,
-                             names_chronics_to_backend=names_chronics_to_backend)
+
+        key = self._get_data_key(self.id_chron_folder_current)
+        data = self._get_prefetched(key)
+        if data is None:
+            data = self._load_data(key, self._next_seed())
+        self.data = data
+        self._prefetch_next()
 
     def done(self):
         """
@@ -242,11 +370,13 @@ class Multifolder(GridValue):
 
         """
         self.subpaths = shuffler(self.subpaths)
+        # the prefetched episodes are not the next ones anymore
+        self._clear_prefetch()
 
     def set_chunk_size(self, new_chunk_size):
         self.chunk_size = new_chunk_size
 
-    def split_and_save(self, datetime_beg, datetime_end, path_out):
+    def split_and_save(self, datetime_beg, datetime_end, path_out, file_format="csv"):
         if not isinstance(datetime_beg, dict):
             datetime_beg_orig = datetime_beg
             datetime_beg = {}
@@ -275,7 +405,8 @@ class Multifolder(GridValue):
                            self._order_backend_subs,
                            self._names_chronics_to_backend)
             path_out_chron = os.path.join(path_out, id_this_chron)
-            tmp.split_and_save(datetime_beg[id_this_chron], datetime_end[id_this_chron], path_out_chron)
+            tmp.split_and_save(datetime_beg[id_this_chron], datetime_end[id_this_chron], path_out_chron,
+                               file_format=file_format)
 
     def fast_forward(self, nb_timestep):
         """
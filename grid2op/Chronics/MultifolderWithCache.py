@@ -6,10 +6,12 @@
 # SPDX-License-Identifier: MPL-2.0
 # This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
 import numpy as np
+from collections import OrderedDict
 from datetime import timedelta, datetime
 
 from grid2op.dtypes import dt_int
 from grid2op.Chronics.MultiFolder import Multifolder
+from grid2op.Exceptions import ChronicsError
 from grid2op.Chronics.GridStateFromFile import GridStateFromFile
 
 
@@ -57,6 +59,41 @@ class MultifolderWithCache(Multifolder):
         while not done:
             act = my_agent.act(obs, reward, done)
             obs, reward, done, info = env.step(act)  # and step will NOT load any data from disk.
+
+    By default, all the chronics kept by the filter are loaded in memory when the cache is built. If they do not all
+    fit in memory, the size of the cache can be bounded, either in number of chronics (`max_cache_size`) or in
+    megabytes (`max_cache_memory`). In this case, the chronics are loaded when they are used and the least
+    recently used ones are removed from the cache when it is full. A chronics that has been removed is loaded again
+    (with the same seed, so with the same data) the next time it is used.
+
+    .. code-block:: python
+
+        from grid2op import make
+        from grid2op.Chronics import MultifolderWithCache
+        env = make(..., chronics_class=MultifolderWithCache, data_feeding_kwargs={"max_cache_memory": 500})
+        env.chronics_handler.real_data.set_filter(lambda x: True)
+        env.chronics_handler.real_data.reset_cache()
+        ...
+        print(env.chronics_handler.real_data.cache_info())
+
+    Attributes
+    ----------
+    max_cache_size: ``int``
+        Maximum number of chronics kept in memory (``None`` for no limit)
+
+    max_cache_memory: ``float``
+        Maximum amount of memory (in megabytes) used by the chronics in memory (``None`` for no limit). The
+        chronics currently used is always kept, even if it is bigger than this limit.
+
+    cache_hits: ``int``
+        Number of times a chronics has been found in the cache when it was used.
+
+    cache_misses: ``int``
+        Number of times a chronics had to be loaded from the hard drive when it was used (only counted when the size
+        of the cache is bounded).
+
+    cache_evictions: ``int``
+        Number of chronics that have been removed from the cache.
     """
     def __init__(self, path,
                  time_interval=timedelta(minutes=5),
@@ -64,7 +101,9 @@ class MultifolderWithCache(Multifolder):
                  gridvalueClass=GridStateFromFile,
                  sep=";",
                  max_iter=-1,
-                 chunk_size=None):
+                 chunk_size=None,
+                 max_cache_size=None,
+                 max_cache_memory=None):
         Multifolder.__init__(self,
                              path=path,
                              time_interval=time_interval,
@@ -73,9 +112,20 @@ class MultifolderWithCache(Multifolder):
                              sep=sep,
                              max_iter=max_iter,
                              chunk_size=None)
-        self._cached_data = None
+        self._cached_data = None  # chronics in memory, from the least recently used to the most recently used
+        self._cached_paths = None  # all the chronics in the cache, in the order in which they will be used
+        self._cached_seeds = None
+        self._cached_nbytes = None
         self._filter = self._default_filter
         self._prev_cache_id = 0
+        self.max_cache_size = None
+        self.max_cache_memory = None
+        self._check_cache_bounds(max_cache_size, max_cache_memory)
+        self.max_cache_size = max_cache_size
+        self.max_cache_memory = max_cache_memory
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
         if not issubclass(self.gridvalueClass, GridStateFromFile):
             raise RuntimeError("MultifolderWithCache does not work when \"gridvalueClass\" does not inherit from "
                                "\"GridStateFromFile\".")
@@ -103,41 +153,142 @@ class MultifolderWithCache(Multifolder):
         """
         self._filter = filter_fun
 
+    @staticmethod
+    def _check_cache_bounds(max_cache_size, max_cache_memory):
+        if max_cache_size is not None and max_cache_size < 1:
+            raise ChronicsError("\"max_cache_size\" should be at least 1, it is currently "
+                                "\"{}\"".format(max_cache_size))
+        if max_cache_memory is not None and max_cache_memory <= 0.:
+            raise ChronicsError("\"max_cache_memory\" should be strictly positive, it is currently "
+                                "\"{}\"".format(max_cache_memory))
+
+    def _is_bounded(self):
+        return self.max_cache_size is not None or self.max_cache_memory is not None
+
+    @staticmethod
+    def _get_nbytes(data):
+        """memory (in bytes) used by the numpy arrays of a chronics"""
+        return sum([el.nbytes for el in data.__dict__.values() if isinstance(el, np.ndarray)])
+
+    def _load_cached_data(self, path):
+        """load (from the hard drive) the chronics stored at `path`"""
+        data = self.gridvalueClass(time_interval=self.time_interval,
+                                   sep=self.sep,
+                                   path=path,
+                                   max_iter=self.max_iter,
+                                   chunk_size=self.chunk_size)
+        data.seed(self._cached_seeds[path])
+        data.initialize(self._order_backend_loads,
+                        self._order_backend_prods,
+                        self._order_backend_lines,
+                        self._order_backend_subs,
+                        self._names_chronics_to_backend)
+        return data
+
+    def _add_to_cache(self, path, data):
+        self._cached_data[path] = data
+        self._cached_nbytes[path] = self._get_nbytes(data)
+
+    def _evict(self):
+        """remove the least recently used chronics until the cache fits in its bounds"""
+        while len(self._cached_data) > 1:
+            too_many = self.max_cache_size is not None and len(self._cached_data) > self.max_cache_size
+            too_big = self.max_cache_memory is not None and \
+                sum(self._cached_nbytes.values()) > 1024. ** 2 * self.max_cache_memory
+            if not (too_many or too_big):
+                break
+            path, _ = self._cached_data.popitem(last=False)
+            del self._cached_nbytes[path]
+            self.cache_evictions += 1
+
+    def _get_data(self, path):
+        """retrieve the data stored at `path` from the cache, loading them if they are not there"""
+        if path in self._cached_data:
+            self.cache_hits += 1
+            self._cached_data.move_to_end(path)
+            return self._cached_data[path]
+        self.cache_misses += 1
+        data = self._load_cached_data(path)
+        self._add_to_cache(path, data)
+        self._evict()
+        return data
+
     def reset_cache(self):
         """
         Rebuilt the cache as if it were built from scratch. This call might take a while to process.
+
+        If the size of the cache is bounded (see :attr:`MultifolderWithCache.max_cache_size` and
+        :attr:`MultifolderWithCache.max_cache_memory`) no data are loaded here: they will be when used.
         """
-        self._cached_data = []
+        self._cached_data = OrderedDict()
+        self._cached_paths = []
+        self._cached_seeds = {}
+        self._cached_nbytes = {}
         self._prev_cache_id = 0
+        max_int = np.iinfo(dt_int).max
         for path in self.subpaths:
             if not self._filter(path):
                 continue
-            data = self.gridvalueClass(time_interval=self.time_interval,
-                                       sep=self.sep,
-                                       path=path,
-                                       max_iter=self.max_iter,
-                                       chunk_size=self.chunk_size)
-            if self.seed is not None:
-                max_int = np.iinfo(dt_int).max
-                seed_chronics = self.space_prng.randint(max_int)
-                data.seed(seed_chronics)
-
-            data.initialize(self._order_backend_loads,
-                            self._order_backend_prods,
-                            self._order_backend_lines,
-                            self._order_backend_subs,
-                            self._names_chronics_to_backend)
-            self._cached_data.append(data)
-
-        if len(self._cached_data) == 0:
+            self._cached_paths.append(path)
+            self._cached_seeds[path] = self.space_prng.randint(max_int)
+            if not self._is_bounded():
+                self._add_to_cache(path, self._load_cached_data(path))
+
+        if len(self._cached_paths) == 0:
             raise RuntimeError("Impossible to initialize the new cache.")
-        self.space_prng.shuffle(self._cached_data)
+        self.space_prng.shuffle(self._cached_paths)
+
+    def set_cache_size(self, max_cache_size=None, max_cache_memory=None):
+        """
+        Change the bounds of the cache. Chronics are removed from the cache if needed.
+
+        **NB** if the cache was not bounded and is still not, this has no effect. If the cache was bounded and is no
+        more, the chronics will be kept in memory as they are used: this does not load all the data in memory.
+
+        Parameters
+        ----------
+        max_cache_size: ``int``
+            Maximum number of chronics kept in memory (``None`` for no limit)
+
+        max_cache_memory: ``float``
+            Maximum amount of memory (in megabytes) used by the chronics in memory (``None`` for no limit)
+
+        """
+        self._check_cache_bounds(max_cache_size, max_cache_memory)
+        self.max_cache_size = max_cache_size
+        self.max_cache_memory = max_cache_memory
+        if self._cached_data is not None:
+            self._evict()
+
+    def cache_info(self):
+        """
+        Statistics about the use of the cache, for example to adjust the amount of memory given to the cache of each
+        worker when training with multiple processes.
+
+        Returns
+        -------
+        res: ``dict``
+            With keys "hits", "misses", "evictions" (see :attr:`MultifolderWithCache.cache_hits`,
+            :attr:`MultifolderWithCache.cache_misses` and :attr:`MultifolderWithCache.cache_evictions`),
+            "size" (number of chronics in memory), "memory" (memory used by these chronics, in megabytes),
+            "max_size" and "max_memory" (see :attr:`MultifolderWithCache.max_cache_size` and
+            :attr:`MultifolderWithCache.max_cache_memory`)
+
+        """
+        size = 0
+        memory = 0.
+        if self._cached_data is not None:
+            size = len(self._cached_data)
+            memory = sum(self._cached_nbytes.values()) / 1024. ** 2
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "evictions": self.cache_evictions,
+                "size": size, "memory": memory,
+                "max_size": self.max_cache_size, "max_memory": self.max_cache_memory}
 
     def next_chronics(self):
         self._prev_cache_id += 1
-        if self._prev_cache_id >= len(self._cached_data):
-            self.space_prng.shuffle(self._cached_data)
-        self._prev_cache_id %= len(self._cached_data)
+        if self._prev_cache_id >= len(self._cached_paths):
+            self.space_prng.shuffle(self._cached_paths)
+        self._prev_cache_id %= len(self._cached_paths)
 
     def initialize(self, order_backend_loads, order_backend_prods, order_backend_lines, order_backend_subs,
                    names_chronics_to_backend=None):
@@ -154,7 +305,7 @@ class MultifolderWithCache(Multifolder):
             # initialize the cache
             self.reset_cache()
 
-        self.data = self._cached_data[self._prev_cache_id]
+        self.data = self._get_data(self._cached_paths[self._prev_cache_id])
         # self.data.current_index = 0
         # self.data.curr_iter = 0
         self.data.next_chronics()
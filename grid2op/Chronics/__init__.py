@@ -7,6 +7,7 @@ __all__ = [
     "GridStateFromFile",
     "GridStateFromFileWithForecasts",
     "GridStateFromFileWithForecastsWithMaintenance",
+    "GridStateFromNpy",
     "ReadPypowNetData"
 ]
 
@@ -19,3 +20,4 @@ from grid2op.Chronics.MultiFolder import Multifolder
 from grid2op.Chronics.ReadPypowNetData import ReadPypowNetData
 from grid2op.Chronics.GSFFWFWM import GridStateFromFileWithForecastsWithMaintenance
 from grid2op.Chronics.MultifolderWithCache import MultifolderWithCache
+from grid2op.Chronics.GridStateFromNpy import GridStateFromNpy
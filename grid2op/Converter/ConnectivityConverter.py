@@ -177,7 +177,7 @@ class ConnectivityConverter(Converter):
 
         """
         argsort = np.argsort(np.minimum(encoded_act, 1-encoded_act))
-        topo_vect = np.zeros(self.n, dtype=dt_int)
+        topo_vect = np.zeros(self.dim_topo, dtype=dt_int)
         subs_added = np.full(self.n_sub, fill_value=False)
         sub_changed = 0
         for el in argsort:
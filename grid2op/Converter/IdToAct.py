@@ -10,7 +10,7 @@ import numpy as np
 
 from grid2op.Action import BaseAction
 from grid2op.Converter.Converters import Converter
-from grid2op.dtypes import dt_float
+from grid2op.dtypes import dt_float, dt_bool
 
 
 class IdToAct(Converter):
@@ -62,17 +62,86 @@ class IdToAct(Converter):
     more than N = 15 or 16 elements, the amount of actions (for this substation alone) will be higher than 16.000
     which makes it rather difficult to handle for most machine learning algorithm. Be carefull with that !
 
+    **NB** The actions are not stored as :class:`grid2op.Action.BaseAction` objects but as a single matrix, each row
+    being an action represented as a vector (see :func:`grid2op.Action.BaseAction.to_vect`). The action with id "i"
+    is built from the "i"-th row of this matrix the first time :func:`IdToAct.convert_act` is called with "i", and
+    then kept in memory (so only the actions used are built). When loaded from the hard drive (see
+    :func:`IdToAct.save` and :func:`IdToAct.init_converter`), this matrix is memory mapped, so that multiple
+    processes using the same action space share the same memory.
+
+    For backward compatibility, the list of all the actions is built the first time :attr:`IdToAct.all_actions` is
+    accessed (or assigned). From this point, this list is used by the converter (and the matrix is not anymore).
+
     """
     def __init__(self, action_space):
         Converter.__init__(self, action_space)
         self.__class__ = IdToAct.init_grid(action_space)
-        self.all_actions = []
+        self._all_actions = None
+        # actions already built from the matrix, by id
+        self._built_actions = {}
         # add the do nothing topology
-        self.all_actions.append(super().__call__())
+        self._all_actions_vect = self._to_matrix([super().__call__()])
         self.n = 1
         self._init_size = action_space.size()
         self.kwargs_init = {}
 
+    @property
+    def all_actions(self):
+        """
+        The list of all the actions of this converter. It is built (and then kept in memory) the first time it is
+        accessed.
+        """
+        if self._all_actions is None:
+            self._all_actions = [self._built_actions[i] if i in self._built_actions else self._build_action(el)
+                                 for i, el in enumerate(self._all_actions_vect)]
+            self._all_actions_vect = None
+            self._built_actions = {}
+        return self._all_actions
+
+    @all_actions.setter
+    def all_actions(self, all_actions):
+        self._all_actions = all_actions
+        self._all_actions_vect = None
+        self._built_actions = {}
+
+    def _to_matrix(self, all_actions):
+        """represent a list of actions as a matrix, each row being an action converted to a vector"""
+        res = np.array([el.to_vect() for el in all_actions], dtype=dt_float)
+        return res.reshape(len(all_actions), self._template_act.size())
+
+    def _topo_to_matrix(self, attr_name, all_topos):
+        """
+        represent a matrix of topologies (given as "set_bus" or "change_bus" vectors) as a matrix of actions,
+        without building the actions
+        """
+        res = np.tile(self._template_act.to_vect().astype(dt_float), (all_topos.shape[0], 1))
+        beg_, end_, _ = self.get_indx_extract(attr_name)
+        res[:, beg_:end_] = all_topos
+        return res
+
+    def _get_all_actions_vect(self):
+        """all the actions, as a matrix"""
+        if self._all_actions is not None:
+            return self._to_matrix(self._all_actions)
+        return self._all_actions_vect
+
+    def _set_all_actions_vect(self, all_actions_vect):
+        self._all_actions = None
+        self._all_actions_vect = all_actions_vect
+        self._built_actions = {}
+        self.n = all_actions_vect.shape[0]
+
+    def _build_action(self, act_as_vect):
+        res = self.__call__()
+        res.from_vect(act_as_vect)
+        return res
+
+    def _check_all_actions_vect(self, all_actions_vect):
+        size_act = self._template_act.size()
+        if len(all_actions_vect.shape) != 2 or all_actions_vect.shape[1] != size_act:
+            raise RuntimeError("The actions should be represented as a matrix with {} columns (one row per action), "
+                               "found an array of shape {}".format(size_act, all_actions_vect.shape))
+
     def init_converter(self, all_actions=None, **kwargs):
         """
         This function is used to initialized the converter. When the converter is created, this method should be called
@@ -87,6 +156,9 @@ class IdToAct(Converter):
             "right" by 3. If nothing is provided, the converter will output all the unary actions possible for
             the environment. Be careful, computing all these actions might take some time.
 
+            It can also be a matrix (each row being an action represented as a vector) or the path of a ".npy" file
+            storing such a matrix (see :func:`IdToAct.save`). In this last case, the file is memory mapped.
+
         kwargs:
             other keyword arguments (all considered to be ``True`` by default) that can be:
 
@@ -117,16 +189,15 @@ class IdToAct(Converter):
         """
         self.kwargs_init = kwargs
         if all_actions is None:
-            self.all_actions = []
             # add the do nothing action, always
-            self.all_actions.append(super().__call__())
+            all_actions_vect = [self._to_matrix([super().__call__()])]
             if "_set_line_status" in self._template_act.attr_list_vect:
                 # lines 'set'
                 include_ = True
                 if "set_line_status" in kwargs:
                     include_ = kwargs["set_line_status"]
                 if include_:
-                    self.all_actions += self.get_all_unitary_line_set(self)
+                    all_actions_vect.append(self._to_matrix(self.get_all_unitary_line_set(self)))
 
             if "_switch_line_status" in self._template_act.attr_list_vect:
                 # lines 'change'
@@ -134,7 +205,7 @@ class IdToAct(Converter):
                 if "change_line_status" in kwargs:
                     include_ = kwargs["change_line_status"]
                 if include_:
-                    self.all_actions += self.get_all_unitary_line_change(self)
+                    all_actions_vect.append(self._to_matrix(self.get_all_unitary_line_change(self)))
 
             if "_set_topo_vect" in self._template_act.attr_list_vect:
                 # topologies 'set'
@@ -142,7 +213,8 @@ class IdToAct(Converter):
                 if "set_topo_vect" in kwargs:
                     include_ = kwargs["set_topo_vect"]
                 if include_:
-                    self.all_actions += self.get_all_unitary_topologies_set(self)
+                    all_topos = self.get_all_unitary_topologies_set_vect(self)
+                    all_actions_vect.append(self._topo_to_matrix("_set_topo_vect", all_topos))
 
             if "_change_bus_vect" in self._template_act.attr_list_vect:
                 # topologies 'change'
@@ -150,7 +222,8 @@ class IdToAct(Converter):
                 if "change_bus_vect" in kwargs:
                     include_ = kwargs["change_bus_vect"]
                 if include_:
-                    self.all_actions += self.get_all_unitary_topologies_change(self)
+                    all_topos = self.get_all_unitary_topologies_change_vect(self)
+                    all_actions_vect.append(self._topo_to_matrix("_change_bus_vect", all_topos))
 
             if "_redispatch" in self._template_act.attr_list_vect:
                 # redispatch (transformed to discrete variables)
@@ -158,40 +231,39 @@ class IdToAct(Converter):
                 if "redispatch" in kwargs:
                     include_ = kwargs["redispatch"]
                 if include_:
-                    self.all_actions += self.get_all_unitary_redispatch(self)
+                    all_actions_vect.append(self._to_matrix(self.get_all_unitary_redispatch(self)))
+            self._set_all_actions_vect(np.concatenate(all_actions_vect, axis=0))
         elif isinstance(all_actions, str):
             # load the path from the path provided
             if not os.path.exists(all_actions):
                 raise FileNotFoundError("No file located at \"{}\" where the actions should have been stored."
                                         "".format(all_actions))
             try:
-                all_act = np.load(all_actions)
+                all_act = np.load(all_actions, mmap_mode="r")
             except Exception as e:
                 raise RuntimeError("Impossible to load the data located at \"{}\" with error\n{}."
                                    "".format(all_actions, e))
             try:
-                self.all_actions = np.array([self.__call__() for _ in all_act])
-                for i, el in enumerate(all_act):
-                    self.all_actions[i].from_vect(el)
+                self._check_all_actions_vect(all_act)
             except Exception as e:
                 raise RuntimeError("Impossible to convert the data located at \"{}\" into valid grid2op action. "
                                    "The error was:\n{}".format(all_actions, e))
+            self._set_all_actions_vect(all_act)
         elif isinstance(all_actions, (list, np.ndarray)):
             # assign the action to my actions
             possible_act = all_actions[0]
             if isinstance(possible_act, BaseAction):
-                self.all_actions = np.array(all_actions)
+                all_act = self._to_matrix(all_actions)
             else:
                 try:
-                    self.all_actions = np.array([self.__call__() for _ in all_actions])
-                    for i, el in enumerate(all_actions):
-                        self.all_actions[i].from_vect(el)
+                    all_act = np.array(all_actions, dtype=dt_float)
+                    self._check_all_actions_vect(all_act)
                 except Exception as e:
                     raise RuntimeError("Impossible to convert the data provided in \"all_actions\" into valid "
                                        "grid2op action. The error was:\n{}".format(e))
+            self._set_all_actions_vect(all_act)
         else:
             raise RuntimeError("Impossible to load the action provided.")
-        self.n = len(self.all_actions)
 
     def filter_action(self, filtering_fun):
         """
@@ -207,8 +279,13 @@ class IdToAct(Converter):
             ``False`` meaning "this action will be dropped.
 
         """
-        self.all_actions = np.array([el for el in self.all_actions if filtering_fun(el)])
-        self.n = len(self.all_actions)
+        if self._all_actions is not None:
+            self._all_actions = np.array([el for el in self._all_actions if filtering_fun(el)])
+            self.n = len(self._all_actions)
+        else:
+            to_keep = np.array([filtering_fun(self._build_action(el)) for el in self._all_actions_vect],
+                               dtype=dt_bool)
+            self._set_all_actions_vect(self._all_actions_vect[to_keep])
 
     def save(self, path, name="action_space_vect.npy"):
         """
@@ -216,7 +293,7 @@ class IdToAct(Converter):
         function by setting argument `all_actions` to `os.path.join(path, name)`
 
         The resulting object will be a numpy array of float. Each row of this array will be an action of the
-        action space.
+        action space. When reloaded, this array is memory mapped, so that multiple processes can share it.
 
         Parameters
         ----------
@@ -236,7 +313,7 @@ class IdToAct(Converter):
         if not os.path.isdir(path):
             raise NotADirectoryError("The path to save the action space provided \"{}\" is not a directory."
                                      "".format(path))
-        saved_npy = np.array([el.to_vect() for el in self.all_actions]).astype(dtype=dt_float).reshape(self.n, -1)
+        saved_npy = self._get_all_actions_vect()
         np.save(file=os.path.join(path, name), arr=saved_npy)
 
     def sample(self):
@@ -260,7 +337,8 @@ class IdToAct(Converter):
         :attr:`IdToAct.all_actions` list.
 
         Converting an id of an action (here called "act") into a valid action is then easy: we just need to take the
-        "act"-th element of :attr:`IdToAct.all_actions`.
+        action built from the "act"-th row of the matrix of all the actions (it is built the first time it is
+        required), or the "act"-th element of :attr:`IdToAct.all_actions` if this list has been built.
 
         Parameters
         ----------
@@ -272,5 +350,10 @@ class IdToAct(Converter):
         action: :class:`grid2op.Action.Action`
             The action corresponding to id "act"
         """
-
-        return self.all_actions[encoded_act]
+        if self._all_actions is not None:
+            return self._all_actions[encoded_act]
+        if encoded_act < 0:
+            encoded_act += self.n
+        if encoded_act not in self._built_actions:
+            self._built_actions[encoded_act] = self._build_action(self._all_actions_vect[encoded_act])
+        return self._built_actions[encoded_act]
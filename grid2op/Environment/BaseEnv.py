@@ -7,6 +7,7 @@
 # This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
 
 import time
+import warnings
 import numpy as np
 from scipy.optimize import minimize
 from scipy.optimize import LinearConstraint
@@ -56,6 +57,20 @@ class BaseEnv(GridObjects, RandomObject, ABC):
         Whether the environment computes the powerflow using the DC approximation or not. It is usually read from
         :attr:`grid2op.Parameters.Parameters.ENV_DC`.
 
+    fast_cascade: ``bool``
+        Whether the cascading failures are computed with the line outage distribution factors (see
+        :func:`grid2op.Backend.Backend.next_grid_state`). It is usually read from
+        :attr:`grid2op.Parameters.Parameters.FAST_CASCADE`, as well as :attr:`BaseEnv.fast_cascade_margin` and
+        :attr:`BaseEnv.fast_cascade_check` (from `FAST_CASCADE_MARGIN` and `FAST_CASCADE_CHECK`).
+
+    kirchhoff_monitor: ``bool``
+        Whether the environment checks that the powergrid respects Kirchhoff's law at each step. It is usually read
+        from :attr:`grid2op.Parameters.Parameters.KIRCHHOFF_MONITOR`.
+
+    max_kirchhoff_imbalance: ``float``
+        Maximum imbalance at any bus (in MW or MVAr) since the beginning of the episode, updated at each step when
+        :attr:`BaseEnv.kirchhoff_monitor` is ``True``.
+
 
     TODO update with maintenance, hazards etc. see below
     # store actions "cooldown"
@@ -147,6 +162,11 @@ class BaseEnv(GridObjects, RandomObject, ABC):
         # hard overflow part
         self.hard_overflow_threshold = self.parameters.HARD_OVERFLOW_THRESHOLD
         self.env_dc = self.parameters.ENV_DC
+        self.fast_cascade = self.parameters.FAST_CASCADE
+        self.fast_cascade_margin = self.parameters.FAST_CASCADE_MARGIN
+        self.fast_cascade_check = self.parameters.FAST_CASCADE_CHECK
+        self.kirchhoff_monitor = self.parameters.KIRCHHOFF_MONITOR
+        self.max_kirchhoff_imbalance = dt_float(0.)
 
         # Remember last line buses
         self.last_bus_line_or = None
@@ -283,6 +303,10 @@ class BaseEnv(GridObjects, RandomObject, ABC):
         # hard overflow part
         self.hard_overflow_threshold = self.parameters.HARD_OVERFLOW_THRESHOLD
         self.env_dc = self.parameters.ENV_DC
+        self.fast_cascade = self.parameters.FAST_CASCADE
+        self.fast_cascade_margin = self.parameters.FAST_CASCADE_MARGIN
+        self.fast_cascade_check = self.parameters.FAST_CASCADE_CHECK
+        self.kirchhoff_monitor = self.parameters.KIRCHHOFF_MONITOR
 
         # Remember lines last bus
         self.last_bus_line_or = np.full(shape=self.n_line, fill_value=1, dtype=dt_int)
@@ -811,6 +835,8 @@ class BaseEnv(GridObjects, RandomObject, ABC):
                     - "is_illegal_reco" (``bool``) was the action illegal due to a powerline reconnection
                     - "exception" (``list`` of :class:`Exceptions.Exceptions.Grid2OpException` if an exception was raised
                        or ``[]`` if everything was fine.)
+                    - "kirchhoff_imbalance" (``float`` or ``None``) the maximum imbalance at any bus of the powergrid
+                      if :attr:`BaseEnv.kirchhoff_monitor` is ``True`` (see :func:`BaseEnv._get_kirchhoff_imbalance`)
 
         """
         # TODO update the documentation
@@ -822,6 +848,7 @@ class BaseEnv(GridObjects, RandomObject, ABC):
         has_error = True
         is_done = False
         disc_lines = None
+        kirchhoff_imbalance = None
         is_illegal = False
         is_ambiguous = False
         is_illegal_redisp = False
@@ -913,6 +940,10 @@ class BaseEnv(GridObjects, RandomObject, ABC):
                 disc_lines, infos = self.backend.next_grid_state(env=self, is_dc=self.env_dc)
                 self._time_powerflow += time.time() - beg_
 
+                if self.kirchhoff_monitor:
+                    kirchhoff_imbalance = self._get_kirchhoff_imbalance()
+                    self.max_kirchhoff_imbalance = max(self.max_kirchhoff_imbalance, kirchhoff_imbalance)
+
                 beg_ = time.time()
                 self.backend.update_thermal_limit(self)  # update the thermal limit, for DLR for example
                 overflow_lines = self.backend.get_line_overflow()
@@ -970,7 +1001,8 @@ class BaseEnv(GridObjects, RandomObject, ABC):
                  "is_ambiguous": is_ambiguous,
                  "is_dispatching_illegal": is_illegal_redisp,
                  "is_illegal_reco": is_illegal_reco,
-                 "exception": except_}
+                 "exception": except_,
+                 "kirchhoff_imbalance": kirchhoff_imbalance}
         self.done = self._is_done(has_error, is_done)
         self.current_reward, other_reward = self._get_reward(action,
                                                              has_error,
@@ -983,6 +1015,28 @@ class BaseEnv(GridObjects, RandomObject, ABC):
             self.__is_init = False
         return self.current_obs, self.current_reward, self.done, infos
 
+    def _get_kirchhoff_imbalance(self):
+        """
+        Compute the maximum imbalance, at any bus, of the powergrid (see :func:`grid2op.Backend.Backend.check_kirchoff`)
+        used when :attr:`BaseEnv.kirchhoff_monitor` is ``True``.
+
+        If the backend does not give information about the shunts, only the active power is checked.
+
+        Returns
+        -------
+        res: ``float``
+            The maximum absolute value of the active (in MW) and reactive (in MVAr) power injected at any bus.
+
+        """
+        with warnings.catch_warnings():
+            # the reactive values are not used if the shunts are not available
+            warnings.filterwarnings("ignore", message="Backend.check_kirchoff Impossible to get shunt information")
+            p_subs, q_subs, p_bus, q_bus = self.backend.check_kirchoff()
+        res = np.max(np.abs(p_bus))
+        if self.backend.shunts_data_available:
+            res = max(res, np.max(np.abs(q_bus)))
+        return dt_float(res)
+
     def _get_reward(self, action, has_error, is_done, is_illegal, is_ambiguous):
         res = self.reward_helper(action, self, has_error, is_done, is_illegal, is_ambiguous)
         other_rewards = {k: v(action, self, has_error, is_done, is_illegal, is_ambiguous)
@@ -1009,6 +1063,10 @@ class BaseEnv(GridObjects, RandomObject, ABC):
         self.nb_time_step = 0
         self.hard_overflow_threshold = self.parameters.HARD_OVERFLOW_THRESHOLD
         self.env_dc = self.parameters.ENV_DC
+        self.fast_cascade = self.parameters.FAST_CASCADE
+        self.fast_cascade_margin = self.parameters.FAST_CASCADE_MARGIN
+        self.fast_cascade_check = self.parameters.FAST_CASCADE_CHECK
+        self.kirchhoff_monitor = self.parameters.KIRCHHOFF_MONITOR
 
         self.times_before_line_status_actionable[:] = 0
         self.max_timestep_line_status_deactivated = self.parameters.NB_TIMESTEP_COOLDOWN_LINE
@@ -1021,6 +1079,7 @@ class BaseEnv(GridObjects, RandomObject, ABC):
         self._time_powerflow = 0
         self._time_extract_obs = 0
         self._time_opponent = 0
+        self.max_kirchhoff_imbalance = dt_float(0.)
 
         # reward and others
         self.current_reward = self.reward_range[0]
@@ -1064,6 +1123,8 @@ class BaseEnv(GridObjects, RandomObject, ABC):
         if self.viewer is not None:
             self.viewer = None
             self.viewer_fig = None
+        if self.chronics_handler is not None:
+            self.chronics_handler.close()
         self.backend.close()
 
     def attach_layout(self, grid_layout):
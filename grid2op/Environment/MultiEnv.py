@@ -5,10 +5,12 @@
 # you can obtain one at http://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 # This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
-from multiprocessing import Process, Pipe
+import time
+from multiprocessing import Process, Pipe, RawArray
+from multiprocessing.connection import wait
 import numpy as np
 
-from grid2op.dtypes import dt_int
+from grid2op.dtypes import dt_int, dt_float, dt_bool
 from grid2op.Exceptions import Grid2OpException, MultiEnvException
 from grid2op.Space import GridObjects
 from grid2op.Environment import Environment
@@ -16,6 +18,24 @@ from grid2op.Action import BaseAction
 # TODO test this class.
 
 
+def _create_shared_array(shape, dtype):
+    """
+    Allocate a buffer of shared memory (that can be accessed by the main process and all the sub processes) big
+    enough to store an array of shape `shape` and type `dtype`.
+
+    Returns the description of this array, that can be used by :func:`_get_shared_array` in any process.
+    """
+    dtype = np.dtype(dtype)
+    raw = RawArray("b", int(np.prod(shape)) * dtype.itemsize)
+    return raw, shape, dtype
+
+
+def _get_shared_array(shared_array):
+    """numpy view on the shared memory described by `shared_array` (see :func:`_create_shared_array`)"""
+    raw, shape, dtype = shared_array
+    return np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+
 class RemoteEnv(Process):
     """
     This class represent the environment that is executed on a remote process.
@@ -24,8 +44,13 @@ class RemoteEnv(Process):
     it is not possible to access anything directly from it in the main process, where the BaseAgent lives. Only the
     :class:`grid2op.Observation.BaseObservation` are forwarded to the agent.
 
+    If `shared_memory` is not ``None``, the actions are read from, and the observations, rewards and "done" flags are
+    written to, the row `env_id` of arrays in shared memory (see :class:`MultiEnvironment`). Only the commands (and
+    the "info" if `return_info` is ``True``) are sent through the pipe.
+
     """
-    def __init__(self, env_params, remote, parent_remote, seed, name=None):
+    def __init__(self, env_params, remote, parent_remote, seed, name=None,
+                 shared_memory=None, env_id=0, return_info=True):
         Process.__init__(self, group=None, target=None, name=name)
         self.backend = None
         self.env = None
@@ -36,6 +61,22 @@ class RemoteEnv(Process):
         self.space_prng = None
         self.fast_forward = 0
         self.all_seeds = []
+        self.shared_memory = shared_memory
+        self.env_id = env_id
+        self.return_info = return_info
+        self._act_shm = None
+        self._obs_shm = None
+        self._rew_shm = None
+        self._done_shm = None
+
+    def _init_shared_memory(self):
+        """get the views on the rows of the shared arrays used by this environment"""
+        if self.shared_memory is None:
+            return
+        self._act_shm = _get_shared_array(self.shared_memory["actions"])[self.env_id]
+        self._obs_shm = _get_shared_array(self.shared_memory["observations"])[self.env_id]
+        self._rew_shm = _get_shared_array(self.shared_memory["rewards"])[self.env_id:(self.env_id + 1)]
+        self._done_shm = _get_shared_array(self.shared_memory["dones"])[self.env_id:(self.env_id + 1)]
 
     def init_env(self):
         """
@@ -92,6 +133,7 @@ class RemoteEnv(Process):
     def run(self):
         if self.env is None:
             self.init_env()
+        self._init_shared_memory()
 
         while True:
             cmd, data = self.remote.recv()
@@ -99,18 +141,34 @@ class RemoteEnv(Process):
                 self.remote.send((self.env.observation_space, self.env.action_space))
             elif cmd == 's':
                 # perform a step
+                if self.shared_memory is not None:
+                    # the action has been written in shared memory by the main process
+                    data = self._act_shm.copy()
                 data = self.env.action_space.from_vect(data)
                 obs, reward, done, info = self.env.step(data)
                 obs_v = obs.to_vect()
                 if done or np.any(~np.isfinite(obs_v)):
                     # if done do a reset
                     obs_v = self.get_obs_ifnotconv()
-                self.remote.send((obs_v, reward, done, info))
+                if not self.return_info:
+                    info = None
+                if self.shared_memory is not None:
+                    self._obs_shm[:] = obs_v
+                    self._rew_shm[0] = reward
+                    self._done_shm[0] = done
+                    # only the info are sent, it also tells the main process the step is over
+                    self.remote.send(info)
+                else:
+                    self.remote.send((obs_v, reward, done, info))
             elif cmd == 'r':
                 # perfom a reset
                 obs_v = self.get_obs_ifnotconv()
                 # self._clean_observation(obs)
-                self.remote.send(obs_v)
+                if self.shared_memory is not None:
+                    self._obs_shm[:] = obs_v
+                    self.remote.send(None)
+                else:
+                    self.remote.send(obs_v)
             elif cmd == 'c':
                 # close everything
                 self.env.close()
@@ -163,6 +221,15 @@ class MultiEnvironment(GridObjects):
     on the latest macos release at time of writing) and windows 10 (latest update at time of
     writing).
 
+    By default, the actions, observations, rewards and "info" are pickled and sent through a ``Pipe`` at each step.
+    When the environments are small, this communication can take most of the time of a step. If
+    `use_shared_memory` is ``True``, they are instead read and written directly in arrays of shape `(nb_env, size)`
+    allocated once in shared memory, and only small "commands" are sent through the pipes. In this case, the
+    observations are returned by :func:`MultiEnvironment.step` and :func:`MultiEnvironment.reset` as a numpy array
+    with one row per environment (the representation of the observation as a vector, that can be converted back
+    with `observation_space.from_vect`). Set `return_info` to ``False`` to avoid sending the "info" dictionary
+    returned by each step.
+
     Examples
     --------
     An example on how you can best leverage this class is given in the getting_started notebooks. Another simple example is:
@@ -213,14 +280,37 @@ class MultiEnvironment(GridObjects):
         that need to be provided in :func:`MultiEnvironment.step` and the return sizes of the list of this
         same function.
 
+    use_shared_memory: ``bool``
+        Whether the actions, observations, rewards and "done" flags are exchanged through shared memory (``True``)
+        or pickled and sent through pipes (``False``, default).
+
+    return_info: ``bool``
+        Whether the "info" returned by each underlying environment are sent back to the main process (``True``,
+        default). If ``False``, :func:`MultiEnvironment.step` returns ``None`` instead of the "info".
+
     """
-    def __init__(self, nb_env, env):
+    def __init__(self, nb_env, env, use_shared_memory=False, return_info=True):
         GridObjects.__init__(self)
         self.imported_env = env
         self.nb_env = nb_env
+        self.use_shared_memory = use_shared_memory
+        self.return_info = return_info
         max_int = np.iinfo(dt_int).max
         self._remotes, self._work_remotes = zip(*[Pipe() for _ in range(self.nb_env)])
 
+        self._shared_memory = None
+        if self.use_shared_memory:
+            self._shared_memory = {
+                "actions": _create_shared_array((self.nb_env, env.action_space.size()), dt_float),
+                "observations": _create_shared_array((self.nb_env, env.observation_space.size()), dt_float),
+                "rewards": _create_shared_array((self.nb_env,), dt_float),
+                "dones": _create_shared_array((self.nb_env,), dt_bool),
+            }
+            self._act_shm = _get_shared_array(self._shared_memory["actions"])
+            self._obs_shm = _get_shared_array(self._shared_memory["observations"])
+            self._rew_shm = _get_shared_array(self._shared_memory["rewards"])
+            self._done_shm = _get_shared_array(self._shared_memory["dones"])
+
         env_params = [env.get_kwargs() for _ in range(self.nb_env)]
         for el in env_params:
             el["backendClass"] = env._raw_backend_class
@@ -228,7 +318,10 @@ class MultiEnvironment(GridObjects):
                               remote=work_remote,
                               parent_remote=remote,
                               name="{}_subprocess_{}".format(env.name, i),
-                              seed=env.space_prng.randint(max_int))
+                              seed=env.space_prng.randint(max_int),
+                              shared_memory=self._shared_memory,
+                              env_id=i,
+                              return_info=self.return_info)
                     for i, (work_remote, remote, env_) in enumerate(zip(self._work_remotes, self._remotes, env_params))]
 
         for p in self._ps:
@@ -237,19 +330,55 @@ class MultiEnvironment(GridObjects):
         for remote in self._work_remotes:
             remote.close()
 
-        self._waiting = True
+        # environments currently performing a step, and results of the steps not retrieved yet (by env id)
+        self._waiting = np.zeros(self.nb_env, dtype=dt_bool)
+        self._results = {}
 
-    def _send_act(self, actions):
-        for remote, action in zip(self._remotes, actions):
-            remote.send(('s', action.to_vect()))
-        self._waiting = True
-
-    def _wait_for_obs(self):
-        results = [remote.recv() for remote in self._remotes]
-        self._waiting = False
-        obs, rews, dones, infos = zip(*results)
-        obs = [self.imported_env.observation_space.from_vect(ob) for ob in obs]
-        return np.stack(obs), np.stack(rews), np.stack(dones), infos
+    def _send_act(self, actions, env_ids):
+        for env_id, action in zip(env_ids, actions):
+            if self.use_shared_memory:
+                self._act_shm[env_id, :] = action.to_vect()
+                self._remotes[env_id].send(('s', None))
+            else:
+                self._remotes[env_id].send(('s', action.to_vect()))
+            self._waiting[env_id] = True
+
+    def _receive(self, env_id):
+        """receive the result of the step performed by the environment `env_id` and store it"""
+        res = self._remotes[env_id].recv()
+        self._waiting[env_id] = False
+        if self.use_shared_memory:
+            # the results have been written in shared memory, the pipes only send the info
+            obs = self._obs_shm[env_id].copy()
+            rew = self._rew_shm[env_id]
+            done = self._done_shm[env_id]
+            info = res
+        else:
+            obs, rew, done, info = res
+            obs = self.imported_env.observation_space.from_vect(obs)
+        if not self.return_info:
+            info = None
+        self._results[env_id] = (obs, rew, done, info)
+
+    def _wait_pending(self):
+        """receive the results of all the steps still running"""
+        for env_id in np.where(self._waiting)[0]:
+            self._receive(env_id)
+
+    def _get_results(self):
+        """return (and forget) all the results received, sorted by environment id"""
+        env_ids = sorted(self._results.keys())
+        if not env_ids:
+            if self.use_shared_memory:
+                obs = np.zeros((0, self._obs_shm.shape[1]), dtype=dt_float)
+            else:
+                obs = np.array([], dtype=object)
+            infos = tuple() if self.return_info else None
+            return np.array([], dtype=dt_int), obs, np.array([], dtype=dt_float), np.array([], dtype=dt_bool), infos
+        obs, rews, dones, infos = zip(*[self._results.pop(env_id) for env_id in env_ids])
+        if not self.return_info:
+            infos = None
+        return np.array(env_ids, dtype=dt_int), np.stack(obs), np.stack(rews), np.stack(dones), infos
 
     def step(self, actions):
         """
@@ -261,6 +390,9 @@ class MultiEnvironment(GridObjects):
 
         It has no impact on the other underlying environments.
 
+        This is equivalent to calling :func:`MultiEnvironment.step_async` and then
+        :func:`MultiEnvironment.step_wait`.
+
         Parameters
         ----------
         actions: ``list``
@@ -270,7 +402,9 @@ class MultiEnvironment(GridObjects):
         Returns
         -------
         obs: ``list``
-            List all the observations returned by each underlying environment.
+            List all the observations returned by each underlying environment. If
+            :attr:`MultiEnvironment.use_shared_memory` is ``True``, this is a numpy array with the vector
+            representation of each observation on each row.
 
         rews: ``list``
             List all the rewards returned by each underlying environment.
@@ -280,20 +414,118 @@ class MultiEnvironment(GridObjects):
             the environment encounter a game over.
 
         infos
+            The "info" returned by each underlying environment (``None`` if :attr:`MultiEnvironment.return_info` is
+            ``False``)
         """
         if len(actions) != self.nb_env:
             raise MultiEnvException("Incorrect number of actions provided. You provided {} actions, but the "
                                     "MultiEnvironment counts {} different environment."
                                     "".format(len(actions), self.nb_env))
+        self.step_async(actions)
+        return self.step_wait()
+
+    def step_async(self, actions, env_ids=None):
+        """
+        Send the actions to the underlying environments, without waiting for the steps to be performed. The results
+        are retrieved with :func:`MultiEnvironment.step_wait` or :func:`MultiEnvironment.poll`.
+
+        Parameters
+        ----------
+        actions: ``list``
+            List of :class:`grid2op.Action.BaseAction`, one for each environment in `env_ids`.
+
+        env_ids: ``list``
+            Ids of the environments that will perform a step (by default all of them). None of them should be
+            performing a step, or have results not retrieved yet.
+
+        Examples
+        --------
+        The steps of the environments that are slower (for example because they need to be reset) do not block the
+        other ones:
+
+        .. code-block:: python
+
+            multi_envs.step_async([agent.act(ob, None, None) for ob in multi_envs.reset()])
+            for i in range(NB_STEP):
+                env_ids, obs, rews, dones, infos = multi_envs.poll()
+                if len(env_ids):
+                    multi_envs.step_async([agent.act(ob, rew, done) for ob, rew, done in zip(obs, rews, dones)],
+                                          env_ids=env_ids)
+
+        """
+        if env_ids is None:
+            env_ids = np.arange(self.nb_env)
+        env_ids = np.array(env_ids, dtype=dt_int).reshape(-1)
+        if len(actions) != env_ids.shape[0]:
+            raise MultiEnvException("Incorrect number of actions provided. You provided {} actions for {} different "
+                                    "environments.".format(len(actions), env_ids.shape[0]))
+        if np.any(env_ids < 0) or np.any(env_ids >= self.nb_env):
+            raise MultiEnvException("Environment ids should be between 0 and {}.".format(self.nb_env - 1))
+        if np.unique(env_ids).shape[0] != env_ids.shape[0]:
+            raise MultiEnvException("The same environment cannot perform two steps at the same time.")
         for act in actions:
             if not isinstance(act, BaseAction):
                 raise MultiEnvException("All actions send to MultiEnvironment.step should be of type \"grid2op.BaseAction\""
                                         "and not {}".format(type(act)))
+        for env_id in env_ids:
+            if self._waiting[env_id] or env_id in self._results:
+                raise MultiEnvException("Environment {} is still performing a step, or the result of its last step "
+                                        "has not been retrieved.".format(env_id))
+        self._send_act(actions, env_ids)
+
+    def step_wait(self, timeout=None):
+        """
+        Wait for all the steps sent with :func:`MultiEnvironment.step_async` to be over and return their results
+        (the results already retrieved with :func:`MultiEnvironment.poll` are not returned again).
+
+        Parameters
+        ----------
+        timeout: ``float``
+            Maximum time to wait (in seconds). If the steps are not over after this time, a
+            :class:`grid2op.Exceptions.MultiEnvException` is raised, and the results of the steps are kept until
+            the next call to :func:`MultiEnvironment.step_wait` or :func:`MultiEnvironment.poll`. By default
+            (``None``) wait as long as needed.
+
+        Returns
+        -------
+        obs, rews, dones, infos:
+            Same as :func:`MultiEnvironment.step`, for the environments that performed a step, sorted by
+            environment id.
 
-        self._send_act(actions)
-        obs, rews, dones, infos = self._wait_for_obs()
+        """
+        beg_ = time.time()
+        while np.any(self._waiting):
+            waiting = np.where(self._waiting)[0]
+            remaining = None
+            if timeout is not None:
+                remaining = max(timeout - (time.time() - beg_), 0.)
+            ready = wait([self._remotes[env_id] for env_id in waiting], timeout=remaining)
+            if not ready:
+                raise MultiEnvException("Timeout: the environments {} have not finished their steps after {}s."
+                                        "".format(waiting.tolist(), timeout))
+            for remote in ready:
+                self._receive(self._remotes.index(remote))
+        _, obs, rews, dones, infos = self._get_results()
         return obs, rews, dones, infos
 
+    def poll(self):
+        """
+        Retrieve the results of the steps that are over, without waiting for the other ones.
+
+        Returns
+        -------
+        env_ids: ``numpy.ndarray``, dtype:int
+            The ids of the environments that finished their steps (possibly empty)
+
+        obs, rews, dones, infos:
+            Same as :func:`MultiEnvironment.step`, for the environments `env_ids`.
+
+        """
+        for env_id in np.where(self._waiting)[0]:
+            if self._remotes[env_id].poll():
+                self._receive(env_id)
+        return self._get_results()
+
     def reset(self):
         """
         Reset all the environments, and return all the associated observation.
@@ -302,11 +534,19 @@ class MultiEnvironment(GridObjects):
         -------
         res: ``list``
             The list of all observations. This list counts :attr:`MultiEnvironment.nb_env` elements, each one being
-            an :class:`grid2op.Observation.BaseObservation`.
+            an :class:`grid2op.Observation.BaseObservation` (or the numpy array of the vector representation of the
+            observations if :attr:`MultiEnvironment.use_shared_memory` is ``True``).
 
         """
+        # the results of the steps still running are discarded
+        self._wait_pending()
+        self._results = {}
         for remote in self._remotes:
             remote.send(('r', None))
+        if self.use_shared_memory:
+            for remote in self._remotes:
+                remote.recv()
+            return self._obs_shm.copy()
         res = [self.imported_env.observation_space.from_vect(remote.recv()) for remote in self._remotes]
         return np.stack(res)
 
@@ -362,6 +602,7 @@ class MultiEnvironment(GridObjects):
         """
         Get the seeds used to initialize each sub environments.
         """
+        self._wait_pending()
         for remote in self._remotes:
             remote.send(('seed', None))
         res = [remote.recv() for remote in self._remotes]
@@ -371,6 +612,7 @@ class MultiEnvironment(GridObjects):
         """
         Get the parameters of each sub environments
         """
+        self._wait_pending()
         for remote in self._remotes:
             remote.send(('params', None))
         res = [remote.recv() for remote in self._remotes]
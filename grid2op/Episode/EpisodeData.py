@@ -48,10 +48,22 @@ will save the information in a structured way. For each episode there will be a
 
 All of the above should allow to read back, and better understand the behaviour of some
 :class:`grid2op.Agent.BaseAgent`, even though such utility functions have not been coded yet.
+
+By default, all the data of an episode are kept in memory and written at the end of the episode, in compressed
+".npz" files. If a `chunk_size` is given (see the `episode_chunk_size` argument of :class:`grid2op.Runner.Runner`),
+they are instead written in ".npy" files (*eg* "actions.npy" instead of "actions.npz") every `chunk_size` steps, as
+well as the "episode_meta.json" and "other_rewards.json" files. The memory used does not depend on the length of the
+episode, and the beginning of an episode is kept on the hard drive even if it is not over (for example if the process
+crashed). :func:`EpisodeData.from_disk` reads both formats, and the episodes that are not over.
+
+Episodes written by chunk can also be loaded "lazily" with `EpisodeData.from_disk(..., lazy=True)`: the ".npy" files
+are memory mapped (and read from the hard drive only when they are accessed) and the actions and observations are
+built only when they are accessed (see :class:`CollectionWrapper`).
 """
 
 import json
 import os
+import struct
 
 import numpy as np
 
@@ -81,17 +93,21 @@ class EpisodeData:
                  params=None, meta=None, episode_times=None,
                  observation_space=None, action_space=None,
                  helper_action_env=None, path_save=None, disc_lines_templ=None,
-                 logger=None, name=str(1), get_dataframes=None, other_rewards=[]):
+                 logger=None, name=str(1), get_dataframes=None, other_rewards=[], chunk_size=None,
+                 lazy=False):
 
         self.actions = CollectionWrapper(actions,
                                          action_space,
-                                         "actions")
+                                         "actions",
+                                         lazy=lazy)
         self.observations = CollectionWrapper(observations,
                                               observation_space,
-                                              "observations")
+                                              "observations",
+                                              lazy=lazy)
         self.env_actions = CollectionWrapper(env_actions,
                                              helper_action_env,
-                                             "env_actions")
+                                             "env_actions",
+                                             lazy=lazy)
         self.other_rewards = other_rewards
         self.observation_space = observation_space
         self.rewards = rewards
@@ -111,6 +127,14 @@ class EpisodeData:
         self.line_names = action_space.name_line
         self.n_lines = len(self.line_names)
         self.name_sub = action_space.name_sub
+        # to write the episode by chunk (see _init_writers)
+        self.chunk_size = chunk_size
+        self._writers = None
+        self._nb_timestep_saved = 0
+        self._nb_timestep_stored = 0
+        self._cum_reward_saved = 0.
+        self._writers_closed = False
+        self._params_saved = False
 
         if path_save is not None:
             self.agent_path = os.path.abspath(path_save)
@@ -152,6 +176,28 @@ class EpisodeData:
                 logger.info(
                     "Creating path \"{}\" to save the episode {}".format(self.episode_path, self.name))
 
+            if self.chunk_size is not None:
+                self._init_writers()
+
+    def _init_writers(self):
+        """
+        Open the ".npy" files in which the data are written every :attr:`EpisodeData.chunk_size` steps. The data
+        already stored (*eg* the first observation) are written at the first flush.
+        """
+        self._writers = {
+            "times": (EpisodeData.AG_EXEC_TIMES, self.times),
+            "actions": (EpisodeData.ACTIONS, self.actions.collection),
+            "env_actions": (EpisodeData.ENV_ACTIONS, self.env_actions.collection),
+            "observations": (EpisodeData.OBSERVATIONS, self.observations.collection),
+            "disc_lines": (EpisodeData.LINES_FAILURES, self.disc_lines),
+            "rewards": (EpisodeData.REWARDS, self.rewards),
+        }
+        for key, (file_name, init_array) in self._writers.items():
+            # data of a previous episode with the same name would be read instead of these ones
+            _remove_if_exists(os.path.join(self.episode_path, file_name))
+            self._writers[key] = _NpyStreamWriter(os.path.join(self.episode_path, _get_npy_name(file_name)),
+                                                  init_array)
+
     def get_actions(self):
         return self.actions.collection
 
@@ -162,7 +208,29 @@ class EpisodeData:
         return int(self.meta["chronics_max_timestep"])
 
     @classmethod
-    def from_disk(cls, agent_path, name=str(1)):
+    def from_disk(cls, agent_path, name=str(1), lazy=False):
+        """
+        Load an episode saved on the hard drive.
+
+        Parameters
+        ----------
+        agent_path: ``str``
+            The path where the episodes of the agent are stored (`path_save` argument of :func:`grid2op.Runner.run`)
+
+        name: ``str``
+            The name of the episode
+
+        lazy: ``bool``
+            If ``True``, the arrays written by chunk (".npy" files) are memory mapped instead of being read, and the
+            actions and observations are built only when they are accessed (see :class:`CollectionWrapper`). The
+            compressed ".npz" files cannot be memory mapped, they are always read entirely. Default to ``False``.
+
+        Returns
+        -------
+        res: :class:`EpisodeData`
+            The episode loaded.
+        """
+        mmap_mode = "r" if lazy else None
 
         if agent_path is None:
             # TODO: proper exception
@@ -174,25 +242,37 @@ class EpisodeData:
                 _parameters = json.load(fp=f)
             with open(os.path.join(episode_path, EpisodeData.META)) as f:
                 episode_meta = json.load(fp=f)
-            with open(os.path.join(episode_path, EpisodeData.TIMES)) as f:
-                episode_times = json.load(fp=f)
+            episode_times = None
+            times_path = os.path.join(episode_path, EpisodeData.TIMES)
+            if os.path.exists(times_path):
+                # this file is written at the end of the episode only
+                with open(times_path) as f:
+                    episode_times = json.load(fp=f)
             with open(os.path.join(episode_path, EpisodeData.OTHER_REWARDS)) as f:
                 other_rewards = json.load(fp=f)
 
-            times = np.load(os.path.join(
-                episode_path, EpisodeData.AG_EXEC_TIMES))["data"]
-            actions = np.load(os.path.join(episode_path, EpisodeData.ACTIONS))["data"]
-            env_actions = np.load(os.path.join(
-                episode_path,EpisodeData.ENV_ACTIONS))["data"]
-            observations = np.load(os.path.join(
-                episode_path, EpisodeData.OBSERVATIONS))["data"]
-            disc_lines = np.load(os.path.join(
-                episode_path, EpisodeData.LINES_FAILURES))["data"]
-            rewards = np.load(os.path.join(episode_path, EpisodeData.REWARDS))["data"]
+            times = _load_array(episode_path, EpisodeData.AG_EXEC_TIMES, mmap_mode)
+            actions = _load_array(episode_path, EpisodeData.ACTIONS, mmap_mode)
+            env_actions = _load_array(episode_path, EpisodeData.ENV_ACTIONS, mmap_mode)
+            observations = _load_array(episode_path, EpisodeData.OBSERVATIONS, mmap_mode)
+            disc_lines = _load_array(episode_path, EpisodeData.LINES_FAILURES, mmap_mode)
+            rewards = _load_array(episode_path, EpisodeData.REWARDS, mmap_mode)
 
         except FileNotFoundError as ex:
             raise Grid2OpException(f"EpisodeData file not found \n {str(ex)}")
 
+        # if the episode is not over, the files might not have been written up to the same time step
+        nb_timestep = min(times.shape[0], actions.shape[0], env_actions.shape[0], observations.shape[0] - 1,
+                          disc_lines.shape[0], rewards.shape[0])
+        if nb_timestep < actions.shape[0] or nb_timestep < observations.shape[0] - 1:
+            times = times[:nb_timestep]
+            actions = actions[:nb_timestep]
+            env_actions = env_actions[:nb_timestep]
+            observations = observations[:(nb_timestep + 1)]
+            disc_lines = disc_lines[:nb_timestep]
+            rewards = rewards[:nb_timestep]
+            other_rewards = other_rewards[:nb_timestep]
+
         observation_space = ObservationSpace.from_dict(
             os.path.join(agent_path, EpisodeData.OBS_SPACE))
         action_space = ActionSpace.from_dict(
@@ -204,7 +284,7 @@ class EpisodeData:
                    times, _parameters, episode_meta, episode_times,
                    observation_space, action_space, helper_action_env,
                    agent_path, name=name, get_dataframes=True,
-                   other_rewards=other_rewards)
+                   other_rewards=other_rewards, lazy=lazy)
 
     def set_parameters(self, env):
         if self.serialize:
@@ -231,7 +311,24 @@ class EpisodeData:
     def incr_store(self, efficient_storing, time_step, time_step_duration,
                    reward, env_act, act, obs, info):
 
-        if self.serialize:
+        if self.serialize and self._writers is not None:
+            # the data are written by chunk on the hard drive
+            self._writers["actions"].append(act.to_vect())
+            self._writers["env_actions"].append(env_act.to_vect())
+            self._writers["observations"].append(obs.to_vect())
+            self._writers["times"].append(time_step_duration)
+            self._writers["rewards"].append(reward)
+            arr = info.get("disc_lines", None)
+            if arr is None:
+                arr = self.disc_lines_templ
+            self._writers["disc_lines"].append(np.reshape(arr, -1))
+            self._cum_reward_saved += reward
+            self._nb_timestep_stored = time_step
+            if "rewards" in info:
+                self.other_rewards.append({k: self._convert_to_float(v) for k, v in info["rewards"].items()})
+            if time_step % self.chunk_size == 0:
+                self._flush(time_step)
+        elif self.serialize:
             self.actions.update(time_step, act.to_vect(), efficient_storing)
             self.env_actions.update(
                 time_step, env_act.to_vect(), efficient_storing)
@@ -265,6 +362,41 @@ class EpisodeData:
             if "rewards" in info:
                 self.other_rewards.append({k: self._convert_to_float(v) for k, v in info["rewards"].items()})
 
+    def _flush(self, time_step):
+        """write the data stored in memory (and the meta data) on the hard drive"""
+        for writer in self._writers.values():
+            writer.flush()
+        self._nb_timestep_saved = time_step
+        if not self._params_saved and getattr(self, "parameters", None) is not None:
+            self._write_json(EpisodeData.PARAMS, self.parameters)
+            self._params_saved = True
+        if self.meta is not None:
+            meta = dict(self.meta)
+            meta["nb_timestep_played"] = self._nb_timestep_saved
+            meta["cumulative_reward"] = float(self._cum_reward_saved)
+            self._write_json(EpisodeData.META, meta)
+        self._write_json(EpisodeData.OTHER_REWARDS, self.other_rewards)
+
+    def close(self):
+        """
+        Write the steps stored since the last flush and close the ".npy" files, if the episode is written by chunk.
+
+        It is called by the :class:`grid2op.Runner.Runner` even if the episode raised an exception, so that the steps
+        already played are kept on the hard drive and no file is left open. Calling it more than once has no effect.
+        """
+        if self._writers is None or self._writers_closed:
+            return
+        try:
+            self._flush(self._nb_timestep_stored)
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers_closed = True
+
+    def _write_json(self, file_name, obj):
+        with open(os.path.join(self.episode_path, file_name), "w") as f:
+            json.dump(obj=obj, fp=f, indent=4, sort_keys=True)
+
     def _convert_to_float(self, el):
         try:
             res = float(el)
@@ -289,6 +421,9 @@ class EpisodeData:
 
     def to_disk(self):
         if self.serialize:
+            # write the last rows before the meta data
+            self.close()
+
             parameters_path = os.path.join(
                 self.episode_path, EpisodeData.PARAMS)
             with open(parameters_path, "w") as f:
@@ -310,6 +445,14 @@ class EpisodeData:
                 json.dump(obj=self.other_rewards, fp=f,
                           indent=4, sort_keys=True)
 
+            if self._writers is not None:
+                # the data have already been written by chunk
+                return
+
+            for file_name in [EpisodeData.AG_EXEC_TIMES, EpisodeData.ACTIONS, EpisodeData.ENV_ACTIONS,
+                              EpisodeData.OBSERVATIONS, EpisodeData.LINES_FAILURES, EpisodeData.REWARDS]:
+                # data of a previous episode with the same name, written by chunk
+                _remove_if_exists(os.path.join(self.episode_path, _get_npy_name(file_name)))
             np.savez_compressed(os.path.join(self.episode_path, EpisodeData.AG_EXEC_TIMES),
                     data=self.times)
             self.actions.save(
@@ -352,7 +495,13 @@ class CollectionWrapper:
         The time step at which the game_over occurs. None if there is no game_over
 
     objects:
-        The collection of objects built with the `from_vect` method
+        The collection of objects built with the `from_vect` method (``None`` if `lazy` is ``True``)
+
+    lazy: ``bool``
+        If ``True``, the objects are not built when the collection is wrapped, but only when they are accessed
+        with `collection_wrapper[i]` (or when iterating through the collection). In this case, slicing the
+        collection (*eg* `collection_wrapper[10:20]`) returns the rows of the wrapped collection (a view on the
+        vectors, and not the objects), which is more suited to vectorized analysis.
 
     Methods
     -------
@@ -370,7 +519,10 @@ class CollectionWrapper:
 
     """
 
-    def __init__(self, collection, helper, collection_name):
+    # number of rows read at once to look for the game over (when the collection is lazy)
+    CHUNK_SIZE_GAME_OVER = 1024
+
+    def __init__(self, collection, helper, collection_name, lazy=False):
         self.collection = collection
         if not hasattr(helper, "from_vect"):
             raise Grid2OpException(f"Object {helper} must implement a "
@@ -380,6 +532,11 @@ class CollectionWrapper:
         self.elem_name = self.collection_name[:-1]
         self.i = 0
         self._game_over = None
+        self.lazy = lazy
+        self._len = None
+        if self.lazy:
+            self.objects = None
+            return
         self.objects = []
         for i, elem in enumerate(self.collection):
             try:
@@ -389,19 +546,41 @@ class CollectionWrapper:
                 self._game_over = i
                 break
 
+    def _find_game_over(self):
+        """
+        Same as the loop in `__init__` without building the objects: rows with non finite numbers cannot be converted
+        to objects with `from_vect`, the collection stops at the first one.
+        """
+        nb_row = self.collection.shape[0]
+        for beg_ in range(0, nb_row, self.CHUNK_SIZE_GAME_OVER):
+            chunk = self.collection[beg_:(beg_ + self.CHUNK_SIZE_GAME_OVER)]
+            not_finite = np.where(~np.all(np.isfinite(chunk), axis=1))[0]
+            if not_finite.shape[0]:
+                self._game_over = beg_ + int(not_finite[0])
+                break
+
     def __len__(self):
+        if self.lazy and self._len is None:
+            self._find_game_over()
+            self._len = self.collection.shape[0] if self._game_over is None else self._game_over
         if self._game_over is None:
             return self.collection.shape[0]
         else:
             return self._game_over
 
     def __getitem__(self, i):
-        if isinstance(i, slice) or i < len(self):
+        if self.lazy:
+            if isinstance(i, slice):
+                return self.collection[:len(self)][i]
+            if i < 0:
+                i += len(self)
+            if 0 <= i < len(self):
+                return self.helper.from_vect(self.collection[i, :])
+        elif isinstance(i, slice) or i < len(self):
             return self.objects[i]
-        else:
-            raise Grid2OpException(
-                f"Trying to reach {self.elem_name} {i + 1} but "
-                f"there are only {len(self)} {self.collection_name}.")
+        raise Grid2OpException(
+            f"Trying to reach {self.elem_name} {i + 1} but "
+            f"there are only {len(self)} {self.collection_name}.")
 
     def __iter__(self):
         self.i = 0
@@ -410,7 +589,7 @@ class CollectionWrapper:
     def __next__(self):
         self.i = self.i + 1
         if self.i < len(self) + 1:
-            return self.objects[self.i - 1]
+            return self[self.i - 1]
         else:
             raise StopIteration
 
@@ -424,5 +603,74 @@ class CollectionWrapper:
         np.savez_compressed(path, data=self.collection)  # do not change keyword arguments
 
 
+def _get_npy_name(file_name):
+    """name of the ".npy" file used when the data are written by chunk, *eg* "actions.npy" for "actions.npz" """
+    return "{}.npy".format(os.path.splitext(file_name)[0])
+
+
+def _remove_if_exists(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _load_array(episode_path, file_name, mmap_mode=None):
+    """load the array stored in the ".npz" file `file_name`, or in its ".npy" counterpart if it does not exist"""
+    path_npz = os.path.join(episode_path, file_name)
+    if os.path.exists(path_npz):
+        return np.load(path_npz)["data"]
+    return np.load(os.path.join(episode_path, _get_npy_name(file_name)), mmap_mode=mmap_mode)
+
+
+class _NpyStreamWriter:
+    """
+    Write an array in a ".npy" file, row by row. The rows are kept in memory until :func:`_NpyStreamWriter.flush` is
+    called.
+
+    The data are appended at the end of the file before its header (which stores the number of rows) is updated, so
+    the file can be read with `numpy.load` at any time, and contains all the rows written by the last flush.
+    """
+    # size of the header of the file (including the "magic string"). It is fixed, so that it can be updated in place
+    HEADER_SIZE = 128
+
+    def __init__(self, path, init_array):
+        init_array = np.asarray(init_array)
+        self.path = path
+        self.dtype = init_array.dtype
+        self.row_shape = tuple(int(el) for el in init_array.shape[1:])
+        self.nb_row = 0
+        self._buffer = [np.array(row, dtype=self.dtype) for row in init_array]
+        self._file = open(self.path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        header = {"descr": np.lib.format.dtype_to_descr(self.dtype),
+                  "fortran_order": False,
+                  "shape": (self.nb_row,) + self.row_shape}
+        header_len = self.HEADER_SIZE - 10
+        header = "{}".format(header).ljust(header_len - 1) + "\n"
+        self._file.seek(0)
+        self._file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", header_len) + header.encode("latin1"))
+
+    def append(self, row):
+        self._buffer.append(np.array(row, dtype=self.dtype))
+
+    def flush(self):
+        if not self._buffer:
+            return
+        data = np.stack(self._buffer)
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(np.ascontiguousarray(data).tobytes())
+        self.nb_row += len(self._buffer)
+        self._buffer = []
+        self._write_header()
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
 if __name__ == "__main__":
     pass
\ No newline at end of file
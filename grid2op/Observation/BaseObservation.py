@@ -6,6 +6,8 @@
 # SPDX-License-Identifier: MPL-2.0
 # This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
 import copy
+import warnings
+import multiprocessing
 import numpy as np
 from abc import abstractmethod
 
@@ -23,6 +25,16 @@ from grid2op.Space import GridObjects
 
 # TODO fix "bug" when action not initalized, return nan in to_vect
 
+# observation and actions to simulate, shared with the (forked) worker processes used by "simulate_batch"
+_SIMULATE_BATCH_DATA = None
+
+
+def _aux_simulate_batch(act_id):
+    """simulate the action `act_id` in a worker process of :func:`BaseObservation.simulate_batch`"""
+    obs, actions = _SIMULATE_BATCH_DATA
+    return obs._simulate_one(actions[act_id])
+
+
 class BaseObservation(GridObjects):
     """
     Basic class representing an observation.
@@ -611,7 +623,25 @@ class BaseObservation(GridObjects):
         """
         pass
 
-    def connectivity_matrix(self):
+    def update_incremental(self, env, with_forecast=True):
+        """
+        Update this observation "in place", only refreshing the attributes that changed since the last call.
+
+        This is used by the :class:`grid2op.Observation.ObservationSpace` when its incremental update mode is activated
+        (see :func:`grid2op.Observation.ObservationSpace.activate_incremental_update`). By default it performs a
+        complete :func:`BaseObservation.update`.
+
+        Parameters
+        ----------
+        env: :class:`grid2op.Environment.Environment`
+            The environment from which to update this observation.
+
+        with_forecast: ``bool``
+            Whether to update the forecasts
+        """
+        self.update(env, with_forecast=with_forecast)
+
+    def connectivity_matrix(self, as_csr_matrix=False):
         """
         Computes and return the "connectivity matrix" `con_mat`.
         if "dim_topo = 2 * n_line + n_prod + n_conso"
@@ -628,6 +658,12 @@ class BaseObservation(GridObjects):
 
         By definition, the diagonal is made of 0.
 
+        Parameters
+        ----------
+        as_csr_matrix: ``bool``
+            Whether to return the matrix as a `scipy.sparse.csr_matrix` (``True``) or as a dense numpy array
+            (``False``, default)
+
         Returns
         -------
         res: ``numpy.ndarray``, shape:dim_topo,dim_topo, dtype:float
@@ -635,7 +671,7 @@ class BaseObservation(GridObjects):
         """
         raise NotImplementedError("This method is not implemented")
 
-    def bus_connectivity_matrix(self):
+    def bus_connectivity_matrix(self, as_csr_matrix=False):
         """
         If we denote by `nb_bus` the total number bus of the powergrid.
 
@@ -644,6 +680,12 @@ class BaseObservation(GridObjects):
         If `bus_connectivity_matrix[i,j] = 1` then at least a power line connects bus i and bus j.
         Otherwise, nothing connects it.
 
+        Parameters
+        ----------
+        as_csr_matrix: ``bool``
+            Whether to return the matrix as a `scipy.sparse.csr_matrix` (``True``) or as a dense numpy array
+            (``False``, default)
+
         Returns
         -------
         res: ``numpy.ndarray``, shape:nb_bus,nb_bus dtype:float
@@ -728,6 +770,14 @@ class BaseObservation(GridObjects):
             info: ``dict``
                 contains auxiliary diagnostic information (helpful for debugging, and sometimes learning)
 
+        """
+        self._init_simulate(time_step)
+        sim_obs = self._obs_env.simulate(action)
+        return sim_obs
+
+    def _init_simulate(self, time_step):
+        """
+        Initialize the forecasted powergrid state (at horizon `time_step`) on which the actions are simulated.
         """
         if self.action_helper is None or self._obs_env is None:
             raise NoForecastAvailable("No forecasts are available for this instance of BaseObservation (no action_space "
@@ -749,8 +799,194 @@ class BaseObservation(GridObjects):
                            timestep_overflow=self.timestep_overflow,
                            topo_vect=self.topo_vect)
 
-        sim_obs = self._obs_env.simulate(action)
-        return sim_obs
+    def _simulate_one(self, action):
+        """simulate one action (forecasted state must be initialized) and returns the reward, done and rho"""
+        sim_obs, sim_reward, sim_done, sim_info = self._obs_env.simulate(action)
+        rho = sim_obs.rho if sim_obs is not None else np.NaN
+        return sim_reward, sim_done, rho
+
+    def simulate_batch(self, actions, time_step=0, nb_process=1):
+        """
+        This method simulates the effect of multiple actions on the same forecasted powergrid state.
+
+        It is equivalent to calling :func:`BaseObservation.simulate` for each action, but the forecasted state
+        (injections, topology etc.) is set up only once and shared for all the actions. Only the reward, the "done"
+        flag and the relative flows (rho) of each simulation are returned.
+
+        Parameters
+        ----------
+        actions: ``list``
+            The list of the :class:`grid2op.Action.BaseAction` to simulate
+
+        time_step: ``int``
+            The time step of the forecasted grid to perform the actions on. If no forecast are available for this
+            time step, a :class:`grid2op.Exceptions.NoForecastAvailable` is thrown.
+
+        nb_process: ``int``
+            Number of processes used to simulate the actions. If ``1`` (default) everything is done in the current
+            process. Otherwise the simulations are dispatched on a pool of local processes (this requires the "fork"
+            start method of multiprocessing, if it is not available, everything is done in the current process).
+
+        Raises
+        ------
+        :class:`grid2op.Exceptions.NoForecastAvailable`
+            if no forecast are available for the time_step querried.
+
+        Returns
+        -------
+        rewards: ``numpy.ndarray``, dtype:float
+            For each action, the reward of the simulation
+
+        dones: ``numpy.ndarray``, dtype:bool
+            For each action, whether the simulation lead to a game over
+
+        rhos: ``numpy.ndarray``, dtype:float
+            For each action (rows), the relative flow on each powerline (columns), see :attr:`BaseObservation.rho`
+
+        Examples
+        --------
+        Find the action leading to the best reward among a list of candidates:
+
+        .. code-block:: python
+
+            import numpy as np
+            import grid2op
+            env = grid2op.make()
+            obs = env.reset()
+            actions = [env.action_space({}),
+                       env.action_space({"set_line_status": [(0, -1)]})]
+            rewards, dones, rhos = obs.simulate_batch(actions)
+            best_action = actions[int(np.argmax(rewards))]
+
+        """
+        global _SIMULATE_BATCH_DATA
+
+        self._init_simulate(time_step)
+        nb_act = len(actions)
+        rewards = np.full(nb_act, fill_value=np.NaN, dtype=dt_float)
+        dones = np.full(nb_act, fill_value=False, dtype=dt_bool)
+        rhos = np.full((nb_act, self.n_line), fill_value=np.NaN, dtype=dt_float)
+
+        if nb_process > 1 and nb_act > 1:
+            if "fork" in multiprocessing.get_all_start_methods():
+                _SIMULATE_BATCH_DATA = (self, actions)
+                try:
+                    with multiprocessing.get_context("fork").Pool(min(nb_process, nb_act)) as pool:
+                        res = pool.map(_aux_simulate_batch, range(nb_act))
+                finally:
+                    _SIMULATE_BATCH_DATA = None
+            else:
+                warnings.warn("The \"fork\" start method of multiprocessing is not available on your system. All "
+                              "simulations are performed in the current process.")
+                res = [self._simulate_one(act) for act in actions]
+        else:
+            res = [self._simulate_one(act) for act in actions]
+
+        for i, (reward, done, rho) in enumerate(res):
+            rewards[i] = reward
+            dones[i] = done
+            rhos[i, :] = rho
+        return rewards, dones, rhos
+
+    def contingency_analysis(self, lines=None, method="dc", time_step=0, screening_threshold=0.9, nb_process=1):
+        """
+        This method computes the relative flows (see :attr:`BaseObservation.rho`) on the forecasted powergrid state
+        after the disconnection of each of the given powerlines, one at a time (this is known as a "N-1" security
+        analysis).
+
+        The forecasted powergrid state is the one obtained by simulating the "do nothing" action (see
+        :func:`BaseObservation.simulate`). The disconnections of the powerlines are then studied directly on the
+        backend, without taking into account the protections (cascading failures) nor the rules of the game.
+
+        Two methods are available:
+
+          - "dc": the flows are estimated all at once from the Line Outage Distribution Factors of the grid (see
+            :func:`grid2op.Backend.Backend.contingency_analysis_dc`), this requires a backend that can compute them,
+            such as :class:`grid2op.Backend.PandaPowerBackend` or :class:`grid2op.Backend.SparseBackend`. If the
+            backend cannot compute them, the "ac" method is used instead (and a warning is issued).
+          - "ac": the flows are first estimated as in the "dc" method, and an AC powerflow is computed (see
+            :func:`grid2op.Backend.Backend.contingency_analysis_ac`) for the disconnections leading to a relative flow
+            above `screening_threshold` on at least one powerline, or splitting the grid. If the backend cannot
+            compute the Line Outage Distribution Factors, an AC powerflow is computed for all the disconnections.
+
+        Parameters
+        ----------
+        lines: ``numpy.ndarray``, dtype:int
+            The ids of the powerlines whose disconnection is studied. By default all the powerlines are studied.
+
+        method: ``str``
+            The method used, either "dc" (default) or "ac".
+
+        time_step: ``int``
+            The time step of the forecasted grid to perform the analysis on. If no forecast are available for this
+            time step, a :class:`grid2op.Exceptions.NoForecastAvailable` is thrown.
+
+        screening_threshold: ``float``
+            Only used with the "ac" method: the disconnections whose estimated relative flows are all below this
+            threshold are not computed with an AC powerflow (their estimated flows are returned). Set it to ``0.`` to
+            compute all of them with an AC powerflow.
+
+        nb_process: ``int``
+            Only used with the "ac" method: number of processes used to compute the AC powerflows (see
+            :func:`grid2op.Backend.Backend.contingency_analysis_ac`).
+
+        Raises
+        ------
+        :class:`grid2op.Exceptions.NoForecastAvailable`
+            if no forecast are available for the time_step querried.
+
+        Returns
+        -------
+        rhos: ``numpy.ndarray``, dtype:float
+            For each powerline disconnected (rows), the relative flow on each powerline (columns). A row is filled
+            with ``NaN`` if the disconnection splits the grid (or makes the AC powerflow diverge). All the rows are
+            filled with ``NaN`` if the "do nothing" action leads to a game over.
+
+        Examples
+        --------
+        Find the powerlines whose disconnection would lead to an overflow:
+
+        .. code-block:: python
+
+            import numpy as np
+            import grid2op
+            from grid2op.Backend import SparseBackend
+            env = grid2op.make(backend=SparseBackend())
+            obs = env.reset()
+            rhos = obs.contingency_analysis(method="ac")
+            dangerous_lines = np.where(~(np.max(rhos, axis=1) < 1.))[0]
+
+        """
+        if method not in ("dc", "ac"):
+            raise Grid2OpException("Unknown method \"{}\" for the contingency analysis, it should be \"dc\" or "
+                                   "\"ac\"".format(method))
+        if lines is None:
+            lines = np.arange(self.n_line, dtype=dt_int)
+        lines = np.array(lines, dtype=dt_int)
+        rhos = np.full((lines.shape[0], self.n_line), fill_value=np.NaN, dtype=dt_float)
+
+        self._init_simulate(time_step)
+        sim_obs, sim_reward, sim_done, sim_info = self._obs_env.simulate(self.action_helper({}))
+        if sim_done:
+            return rhos
+
+        backend = self._obs_env.backend
+        try:
+            rhos = backend.contingency_analysis_dc(lines)
+        except DivergingPowerFlow:
+            if method == "dc":
+                raise
+        except Grid2OpException:
+            if method == "dc":
+                warnings.warn("This backend cannot compute the line outage distribution factors, the contingency "
+                              "analysis is performed with AC powerflows.")
+        else:
+            if method == "dc":
+                return rhos
+        # the comparison is False for the rows filled with NaN
+        flagged = ~(np.max(rhos, axis=1) < screening_threshold)
+        rhos[flagged] = backend.contingency_analysis_ac(lines[flagged], nb_process=nb_process)
+        return rhos
 
     def copy(self):
         """
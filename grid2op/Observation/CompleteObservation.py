@@ -8,6 +8,7 @@
 
 import numpy as np
 import copy
+from scipy.sparse import csr_matrix
 
 from grid2op.dtypes import dt_int, dt_float
 from grid2op.Observation.BaseObservation import BaseObservation
@@ -88,6 +89,9 @@ class CompleteObservation(BaseObservation):
         :func:`CompleteObservation.to_dict` for a description of this dictionnary.
 
     """
+    # pairs of elements of the same substation, computed once for each class (see `_get_sub_pairs`)
+    _sub_pairs = None
+
     def __init__(self,
                  obs_env=None,
                  action_helper=None,
@@ -98,6 +102,11 @@ class CompleteObservation(BaseObservation):
                                  action_helper=action_helper,
                                  seed=seed)
         self.dictionnarized = None
+        # position of each attribute in the vector representation, used by "update_incremental"
+        self._vect_slices = None
+        # sparse representation of the connectivity matrices (if computed, or None)
+        self._connectivity_matrix_csr = None
+        self._bus_connectivity_matrix_csr = None
         self.attr_list_vect = [
             "year", "month", "day", "hour_of_day",
             "minute_of_hour", "day_of_week",
@@ -116,7 +125,10 @@ class CompleteObservation(BaseObservation):
     def _reset_matrices(self):
         self.connectivity_matrix_ = None
         self.bus_connectivity_matrix_ = None
+        self._connectivity_matrix_csr = None
+        self._bus_connectivity_matrix_csr = None
         self.vectorized = None
+        self._vectorized = None
         self.dictionnarized = None
 
     def update(self, env, with_forecast=True):
@@ -154,12 +166,7 @@ class CompleteObservation(BaseObservation):
 
         # handles forecasts here
         if with_forecast:
-            self._forecasted_inj = env.chronics_handler.forecasts()
-            for grid_act in self._forecasted_grid_act.values():
-                # in the action, i assign the lat topology known, it's a choice here...
-                grid_act["inj_action"]["setbus"] = self.topo_vect
-
-            self._forecasted_grid = [None for _ in self._forecasted_inj]
+            self._update_forecasts(env)
 
         self.rho = env.backend.get_relative_flow().astype(dt_float)
 
@@ -173,6 +180,114 @@ class CompleteObservation(BaseObservation):
         self.target_dispatch[:] = env.target_dispatch
         self.actual_dispatch[:] = env.actual_dispatch
 
+    def _update_forecasts(self, env):
+        self._forecasted_inj = env.chronics_handler.forecasts()
+        for grid_act in self._forecasted_grid_act.values():
+            # in the action, i assign the lat topology known, it's a choice here...
+            grid_act["inj_action"]["setbus"] = self.topo_vect
+
+        self._forecasted_grid = [None for _ in self._forecasted_inj]
+
+    def _compute_vect_slices(self):
+        """compute the position [beg, end) of each attribute of :attr:`CompleteObservation.attr_list_vect` in the
+        vector representation of the observation"""
+        end_ = np.cumsum(self.shape())
+        beg_ = end_ - self.shape()
+        return {attr_nm: (int(b), int(e)) for attr_nm, b, e in zip(self.attr_list_vect, beg_, end_)}
+
+    def _patch_attr(self, attr_nm, new_val, check_changed=False):
+        """
+        Assign `new_val` to the attribute `attr_nm` and patch the cached vector representation of this observation
+        accordingly. If `check_changed` is ``True`` nothing is done if the values did not change.
+        """
+        tmp = getattr(self, attr_nm)
+        beg_, end_ = self._vect_slices[attr_nm]
+        if isinstance(tmp, np.ndarray):
+            if check_changed and np.array_equal(tmp, new_val):
+                return
+            tmp[:] = new_val
+            self._vectorized[beg_:end_] = tmp
+        else:
+            new_val = dt_int(new_val)
+            setattr(self, attr_nm, new_val)
+            self._vectorized[beg_] = new_val
+
+    def update_incremental(self, env, with_forecast=True):
+        """
+        Update this observation "in place" with the new state of the environment.
+
+        Contrary to :func:`CompleteObservation.update`, the observation is not reset: the values that change at
+        every step (injections, flows, rho) are refreshed, the other ones (topology, line status, cooldowns,
+        maintenance, redispatching) are only refreshed if they differ from the one in the environment / backend.
+
+        The vector representation of the observation (see :func:`grid2op.Space.GridObjects.to_vect`) is not rebuilt,
+        but patched in place for the attributes that changed. This means the vector returned by `to_vect` is
+        modified at each call to this function.
+
+        Parameters
+        ----------
+        env: :class:`grid2op.Environment.Environment`
+            The environment from which to update this observation.
+
+        with_forecast: ``bool``
+            Whether to update the forecasts
+
+        """
+        if self._vectorized is None or self._vect_slices is None:
+            # first call, everything is computed
+            self.update(env, with_forecast=with_forecast)
+            self._vect_slices = self._compute_vect_slices()
+            self.to_vect()
+            return
+
+        self.connectivity_matrix_ = None
+        self.bus_connectivity_matrix_ = None
+        self._connectivity_matrix_csr = None
+        self._bus_connectivity_matrix_csr = None
+        self.dictionnarized = None
+
+        # extract the time stamps
+        self._patch_attr("year", env.time_stamp.year)
+        self._patch_attr("month", env.time_stamp.month)
+        self._patch_attr("day", env.time_stamp.day)
+        self._patch_attr("hour_of_day", env.time_stamp.hour)
+        self._patch_attr("minute_of_hour", env.time_stamp.minute)
+        self._patch_attr("day_of_week", env.time_stamp.weekday())
+
+        # get the values related to topology
+        self._patch_attr("timestep_overflow", env.timestep_overflow, check_changed=True)
+        self._patch_attr("line_status", env.backend.get_line_status(), check_changed=True)
+        self._patch_attr("topo_vect", env.backend.get_topo_vect(), check_changed=True)
+
+        # get the values related to continuous values
+        for attr_nm, val in zip(["prod_p", "prod_q", "prod_v"], env.backend.generators_info()):
+            self._patch_attr(attr_nm, val)
+        for attr_nm, val in zip(["load_p", "load_q", "load_v"], env.backend.loads_info()):
+            self._patch_attr(attr_nm, val)
+        for attr_nm, val in zip(["p_or", "q_or", "v_or", "a_or"], env.backend.lines_or_info()):
+            self._patch_attr(attr_nm, val)
+        for attr_nm, val in zip(["p_ex", "q_ex", "v_ex", "a_ex"], env.backend.lines_ex_info()):
+            self._patch_attr(attr_nm, val)
+
+        # handles forecasts here
+        self._forecasted_grid_act = {}
+        if with_forecast:
+            self._update_forecasts(env)
+        else:
+            self._forecasted_inj = []
+
+        self._patch_attr("rho", env.backend.get_relative_flow())
+
+        # cool down and reconnection time after hard overflow, soft overflow or cascading failure
+        self._patch_attr("time_before_cooldown_line", env.times_before_line_status_actionable, check_changed=True)
+        self._patch_attr("time_before_cooldown_sub", env.times_before_topology_actionable, check_changed=True)
+        self._patch_attr("time_next_maintenance", env.time_next_maintenance, check_changed=True)
+        self._patch_attr("duration_next_maintenance", env.duration_next_maintenance, check_changed=True)
+
+        # redispatching
+        self._patch_attr("target_dispatch", env.target_dispatch, check_changed=True)
+        self._patch_attr("actual_dispatch", env.actual_dispatch, check_changed=True)
+
     def from_vect(self, vect):
         """
         Convert back an observation represented as a vector into a proper observation.
@@ -237,7 +352,38 @@ class CompleteObservation(BaseObservation):
 
         return self.dictionnarized
 
-    def connectivity_matrix(self):
+    @classmethod
+    def _get_sub_pairs(cls):
+        """
+        All the pairs (i, j) of different elements of the topology vector that belong to the same substation. They are
+        computed once for each class (each powergrid).
+        """
+        if cls._sub_pairs is None or cls._sub_pairs[0] is not cls.sub_info:
+            pairs_i = []
+            pairs_j = []
+            beg_ = 0
+            for nb_obj in cls.sub_info:
+                nb_obj = int(nb_obj)
+                obj_i, obj_j = np.nonzero(~np.eye(nb_obj, dtype=bool))
+                pairs_i.append(beg_ + obj_i)
+                pairs_j.append(beg_ + obj_j)
+                beg_ += nb_obj
+            cls._sub_pairs = (cls.sub_info, np.concatenate(pairs_i), np.concatenate(pairs_j))
+        return cls._sub_pairs[1], cls._sub_pairs[2]
+
+    @staticmethod
+    def _to_matrix(rows, cols, size, as_csr_matrix):
+        """matrix of size (size, size) with 1 at each (rows[k], cols[k]) and 0 elsewhere"""
+        if as_csr_matrix:
+            res = csr_matrix((np.ones(rows.shape[0], dtype=dt_float), (rows, cols)), shape=(size, size))
+            # the same coefficient can be given multiple times (eg. parallel powerlines)
+            res.data[:] = 1.
+            return res
+        res = np.zeros(shape=(size, size), dtype=dt_float)
+        res[rows, cols] = 1.
+        return res
+
+    def connectivity_matrix(self, as_csr_matrix=False):
         """
         Computes and return the "connectivity matrix" `con_mat`.
         if "dim_topo = 2 * n_line + n_prod + n_conso"
@@ -254,40 +400,37 @@ class CompleteObservation(BaseObservation):
 
         By definition, the diagonal is made of 0.
 
+        Parameters
+        ----------
+        as_csr_matrix: ``bool``
+            Whether to return the matrix as a `scipy.sparse.csr_matrix` (``True``) or as a dense numpy array
+            (``False``, default)
+
         Returns
         -------
         res: ``numpy.ndarray``, shape:dim_topo,dim_topo, dtype:float
-            The connectivity matrix, as defined above
+            The connectivity matrix, as defined above (a `scipy.sparse.csr_matrix` if `as_csr_matrix` is ``True``)
 
         """
-        if self.connectivity_matrix_ is None:
-            self.connectivity_matrix_ = np.zeros(shape=(self.dim_topo, self.dim_topo), dtype=dt_float)
-            # fill it by block for the objects
-            beg_ = 0
-            end_ = 0
-            for sub_id, nb_obj in enumerate(self.sub_info):
-                # it must be a vanilla python integer, otherwise it's not handled by some backend
-                # especially if written in c++
-                nb_obj = int(nb_obj)
-                end_ += nb_obj
-                tmp = np.zeros(shape=(nb_obj, nb_obj), dtype=dt_float)
-                for obj1 in range(nb_obj):
-                    for obj2 in range(obj1+1, nb_obj):
-                        if self.topo_vect[beg_+obj1] == self.topo_vect[beg_+obj2]:
-                            # objects are on the same bus
-                            tmp[obj1, obj2] = 1
-                            tmp[obj2, obj1] = 1
-
-                self.connectivity_matrix_[beg_:end_, beg_:end_] = tmp
-                beg_ += nb_obj
+        if as_csr_matrix:
+            res = self._connectivity_matrix_csr
+        else:
+            res = self.connectivity_matrix_
+        if res is None:
+            # objects on the same bus of a substation are connected together
+            pairs_i, pairs_j = self._get_sub_pairs()
+            same_bus = self.topo_vect[pairs_i] == self.topo_vect[pairs_j]
             # connect the objects together with the lines (both ends of a lines are connected together)
-            for q_id in range(self.n_line):
-                self.connectivity_matrix_[self.line_or_pos_topo_vect[q_id], self.line_ex_pos_topo_vect[q_id]] = 1
-                self.connectivity_matrix_[self.line_ex_pos_topo_vect[q_id], self.line_or_pos_topo_vect[q_id]] = 1
-
-        return self.connectivity_matrix_
-
-    def bus_connectivity_matrix(self):
+            rows = np.concatenate((pairs_i[same_bus], self.line_or_pos_topo_vect, self.line_ex_pos_topo_vect))
+            cols = np.concatenate((pairs_j[same_bus], self.line_ex_pos_topo_vect, self.line_or_pos_topo_vect))
+            res = self._to_matrix(rows, cols, self.dim_topo, as_csr_matrix)
+            if as_csr_matrix:
+                self._connectivity_matrix_csr = res
+            else:
+                self.connectivity_matrix_ = res
+        return res
+
+    def bus_connectivity_matrix(self, as_csr_matrix=False):
         """
         If we denote by `nb_bus` the total number bus of the powergrid.
 
@@ -296,44 +439,50 @@ class CompleteObservation(BaseObservation):
         If `bus_connectivity_matrix[i,j] = 1` then at least a power line connects bus i and bus j.
         Otherwise, nothing connects it.
 
+        Buses are sorted by substation, and then by bus id in the substation. Only the buses with at least one element
+        connected to them are counted.
+
+        Parameters
+        ----------
+        as_csr_matrix: ``bool``
+            Whether to return the matrix as a `scipy.sparse.csr_matrix` (``True``) or as a dense numpy array
+            (``False``, default)
+
         Returns
         -------
         res: ``numpy.ndarray``, shape:nb_bus,nb_bus dtype:float
-            The bus connectivity matrix
+            The bus connectivity matrix (a `scipy.sparse.csr_matrix` if `as_csr_matrix` is ``True``)
         """
         # TODO voir avec Antoine pour les r,x,h ici !! (surtout les x)
-        if self.bus_connectivity_matrix_ is None:
-            # computes the number of buses in the powergrid.
-            nb_bus = 0
-            nb_bus_per_sub = np.zeros(self.sub_info.shape[0], dtype=dt_int)
-            beg_ = 0
-            end_ = 0
-            for sub_id, nb_obj in enumerate(self.sub_info):
-                nb_obj = int(nb_obj)
-                end_ += nb_obj
-
-                tmp = len(np.unique(self.topo_vect[beg_:end_]))
-                nb_bus_per_sub[sub_id] = tmp
-                nb_bus += tmp
-
-                beg_ += nb_obj
-
-            # define the bus_connectivity_matrix
-            self.bus_connectivity_matrix_ = np.zeros(shape=(nb_bus, nb_bus), dtype=dt_float)
-            np.fill_diagonal(self.bus_connectivity_matrix_, 1)
-
-            for q_id in range(self.n_line):
-                bus_or = int(self.topo_vect[self.line_or_pos_topo_vect[q_id]])
-                sub_id_or = int(self.line_or_to_subid[q_id])
-
-                bus_ex = int(self.topo_vect[self.line_ex_pos_topo_vect[q_id]])
-                sub_id_ex = int(self.line_ex_to_subid[q_id])
-
-                # try:
-                bus_id_or = int(np.sum(nb_bus_per_sub[:sub_id_or])+(bus_or-1))
-                bus_id_ex = int(np.sum(nb_bus_per_sub[:sub_id_ex])+(bus_ex-1))
-
-                self.bus_connectivity_matrix_[bus_id_or, bus_id_ex] = 1
-                self.bus_connectivity_matrix_[bus_id_ex, bus_id_or] = 1
-        return self.bus_connectivity_matrix_
+        if as_csr_matrix:
+            res = self._bus_connectivity_matrix_csr
+        else:
+            res = self.bus_connectivity_matrix_
+        if res is None:
+            # each bus is identified by (substation id, bus id in the substation)
+            max_bus = max(int(np.max(self.topo_vect)), 1)
+            pairs_i, _ = self._get_sub_pairs()
+            topo_vect_to_sub = np.repeat(np.arange(self.n_sub, dtype=dt_int), repeats=self.sub_info)
+            connected = self.topo_vect > 0
+            bus_key = topo_vect_to_sub * max_bus + self.topo_vect - 1
+            all_buses, bus_id = np.unique(bus_key[connected], return_inverse=True)
+            nb_bus = all_buses.shape[0]
+            topo_vect_to_bus = np.full(self.dim_topo, fill_value=-1, dtype=dt_int)
+            topo_vect_to_bus[connected] = bus_id
+
+            # powerlines connect the buses of both their ends
+            bus_or = topo_vect_to_bus[self.line_or_pos_topo_vect]
+            bus_ex = topo_vect_to_bus[self.line_ex_pos_topo_vect]
+            line_connected = (bus_or >= 0) & (bus_ex >= 0)
+            bus_or = bus_or[line_connected]
+            bus_ex = bus_ex[line_connected]
+            all_bus_id = np.arange(nb_bus, dtype=dt_int)
+            rows = np.concatenate((all_bus_id, bus_or, bus_ex))
+            cols = np.concatenate((all_bus_id, bus_ex, bus_or))
+            res = self._to_matrix(rows, cols, nb_bus, as_csr_matrix)
+            if as_csr_matrix:
+                self._bus_connectivity_matrix_csr = res
+            else:
+                self.bus_connectivity_matrix_ = res
+        return res
 
@@ -109,6 +109,36 @@ class ObservationSpace(SerializableObservationSpace):
                                                 action_helper=self.action_helper_env)
         self._update_env_time = 0.
 
+        # observation updated in place if the incremental update is activated
+        self.incremental_update = False
+        self._obs_incremental = None
+
+    def activate_incremental_update(self):
+        """
+        Activate the incremental update of the observations.
+
+        When activated, the same observation object is returned at each call and it is updated "in place" (see
+        :func:`grid2op.Observation.CompleteObservation.update_incremental`): only the attributes that changed are
+        refreshed and its vector representation (see :func:`grid2op.Space.GridObjects.to_vect`) is patched instead
+        of being rebuilt.
+
+        Notes
+        -----
+        As the observation returned is modified in place at each step, you need to copy it (or its vector
+        representation) if you want to keep it for later use.
+
+        """
+        self.incremental_update = True
+        self._obs_incremental = None
+
+    def deactivate_incremental_update(self):
+        """
+        Deactivate the incremental update of the observations (see
+        :func:`ObservationSpace.activate_incremental_update`): a new observation is built at each call.
+        """
+        self.incremental_update = False
+        self._obs_incremental = None
+
     def reset_space(self):
         if self.with_forecast:
             self.obs_env.reset_space()
@@ -118,6 +148,13 @@ class ObservationSpace(SerializableObservationSpace):
         if self.with_forecast:
             self.obs_env.update_grid(env)
 
+        if self.incremental_update:
+            if self._obs_incremental is None:
+                self._obs_incremental = self.observationClass(obs_env=self.obs_env,
+                                                              action_helper=self.action_helper_env)
+            self._obs_incremental.update_incremental(env=env, with_forecast=self.with_forecast)
+            return self._obs_incremental
+
         res = self.observationClass(obs_env=self.obs_env,
                                     action_helper=self.action_helper_env)
 
@@ -74,6 +74,8 @@ class _ObsEnv(BaseEnv):
         self.env_modification = self.helper_action_env()
         self._do_nothing_act = self.helper_action_env()
         self._backend_action_set = self._backend_action_class()
+        # state of the backend (see :func:`grid2op.Backend.Backend.get_state`) restored before each simulation
+        self._backend_state_init = None
 
     def init_backend(self,
                      init_grid_path,
@@ -150,17 +152,21 @@ class _ObsEnv(BaseEnv):
 
     def copy(self):
         """
-        Implement the deep copy of this instance.
+        Implement the copy of this instance.
+
+        The backend is not deep copied: it is shared with the copy. This is safe because the state of the backend
+        (see :func:`grid2op.Backend.Backend.get_state`) is stored in each instance and restored before each
+        simulation.
 
         Returns
         -------
         res: :class:`ObsEnv`
-            A deep copy of this instance.
+            A copy of this instance.
         """
         backend = self.backend
         self.backend = None
         res = copy.deepcopy(self)
-        res.backend = backend.copy()
+        res.backend = backend
         self.backend = backend
         return res
 
@@ -209,6 +215,7 @@ class _ObsEnv(BaseEnv):
                                                             "injection": {"prod_p": self._prod_p, "prod_v": self._prod_v,
                                                                           "load_p": self._load_p, "load_q": self._load_q}})
         self._backend_action_set += self._action
+        self._backend_state_init = self.backend.get_state()
         self.is_init = True
         self.current_obs = None
         self.time_stamp = time_stamp
@@ -219,6 +226,8 @@ class _ObsEnv(BaseEnv):
         reset this "environment" to the state it should be
         """
         self.reset()  # reset the "BaseEnv"
+        if self._backend_state_init is not None:
+            self.backend.set_state(self._backend_state_init)
         self.backend.set_thermal_limit(self._thermal_limit_a)
         self.gen_activeprod_t[:] = self.gen_activeprod_t_init
         self.gen_activeprod_t_redisp[:] = self.gen_activeprod_t_redisp_init
@@ -77,6 +77,31 @@ class Parameters:
     IGNORE_MIN_UP_DOWN_TIME: ``bool``
         Whether or not to ignore the attributes `gen_min_uptime` and `gen_min_downtime`. Basically setting this
         parameter to ``True``
+
+    FAST_CASCADE: ``bool``
+        Whether to predict the flows of each round of a cascading failure with the Line Outage Distribution Factors
+        of the grid (see :func:`grid2op.Backend.Backend.next_grid_state`) instead of running a powerflow after each
+        round of powerline disconnections. This requires a backend able to compute these factors (such as
+        :class:`grid2op.Backend.PandaPowerBackend` or :class:`grid2op.Backend.SparseBackend`) and is not used if the
+        backend keeps the detailed information about the cascading failures. Default is ``False``.
+
+    FAST_CASCADE_MARGIN: ``float``
+        When :attr:`FAST_CASCADE` is ``True``, a predicted flow is considered ambiguous, and the powerflow is computed
+        to decide which powerlines are disconnected, if it is closer to a threshold (the thermal limit or
+        :attr:`HARD_OVERFLOW_THRESHOLD` times the thermal limit) than this margin (relative to this threshold).
+        Default is ``0.05``.
+
+    FAST_CASCADE_CHECK: ``bool``
+        When :attr:`FAST_CASCADE` is ``True``, also compute the cascading failure with a powerflow after each round
+        and issue a warning if both methods do not disconnect the same powerlines. The results of the exact
+        computation are kept. This is only meant to assess the accuracy of the fast method, as it is slower than
+        not using it. Default is ``False``.
+
+    KIRCHHOFF_MONITOR: ``bool``
+        Whether the environment checks, at each step, that the powergrid respects Kirchhoff's law (with
+        :func:`grid2op.Backend.Backend.check_kirchoff`). The maximum imbalance at any bus is then given in the "info"
+        returned by :func:`grid2op.Environment.BaseEnv.step` and the maximum over the episode is stored by the
+        environment. Default is ``False``.
     """
     def __init__(self, parameters_path=None):
         """
@@ -126,6 +151,18 @@ class Parameters:
         # allow dispatch on turned off generator (if ``True`` you can actually dispatch a turned on geenrator)
         self.ALLOW_DISPATCH_GEN_SWITCH_OFF = True
 
+        # predict the flows during the cascading failures with the line outage distribution factors
+        self.FAST_CASCADE = False
+
+        # relative margin around the thresholds under which the predicted flows are checked with a powerflow
+        self.FAST_CASCADE_MARGIN = dt_float(0.05)
+
+        # compare the fast computation of the cascading failures with the exact one
+        self.FAST_CASCADE_CHECK = False
+
+        # check kirchhoff's law at each step
+        self.KIRCHHOFF_MONITOR = False
+
         if parameters_path is not None:
             if os.path.isfile(parameters_path):
                 self.init_from_json(parameters_path)
@@ -208,6 +245,18 @@ class Parameters:
         if "NB_TIMESTEP_COOLDOWN_LINE" in dict_:
             self.NB_TIMESTEP_COOLDOWN_LINE = dt_int(dict_["NB_TIMESTEP_COOLDOWN_LINE"])
 
+        if "FAST_CASCADE" in dict_:
+            self.FAST_CASCADE = Parameters._isok_txt(dict_["FAST_CASCADE"])
+
+        if "FAST_CASCADE_MARGIN" in dict_:
+            self.FAST_CASCADE_MARGIN = dt_float(dict_["FAST_CASCADE_MARGIN"])
+
+        if "FAST_CASCADE_CHECK" in dict_:
+            self.FAST_CASCADE_CHECK = Parameters._isok_txt(dict_["FAST_CASCADE_CHECK"])
+
+        if "KIRCHHOFF_MONITOR" in dict_:
+            self.KIRCHHOFF_MONITOR = Parameters._isok_txt(dict_["KIRCHHOFF_MONITOR"])
+
         authorized_keys = set(self.__dict__.keys())
         authorized_keys = authorized_keys | {'NB_TIMESTEP_POWERFLOW_ALLOWED',
                                              'NB_TIMESTEP_TOPOLOGY_REMODIF',
@@ -240,6 +289,10 @@ class Parameters:
         res["MAX_LINE_STATUS_CHANGED"] = int(self.MAX_LINE_STATUS_CHANGED)
         res["NB_TIMESTEP_COOLDOWN_LINE"] = int(self.NB_TIMESTEP_COOLDOWN_LINE)
         res["NB_TIMESTEP_COOLDOWN_SUB"] = int(self.NB_TIMESTEP_COOLDOWN_SUB)
+        res["FAST_CASCADE"] = bool(self.FAST_CASCADE)
+        res["FAST_CASCADE_MARGIN"] = float(self.FAST_CASCADE_MARGIN)
+        res["FAST_CASCADE_CHECK"] = bool(self.FAST_CASCADE_CHECK)
+        res["KIRCHHOFF_MONITOR"] = bool(self.KIRCHHOFF_MONITOR)
         return res
 
     def init_from_json(self, json_path):
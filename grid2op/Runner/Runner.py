@@ -102,6 +102,9 @@ class ConsoleLog(DoNothingLog):
 
 #TODO i think runner.env are not close, like, never closed :eyes:
 
+# environment (and agent) of the current process when it is a worker of a persistent pool (see Runner.start_pool)
+_WORKER_DATA = {}
+
 
 class Runner(object):
     """
@@ -231,7 +234,8 @@ class Runner(object):
                  opponent_action_class=DontAct,
                  opponent_class=BaseOpponent,
                  opponent_init_budget=0,
-                 grid_layout=None):
+                 grid_layout=None,
+                 episode_chunk_size=None):
         """
         Initialize the Runner.
 
@@ -297,6 +301,11 @@ class Runner(object):
 
         seed: ``int``
             Seed used (default ``None``)
+
+        episode_chunk_size: ``int``
+            If not ``None``, the episodes saved on the hard drive (when a `path_save` is given) are written every
+            `episode_chunk_size` steps instead of at the end of each episode (see :class:`grid2op.Episode.EpisodeData`
+            for more information). Default to ``None``.
         """
         self.name_env = name_env
         if not isinstance(envClass, type):
@@ -467,6 +476,22 @@ class Runner(object):
         self.opponent_class = opponent_class
         self.opponent_init_budget = opponent_init_budget
         self.grid_layout = grid_layout
+        if episode_chunk_size is not None:
+            episode_chunk_size = int(episode_chunk_size)
+            if episode_chunk_size <= 0:
+                raise Grid2OpException("\"episode_chunk_size\" should be a positive integer.")
+        self.episode_chunk_size = episode_chunk_size
+
+        # persistent pool of processes, see Runner.start_pool
+        self._pool = None
+        self._pool_size = 0
+
+    def __getstate__(self):
+        # the pool of processes cannot be sent to other processes
+        res = self.__dict__.copy()
+        res["_pool"] = None
+        res["_pool_size"] = 0
+        return res
 
     def _new_env(self, chronics_handler, backend, parameters):
         res = self.envClass(init_grid_path=self.init_grid_path,
@@ -552,11 +577,12 @@ class Runner(object):
         """
         self.reset()
         res = self._run_one_episode(self.env, self.agent, self.logger, indx, path_save,
-                                    pbar=pbar, seed=seed, max_iter=max_iter)
+                                    pbar=pbar, seed=seed, max_iter=max_iter, chunk_size=self.episode_chunk_size)
         return res
 
     @staticmethod
-    def _run_one_episode(env, agent, logger, indx, path_save=None, pbar=False, seed=None, max_iter=None):
+    def _run_one_episode(env, agent, logger, indx, path_save=None, pbar=False, seed=None, max_iter=None,
+                         chunk_size=None):
         done = False
         time_step = int(0)
         time_act = 0.
@@ -582,7 +608,8 @@ class Runner(object):
 
         # compute the size and everything if it needs to be stored
         nb_timestep_max = env.chronics_handler.max_timestep()
-        efficient_storing = nb_timestep_max > 0
+        # if the episode is written by chunk, there is no need to allocate memory for the whole episode
+        efficient_storing = nb_timestep_max > 0 and chunk_size is None
         nb_timestep_max = max(nb_timestep_max, 0)
 
         if path_save is None:
@@ -631,9 +658,11 @@ class Runner(object):
                               disc_lines_templ=disc_lines_templ,
                               logger=logger,
                               name=env.chronics_handler.get_name(),
-                              other_rewards=[])
+                              other_rewards=[],
+                              chunk_size=chunk_size if path_save is not None else None)
 
         episode.set_parameters(env)
+        episode.set_meta(env, time_step, float(cum_reward), seed)
 
         beg_ = time.time()
 
@@ -641,21 +670,25 @@ class Runner(object):
         done = False
 
         next_pbar = [False]
-        with Runner._make_progress_bar(pbar, nb_timestep_max, next_pbar) as pbar_:
-            while not done:
-                beg__ = time.time()
-                act = agent.act(obs, reward, done)
-                end__ = time.time()
-                time_act += end__ - beg__
-
-                obs, reward, done, info = env.step(act)  # should load the first time stamp
-                cum_reward += reward
-                time_step += 1
-                pbar_.update(1)
-
-                episode.incr_store(efficient_storing, time_step, end__ - beg__,
-                                   float(reward), env.env_modification, act, obs, info)
-            end_ = time.time()
+        try:
+            with Runner._make_progress_bar(pbar, nb_timestep_max, next_pbar) as pbar_:
+                while not done:
+                    beg__ = time.time()
+                    act = agent.act(obs, reward, done)
+                    end__ = time.time()
+                    time_act += end__ - beg__
+
+                    obs, reward, done, info = env.step(act)  # should load the first time stamp
+                    cum_reward += reward
+                    time_step += 1
+                    pbar_.update(1)
+
+                    episode.incr_store(efficient_storing, time_step, end__ - beg__,
+                                       float(reward), env.env_modification, act, obs, info)
+                end_ = time.time()
+        finally:
+            # keep the steps already played, and release the files, if the episode raised
+            episode.close()
 
         episode.set_meta(env, time_step, float(cum_reward), seed)
 
@@ -751,49 +784,120 @@ class Runner(object):
               - "max_ts" : the maximum number of time steps of the chronics
 
         """
-        res = [(None, None, None, None, None) for _ in range(nb_episode)]
-
+        res = []
         next_pbar = [False]
         with self._make_progress_bar(pbar, nb_episode, next_pbar) as pbar_:
-            for i in range(nb_episode):
-                seed = None
-                if seeds is not None:
-                    seed = seeds[i]
-                name_chron, cum_reward, nb_time_step = self.run_one_episode(path_save=path_save,
-                                                                            indx=i,
-                                                                            pbar=next_pbar[0],
-                                                                            seed=seed,
-                                                                            max_iter=max_iter)
-                id_chron = self.chronics_handler.get_id()
-                max_ts = self.chronics_handler.max_timestep()
-                res[i] = (id_chron, name_chron, float(cum_reward), nb_time_step, max_ts)
+            for el in self._run_sequential_iter(nb_episode, path_save=path_save, seeds=seeds, max_iter=max_iter,
+                                                pbar=next_pbar[0]):
+                res.append(el)
                 pbar_.update(1)
         return res
 
+    def _run_sequential_iter(self, nb_episode, path_save=None, seeds=None, max_iter=None, pbar=False):
+        """play the episodes one after the other in this process, and yield their results"""
+        for i in range(nb_episode):
+            seed = None
+            if seeds is not None:
+                seed = seeds[i]
+            name_chron, cum_reward, nb_time_step = self.run_one_episode(path_save=path_save,
+                                                                        indx=i,
+                                                                        pbar=pbar,
+                                                                        seed=seed,
+                                                                        max_iter=max_iter)
+            id_chron = self.chronics_handler.get_id()
+            max_ts = self.chronics_handler.max_timestep()
+            yield id_chron, name_chron, float(cum_reward), nb_time_step, max_ts
+
+    def start_pool(self, nb_process):
+        """
+        Start a pool of `nb_process` processes that will be used by all the next calls to :func:`Runner.run` and
+        :func:`Runner.run_parrallel`, until :func:`Runner.close_pool` is called.
+
+        Each process of the pool loads the powergrid, the chronics and builds its environment and its agent only once,
+        when the pool is started, and keep them for all the episodes it plays. Episodes are then sent one by one to the
+        processes, as soon as they are available, rather than being split in advance between the processes.
+
+        This is usefull when a lot of short episodes are played, in which case starting the processes and building
+        the environments can take more time than the episodes themselves.
+
+        If the agent cannot be copied, no pool is started (episodes are played sequentially, see
+        :func:`Runner.run_parrallel`).
+
+        Parameters
+        ----------
+        nb_process: ``int``
+            Number of processes in the pool.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            runner = Runner(**env.get_params_for_runner(), agentClass=DoNothingAgent)
+            runner.start_pool(nb_process=4)
+            res1 = runner.run(nb_episode=100)  # environments are built here, in each process
+            res2 = runner.run(nb_episode=100)  # and reused here
+            runner.close_pool()
+
+        """
+        nb_process = int(nb_process)
+        if nb_process <= 0:
+            raise RuntimeError("Runner: you need at least 1 process to run episodes")
+        if self.__can_copy_agent is False:
+            warnings.warn("Runner.start_pool: the agent cannot be copied, no pool of process is started.")
+            return
+        self.close_pool()
+        if self.env is not None:
+            self.env.close()
+            self.env = None
+        self._pool = Pool(nb_process, initializer=Runner._init_worker, initargs=(self,))
+        self._pool_size = nb_process
+
+    def close_pool(self):
+        """
+        Stop the processes started with :func:`Runner.start_pool` (if any).
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._pool_size = 0
+
     @staticmethod
-    def _one_process_parrallel(runner, episode_this_process, process_id, path_save=None, seeds=None, max_iter=None):
+    def _init_worker(runner):
+        """build the environment of a process of the persistent pool"""
         chronics_handler = ChronicsHandler(chronicsClass=runner.gridStateclass,
                                            path=runner.path_chron,
                                            **runner.gridStateclass_kwargs)
         parameters = copy.deepcopy(runner.parameters)
         backend = runner.backendClass()
-        nb_episode_this_process = len(episode_this_process)
-        res = [(None, None, None) for _ in range(nb_episode_this_process)]
-        for i, p_id in enumerate(episode_this_process):
-            env, agent = runner._new_env(chronics_handler=chronics_handler,
-                                         backend=backend,
-                                         parameters=parameters)
-            seed = None
-            if seeds is not None:
-                seed = seeds[i]
-            name_chron, cum_reward, nb_time_step = Runner._run_one_episode(
-                env, agent, runner.logger, p_id, path_save, seed=seed, max_iter=max_iter)
-            id_chron = chronics_handler.get_id()
-            max_ts = chronics_handler.max_timestep()
-            res[i] = (id_chron, name_chron, float(cum_reward), nb_time_step, max_ts)
-        return res
+        env, agent = runner._new_env(chronics_handler=chronics_handler,
+                                     backend=backend,
+                                     parameters=parameters)
+        _WORKER_DATA["runner"] = runner
+        _WORKER_DATA["env"] = env
+        _WORKER_DATA["agent"] = agent
 
-    def run_parrallel(self, nb_episode, nb_process=1, path_save=None, seeds=None, max_iter=None):
+    @staticmethod
+    def _one_episode_worker(args):
+        """
+        play one episode in a process of the pool, `args` being (indx, path_save, seed, max_iter). The index of the
+        episode is returned with its results.
+        """
+        indx, path_save, seed, max_iter = args
+        runner = _WORKER_DATA["runner"]
+        env = _WORKER_DATA["env"]
+        if max_iter is None:
+            # the environment is kept between the episodes, a previous one might have changed it
+            max_iter = int(runner.gridStateclass_kwargs.get("max_iter", -1))
+        name_chron, cum_reward, nb_time_step = Runner._run_one_episode(
+            env, _WORKER_DATA["agent"], runner.logger, indx, path_save, seed=seed, max_iter=max_iter,
+            chunk_size=runner.episode_chunk_size)
+        id_chron = env.chronics_handler.get_id()
+        max_ts = env.chronics_handler.max_timestep()
+        return indx, (id_chron, name_chron, float(cum_reward), nb_time_step, max_ts)
+
+    def run_parrallel(self, nb_episode, nb_process=1, path_save=None, seeds=None, max_iter=None, pbar=False):
         """
         This method will run in parrallel, independantly the nb_episode over nb_process.
 
@@ -808,6 +912,13 @@ class Runner(object):
 
         It has the same return type as the :func:`Runner.run_sequential`.
 
+        The episodes are sent one by one to the processes, as soon as they are available: a process that finished a
+        short episode (for example because of a game over) starts the next one directly. See :func:`Runner.run_iter`
+        to retrieve the results as soon as each episode is over.
+
+        If a persistent pool of processes has been started with :func:`Runner.start_pool`, it is used (and
+        `nb_process` is ignored).
+
         Parameters
         ----------
         nb_episode: ``int``
@@ -824,56 +935,127 @@ class Runner(object):
             An iterable of the seed used for the experiments. By default ``None``, no seeds are set. If provided,
             its size should match ``nb_episode``.
 
+        max_iter: ``int``
+            Maximum number of iteration you want the runner to perform.
+
+        pbar: ``bool`` or ``type`` or ``object``
+            How to display the progress bar (updated each time an episode is over), see :func:`Runner.run_sequential`
+
         Returns
         -------
         res: ``list``
             List of tuple. Each tuple having 3 elements:
 
-              - "i" unique identifier of the episode (compared to :func:`Runner.run_sequential`, the elements of the
-                returned list are not necessarily sorted by this value)
+              - "i" unique identifier of the episode
               - "cum_reward" the cumulative reward obtained by the :attr:`Runner.BaseAgent` on this episode i
               - "nb_time_step": the number of time steps played in this episode.
               - "max_ts" : the maximum number of time steps of the chronics
 
         """
-        if nb_process <= 0:
-            raise RuntimeError(
-                "Runner: you need at least 1 process to run episodes")
-        if nb_process == 1 or self.__can_copy_agent is False:
+        if self._pool is None and (nb_process == 1 or self.__can_copy_agent is False):
             warnings.warn(
                 "Runner.run_parrallel: number of process set to 1. Failing back into sequential mod.")
-            return [self.run_sequential(nb_episode, path_save=path_save, seeds=seeds)]
-        else:
-            if self.env is not None:
-                self.env.close()
-                self.env = None
-            self.backend = self.backendClass()
-
-            nb_process = int(nb_process)
-            process_ids = [[] for i in range(nb_process)]
-            for i in range(nb_episode):
-                process_ids[i % nb_process].append(i)
-
-            if seeds is None:
-                seeds_res = [None for _ in range(nb_process)]
-            else:
-                # split the seeds according to the process
-                seeds_res = [[] for i in range(nb_process)]
-                for i in range(nb_episode):
-                    seeds_res[i % nb_process].append(seeds[i])
+        res = []
+        next_pbar = [False]
+        with self._make_progress_bar(pbar, nb_episode, next_pbar) as pbar_:
+            for indx, el in self._run_iter(nb_episode, nb_process=nb_process, path_save=path_save, seeds=seeds,
+                                           max_iter=max_iter):
+                res.append((indx, el))
+                pbar_.update(1)
+        # the episodes finish in any order, they are returned in the order they were started
+        return [el for _, el in sorted(res, key=lambda x: x[0])]
 
-            res = []
-            with Pool(nb_process) as p:
-                tmp = p.starmap(Runner._one_process_parrallel,
-                                [(self, pn, i, path_save, seeds_res[i], max_iter) for i, pn in enumerate(process_ids)])
-            for el in tmp:
-                res += el
-        return res
+    def run_iter(self, nb_episode, nb_process=1, path_save=None, seeds=None, max_iter=None):
+        """
+        Play the episodes, like :func:`Runner.run`, but yield the result of each episode as soon as it is over
+        (without waiting for the other ones).
+
+        If `nb_process` is 2 or more (or if a pool of processes has been started with :func:`Runner.start_pool`)
+        the episodes are sent one by one to the processes when they are available, and the results are yielded in the
+        order the episodes finish (not necessarily the order of the episodes). If no pool of processes has been
+        started, a new one is created for this call and stopped once all the results have been yielded.
+
+        Parameters
+        ----------
+        nb_episode: ``int``
+            Number of episode to simulate
+
+        nb_process: ``int``, optional
+            Number of process used to play the nb_episode. Default to 1.
+
+        path_save: ``str``, optional
+            If not None, it specifies where to store the data. See the description of this module :mod:`Runner` for
+            more information
+
+        seeds: ``list``
+            An iterable of the seed used for the experiments. By default ``None``, no seeds are set. If provided,
+            its size should match ``nb_episode``.
+
+        max_iter: ``int``
+            Maximum number of iteration you want the runner to perform.
+
+        Yields
+        ------
+        res: ``tuple``
+            The result of one episode, with the same 5 elements as the ones returned by :func:`Runner.run_sequential`
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            runner = Runner(**env.get_params_for_runner(), agentClass=DoNothingAgent)
+            for id_chron, name_chron, cum_reward, nb_time_step, max_ts in runner.run_iter(nb_episode=10,
+                                                                                          nb_process=4):
+                print("{} is over with a cumulative reward of {}".format(name_chron, cum_reward))
+
+        """
+        iter_ = self._run_iter(nb_episode, nb_process=nb_process, path_save=path_save, seeds=seeds,
+                               max_iter=max_iter)
+        try:
+            for _, el in iter_:
+                yield el
+        finally:
+            iter_.close()
+
+    def _run_iter(self, nb_episode, nb_process=1, path_save=None, seeds=None, max_iter=None):
+        """
+        Same as :func:`Runner.run_iter`, but yields the index of each episode (in `range(nb_episode)`) with its
+        results.
+        """
+        if self._pool is None:
+            if nb_process <= 0:
+                raise RuntimeError(
+                    "Runner: you need at least 1 process to run episodes")
+            if nb_process == 1 or self.__can_copy_agent is False:
+                for indx, el in enumerate(self._run_sequential_iter(nb_episode, path_save=path_save, seeds=seeds,
+                                                                    max_iter=max_iter)):
+                    yield indx, el
+                return
+
+        if seeds is None:
+            seeds = [None for _ in range(nb_episode)]
+        temporary_pool = self._pool is None
+        if temporary_pool:
+            self.start_pool(nb_process)
+        try:
+            # episodes are sent one by one to the processes, as soon as they are available
+            for indx, el in self._pool.imap_unordered(Runner._one_episode_worker,
+                                                      [(i, path_save, seeds[i], max_iter) for i in range(nb_episode)]):
+                yield indx, el
+        finally:
+            if temporary_pool:
+                # the remaining episodes (if the iteration was stopped before the end) are not played
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+                self._pool_size = 0
 
     def run(self, nb_episode, nb_process=1, path_save=None, max_iter=None, pbar=False, seeds=None):
         """
         Main method of the :class:`Runner` class. It will either call :func:`Runner.run_sequential` if "nb_process" is
-        1 or :func:`Runner.run_parrallel` if nb_process >= 2.
+        1 or :func:`Runner.run_parrallel` if nb_process >= 2 (or if a pool of processes has been started with
+        :func:`Runner.start_pool`).
 
         Parameters
         ----------
@@ -911,8 +1093,7 @@ class Runner(object):
         res: ``list``
             List of tuple. Each tuple having 3 elements:
 
-              - "i" unique identifier of the episode (compared to :func:`Runner.run_sequential`, the elements of the
-                returned list are not necessarily sorted by this value)
+              - "i" unique identifier of the episode
               - "cum_reward" the cumulative reward obtained by the :attr:`Runner.BaseAgent` on this episode i
               - "nb_time_step": the number of time steps played in this episode.
 
@@ -934,11 +1115,11 @@ class Runner(object):
             if nb_process <= 0:
                 raise RuntimeError("Impossible to run using less than 1 process.")
 
-            if nb_process == 1:
+            if nb_process == 1 and self._pool is None:
                 self.logger.info("Sequential runner used.")
                 res = self.run_sequential(nb_episode, path_save=path_save, pbar=pbar, seeds=seeds, max_iter=max_iter)
             else:
                 self.logger.info("Parallel runner used.")
                 res = self.run_parrallel(nb_episode, nb_process=nb_process, path_save=path_save, seeds=seeds,
-                                         max_iter=max_iter)
+                                         max_iter=max_iter, pbar=pbar)
         return res
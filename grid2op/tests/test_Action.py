@@ -11,6 +11,7 @@ import json
 import re
 import warnings
 import pdb
+import itertools
 from abc import ABC, abstractmethod
 
 from grid2op.tests.helper_path_test import *
@@ -21,6 +22,7 @@ from grid2op.Action import *
 from grid2op.Rules import RulesChecker, DefaultRules
 from grid2op.Space import GridObjects
 from grid2op.Space.space_utils import save_to_dict
+from grid2op.MakeEnv import make
 
 
 class TestActionBase(ABC):
@@ -649,6 +651,18 @@ class TestActionBase(ABC):
         assert aff_subs[id_1]
         assert aff_subs[id_2]
 
+    def test_topo_vect_wrong_shape(self):
+        self._skipMissingKey('set_bus')
+        self._skipMissingKey('change_bus')
+        dim_topo = self.helper_action.dim_topo
+        with self.assertRaises(AmbiguousAction):
+            self.helper_action({"set_bus": np.ones(dim_topo + 1, dtype=dt_int)})
+        with self.assertRaises(AmbiguousAction):
+            self.helper_action({"change_bus": np.full(dim_topo - 1, fill_value=True, dtype=dt_bool)})
+        act = self.helper_action({"set_bus": np.ones(dim_topo, dtype=dt_int)})
+        _, aff_subs = act.get_topological_impact()
+        assert np.all(aff_subs)
+
     def test_to_dict(self):
         dict_ = self.helper_action.to_dict()
         self.maxDiff = None
@@ -1133,5 +1147,190 @@ class TestTopologyAndDispatchAction_PowerlineChangeAndDispatchAction(TestIADD, u
                            actionClass=PowerlineChangeAndDispatchAction)
 
 
+class TestUnitaryTopologies(unittest.TestCase):
+    """
+    Test that the (vectorized) enumeration of the unitary topologies gives the same actions, in the same order, as the
+    previous implementation (one action built for each possible topology)
+    """
+    def setUp(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env = make("rte_case14_realistic", test=True)
+        self.action_space = self.env.action_space
+
+    def tearDown(self):
+        self.env.close()
+
+    @staticmethod
+    def _sub_topologies_set_ref(num_el, powerlines_id):
+        res = []
+        for tup in itertools.product([0, 1], repeat=num_el - 1):
+            indx = np.array((0, *tup)).astype(dt_bool)
+            if np.sum(indx[powerlines_id]) >= 1 and np.sum(~indx[powerlines_id]) >= 1:
+                new_topo = np.full(shape=num_el, fill_value=1, dtype=dt_int)
+                new_topo[~indx] = 2
+                res.append(new_topo)
+        return res
+
+    def _topologies_set_ref(self):
+        action_space = self.action_space
+        res = []
+        for sub_id, num_el in enumerate(action_space.sub_info):
+            tmp = [action_space({"set_bus": {"substations_id": [(sub_id, np.ones(num_el, dtype=dt_int))]}})]
+            powerlines_or_id = action_space.line_or_to_sub_pos[action_space.line_or_to_subid == sub_id]
+            powerlines_ex_id = action_space.line_ex_to_sub_pos[action_space.line_ex_to_subid == sub_id]
+            powerlines_id = np.concatenate((powerlines_or_id, powerlines_ex_id))
+            for new_topo in self._sub_topologies_set_ref(num_el, powerlines_id):
+                tmp.append(action_space({"set_bus": {"substations_id": [(sub_id, new_topo)]}}))
+            if len(tmp) >= 2:
+                res += tmp
+        return res
+
+    def _topologies_change_ref(self):
+        action_space = self.action_space
+        res = []
+        for sub_id, num_el in enumerate(action_space.sub_info):
+            already_set = set()
+            for tup_ in itertools.product([0, 1], repeat=num_el):
+                if tup_ not in already_set:
+                    indx = np.array(tup_).astype(dt_bool)
+                    res.append(action_space({"change_bus": {"substations_id": [(sub_id, indx)]}}))
+                    already_set.add(tup_)
+                    already_set.add(tuple([1 - el for el in tup_]))
+        return res
+
+    def test_topologies_set(self):
+        res = self.action_space.get_all_unitary_topologies_set(self.action_space)
+        res_ref = self._topologies_set_ref()
+        assert len(res) == len(res_ref)
+        for act, act_ref in zip(res, res_ref):
+            assert act == act_ref
+
+        res_vect = self.action_space.get_all_unitary_topologies_set_vect(self.action_space)
+        assert res_vect.shape == (len(res_ref), self.action_space.dim_topo)
+        for topo, act_ref in zip(res_vect, res_ref):
+            assert np.all(topo == act_ref._set_topo_vect)
+
+    def test_topologies_change(self):
+        res = self.action_space.get_all_unitary_topologies_change(self.action_space)
+        res_ref = self._topologies_change_ref()
+        assert len(res) == len(res_ref)
+        for act, act_ref in zip(res, res_ref):
+            assert act == act_ref
+
+        res_vect = self.action_space.get_all_unitary_topologies_change_vect(self.action_space)
+        assert res_vect.shape == (len(res_ref), self.action_space.dim_topo)
+        for change, act_ref in zip(res_vect, res_ref):
+            assert np.all(change == act_ref._change_bus_vect)
+
+    def test_big_substation(self):
+        num_el = 13
+        for powerlines_id in [np.array([0, 5, 12]), np.array([3, 4]), np.array([7]), np.arange(num_el)]:
+            res = self.action_space._get_sub_topologies_set(num_el, powerlines_id)
+            res_ref = self._sub_topologies_set_ref(num_el, powerlines_id)
+            assert res.shape == (len(res_ref), num_el)
+            if res_ref:
+                assert np.all(res == np.array(res_ref))
+
+
+class TestTopologicalImpact(unittest.TestCase):
+    """
+    Test that the vectorized get_topological_impact gives the same results as the previous implementation (one loop
+    through the substations) and that its results are stored until the action is modified
+    """
+    def setUp(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env = make("rte_case14_realistic", test=True)
+        self.action_space = self.env.action_space
+        self.prng = np.random.RandomState(42)
+
+    def tearDown(self):
+        self.env.close()
+
+    @staticmethod
+    def _topological_impact_ref(act, powerline_status):
+        not_powerline_status = ~powerline_status
+        lines_impacted = act._switch_line_status | (act._set_line_status != 0 & not_powerline_status)
+        subs_impacted = np.full(shape=act.sub_info.shape, fill_value=False, dtype=dt_bool)
+        powerlines_reco = np.arange(act.n_line)[(act._set_line_status == 1) & not_powerline_status |
+                                                act._switch_line_status & not_powerline_status]
+        sub_id = np.concatenate((act.line_or_to_subid[powerlines_reco], act.line_ex_to_subid[powerlines_reco]))
+        sub_id_unique, sub_counts = np.unique(sub_id, return_counts=True)
+        sub_reco_counts = dict(zip(sub_id_unique, sub_counts))
+        beg_ = 0
+        for sub_id, nb_obj in enumerate(act.sub_info):
+            end_ = beg_ + nb_obj
+            if np.any(act._change_bus_vect[beg_:end_]):
+                subs_impacted[sub_id] = True
+            nb_set = np.sum(act._set_topo_vect[beg_:end_] != 0)
+            if nb_set > 0:
+                if sub_id in sub_reco_counts:
+                    subs_impacted[sub_id] = nb_set > sub_reco_counts[sub_id]
+                else:
+                    subs_impacted[sub_id] = True
+            beg_ = end_
+        return lines_impacted, subs_impacted
+
+    def _random_action(self):
+        dim_topo = self.action_space.dim_topo
+        n_line = self.action_space.n_line
+        set_bus = self.prng.choice([0, 1, 2], size=dim_topo, p=[0.9, 0.05, 0.05]).astype(dt_int)
+        change_bus = self.prng.random_sample(dim_topo) < 0.05
+        set_status = self.prng.choice([-1, 0, 1], size=n_line, p=[0.1, 0.7, 0.2]).astype(dt_int)
+        change_status = self.prng.random_sample(n_line) < 0.1
+        # set the buses of the ends of the powerlines reconnected
+        for l_id in np.where(set_status == 1)[0]:
+            set_bus[self.action_space.line_or_pos_topo_vect[l_id]] = 1
+            set_bus[self.action_space.line_ex_pos_topo_vect[l_id]] = 1
+        return self.action_space({"set_bus": set_bus, "change_bus": change_bus,
+                                  "set_line_status": set_status, "change_line_status": change_status})
+
+    def test_same_as_loop(self):
+        for _ in range(200):
+            act = self._random_action()
+            powerline_status = self.prng.random_sample(self.action_space.n_line) < 0.7
+            lines_impacted, subs_impacted = act.get_topological_impact(powerline_status)
+            lines_impacted_ref, subs_impacted_ref = self._topological_impact_ref(act, powerline_status)
+            assert np.all(lines_impacted == lines_impacted_ref)
+            assert np.all(subs_impacted == subs_impacted_ref)
+
+            act = self._random_action()
+            lines_impacted, subs_impacted = act.get_topological_impact()
+            lines_impacted_ref, subs_impacted_ref = self._topological_impact_ref(
+                act, np.full(self.action_space.n_line, fill_value=False, dtype=dt_bool))
+            assert np.all(lines_impacted == lines_impacted_ref)
+            assert np.all(subs_impacted == subs_impacted_ref)
+
+    def test_memoized(self):
+        powerline_status = np.full(self.action_space.n_line, fill_value=True, dtype=dt_bool)
+        act = self.action_space({"set_bus": {"lines_or_id": [(0, 2)]}})
+        lines_impacted, subs_impacted = act.get_topological_impact(powerline_status)
+        assert np.sum(subs_impacted) == 1
+        # same status, or no status given: results are not computed again
+        lines_impacted2, subs_impacted2 = act.get_topological_impact(powerline_status.copy())
+        assert subs_impacted2 is subs_impacted
+        lines_impacted2, subs_impacted2 = act.get_topological_impact()
+        assert subs_impacted2 is subs_impacted
+
+        # the action is modified: results are computed again
+        act.update({"set_bus": {"lines_or_id": [(5, 2)]}})
+        _, subs_impacted = act.get_topological_impact(powerline_status)
+        assert np.sum(subs_impacted) == 2
+        act += self.action_space({"change_bus": {"lines_ex_id": [19]}})
+        _, subs_impacted = act.get_topological_impact(powerline_status)
+        assert np.sum(subs_impacted) == 3
+        act.from_vect(self.action_space().to_vect())
+        _, subs_impacted = act.get_topological_impact(powerline_status)
+        assert np.sum(subs_impacted) == 0
+        act.update({"set_line_status": [(0, 1)], "set_bus": {"lines_or_id": [(0, 2)], "lines_ex_id": [(0, 2)]}})
+        _, subs_impacted = act.get_topological_impact(powerline_status)
+        assert np.sum(subs_impacted) == 2
+        # the status changed: powerline 0 is reconnected, it does not impact the substations
+        powerline_status[0] = False
+        _, subs_impacted = act.get_topological_impact(powerline_status)
+        assert np.sum(subs_impacted) == 0
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -7,7 +7,9 @@
 # This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
 
 import pdb
+import copy
 import warnings
+import tempfile
 import pandas as pd
 
 from grid2op.tests.helper_path_test import *
@@ -15,7 +17,7 @@ from grid2op.tests.helper_path_test import *
 from grid2op.MakeEnv import make
 from grid2op.Exceptions import *
 from grid2op.Chronics import ChronicsHandler, GridStateFromFile, GridStateFromFileWithForecasts, Multifolder, GridValue
-from grid2op.Chronics import MultifolderWithCache
+from grid2op.Chronics import MultifolderWithCache, GridStateFromNpy
 from grid2op.Backend import PandaPowerBackend
 from grid2op.Parameters import Parameters
 
@@ -84,6 +86,33 @@ class TestProperHandlingHazardsMaintenance(HelperTests):
         hazard_duration = GridValue.get_hazard_duration_1d(hazard)
         assert np.all(hazard_duration == np.array([0,0,0,0,0,0,0,0,0,0,0,0,5,4,3,2,1]))
 
+    def test_get_2d_equals_1d(self):
+        maintenance = np.array([[0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],
+                                [0,0,0,0,0,1,1,1,0,0,0,0,0,0,0,0,0],
+                                [0,0,0,0,0,1,1,1,0,0,0,0,1,1,0,0,0],
+                                [0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,1]]).T
+        # and some random ones
+        np.random.seed(0)
+        maintenance = np.concatenate((maintenance, np.random.choice([0, 1], size=(17, 50), p=[0.7, 0.3])), axis=1)
+        maintenance[0, :] = 0  # the 1d versions do not handle maintenance at the first time step
+        maintenance_time = GridValue.get_maintenance_time_2d(maintenance)
+        maintenance_duration = GridValue.get_maintenance_duration_2d(maintenance)
+        hazard_duration = GridValue.get_hazard_duration_2d(maintenance)
+        for line_id in range(maintenance.shape[1]):
+            assert np.all(maintenance_time[:, line_id] == GridValue.get_maintenance_time_1d(maintenance[:, line_id]))
+            assert np.all(maintenance_duration[:, line_id] ==
+                          GridValue.get_maintenance_duration_1d(maintenance[:, line_id]))
+            assert np.all(hazard_duration[:, line_id] == GridValue.get_hazard_duration_1d(maintenance[:, line_id]))
+
+    def test_get_2d_maintenance_first_ts(self):
+        maintenance = np.array([[1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1]]).T
+        maintenance_time = GridValue.get_maintenance_time_2d(maintenance)
+        assert np.all(maintenance_time[:, 0] == np.array([0,0,14,13,12,11,10,9,8,7,6,5,4,3,2,1,0]))
+        maintenance_duration = GridValue.get_maintenance_duration_2d(maintenance)
+        assert np.all(maintenance_duration[:, 0] == np.array([2,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1]))
+        hazard_duration = GridValue.get_hazard_duration_2d(maintenance)
+        assert np.all(hazard_duration[:, 0] == np.array([2,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1]))
+
     def test_loadchornics_hazard_ok(self):
         chron_handl = ChronicsHandler(chronicsClass=GridStateFromFile, path=self.path_hazard)
         chron_handl.initialize(self.order_backend_loads, self.order_backend_prods,
@@ -535,6 +564,106 @@ class TestLoadingMultiFolder(HelperTests):
             pass
 
 
+    def _get_multifolder(self, **kwargs):
+        chron_handl = ChronicsHandler(chronicsClass=Multifolder,
+                                      path=self.path,
+                                      gridvalueClass=GridStateFromFileWithForecasts,
+                                      max_iter=self.max_iter,
+                                      **kwargs)
+        chron_handl.initialize(self.order_backend_loads, self.order_backend_prods,
+                               self.order_backend_lines, self.order_backend_subs,
+                               self.names_chronics_to_backend)
+        return chron_handl
+
+    def _next_episode(self, chron_handl, id_=None):
+        if id_ is not None:
+            chron_handl.tell_id(id_)
+        else:
+            chron_handl.next_chronics()
+        chron_handl.initialize(self.order_backend_loads, self.order_backend_prods,
+                               self.order_backend_lines, self.order_backend_subs,
+                               self.names_chronics_to_backend)
+
+    def _check_same_episode(self, chron_handl, chron_handl_ref):
+        assert chron_handl.get_id() == chron_handl_ref.get_id()
+        assert np.all(chron_handl.real_data.data.load_p == chron_handl_ref.real_data.data.load_p)
+        assert np.all(chron_handl.real_data.data.prod_v == chron_handl_ref.real_data.data.prod_v)
+
+    def test_prefetch(self):
+        chron_handl_ref = self._get_multifolder()
+        chron_handl = self._get_multifolder(prefetch=2)
+        real_data = chron_handl.real_data
+        self._check_same_episode(chron_handl, chron_handl_ref)
+        assert len(real_data._prefetched) == 2
+        for _ in range(4):
+            # next episode is the one that has been prefetched
+            key, _, future = real_data._prefetched[0]
+            assert key[1] == real_data.subpaths[(real_data.id_chron_folder_current + 1) % len(real_data.subpaths)]
+            self._next_episode(chron_handl)
+            self._next_episode(chron_handl_ref)
+            assert real_data.data is future.result()
+            assert len(real_data._prefetched) == 2
+            self._check_same_episode(chron_handl, chron_handl_ref)
+
+    def test_prefetch_tell_id(self):
+        chron_handl_ref = self._get_multifolder()
+        chron_handl = self._get_multifolder(prefetch=1)
+        for id_ in [0, 0, 2, 1, None, None]:
+            self._next_episode(chron_handl, id_)
+            self._next_episode(chron_handl_ref, id_)
+            self._check_same_episode(chron_handl, chron_handl_ref)
+
+    def test_prefetch_shuffle(self):
+        chron_handl_ref = self._get_multifolder()
+        chron_handl = self._get_multifolder(prefetch=1)
+        for _ in range(2):
+            self._next_episode(chron_handl)
+            self._next_episode(chron_handl_ref)
+            chron_handl.shuffle(shuffler=lambda x: x[[2, 0, 1]])
+            chron_handl_ref.shuffle(shuffler=lambda x: x[[2, 0, 1]])
+            for _ in range(4):
+                self._next_episode(chron_handl)
+                self._next_episode(chron_handl_ref)
+                self._check_same_episode(chron_handl, chron_handl_ref)
+
+    def test_prefetch_max_iter(self):
+        chron_handl = self._get_multifolder(prefetch=1)
+        chron_handl.set_max_iter(3)
+        self._next_episode(chron_handl)
+        assert chron_handl.max_timestep() == 3
+
+    def test_prefetch_copy(self):
+        chron_handl = self._get_multifolder(prefetch=1)
+        chron_handl_cpy = copy.deepcopy(chron_handl)
+        assert len(chron_handl_cpy.real_data._prefetched) == 0
+        for _ in range(3):
+            self._next_episode(chron_handl)
+            self._next_episode(chron_handl_cpy)
+            self._check_same_episode(chron_handl, chron_handl_cpy)
+
+    def test_prefetch_close(self):
+        chron_handl = self._get_multifolder(prefetch=2)
+        real_data = chron_handl.real_data
+        executor = real_data._prefetch_executor
+        futures = [future for _, _, future in real_data._prefetched]
+        chron_handl.close()
+        assert real_data._prefetch_executor is None
+        assert len(real_data._prefetched) == 0
+        # the pending loads are cancelled or finished, and the thread is stopped
+        assert all(future.done() for future in futures)
+        assert not any(thread.is_alive() for thread in executor._threads)
+        # the chronics can still be used after being closed
+        self._next_episode(chron_handl)
+        assert len(real_data._prefetched) == 2
+        chron_handl.close()
+
+    def test_prefetch_wrong(self):
+        with self.assertRaises(ChronicsError):
+            self._get_multifolder(prefetch=-1)
+        with self.assertRaises(ChronicsError):
+            self._get_multifolder(prefetch="one")
+
+
 class TestEnvChunk(HelperTests):
     def setUp(self):
         self.max_iter = 10
@@ -715,8 +844,11 @@ class TestCFFWFWM(HelperTests):
                 assert len(env.chronics_handler.real_data.data.line_to_maintenance) == nb_line_in_maintenance
                 proba = 0.06
 
-                nb_th = proba * 5/7  # for day of week
-                nb_th *= 8/24  # maintenance only between 9 and 17
+                # maintenance only between 9 and 17 on working days (the last day of the chronics is not used)
+                data = env.chronics_handler.real_data.data
+                nb_ts_day = int(86400 / data.time_interval.total_seconds())
+                days = pd.date_range(data.start_datetime, periods=data.n_ // nb_ts_day, freq="D")
+                nb_th = proba * np.sum(days.weekday < 5) * 8 * nb_ts_day / 24 / data.n_
 
                 nb_maintenance = np.zeros(env.n_line, dtype=dt_float)
                 nb_ts_ = 0
@@ -767,7 +899,7 @@ class TestCFFWFWM(HelperTests):
                 for i in range(nb_scenario):
                     obs = env.reset()
                     nb_maintenance1[i, :] = np.sum(env.chronics_handler.real_data.data.maintenance, axis=0)
-                assert np.all(nb_maintenance == nb_maintenance)
+                assert np.all(nb_maintenance == nb_maintenance1)
 
     def test_chunk_size(self):
         param = Parameters()
@@ -787,6 +919,33 @@ class TestCFFWFWM(HelperTests):
                 assert np.all(maint == maint2)
 
 
+    def test_prefetch_same_maintenance(self):
+        param = Parameters()
+        param.NO_OVERFLOW_DISCONNECTION = True
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            with make(os.path.join(PATH_DATA_TEST, "ieee118_R2subgrid_wcci_test_maintenance"),
+                      param=param) as env_ref:
+                with make(os.path.join(PATH_DATA_TEST, "ieee118_R2subgrid_wcci_test_maintenance"),
+                          param=param, data_feeding_kwargs={"prefetch": 2}) as env:
+                    env.seed(0)
+                    env_ref.seed(0)
+                    for i in range(5):
+                        if i == 3:
+                            # prefetched episodes are discarded
+                            env.set_id(0)
+                            env_ref.set_id(0)
+                        env.reset()
+                        env_ref.reset()
+                        assert np.all(env.chronics_handler.real_data.data.maintenance ==
+                                      env_ref.chronics_handler.real_data.data.maintenance)
+                    executor = env.chronics_handler.real_data._prefetch_executor
+                    assert executor is not None
+                # closing the environment stops the thread used to prefetch the episodes
+                assert env.chronics_handler.real_data._prefetch_executor is None
+                assert not any(thread.is_alive() for thread in executor._threads)
+
+
 class TestWithCache(HelperTests):
     def test_load(self):
         param = Parameters()
@@ -811,6 +970,165 @@ class TestWithCache(HelperTests):
                 assert env.chronics_handler.real_data.data.current_index == 0
                 assert env.chronics_handler.real_data.data.curr_iter == 1
 
+    def _make_env_cache(self, **kwargs):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            env = make("rte_case14_realistic", test=True, chronics_class=MultifolderWithCache,
+                       data_feeding_kwargs=kwargs)
+        env.seed(0)
+        env.chronics_handler.real_data.set_filter(lambda x: True)
+        env.chronics_handler.real_data.reset_cache()
+        return env
+
+    def _check_same_data(self, env, env_ref, nb_reset=5):
+        for _ in range(nb_reset):
+            obs = env.reset()
+            obs_ref = env_ref.reset()
+            assert env.chronics_handler.real_data.data.path == env_ref.chronics_handler.real_data.data.path
+            assert np.all(env.chronics_handler.real_data.data.load_p == env_ref.chronics_handler.real_data.data.load_p)
+            assert np.all(obs.prod_p == obs_ref.prod_p)
+
+    def test_lru_size(self):
+        with self._make_env_cache() as env_ref:
+            assert env_ref.chronics_handler.real_data.cache_info()["size"] == 2
+            with self._make_env_cache(max_cache_size=1) as env:
+                # nothing is loaded when the cache is built
+                real_data = env.chronics_handler.real_data
+                assert real_data.cache_info()["size"] == 0
+                info_before = real_data.cache_info()
+                self._check_same_data(env, env_ref)
+                info = real_data.cache_info()
+                assert info["size"] == 1
+                assert info["max_size"] == 1
+                nb_miss = info["misses"] - info_before["misses"]
+                assert info["hits"] - info_before["hits"] + nb_miss == 5
+                assert info["evictions"] - info_before["evictions"] == nb_miss - 1
+                assert nb_miss > 1
+
+                # unbounded cache: nothing is evicted anymore
+                real_data.set_cache_size(max_cache_size=None)
+                self._check_same_data(env, env_ref)
+                assert real_data.cache_info()["size"] == 2
+                nb_miss = real_data.cache_misses
+                self._check_same_data(env, env_ref)
+                assert real_data.cache_misses == nb_miss
+                real_data.set_cache_size(max_cache_size=1)
+                assert real_data.cache_info()["size"] == 1
+
+    def test_lru_memory(self):
+        with self._make_env_cache() as env_ref:
+            memory_one = env_ref.chronics_handler.real_data.cache_info()["memory"] / 2
+            with self._make_env_cache(max_cache_memory=1.5 * memory_one) as env:
+                real_data = env.chronics_handler.real_data
+                self._check_same_data(env, env_ref)
+                assert real_data.cache_info()["size"] == 1
+                assert real_data.cache_info()["memory"] <= 1.5 * memory_one
+                real_data.set_cache_size(max_cache_memory=2.5 * memory_one)
+                self._check_same_data(env, env_ref)
+                assert real_data.cache_info()["size"] == 2
+
+    def test_lru_wrong_size(self):
+        with self.assertRaises(ChronicsError):
+            MultifolderWithCache(path=os.path.join(PATH_DATA_TEST, "5bus_example_some_missing", "chronics"),
+                                 max_cache_size=0)
+        with self.assertRaises(ChronicsError):
+            MultifolderWithCache(path=os.path.join(PATH_DATA_TEST, "5bus_example_some_missing", "chronics"),
+                                 max_cache_memory=-1.)
+
+    def test_load_data_inherited(self):
+        # the method used by Multifolder (for example to prefetch the episodes) is not shadowed by the cache
+        env = self._make_env_cache()
+        real_data = env.chronics_handler.real_data
+        key = real_data._get_data_key(0)
+        data = real_data._load_data(key, 0)
+        assert data.path == real_data.subpaths[0]
+        assert data.load_p is not None
+        env.close()
+
+
+
+class TestNpyChronics(HelperTests):
+    def setUp(self):
+        self.path_maintenance = os.path.join(PATH_CHRONICS, "chronics_with_maintenance")
+        self.order_backend_loads = ['2_C-10.61', '3_C151.15', '4_C-9.47', '5_C201.84', '6_C-6.27', '9_C130.49',
+                                    '10_C228.66', '11_C-138.89', '12_C-27.88', '13_C-13.33', '14_C63.6']
+        self.order_backend_prods = ['1_G137.1', '2_G-56.47', '3_G36.31', '6_G63.29', '8_G40.43']
+        self.order_backend_lines = ['1_2_1', '1_5_2', '2_3_3', '2_4_4', '2_5_5', '3_4_6', '4_5_7', '4_7_8', '4_9_9',
+                                    '5_6_10', '6_11_11', '6_12_12', '6_13_13', '7_8_14', '7_9_15', '9_10_16', '9_14_17',
+                                    '10_11_18', '12_13_19', '13_14_20']
+        self.order_backend_subs = ['bus_1', 'bus_2', 'bus_3', 'bus_4', 'bus_5', 'bus_6', 'bus_7', 'bus_8', 'bus_9',
+                                   'bus_10', 'bus_11', 'bus_12', 'bus_13', 'bus_14']
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _get_chronics_handler(self, chronics_class, path):
+        res = ChronicsHandler(chronicsClass=chronics_class, path=path)
+        res.initialize(self.order_backend_loads, self.order_backend_prods,
+                       self.order_backend_lines, self.order_backend_subs)
+        return res
+
+    def test_maintenance_npy(self):
+        chron_handl = self._get_chronics_handler(GridStateFromFile, self.path_maintenance)
+        path_csv = os.path.join(self.tmp_dir.name, "csv")
+        path_npy = os.path.join(self.tmp_dir.name, "npy")
+        chron_handl.real_data.split_and_save("2019-01-01 00:00", "2019-01-02 00:00", path_csv)
+        chron_handl.real_data.split_and_save("2019-01-01 00:00", "2019-01-02 00:00", path_npy, file_format="npy")
+        assert os.path.exists(os.path.join(path_npy, "maintenance_time.npy"))
+
+        chron_handl_csv = self._get_chronics_handler(GridStateFromFile, path_csv)
+        chron_handl_npy = self._get_chronics_handler(GridStateFromNpy, path_npy)
+        assert isinstance(chron_handl_npy.real_data.load_p, np.memmap)
+        assert chron_handl_npy.max_timestep() == chron_handl_csv.max_timestep()
+        # first row of the split is the first row of the chronics
+        assert np.all(chron_handl_npy.real_data.load_p[0] == chron_handl.real_data.load_p[0])
+        for i in range(chron_handl_csv.max_timestep()):
+            dt_csv, dict_csv, maint_time_csv, maint_dur_csv, hazard_dur_csv, prod_v_csv = \
+                chron_handl_csv.next_time_step()
+            dt_npy, dict_npy, maint_time_npy, maint_dur_npy, hazard_dur_npy, prod_v_npy = \
+                chron_handl_npy.next_time_step()
+            assert dt_csv == dt_npy
+            for el in ["load_p", "load_q", "prod_p"]:
+                assert np.all(np.abs(dict_csv["injection"][el] - dict_npy["injection"][el]) <= self.tol_one)
+            assert np.all(np.abs(prod_v_csv - prod_v_npy) <= self.tol_one)
+            assert np.all(dict_csv["maintenance"] == dict_npy["maintenance"])
+            assert np.all(dict_csv["hazards"] == dict_npy["hazards"])
+            assert np.all(maint_time_csv == maint_time_npy)
+            assert np.all(maint_dur_csv == maint_dur_npy)
+            assert np.all(hazard_dur_csv == hazard_dur_npy)
+        assert chron_handl_npy.real_data.forecasts() == []
+
+    def test_env_npy(self):
+        path_csv = os.path.join(self.tmp_dir.name, "csv")
+        path_npy = os.path.join(self.tmp_dir.name, "npy")
+        os.mkdir(path_csv)
+        os.mkdir(path_npy)
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            with make("rte_case14_realistic", test=True) as env:
+                env.chronics_handler.real_data.split_and_save("2019-01-06 00:00", "2019-01-06 12:00", path_csv)
+                env.chronics_handler.real_data.split_and_save("2019-01-06 00:00", "2019-01-06 12:00", path_npy,
+                                                              file_format="npy")
+            env_csv = make("rte_case14_realistic", test=True, chronics_path=path_csv)
+            env_npy = make("rte_case14_realistic", test=True, chronics_path=path_npy,
+                           data_feeding_kwargs={"gridvalueClass": GridStateFromNpy})
+        with env_csv:
+            with env_npy:
+                for _ in range(2):
+                    obs_csv = env_csv.reset()
+                    obs_npy = env_npy.reset()
+                    assert env_csv.chronics_handler.get_name() == env_npy.chronics_handler.get_name()
+                    assert isinstance(env_npy.chronics_handler.real_data.data.prod_p, np.memmap)
+                    for ts in range(10):
+                        assert np.all(np.abs(obs_csv.load_p - obs_npy.load_p) <= self.tol_one)
+                        assert np.all(np.abs(obs_csv.prod_p - obs_npy.prod_p) <= self.tol_one)
+                        assert np.all(np.abs(obs_csv.a_or - obs_npy.a_or) <= self.tol_one)
+                        sim_obs_csv, *_ = obs_csv.simulate(env_csv.action_space())
+                        sim_obs_npy, *_ = obs_npy.simulate(env_npy.action_space())
+                        assert np.all(np.abs(sim_obs_csv.load_p - sim_obs_npy.load_p) <= self.tol_one)
+                        obs_csv, *_ = env_csv.step(env_csv.action_space())
+                        obs_npy, *_ = env_npy.step(env_npy.action_space())
 
 
 if __name__ == "__main__":
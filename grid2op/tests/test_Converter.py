@@ -117,6 +117,77 @@ class TestIdToAct(HelperTests):
         assert act == act2
         assert act_ == act2_
 
+    def test_save_mmap(self):
+        path_ = tempfile.mkdtemp()
+        converter = IdToAct(self.env.action_space)
+        converter.init_converter()
+        converter.save(path_, "tmp_convert.npy")
+        converter2 = IdToAct(self.env.action_space)
+        converter2.init_converter(all_actions=os.path.join(path_, "tmp_convert.npy"))
+        assert isinstance(converter2._all_actions_vect, np.memmap)
+        assert converter2.n == converter.n
+        for i in range(converter.n):
+            assert converter.convert_act(i) == converter2.convert_act(i)
+
+        with self.assertRaises(RuntimeError):
+            np.save(os.path.join(path_, "tmp_wrong.npy"), np.zeros((2, 3)))
+            converter2.init_converter(all_actions=os.path.join(path_, "tmp_wrong.npy"))
+
+    def test_array_backed(self):
+        converter = IdToAct(self.env.action_space)
+        converter.init_converter()
+        # actions are not built at initialization
+        assert converter._all_actions is None
+        assert converter._all_actions_vect.shape == (converter.n, self.env.action_space.size())
+        act_0 = converter.convert_act(1)
+        act_1 = converter.convert_act(1)
+        # the action is built once, then kept in memory
+        assert act_0 is act_1
+        assert list(converter._built_actions.keys()) == [1]
+        assert act_0 == self.env.action_space.get_all_unitary_line_set(self.env.action_space)[0]
+        assert converter.convert_act(-1) is converter.convert_act(converter.n - 1)
+        with self.assertRaises(IndexError):
+            converter.convert_act(converter.n)
+
+        # the list of actions is the same as the actions converted
+        converter_list = IdToAct(self.env.action_space)
+        converter_list.init_converter()
+        all_actions = converter_list.all_actions
+        assert converter_list._all_actions_vect is None
+        assert len(all_actions) == converter.n
+        for i in range(converter.n):
+            assert all_actions[i] == converter.convert_act(i)
+        assert converter_list.convert_act(5) is all_actions[5]
+        # the actions already built are kept in the list
+        all_actions_built = converter.all_actions
+        assert all_actions_built[1] is act_0
+        assert converter._built_actions == {}
+
+        # from a list of actions or a matrix
+        converter_list.init_converter(all_actions=all_actions[:10])
+        assert converter_list.n == 10
+        assert converter_list.convert_act(5) == all_actions[5]
+        converter_list.init_converter(all_actions=converter._get_all_actions_vect()[10:15])
+        assert converter_list.n == 5
+        assert converter_list.convert_act(4) == all_actions[14]
+
+    def test_filter_action(self):
+        converter = IdToAct(self.env.action_space)
+        converter.init_converter()
+        converter_list = IdToAct(self.env.action_space)
+        converter_list.init_converter()
+        all_actions = converter_list.all_actions
+
+        def filtering_fun(act):
+            return act.as_dict() != {} and "set_line_status" in act.as_dict()
+        converter.filter_action(filtering_fun)
+        converter_list.filter_action(filtering_fun)
+        assert converter._all_actions is None
+        assert converter.n == converter_list.n
+        assert converter.n == self.env.n_line * 5
+        for i in range(converter.n):
+            assert converter.convert_act(i) == converter_list.convert_act(i)
+
 
 
 if __name__ == "__main__":
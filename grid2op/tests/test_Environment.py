@@ -539,5 +539,52 @@ class TestDeactivateForecast(unittest.TestCase):
         sim_obs, *_ = obs.simulate(self.env1.action_space())
 
 
+class TestKirchhoffMonitor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tol_one = 1e-3
+        param = Parameters()
+        param.KIRCHHOFF_MONITOR = True
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env = make("rte_case14_realistic", test=True, param=param)
+            self.env_no_monitor = make("rte_case14_realistic", test=True)
+
+    def tearDown(self) -> None:
+        self.env.close()
+        self.env_no_monitor.close()
+
+    def test_no_monitor(self):
+        obs, reward, done, info = self.env_no_monitor.step(self.env_no_monitor.action_space())
+        assert info["kirchhoff_imbalance"] is None
+        assert self.env_no_monitor.max_kirchhoff_imbalance == 0.
+
+    def test_monitor(self):
+        action = self.env.action_space({"set_bus": {"generators_id": [(-1, 2)], "lines_or_id": [(0, 2)]}})
+        all_imbalances = []
+        for act in [self.env.action_space(), action, self.env.action_space()]:
+            obs, reward, done, info = self.env.step(act)
+            assert not done
+            p_subs, q_subs, p_bus, q_bus = self.env.backend.check_kirchoff()
+            expected = max(np.max(np.abs(p_bus)), np.max(np.abs(q_bus)))
+            assert abs(info["kirchhoff_imbalance"] - expected) <= 1e-6
+            assert info["kirchhoff_imbalance"] <= self.tol_one
+            all_imbalances.append(info["kirchhoff_imbalance"])
+        assert self.env.max_kirchhoff_imbalance == max(all_imbalances)
+        self.env.reset()
+        assert self.env.max_kirchhoff_imbalance == 0.
+
+    def test_monitor_detects_imbalance(self):
+        check_kirchoff = self.env.backend.check_kirchoff
+
+        def check_kirchoff_wrong():
+            p_subs, q_subs, p_bus, q_bus = check_kirchoff()
+            p_bus[3, 0] += 10.
+            return p_subs, q_subs, p_bus, q_bus
+        self.env.backend.check_kirchoff = check_kirchoff_wrong
+        obs, reward, done, info = self.env.step(self.env.action_space())
+        assert abs(info["kirchhoff_imbalance"] - 10.) <= self.tol_one
+        assert abs(self.env.max_kirchhoff_imbalance - 10.) <= self.tol_one
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -17,6 +17,7 @@ from grid2op.Reward import L2RPNReward
 from grid2op.Backend import PandaPowerBackend
 from grid2op.Runner import Runner
 from grid2op.Episode import EpisodeData
+from grid2op.Agent import DoNothingAgent
 from grid2op.dtypes import dt_float
 
 DEBUG = True
@@ -105,6 +106,103 @@ class TestEpisodeData(unittest.TestCase):
             assert np.abs(
                 dt_float(episode_data.meta["cumulative_reward"]) - self.real_reward) <= self.tol_one
 
+    def _make_runner(self, **kwargs):
+        return Runner(init_grid_path=self.init_grid_path,
+                      path_chron=self.path_chron,
+                      parameters_path=self.parameters_path,
+                      names_chronics_to_backend=self.names_chronics_to_backend,
+                      gridStateclass=self.gridStateclass,
+                      backendClass=self.backendClass,
+                      rewardClass=L2RPNReward,
+                      other_rewards={"test": L2RPNReward},
+                      max_iter=self.max_iter,
+                      name_env="test_episodedata_env",
+                      **kwargs)
+
+    def test_one_episode_by_chunk(self):
+        f_ref = tempfile.mkdtemp()
+        episode_name, cum_reward, timestep = self.runner.run_one_episode(path_save=f_ref)
+        episode_ref = EpisodeData.from_disk(agent_path=f_ref, name=episode_name)
+
+        f = tempfile.mkdtemp()
+        runner = self._make_runner(episode_chunk_size=3)
+        episode_name, cum_reward, timestep = runner.run_one_episode(path_save=f)
+        assert os.path.exists(os.path.join(f, episode_name, "observations.npy"))
+        assert not os.path.exists(os.path.join(f, episode_name, EpisodeData.OBSERVATIONS))
+        episode_data = EpisodeData.from_disk(agent_path=f, name=episode_name)
+        assert int(episode_data.meta["nb_timestep_played"]) == self.max_iter
+        assert np.abs(dt_float(episode_data.meta["cumulative_reward"]) - self.real_reward) <= self.tol_one
+        assert len(episode_data.other_rewards) == self.max_iter
+        assert np.allclose(episode_data.rewards, episode_ref.rewards)
+        assert episode_data.times.shape == episode_ref.times.shape
+        assert np.array_equal(episode_data.disc_lines, episode_ref.disc_lines)
+        assert np.allclose(episode_data.actions.collection, episode_ref.actions.collection, equal_nan=True)
+        assert np.allclose(episode_data.env_actions.collection, episode_ref.env_actions.collection,
+                           equal_nan=True)
+        assert np.allclose(episode_data.observations.collection, episode_ref.observations.collection,
+                           equal_nan=True)
+        assert len(episode_data.observations) == self.max_iter + 1
+
+    def test_partial_episode(self):
+        class CrashAgent(DoNothingAgent):
+            nb_act = 0
+            def act(self, observation, reward, done=False):
+                self.nb_act += 1
+                if self.nb_act > 7:
+                    raise RuntimeError("crash")
+                return super().act(observation, reward, done)
+
+        f = tempfile.mkdtemp()
+        runner = self._make_runner(episode_chunk_size=3, agentClass=CrashAgent)
+        with self.assertRaises(RuntimeError):
+            runner.run_one_episode(path_save=f)
+        episode_name = os.listdir(f)
+        episode_name = [el for el in episode_name if os.path.isdir(os.path.join(f, el))][0]
+        # no file of the episode is left open
+        if os.path.isdir("/proc/self/fd"):
+            opened = [os.path.realpath(os.path.join("/proc/self/fd", el)) for el in os.listdir("/proc/self/fd")]
+            assert not [el for el in opened if el.startswith(os.path.realpath(f))]
+        episode_data = EpisodeData.from_disk(agent_path=f, name=episode_name)
+        # 7 steps were played before the crash: they are all written, even if the data are written every 3 steps
+        assert int(episode_data.meta["nb_timestep_played"]) == 7
+        assert episode_data.episode_times is None
+        assert episode_data.rewards.shape[0] == 7
+        assert len(episode_data.actions) == 7
+        assert len(episode_data.observations) == 8
+        assert len(episode_data.other_rewards) == 7
+
+    def test_lazy(self):
+        f = tempfile.mkdtemp()
+        runner = self._make_runner(episode_chunk_size=4)
+        episode_name, cum_reward, timestep = runner.run_one_episode(path_save=f)
+        episode_ref = EpisodeData.from_disk(agent_path=f, name=episode_name)
+        episode_data = EpisodeData.from_disk(agent_path=f, name=episode_name, lazy=True)
+        assert isinstance(episode_data.observations.collection, np.memmap)
+        assert episode_data.observations.objects is None
+        assert len(episode_data.observations) == len(episode_ref.observations)
+        assert len(episode_data.actions) == len(episode_ref.actions)
+
+        # objects are built when accessed
+        assert episode_data.observations[3] == episode_ref.observations[3]
+        assert episode_data.actions[-1] == episode_ref.actions[-1]
+        assert len([obs for obs in episode_data.observations]) == self.max_iter + 1
+        with self.assertRaises(Grid2OpException):
+            episode_data.actions[self.max_iter]
+
+        # slices are the vectors
+        obs_vect = episode_data.observations[2:5]
+        assert isinstance(obs_vect, np.ndarray)
+        assert obs_vect.shape == (3, episode_data.observation_space.n)
+        assert np.array_equal(obs_vect, episode_ref.observations.collection[2:5], equal_nan=True)
+
+        # compressed files are read entirely, but the objects are still built when accessed
+        f_npz = tempfile.mkdtemp()
+        episode_name, cum_reward, timestep = self.runner.run_one_episode(path_save=f_npz)
+        episode_data = EpisodeData.from_disk(agent_path=f_npz, name=episode_name, lazy=True)
+        assert episode_data.observations.objects is None
+        assert len(episode_data.observations) == self.max_iter + 1
+        assert episode_data.observations[self.max_iter] is not None
+
 
 if __name__ == "__main__":
     unittest.main()
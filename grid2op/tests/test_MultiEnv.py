@@ -12,6 +12,7 @@ from grid2op.tests.helper_path_test import *
 from grid2op.Environment import MultiEnvironment
 from grid2op.MakeEnv import make
 from grid2op.Observation import CompleteObservation
+from grid2op.Exceptions import MultiEnvException
 import pdb
 
 
@@ -57,6 +58,88 @@ class TestLoadingMultiEnv(unittest.TestCase):
                 assert np.all(seeds_1 == seeds_3)
                 assert np.any(seeds_1 != seeds_2)
 
+    def test_shared_memory(self):
+        nb_env = 2
+        nb_step = 5
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            with make("rte_case5_example", test=True) as env:
+                res = []
+                for use_shared_memory in [False, True]:
+                    env.seed(0)
+                    multi_envs = MultiEnvironment(env=env, nb_env=nb_env, use_shared_memory=use_shared_memory)
+                    obss = multi_envs.reset()
+                    all_obs = [np.stack([ob.to_vect() if use_shared_memory is False else ob for ob in obss])]
+                    all_rews = []
+                    for _ in range(nb_step):
+                        obss, rewards, dones, infos = multi_envs.step([env.action_space() for _ in range(nb_env)])
+                        if use_shared_memory:
+                            assert isinstance(obss, np.ndarray)
+                            assert obss.shape == (nb_env, env.observation_space.size())
+                            assert len(infos) == nb_env
+                            assert isinstance(infos[0], dict)
+                        else:
+                            obss = np.stack([ob.to_vect() for ob in obss])
+                        all_obs.append(obss)
+                        all_rews.append(rewards)
+                    multi_envs.close()
+                    res.append((all_obs, all_rews))
+                for obs_pipe, obs_shm in zip(res[0][0], res[1][0]):
+                    assert np.array_equal(obs_pipe, obs_shm, equal_nan=True)
+                for rew_pipe, rew_shm in zip(res[0][1], res[1][1]):
+                    assert np.allclose(rew_pipe, rew_shm)
+
+                multi_envs = MultiEnvironment(env=env, nb_env=nb_env, use_shared_memory=True, return_info=False)
+                multi_envs.reset()
+                obss, rewards, dones, infos = multi_envs.step([env.action_space() for _ in range(nb_env)])
+                assert infos is None
+                obs = env.observation_space.from_vect(obss[0])
+                assert isinstance(obs, CompleteObservation)
+                multi_envs.close()
+
+    def test_step_async(self):
+        nb_env = 3
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            with make("rte_case5_example", test=True) as env:
+                for use_shared_memory in [False, True]:
+                    multi_envs = MultiEnvironment(env=env, nb_env=nb_env, use_shared_memory=use_shared_memory)
+                    multi_envs.reset()
+                    multi_envs.step_async([env.action_space() for _ in range(nb_env)])
+                    with self.assertRaises(MultiEnvException):
+                        # environments are still performing a step
+                        multi_envs.step_async([env.action_space()], env_ids=[0])
+                    obss, rewards, dones, infos = multi_envs.step_wait()
+                    assert len(obss) == nb_env
+                    assert rewards.shape == (nb_env,)
+                    assert dones.shape == (nb_env,)
+                    assert len(infos) == nb_env
+
+                    # only some environments perform a step
+                    multi_envs.step_async([env.action_space(), env.action_space()], env_ids=[2, 0])
+                    env_ids = []
+                    while len(env_ids) < 2:
+                        ids, obss, rewards, dones, infos = multi_envs.poll()
+                        assert len(ids) == len(obss)
+                        assert len(ids) == rewards.shape[0]
+                        env_ids += ids.tolist()
+                    assert sorted(env_ids) == [0, 2]
+                    ids, obss, rewards, dones, infos = multi_envs.poll()
+                    assert len(ids) == 0
+                    assert len(obss) == 0
+
+                    # results are kept if the timeout expired
+                    multi_envs.step_async([env.action_space() for _ in range(nb_env)])
+                    timeout = False
+                    try:
+                        multi_envs.step_wait(timeout=0.)
+                    except MultiEnvException:
+                        timeout = True
+                    obss, rewards, dones, infos = multi_envs.step_wait()
+                    # if all the steps were already over, the results have already been returned
+                    assert len(obss) == (nb_env if timeout else 0)
+                    multi_envs.close()
+
 
 if __name__ == "__main__":
     unittest.main()
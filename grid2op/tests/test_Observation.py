@@ -19,7 +19,7 @@ from grid2op.Chronics import ChronicsHandler, GridStateFromFile
 from grid2op.Rules import RulesChecker
 from grid2op.Reward import L2RPNReward
 from grid2op.Parameters import Parameters
-from grid2op.Backend import PandaPowerBackend
+from grid2op.Backend import Backend, PandaPowerBackend, SparseBackend
 from grid2op.Environment import Environment
 from grid2op.MakeEnv import make
 
@@ -186,6 +186,61 @@ class TestLoadingBackendFunc(unittest.TestCase):
                             ])
         assert np.all(mat[:10,:] == ref_mat)
 
+    def _ref_conn_mats(self, obs):
+        """connectivity matrices computed element by element"""
+        conn_mat = np.zeros((obs.dim_topo, obs.dim_topo), dtype=dt_float)
+        topo_vect_to_sub = np.repeat(np.arange(obs.n_sub), repeats=obs.sub_info)
+        for i in range(obs.dim_topo):
+            for j in range(obs.dim_topo):
+                if i != j and topo_vect_to_sub[i] == topo_vect_to_sub[j] and obs.topo_vect[i] == obs.topo_vect[j]:
+                    conn_mat[i, j] = 1.
+        all_buses = sorted(set([(topo_vect_to_sub[i], obs.topo_vect[i])
+                                for i in range(obs.dim_topo) if obs.topo_vect[i] > 0]))
+        bus_mat = np.eye(len(all_buses), dtype=dt_float)
+        for l_id in range(obs.n_line):
+            pos_or = obs.line_or_pos_topo_vect[l_id]
+            pos_ex = obs.line_ex_pos_topo_vect[l_id]
+            conn_mat[pos_or, pos_ex] = 1.
+            conn_mat[pos_ex, pos_or] = 1.
+            if obs.topo_vect[pos_or] > 0 and obs.topo_vect[pos_ex] > 0:
+                bus_or = all_buses.index((topo_vect_to_sub[pos_or], obs.topo_vect[pos_or]))
+                bus_ex = all_buses.index((topo_vect_to_sub[pos_ex], obs.topo_vect[pos_ex]))
+                bus_mat[bus_or, bus_ex] = 1.
+                bus_mat[bus_ex, bus_or] = 1.
+        return conn_mat, bus_mat
+
+    def test_conn_mat_csr(self):
+        obs = self.env.helper_observation(self.env)
+        mat = obs.connectivity_matrix(as_csr_matrix=True)
+        assert mat.shape == (obs.dim_topo, obs.dim_topo)
+        assert np.all(mat.toarray() == obs.connectivity_matrix())
+        bus_mat = obs.bus_connectivity_matrix(as_csr_matrix=True)
+        assert np.all(bus_mat.toarray() == obs.bus_connectivity_matrix())
+
+    def test_conn_mat_topo_changed(self):
+        obs = self.env.helper_observation(self.env)
+        topo_vect = obs.topo_vect.copy()
+        # split substation 1 in two buses
+        beg_ = np.sum(obs.sub_info[:1])
+        obs.topo_vect[beg_:(beg_ + 3)] = 2
+        # and disconnect powerline 0
+        obs.topo_vect[obs.line_or_pos_topo_vect[0]] = -1
+        obs.topo_vect[obs.line_ex_pos_topo_vect[0]] = -1
+        obs._reset_matrices()
+        ref_conn_mat, ref_bus_mat = self._ref_conn_mats(obs)
+        assert np.all(obs.connectivity_matrix() == ref_conn_mat)
+        assert np.all(obs.connectivity_matrix(as_csr_matrix=True).toarray() == ref_conn_mat)
+        assert obs.bus_connectivity_matrix().shape == (15, 15)
+        assert np.all(obs.bus_connectivity_matrix() == ref_bus_mat)
+        assert np.all(obs.bus_connectivity_matrix(as_csr_matrix=True).toarray() == ref_bus_mat)
+
+        # matrices are recomputed when the observation is updated
+        obs.topo_vect[:] = topo_vect
+        obs._reset_matrices()
+        ref_conn_mat, ref_bus_mat = self._ref_conn_mats(obs)
+        assert np.all(obs.connectivity_matrix(as_csr_matrix=True).toarray() == ref_conn_mat)
+        assert np.all(obs.bus_connectivity_matrix(as_csr_matrix=True).toarray() == ref_bus_mat)
+
     def test_observation_space(self):
         obs = self.env.helper_observation(self.env)
         assert self.env.observation_space.n == obs.size()
@@ -1017,6 +1072,191 @@ class TestSimulateEqualsStep(unittest.TestCase):
 
 ## TODO test -- Add test to cover simulation vs step when there is a planned maintenance operation
 
+
+class TestSimulateBatch(unittest.TestCase):
+    def setUp(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env = make("rte_case14_realistic", test=True)
+        self.obs = self.env.reset()
+        self.actions = [self.env.action_space(),
+                        self.env.action_space({"set_line_status": [(0, -1)]}),
+                        self.env.action_space({"change_line_status": [3]}),
+                        self.env.action_space({"set_bus": {"substations_id": [(1, [1, 2, 2, 1, 1, 2])]}})]
+
+    def tearDown(self):
+        self.env.close()
+
+    def _aux_check(self, rewards, dones, rhos):
+        assert rewards.shape == (len(self.actions),)
+        assert dones.shape == (len(self.actions),)
+        assert rhos.shape == (len(self.actions), self.env.n_line)
+        for i, act in enumerate(self.actions):
+            sim_obs, sim_r, sim_d, _ = self.obs.simulate(act)
+            assert abs(sim_r - rewards[i]) <= 1e-5
+            assert sim_d == dones[i]
+            assert np.allclose(sim_obs.rho, rhos[i])
+
+    def test_simulate_batch(self):
+        rewards, dones, rhos = self.obs.simulate_batch(self.actions)
+        self._aux_check(rewards, dones, rhos)
+
+    def test_simulate_batch_multiprocess(self):
+        rewards, dones, rhos = self.obs.simulate_batch(self.actions, nb_process=2)
+        self._aux_check(rewards, dones, rhos)
+
+    def test_simulate_batch_no_forecast(self):
+        with self.assertRaises(NoForecastAvailable):
+            self.obs.simulate_batch(self.actions, time_step=100)
+
+
+class NoLodfBackend(PandaPowerBackend):
+    """a backend that cannot compute the line outage distribution factors"""
+    get_lodf = Backend.get_lodf
+
+
+class TestContingencyAnalysis(unittest.TestCase):
+    def setUp(self):
+        param = Parameters()
+        # the protections are not taken into account in the contingency analysis
+        param.NO_OVERFLOW_DISCONNECTION = True
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env = make("rte_case14_realistic", test=True, param=param, backend=SparseBackend())
+        self.obs = self.env.reset()
+
+    def tearDown(self):
+        self.env.close()
+
+    def _simulate_all(self, lines):
+        res = np.full((len(lines), self.env.n_line), fill_value=np.NaN, dtype=dt_float)
+        for i, l_id in enumerate(lines):
+            sim_obs, sim_r, sim_d, _ = self.obs.simulate(self.env.action_space({"set_line_status": [(l_id, -1)]}))
+            if not sim_d:
+                res[i] = sim_obs.rho
+        return res
+
+    def test_dc(self):
+        rhos = self.obs.contingency_analysis()
+        assert rhos.shape == (self.env.n_line, self.env.n_line)
+        rhos_sim = self._simulate_all(np.arange(self.env.n_line))
+        # disconnecting powerline 18 isolates a substation
+        assert np.all(np.isnan(rhos[18]))
+        assert np.all(np.isnan(rhos_sim[18]))
+        ok = ~np.any(np.isnan(rhos_sim), axis=1)
+        # error of the DC approximation on this grid: 0.32 at most, 0.02 on average
+        error = np.abs(rhos[ok] - rhos_sim[ok])
+        assert np.max(error) <= 0.35
+        assert np.mean(error) <= 0.025
+        # the disconnections leading to an overflow according to the DC approximation lead to an overflow
+        overflow = np.max(rhos[ok], axis=1) >= 1.
+        overflow_sim = np.max(rhos_sim[ok], axis=1) >= 1.
+        assert np.sum(overflow) == 7
+        assert np.all(overflow_sim[overflow])
+
+    def test_ac(self):
+        lines = np.array([0, 3, 7, 18])
+        rhos = self.obs.contingency_analysis(lines, method="ac", screening_threshold=0.)
+        assert rhos.shape == (4, self.env.n_line)
+        assert np.allclose(rhos, self._simulate_all(lines), equal_nan=True)
+        rhos_multi = self.obs.contingency_analysis(lines, method="ac", screening_threshold=0., nb_process=2)
+        assert np.allclose(rhos, rhos_multi, equal_nan=True)
+
+    def test_ac_screening(self):
+        rhos_dc = self.obs.contingency_analysis()
+        rhos_ac = self.obs.contingency_analysis(method="ac", screening_threshold=0.)
+        # half of the disconnections are computed with an AC powerflow
+        screening_threshold = np.nanmedian(np.max(rhos_dc, axis=1))
+        rhos = self.obs.contingency_analysis(method="ac", screening_threshold=screening_threshold)
+        flagged = ~(np.max(rhos_dc, axis=1) < screening_threshold)
+        assert np.any(flagged) and not np.all(flagged)
+        assert np.allclose(rhos[flagged], rhos_ac[flagged], equal_nan=True)
+        assert np.allclose(rhos[~flagged], rhos_dc[~flagged])
+
+    def test_pandapower(self):
+        param = Parameters()
+        param.NO_OVERFLOW_DISCONNECTION = True
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            env = make("rte_case14_realistic", test=True, param=param)
+        obs = env.reset()
+        assert isinstance(env.backend, PandaPowerBackend)
+        rhos = obs.contingency_analysis()
+        assert np.allclose(rhos, self.obs.contingency_analysis(), rtol=1e-4, atol=1e-4, equal_nan=True)
+        env.close()
+
+    def test_no_lodf(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            env = make("rte_case14_realistic", test=True, backend=NoLodfBackend())
+        obs = env.reset()
+        # the AC powerflows are used instead
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            rhos = obs.contingency_analysis([0, 3])
+        assert len([el for el in w if "outage distribution factors" in str(el.message)]) == 1
+        assert rhos.shape == (2, env.n_line)
+        assert np.all(np.isfinite(rhos))
+        assert np.allclose(rhos, obs.contingency_analysis([0, 3], method="ac"))
+        env.close()
+
+    def test_unknown_method(self):
+        with self.assertRaises(Grid2OpException):
+            self.obs.contingency_analysis(method="ptdf")
+
+
+class TestIncrementalUpdate(unittest.TestCase):
+    def setUp(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env_ref = make("rte_case5_example", test=True)
+            self.env = make("rte_case5_example", test=True)
+        self.env.observation_space.activate_incremental_update()
+        self.obs_ref = self.env_ref.reset()
+        self.obs = self.env.reset()
+
+    def tearDown(self):
+        self.env_ref.close()
+        self.env.close()
+
+    def _aux_compare(self, obs_ref, obs):
+        assert obs_ref == obs
+        vect_ref = obs_ref.to_vect()
+        vect = obs.to_vect()
+        assert np.all(np.isfinite(vect_ref) == np.isfinite(vect))
+        assert np.allclose(vect_ref[np.isfinite(vect_ref)], vect[np.isfinite(vect)])
+        # the patched vector is the same as a rebuilt one
+        obs_cpy = self.env.observation_space.from_vect(vect)
+        assert np.allclose(obs_cpy.topo_vect, obs.topo_vect)
+
+    def test_same_obs(self):
+        self._aux_compare(self.obs_ref, self.obs)
+        actions = [self.env.action_space(),
+                   self.env.action_space({"set_line_status": [(3, -1)]}),
+                   self.env.action_space(),
+                   self.env.action_space({"change_line_status": [2]}),
+                   self.env.action_space({"set_line_status": [(3, 1)]}),
+                   self.env.action_space()]
+        for act in actions:
+            obs_ref, reward_ref, done_ref, _ = self.env_ref.step(act)
+            obs, reward, done, _ = self.env.step(act)
+            assert not done
+            assert done == done_ref
+            self._aux_compare(obs_ref, obs)
+
+    def test_obs_updated_in_place(self):
+        obs, *_ = self.env.step(self.env.action_space())
+        vect = obs.to_vect()
+        obs2, *_ = self.env.step(self.env.action_space())
+        assert obs2 is obs
+        assert obs2.to_vect() is vect
+
+    def test_deactivate(self):
+        self.env.observation_space.deactivate_incremental_update()
+        obs, *_ = self.env.step(self.env.action_space())
+        obs2, *_ = self.env.step(self.env.action_space())
+        assert obs2 is not obs
+
         
 if __name__ == "__main__":
     unittest.main()
@@ -11,8 +11,13 @@ import unittest
 import numpy as np
 import copy
 import pdb
+import time
+import pickle
+import tempfile
 import warnings
 
+import pandapower as pp
+
 import grid2op
 from grid2op.dtypes import dt_int
 from grid2op.tests.helper_path_test import HelperTests, PATH_DATA_TEST_PP, PATH_DATA_TEST
@@ -31,21 +36,30 @@ PATH_DATA_TEST_INIT = PATH_DATA_TEST
 PATH_DATA_TEST = PATH_DATA_TEST_PP
 
 
-class TestNames(unittest.TestCase):
+class MakeBackend(object):
+    """
+    Build the backend tested. The tests of this file can be run on another backend (reading the same pandapower
+    grids) by overriding :func:`MakeBackend.make_backend` (see "test_SparseBackend.py").
+    """
+    def make_backend(self, detailed_infos_for_cascading_failures=False):
+        return PandaPowerBackend(detailed_infos_for_cascading_failures=detailed_infos_for_cascading_failures)
+
+
+class TestNames(MakeBackend, unittest.TestCase):
     def test_properNames(self):
-        with make(os.path.join(PATH_DATA_TEST_INIT, "5bus_example_diff_name")) as env:
+        with make(os.path.join(PATH_DATA_TEST_INIT, "5bus_example_diff_name"), backend=self.make_backend()) as env:
             obs = env.reset()
             assert np.all(obs.name_load == ["tutu", "toto", "tata"])
             assert np.all(env.name_load == ["tutu", "toto", "tata"])
 
 
-class TestLoadingCase(unittest.TestCase):
+class TestLoadingCase(MakeBackend, unittest.TestCase):
     def setUp(self):
         self.tolvect = 1e-2
         self.tol_one = 1e-5
 
     def test_load_file(self):
-        backend = PandaPowerBackend()
+        backend = self.make_backend()
         path_matpower = PATH_DATA_TEST
         case_file = "test_case14.json"
         backend.load_grid(path_matpower, case_file)
@@ -90,7 +104,7 @@ class TestLoadingCase(unittest.TestCase):
             pass
 
     def test_assert_grid_correct(self):
-        backend = PandaPowerBackend()
+        backend = self.make_backend()
         path_matpower = PATH_DATA_TEST
         case_file = "test_case14.json"
         backend.load_grid(path_matpower, case_file)
@@ -100,10 +114,10 @@ class TestLoadingCase(unittest.TestCase):
         backend.assert_grid_correct_after_powerflow()
 
 
-class TestLoadingBackendFunc(unittest.TestCase):
+class TestLoadingBackendFunc(MakeBackend, unittest.TestCase):
     # Cette méthode sera appelée avant chaque test.
     def setUp(self):
-        self.backend = PandaPowerBackend()
+        self.backend = self.make_backend()
         self.path_matpower = PATH_DATA_TEST
         self.case_file = "test_case14.json"
         self.backend.load_grid(self.path_matpower, self.case_file)
@@ -469,10 +483,10 @@ class TestLoadingBackendFunc(unittest.TestCase):
         assert not flows[17]
 
 
-class TestTopoAction(unittest.TestCase):
+class TestTopoAction(MakeBackend, unittest.TestCase):
     # Cette méthode sera appelée avant chaque test.
     def setUp(self):
-        self.backend = PandaPowerBackend()
+        self.backend = self.make_backend()
         self.path_matpower = PATH_DATA_TEST
         self.case_file = "test_case14.json"
         self.backend.load_grid(self.path_matpower, self.case_file)
@@ -516,6 +530,29 @@ class TestTopoAction(unittest.TestCase):
                                   1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], dtype=dt_int)
         assert self.compare_vect(topo_vect, topo_vect_old) == True
 
+    def test_get_topo_vect_disconnect(self):
+        conv = self.backend.runpf()
+        assert conv
+        topo_vect = copy.deepcopy(self.backend.get_topo_vect())
+        assert np.all(topo_vect == 1)
+
+        # the topology vector is updated if a powerline is disconnected directly in the backend
+        l_id = 3
+        self.backend._disconnect_line(l_id)
+        conv = self.backend.runpf()
+        assert conv
+        topo_vect = self.backend.get_topo_vect()
+        assert topo_vect[self.backend.line_or_pos_topo_vect[l_id]] == -1
+        assert topo_vect[self.backend.line_ex_pos_topo_vect[l_id]] == -1
+        assert np.sum(topo_vect == -1) == 2
+        assert np.all(topo_vect == self.backend._get_topo_vect())
+
+        # and restored if it is reconnected
+        self.backend._reconnect_line(l_id)
+        conv = self.backend.runpf()
+        assert conv
+        assert np.all(self.backend.get_topo_vect() == 1)
+
     def test_topo_set1sub(self):
         # retrieve some initial data to be sure only a subpart of the _grid is modified
         conv = self.backend.runpf()
@@ -764,12 +801,12 @@ class TestTopoAction(unittest.TestCase):
             pass
 
 
-class TestEnvPerformsCorrectCascadingFailures(unittest.TestCase):
+class TestEnvPerformsCorrectCascadingFailures(MakeBackend, unittest.TestCase):
     """
     Test the "next_grid_state" method of the back-end
     """
     def setUp(self):
-        self.backend = PandaPowerBackend(detailed_infos_for_cascading_failures=True)
+        self.backend = self.make_backend(detailed_infos_for_cascading_failures=True)
         self.path_matpower = PATH_DATA_TEST
         self.case_file = "test_case14.json"
         self.backend.load_grid(self.path_matpower, self.case_file)
@@ -968,11 +1005,11 @@ class TestEnvPerformsCorrectCascadingFailures(unittest.TestCase):
                 assert (not grid_tmp.get_line_status()[self.id_2nd_line_disco])
 
 
-class TestChangeBusAffectRightBus(unittest.TestCase):
+class TestChangeBusAffectRightBus(MakeBackend, unittest.TestCase):
     def test_set_bus(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env = make(test=True)
+            env = make(test=True, backend=self.make_backend())
         env.reset()
         # action = env.helper_action_player({"change_bus": {"lines_or_id": [17]}})
         action = env.helper_action_player({"set_bus": {"lines_or_id": [(17, 2)]}})
@@ -983,7 +1020,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_change_bus(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env = make(test=True)
+            env = make(test=True, backend=self.make_backend())
         env.reset()
         action = env.helper_action_player({"change_bus": {"lines_or_id": [17]}})
         obs, reward, done, info = env.step(action)
@@ -993,7 +1030,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_change_bustwice(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env = make(test=True)
+            env = make(test=True, backend=self.make_backend())
         env.reset()
         action = env.helper_action_player({"change_bus": {"lines_or_id": [17]}})
         obs, reward, done, info = env.step(action)
@@ -1012,7 +1049,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_isolate_load(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env = make(test=True)
+            env = make(test=True, backend=self.make_backend())
         act = env.action_space({"set_bus": {"loads_id": [(0, 2)]}})
         obs, reward, done, info = env.step(act)
         assert done, "an isolated laod has not lead to a game over"
@@ -1020,7 +1057,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_reco_disco_bus(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env_case1 = make("rte_case5_example", test=True, gamerules_class=AlwaysLegal)
+            env_case1 = make("rte_case5_example", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal)
         obs = env_case1.reset()  # reset is good
         act = env_case1.action_space.disconnect_powerline(line_id=5)  # I disconnect a powerline
         obs, reward, done, info = env_case1.step(act)  # do the action, it's valid
@@ -1033,7 +1070,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_reco_disco_bus2(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env_case2 = make("rte_case5_example", test=True, gamerules_class=AlwaysLegal)
+            env_case2 = make("rte_case5_example", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal)
         obs = env_case2.reset()  # reset is good
         obs, reward, done, info = env_case2.step(env_case2.action_space())  # do the action, it's valid
         act_case2 = env_case2.action_space.reconnect_powerline(line_id=5, bus_or=2, bus_ex=2)  # reconnect powerline on bus 2 both ends
@@ -1046,7 +1083,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_reco_disco_bus3(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env_case2 = make("rte_case5_example", test=True, gamerules_class=AlwaysLegal)
+            env_case2 = make("rte_case5_example", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal)
         obs = env_case2.reset()  # reset is good
         obs, reward, done, info = env_case2.step(env_case2.action_space())  # do the action, it's valid
         act_case2 = env_case2.action_space.reconnect_powerline(line_id=5, bus_or=1, bus_ex=2)  # reconnect powerline on bus 2 both ends
@@ -1057,7 +1094,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_reco_disco_bus4(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env_case2 = make("rte_case5_example", test=True, gamerules_class=AlwaysLegal)
+            env_case2 = make("rte_case5_example", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal)
         obs = env_case2.reset()  # reset is good
         obs, reward, done, info = env_case2.step(env_case2.action_space())  # do the action, it's valid
         act_case2 = env_case2.action_space.reconnect_powerline(line_id=5, bus_or=2, bus_ex=1)  # reconnect powerline on bus 2 both ends
@@ -1068,7 +1105,7 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
     def test_reco_disco_bus5(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env_case2 = make("rte_case5_example", test=True, gamerules_class=AlwaysLegal)
+            env_case2 = make("rte_case5_example", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal)
         obs = env_case2.reset()  # reset is good
         act_case2 = env_case2.action_space({"set_bus": {"lines_or_id": [(5,2)], "lines_ex_id": [(5,2)]}})  # reconnect powerline on bus 2 both ends
         # this should not lead to a game over this time, the grid is connex!
@@ -1076,20 +1113,20 @@ class TestChangeBusAffectRightBus(unittest.TestCase):
         assert done_case2
 
 
-class TestShuntAction(HelperTests):
+class TestShuntAction(MakeBackend, HelperTests):
     def test_shunt_ambiguous_id_incorrect(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            with make("rte_case5_example", test=True, gamerules_class=AlwaysLegal, action_class=CompleteAction) as env_case2:
+            with make("rte_case5_example", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal, action_class=CompleteAction) as env_case2:
                 with self.assertRaises(AmbiguousAction):
                     act = env_case2.action_space({"shunt": {"set_bus": [(0, 2)]}})
 
     def test_shunt_effect(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env_ref = make("rte_case14_realistic", test=True, gamerules_class=AlwaysLegal,
+            env_ref = make("rte_case14_realistic", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal,
                                action_class=CompleteAction)
-            env_change_q = make("rte_case14_realistic", test=True, gamerules_class=AlwaysLegal,
+            env_change_q = make("rte_case14_realistic", test=True, backend=self.make_backend(), gamerules_class=AlwaysLegal,
                                     action_class=CompleteAction)
 
         obs_ref, *_ = env_ref.step(env_ref.action_space())
@@ -1104,13 +1141,13 @@ class TestShuntAction(HelperTests):
         assert np.abs(obs_ref.v_or[10] - obs_change_p.v_or[10]) < self.tol_one
 
 
-class TestResetEqualsLoadGrid(unittest.TestCase):
+class TestResetEqualsLoadGrid(MakeBackend, unittest.TestCase):
     def setUp(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            self.env1 = make("rte_case5_example", test=True, backend=PandaPowerBackend())
+            self.env1 = make("rte_case5_example", test=True, backend=self.make_backend())
             self.backend1 = self.env1.backend
-            self.env2 = make("rte_case5_example", test=True, backend=PandaPowerBackend())
+            self.env2 = make("rte_case5_example", test=True, backend=self.make_backend())
             self.backend2 = self.env2.backend
 
     def tearDown(self):
@@ -1218,18 +1255,18 @@ class TestResetEqualsLoadGrid(unittest.TestCase):
         assert np.all(obs1.actual_dispatch == obs2.actual_dispatch)
 
 
-class TestVoltageOWhenDisco(unittest.TestCase):
+class TestVoltageOWhenDisco(MakeBackend, unittest.TestCase):
     def test_this(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            with make("rte_case14_realistic", test=True) as env:
+            with make("rte_case14_realistic", test=True, backend=self.make_backend()) as env:
                 line_id = 1
                 act = env.action_space({"set_line_status": [(line_id, -1)]})
                 obs, *_ = env.step(act)
                 assert obs.v_or[line_id] == 0.  # is not 0 however line is not connected
 
 
-class TestChangeBusSlack(unittest.TestCase):
+class TestChangeBusSlack(MakeBackend, unittest.TestCase):
     def setUp(self):
         self.tolvect = 1e-2
         self.tol_one = 1e-5
@@ -1237,7 +1274,7 @@ class TestChangeBusSlack(unittest.TestCase):
     def test_change_slack_case14(self):
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore")
-            env = grid2op.make("rte_case14_realistic", test=True)
+            env = grid2op.make("rte_case14_realistic", test=True, backend=self.make_backend())
         action = env.action_space({"set_bus": {"generators_id": [(-1, 2)], "lines_or_id": [(0, 2)]}})
         obs, reward, am_i_done, info = env.step(action)
         assert am_i_done is False
@@ -1248,5 +1285,283 @@ class TestChangeBusSlack(unittest.TestCase):
         assert np.all(np.abs(p_bus) <= self.tol_one)
 
 
+class TestGetSetState(MakeBackend, unittest.TestCase):
+    def setUp(self):
+        self.tol_one = 1e-5
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env = make("rte_case14_realistic", test=True, backend=self.make_backend(),
+                            gamerules_class=AlwaysLegal)
+        self.backend = self.env.backend
+
+    def tearDown(self):
+        self.env.close()
+
+    def _compare_results(self, p_or, a_or, prod_p, topo_vect):
+        assert np.max(np.abs(self.backend.p_or - p_or)) <= self.tol_one
+        assert np.max(np.abs(self.backend.a_or - a_or)) <= self.tol_one
+        assert np.max(np.abs(self.backend.prod_p - prod_p)) <= self.tol_one
+        assert np.all(self.backend.get_topo_vect() == topo_vect)
+
+    def test_set_state_restores_backend(self):
+        state = self.backend.get_state()
+        p_or = copy.deepcopy(self.backend.p_or)
+        a_or = copy.deepcopy(self.backend.a_or)
+        prod_p = copy.deepcopy(self.backend.prod_p)
+        topo_vect = copy.deepcopy(self.backend.get_topo_vect())
+
+        # modify the topology, the status of a powerline and the injections
+        action = self.env.action_space({"set_bus": {"generators_id": [(-1, 2)], "lines_or_id": [(0, 2)]},
+                                        "set_line_status": [(2, -1)]})
+        obs, reward, done, info = self.env.step(action)
+        assert not done
+        assert np.any(self.backend.get_topo_vect() != topo_vect)
+
+        self.backend.set_state(state)
+        self._compare_results(p_or, a_or, prod_p, topo_vect)
+        # the state is not modified by set_state, and the powerflow gives the same results
+        self.backend.runpf()
+        self._compare_results(p_or, a_or, prod_p, topo_vect)
+        self.backend.set_state(state)
+        self._compare_results(p_or, a_or, prod_p, topo_vect)
+
+    def test_state_lighter_than_copy(self):
+        size_state = len(pickle.dumps(self.backend.get_state()))
+        size_copy = len(pickle.dumps(self.backend._grid))
+        assert size_state < size_copy
+
+    def test_simulate_after_obs_copy(self):
+        obs = self.env.get_obs()
+        obs_cpy = obs.copy()
+        # the backend is shared between the copies, but each one restores its state before simulating
+        assert obs_cpy._obs_env.backend is obs._obs_env.backend
+        action = self.env.action_space({"set_line_status": [(2, -1)]})
+        sim_obs, reward, done, info = obs.simulate(self.env.action_space())
+        sim_obs_cpy, *_ = obs_cpy.simulate(action)
+        sim_obs_cpy2, *_ = obs_cpy.simulate(self.env.action_space())
+        assert np.max(np.abs(sim_obs.a_or - sim_obs_cpy2.a_or)) <= self.tol_one
+        assert np.max(np.abs(sim_obs.a_or - sim_obs_cpy.a_or)) > self.tol_one
+
+
+class TestPtdfLodf(MakeBackend, unittest.TestCase):
+    """check the power transfer and line outage distribution factors against DC powerflows"""
+    def setUp(self):
+        self.tol = 1e-3
+        self.backend = self.make_backend()
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.backend.load_grid(PATH_DATA_TEST, "test_case14.json")
+        assert self.backend.runpf(is_dc=True)
+        self.p_or_init = 1. * self.backend.p_or
+
+    def test_ptdf(self):
+        ptdf = self.backend.get_ptdf()
+        assert ptdf.shape == (self.backend.n_line, 2 * self.backend.n_sub)
+        # the buses 2 are not used
+        assert np.all(ptdf[:, self.backend.n_sub:] == 0.)
+        for load_id in [0, 5]:
+            backend = self.backend.copy()
+            bus_id = backend._grid.load["bus"].values[load_id]
+            backend._grid.load["p_mw"].values[load_id] += 10.
+            assert backend.runpf(is_dc=True)
+            p_or_ptdf = self.p_or_init - 10. * ptdf[:, bus_id]
+            assert np.max(np.abs(p_or_ptdf - backend.p_or)) <= self.tol
+
+    def test_lodf(self):
+        lodf = self.backend.get_lodf()
+        assert lodf.shape == (self.backend.n_line, self.backend.n_line)
+        # disconnecting powerline 18 isolates a substation
+        assert np.all(np.isnan(lodf[:, 18]))
+        assert np.sum(np.any(np.isnan(lodf), axis=0)) == 1
+        for l_id in range(self.backend.n_line):
+            if l_id == 18:
+                continue
+            assert lodf[l_id, l_id] == -1.
+            backend = self.backend.copy()
+            backend._disconnect_line(l_id)
+            assert backend.runpf(is_dc=True)
+            p_or_lodf = self.p_or_init + lodf[:, l_id] * self.p_or_init[l_id]
+            assert np.max(np.abs(p_or_lodf - backend.p_or)) <= self.tol
+
+        # the columns of the powerlines disconnected are filled with 0.
+        self.backend._disconnect_line(3)
+        assert self.backend.runpf(is_dc=True)
+        lodf = self.backend.get_lodf()
+        assert np.all(lodf[:, 3] == 0.)
+        assert np.all(self.backend.get_ptdf()[3] == 0.)
+
+
+class TestWarmStartCache(unittest.TestCase):
+    def setUp(self):
+        self.tol_one = 1e-5
+        # no powerline is disconnected by the environment: each step computes a single powerflow
+        param = Parameters()
+        param.NO_OVERFLOW_DISCONNECTION = True
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.env = make("rte_case14_realistic", test=True, backend=PandaPowerBackend(warm_start_cache_size=2),
+                            gamerules_class=AlwaysLegal, param=param)
+            self.env_ref = make("rte_case14_realistic", test=True, backend=PandaPowerBackend(warm_start_cache_size=0),
+                                gamerules_class=AlwaysLegal, param=param)
+        self.backend = self.env.backend
+        self.topo_1 = {"set_bus": {"generators_id": [(-1, 2)], "lines_or_id": [(0, 2)]}}
+        self.topo_2 = {"set_line_status": [(3, -1)]}
+        self.topo_ref = {"set_bus": {"generators_id": [(-1, 1)], "lines_or_id": [(0, 1)]},
+                         "set_line_status": [(3, 1)]}
+
+    def tearDown(self):
+        self.env.close()
+        self.env_ref.close()
+
+    def _step_both(self, act_dict):
+        obs, reward, done, info = self.env.step(self.env.action_space(act_dict))
+        obs_ref, *_ = self.env_ref.step(self.env_ref.action_space(act_dict))
+        assert not done
+        assert np.max(np.abs(obs.a_or - obs_ref.a_or)) <= self.tol_one
+        assert np.max(np.abs(obs.v_or - obs_ref.v_or)) <= self.tol_one
+        return obs
+
+    def test_same_results_fewer_iterations(self):
+        for act_dict in [{}, self.topo_1, self.topo_ref, self.topo_1, self.topo_ref, {}]:
+            self._step_both(act_dict)
+        assert self.backend.nb_cache_hit > 0
+        assert self.env_ref.backend.nb_cache_hit == 0
+        assert self.env_ref.backend.nb_cache_miss == 0
+        assert self.backend.nb_iter_total < self.env_ref.backend.nb_iter_total
+
+    def test_hit_and_miss(self):
+        nb_hit = self.backend.nb_cache_hit
+        nb_miss = self.backend.nb_cache_miss
+        self._step_both(self.topo_1)
+        # first time this topology is encountered
+        assert self.backend.nb_cache_miss == nb_miss + 1
+        assert self.backend.nb_cache_hit == nb_hit
+        self._step_both({})
+        assert self.backend.nb_cache_miss == nb_miss + 1
+        assert self.backend.nb_cache_hit == nb_hit + 1
+
+    def test_lru_eviction(self):
+        self._step_both(self.topo_1)
+        self._step_both(self.topo_2)
+        self._step_both(self.topo_ref)
+        assert len(self.backend._warm_start_cache) == 2
+        # the topology of the first step is the least recently used: it has been removed
+        nb_miss = self.backend.nb_cache_miss
+        self._step_both(self.topo_1)
+        assert self.backend.nb_cache_miss == nb_miss + 1
+        assert len(self.backend._warm_start_cache) == 2
+
+    def test_cache_kept_after_reset(self):
+        self._step_both(self.topo_1)
+        cached = set(self.backend._warm_start_cache.keys())
+        nb_hit = self.backend.nb_cache_hit
+        self.env.reset()
+        assert set(self.backend._warm_start_cache.keys()) == cached
+        # the reference topology, used after the reset, was already in the cache
+        assert self.backend.nb_cache_hit > nb_hit
+
+
+class TestApplyActionColumns(MakeBackend, unittest.TestCase):
+    """check that the pandapower dataframes are modified as expected by PandaPowerBackend.apply_action"""
+    def setUp(self):
+        self.backend = self.make_backend()
+        self.backend.load_grid(PATH_DATA_TEST, "test_case14.json")
+        self.backend.set_env_name("TestApplyActionColumns_env")
+        as_class = ActionSpace.init_grid(self.backend)
+        self.helper_action = as_class(gridobj=self.backend, legal_action=RulesChecker().legal_action)
+        self.bk_action = _BackendAction.init_grid(self.backend)()
+        grid = self.backend._grid
+        self.nb_bus = grid.bus.shape[0] // 2
+        self.nb_pp_line = grid.line.shape[0]
+        self.init_cols = {(table, col): grid[table][col].values.copy()
+                          for table, col in [("load", "bus"), ("gen", "bus"), ("line", "from_bus"),
+                                             ("line", "to_bus"), ("trafo", "hv_bus"), ("trafo", "lv_bus"),
+                                             ("load", "in_service"), ("gen", "in_service"),
+                                             ("line", "in_service"), ("trafo", "in_service")]}
+        # one load, one generator, one origin and one extremity of a powerline and of a transformer
+        self.elements = {"loads_id": ("load", "bus", 2),
+                         "generators_id": ("gen", "bus", 1),
+                         "lines_or_id": [("line", "from_bus", 3), ("trafo", "hv_bus", self.nb_pp_line + 1)],
+                         "lines_ex_id": [("line", "to_bus", 5), ("trafo", "lv_bus", self.nb_pp_line + 2)]}
+
+    def _all_elements(self):
+        for key, val in self.elements.items():
+            for table, col, el_id in (val if isinstance(val, list) else [val]):
+                row = el_id - self.nb_pp_line if table == "trafo" else el_id
+                yield key, table, col, el_id, row
+
+    def _ids(self, bus=None):
+        res = {}
+        for key, _, _, el_id, _ in self._all_elements():
+            res.setdefault(key, []).append(el_id if bus is None else (el_id, bus))
+        return res
+
+    def _apply(self, dict_):
+        # the same backend action is used, like in the environment, to keep track of the current topology
+        self.bk_action += self.helper_action(dict_)
+        self.backend.apply_action(self.bk_action)
+        self.bk_action.reset()
+
+    def _check(self, expected_bus, expected_status):
+        grid = self.backend._grid
+        for (table, col), init_val in self.init_cols.items():
+            expected = init_val.copy()
+            for key, table_el, col_el, el_id, row in self._all_elements():
+                if table_el != table:
+                    continue
+                if col == "in_service":
+                    expected[row] = expected_status[key, el_id]
+                elif col == col_el and expected_status[key, el_id]:
+                    expected[row] = expected_bus[key, el_id]
+            assert np.all(grid[table][col].values == expected), "wrong column {} of {}".format(col, table)
+
+    def _expected_bus(self, bus):
+        return {(key, el_id): self.init_cols[table, col][row] + (self.nb_bus if bus == 2 else 0)
+                for key, table, col, el_id, row in self._all_elements()}
+
+    def test_set_bus(self):
+        status = {(key, el_id): True for key, _, _, el_id, _ in self._all_elements()}
+        self._apply({"set_bus": self._ids(2)})
+        self._check(self._expected_bus(2), status)
+        self._apply({"set_bus": self._ids(1)})
+        self._check(self._expected_bus(1), status)
+
+    def test_change_bus(self):
+        status = {(key, el_id): True for key, _, _, el_id, _ in self._all_elements()}
+        self._apply({"change_bus": self._ids()})
+        self._check(self._expected_bus(2), status)
+        self._apply({"change_bus": self._ids()})
+        self._check(self._expected_bus(1), status)
+
+    def test_disconnect(self):
+        # the buses are not modified, only the status
+        status = {(key, el_id): False for key, _, _, el_id, _ in self._all_elements()}
+        self._apply({"set_bus": self._ids(-1)})
+        self._check(self._expected_bus(1), status)
+        # disconnecting a load or a generator is a game over
+        assert not self.backend.runpf()
+
+    def test_out_of_service_in_original_grid(self):
+        grid = pp.from_json(os.path.join(PATH_DATA_TEST, "test_case14.json"))
+        grid.load["in_service"].values[3] = False
+        grid.gen["in_service"].values[1] = False
+        with tempfile.TemporaryDirectory() as path:
+            pp.to_json(grid, os.path.join(path, "test_case14_load_off.json"))
+            backend = self.make_backend()
+            backend.load_grid(path, "test_case14_load_off.json")
+        # a load or a generator out of service in the original grid does not prevent the powerflow to converge
+        for is_dc in [False, True]:
+            assert backend.runpf(is_dc=is_dc)
+            assert backend.get_topo_vect()[backend.load_pos_topo_vect[3]] == -1
+            assert backend.get_topo_vect()[backend.gen_pos_topo_vect[1]] == -1
+            assert np.all(np.isfinite(backend.get_line_flow()))
+            # and they neither consume nor produce anything
+            load_p, load_q, _ = backend.loads_info()
+            prod_p, prod_q, prod_v = backend.generators_info()
+            assert load_p[3] == 0. and load_q[3] == 0.
+            assert prod_p[1] == 0. and prod_q[1] == 0. and prod_v[1] == 0.
+            assert np.all(load_p[np.arange(backend.n_load) != 3] > 0.)
+
+
 if __name__ == "__main__":
     unittest.main()
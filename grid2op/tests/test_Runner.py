@@ -8,6 +8,7 @@
 
 import warnings
 import tempfile
+import time
 import pdb
 
 from grid2op.tests.helper_path_test import *
@@ -21,6 +22,16 @@ from grid2op.Runner import Runner
 from grid2op.dtypes import dt_float
 
 
+def _slow_first_episode_worker(args):
+    """play the episodes in the processes of the pool, the first one being the last to finish"""
+    if args[0] == 0:
+        time.sleep(2.)
+    return _ONE_EPISODE_WORKER(args)
+
+
+_ONE_EPISODE_WORKER = Runner._one_episode_worker
+
+
 class TestRunner(HelperTests):
     def setUp(self):
         self.init_grid_path = os.path.join(PATH_DATA_TEST_PP, "test_case14.json")
@@ -78,6 +89,75 @@ class TestRunner(HelperTests):
             assert int(timestep) == self.max_iter
             assert np.abs(cum_reward - self.real_reward) <= self.tol_one
 
+    def test_run_iter(self):
+        res = list(self.runner.run_iter(nb_episode=3, nb_process=2, max_iter=self.max_iter))
+        assert len(res) == 3
+        for i, _, cum_reward, timestep, total_ts in res:
+            assert int(timestep) == self.max_iter
+            assert np.abs(cum_reward - self.real_reward) <= self.tol_one
+        assert self.runner._pool is None
+
+        # sequential
+        res = list(self.runner.run_iter(nb_episode=2, max_iter=self.max_iter))
+        assert len(res) == 2
+
+        # results are available before all the episodes are over
+        it_ = self.runner.run_iter(nb_episode=4, nb_process=2, max_iter=self.max_iter)
+        first = next(it_)
+        assert int(first[3]) == self.max_iter
+        it_.close()
+        assert self.runner._pool is None
+
+    def test_parrallel_order(self):
+        res_seq = self.runner.run_sequential(nb_episode=3, max_iter=self.max_iter)
+        Runner._one_episode_worker = staticmethod(_slow_first_episode_worker)
+        try:
+            # the first episode finishes last
+            res_iter = list(self.runner.run_iter(nb_episode=3, nb_process=2, max_iter=self.max_iter))
+            res = self.runner.run_parrallel(nb_episode=3, nb_process=2, max_iter=self.max_iter)
+        finally:
+            Runner._one_episode_worker = staticmethod(_ONE_EPISODE_WORKER)
+        assert res_iter[-1][1] == res_seq[0][1]
+        # but the episodes are returned in the order they were started
+        assert [el[1] for el in res] == [el[1] for el in res_seq]
+
+    def test_parrallel_pbar(self):
+        class CountPbar(object):
+            nb_update = 0
+            def __init__(self, total, desc):
+                self.total = total
+            def update(self, n):
+                CountPbar.nb_update += n
+            def __enter__(self):
+                return self
+            def __exit__(self, *args):
+                pass
+        res = self.runner.run(nb_episode=3, nb_process=2, max_iter=self.max_iter, pbar=CountPbar)
+        assert len(res) == 3
+        assert CountPbar.nb_update == 3
+
+    def test_pool(self):
+        self.runner.start_pool(nb_process=2)
+        try:
+            for _ in range(2):
+                # the same processes are used for both calls
+                res = self.runner.run(nb_episode=3, max_iter=self.max_iter)
+                assert len(res) == 3
+                for i, _, cum_reward, timestep, total_ts in res:
+                    assert int(timestep) == self.max_iter
+                    assert np.abs(cum_reward - self.real_reward) <= self.tol_one
+            res = self.runner.run(nb_episode=2, max_iter=5)
+            assert len(res) == 2
+            for i, _, cum_reward, timestep, total_ts in res:
+                assert int(timestep) == 5
+            # max_iter of the runner is used again
+            res = self.runner.run_parrallel(nb_episode=2)
+            for i, _, cum_reward, timestep, total_ts in res:
+                assert int(timestep) == self.max_iter
+        finally:
+            self.runner.close_pool()
+        assert self.runner._pool is None
+
     def test_complex_agent(self):
         nb_episode = 4
         with warnings.catch_warnings():
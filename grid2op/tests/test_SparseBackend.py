@@ -0,0 +1,477 @@
+# Copyright (c) 2019-2020, RTE (https://www.rte-france.com)
+# See AUTHORS.txt
+# This Source Code Form is subject to the terms of the Mozilla Public License, version 2.0.
+# If a copy of the Mozilla Public License, version 2.0 was not distributed with this file,
+# you can obtain one at http://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+# This file is part of Grid2Op, Grid2Op a testbed platform to model sequential decision making in power systems.
+
+import os
+import unittest
+import copy
+import pickle
+import tempfile
+import warnings
+import numpy as np
+import scipy.sparse
+import pandapower as pp
+
+from grid2op.tests.helper_path_test import PATH_DATA_TEST_PP
+from grid2op.Backend import Backend, PandaPowerBackend, SparseBackend
+from grid2op.Parameters import Parameters
+from grid2op.Chronics import ChronicsHandler
+from grid2op.Environment import Environment
+from grid2op.Exceptions import DivergingPowerFlow
+import grid2op.tests.test_PandaPowerBackend as test_pp
+
+
+class MakeSparseBackend(test_pp.MakeBackend):
+    def make_backend(self, detailed_infos_for_cascading_failures=False):
+        return SparseBackend(detailed_infos_for_cascading_failures=detailed_infos_for_cascading_failures)
+
+
+# all the tests of the PandaPowerBackend are performed with the SparseBackend
+class TestNamesSparse(MakeSparseBackend, test_pp.TestNames):
+    pass
+
+
+class TestLoadingCaseSparse(MakeSparseBackend, test_pp.TestLoadingCase):
+    pass
+
+
+class TestLoadingBackendFuncSparse(MakeSparseBackend, test_pp.TestLoadingBackendFunc):
+    pass
+
+
+class TestTopoActionSparse(MakeSparseBackend, test_pp.TestTopoAction):
+    pass
+
+
+class TestEnvPerformsCorrectCascadingFailuresSparse(MakeSparseBackend, test_pp.TestEnvPerformsCorrectCascadingFailures):
+    pass
+
+
+class TestChangeBusAffectRightBusSparse(MakeSparseBackend, test_pp.TestChangeBusAffectRightBus):
+    pass
+
+
+class TestShuntActionSparse(MakeSparseBackend, test_pp.TestShuntAction):
+    pass
+
+
+class TestResetEqualsLoadGridSparse(MakeSparseBackend, test_pp.TestResetEqualsLoadGrid):
+    pass
+
+
+class TestVoltageOWhenDiscoSparse(MakeSparseBackend, test_pp.TestVoltageOWhenDisco):
+    pass
+
+
+class TestChangeBusSlackSparse(MakeSparseBackend, test_pp.TestChangeBusSlack):
+    pass
+
+
+class TestGetSetStateSparse(MakeSparseBackend, test_pp.TestGetSetState):
+    pass
+
+
+class TestApplyActionColumnsSparse(MakeSparseBackend, test_pp.TestApplyActionColumns):
+    pass
+
+
+class TestPtdfLodfSparse(MakeSparseBackend, test_pp.TestPtdfLodf):
+    pass
+
+
+class TestSparseBackend(unittest.TestCase):
+    def setUp(self):
+        self.tol = 1e-3
+        self.backend_pp = PandaPowerBackend()
+        self.backend = SparseBackend()
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            self.backend_pp.load_grid(PATH_DATA_TEST_PP, "test_case14.json")
+            self.backend.load_grid(PATH_DATA_TEST_PP, "test_case14.json")
+
+    def _compare_with_pp(self, is_dc):
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            conv_pp = self.backend_pp.runpf(is_dc=is_dc)
+        conv = self.backend.runpf(is_dc=is_dc)
+        assert conv_pp and conv
+        attr_nms = ["p_or", "q_or", "p_ex", "q_ex"]
+        if not is_dc:
+            # in DC, the voltages (and the flows in amps) of pandapower are the ones of its initial point
+            attr_nms += ["v_or", "v_ex", "a_or", "a_ex", "load_v", "prod_p", "prod_q", "prod_v"]
+        assert np.all(self.backend.line_status == self.backend_pp.line_status)
+        status = self.backend.line_status
+        for attr_nm in attr_nms:
+            res = getattr(self.backend, attr_nm)
+            res_pp = getattr(self.backend_pp, attr_nm)
+            if res.shape[0] == self.backend.n_line:
+                # pandapower does not always set the voltage of the disconnected powerlines to 0.
+                res = res[status]
+                res_pp = res_pp[status]
+            # results are stored in float32: the tolerance is relative for the (high) flows in amps
+            assert np.allclose(res, res_pp, rtol=1e-6, atol=self.tol), "wrong {}".format(attr_nm)
+
+    def test_same_results_as_pp(self):
+        self._compare_with_pp(is_dc=False)
+        self._compare_with_pp(is_dc=True)
+        for backend in [self.backend_pp, self.backend]:
+            # disconnect a powerline and move a transformer to the second bus of both its substations
+            backend._disconnect_line(3)
+            backend._grid.trafo["hv_bus"].values[2] += backend.n_sub
+            backend._grid.trafo["lv_bus"].values[2] += backend.n_sub
+            backend._grid.bus["in_service"].values[backend._bus_pos_in_df[backend._grid.trafo["hv_bus"].values[2]]] = True
+            backend._grid.bus["in_service"].values[backend._bus_pos_in_df[backend._grid.trafo["lv_bus"].values[2]]] = True
+            backend._grid.load["p_mw"].values[0] += 5.
+        # the two new buses are only connected by the transformer: the grid is not connex anymore
+        assert not self.backend.runpf()
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            assert not self.backend_pp.runpf()
+        for backend in [self.backend_pp, self.backend]:
+            backend._grid.trafo["lv_bus"].values[2] -= backend.n_sub
+            backend._grid.bus["in_service"].values[backend._bus_pos_in_df[backend._grid.trafo["lv_bus"].values[2] +
+                                                                          backend.n_sub]] = False
+        self._compare_with_pp(is_dc=False)
+        self._compare_with_pp(is_dc=True)
+
+    def test_out_of_service_in_original_grid(self):
+        grid = pp.from_json(os.path.join(PATH_DATA_TEST_PP, "test_case14.json"))
+        grid.load["in_service"].values[3] = False
+        grid.gen["in_service"].values[1] = False
+        with tempfile.TemporaryDirectory() as path:
+            pp.to_json(grid, os.path.join(path, "test_case14_off.json"))
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore")
+                self.backend_pp.load_grid(path, "test_case14_off.json")
+                self.backend.load_grid(path, "test_case14_off.json")
+        self._compare_with_pp(is_dc=False)
+        self._compare_with_pp(is_dc=True)
+        assert np.all(self.backend.load_p == self.backend_pp.load_p)
+        assert np.all(self.backend.load_q == self.backend_pp.load_q)
+
+        # disconnecting a load that was in service is still a game over
+        for backend in [self.backend_pp, self.backend]:
+            backend._grid.load["in_service"].values[0] = False
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore")
+                assert not backend.runpf()
+
+    def test_incremental_update(self):
+        self.backend._disconnect_line(5)
+        self.backend._grid.line["from_bus"].values[0] += self.backend.n_sub
+        self.backend._grid.bus["in_service"].values[self.backend._bus_pos_in_df[self.backend.n_sub]] = True
+        self.backend.runpf()
+        # the matrices updated incrementally are the same as the ones built from scratch
+        bus_or, bus_ex, status = self.backend._get_branch_state()
+        ybus, bbus = self.backend._branch_matrices(bus_or, bus_ex, status)
+        assert np.max(np.abs((ybus - self.backend._ybus).toarray())) <= 1e-10
+        assert np.max(np.abs((bbus - self.backend._bbus).toarray())) <= 1e-10
+        assert scipy.sparse.issparse(self.backend._ybus)
+
+    def test_ptdf_lodf(self):
+        self.backend.runpf(is_dc=True)
+        p_or_init = 1. * self.backend.p_or
+        ptdf = self.backend.get_ptdf()
+        assert ptdf.shape == (self.backend.n_line, 2 * self.backend.n_sub)
+        lodf = self.backend.get_lodf()
+        assert lodf.shape == (self.backend.n_line, self.backend.n_line)
+
+        for l_id in [0, 3, 7]:
+            backend = self.backend.copy()
+            backend._disconnect_line(l_id)
+            assert backend.runpf(is_dc=True)
+            p_or_lodf = p_or_init + lodf[:, l_id] * p_or_init[l_id]
+            assert np.max(np.abs(p_or_lodf - backend.p_or)) <= self.tol
+            # the ptdf are updated when a powerline is disconnected
+            ptdf_upd = backend.get_ptdf()
+            backend._ptdf_cache = None
+            ptdf_ref = backend.get_ptdf()
+            assert np.max(np.abs(ptdf_upd - ptdf_ref)) <= 1e-8
+            assert np.all(ptdf_ref[l_id] == 0.)
+
+        # disconnecting line 18 isolates a substation
+        assert np.all(np.isnan(lodf[:, 18]))
+
+    def test_pickle_copy(self):
+        self.backend.runpf(is_dc=True)
+        backend_cpy = pickle.loads(pickle.dumps(self.backend))
+        assert backend_cpy.runpf(is_dc=True)
+        assert np.max(np.abs(backend_cpy.p_or - self.backend.p_or)) <= self.tol
+        backend_cpy = self.backend.copy()
+        assert backend_cpy.runpf()
+        assert self.backend.runpf()
+        assert np.max(np.abs(backend_cpy.p_or - self.backend.p_or)) <= self.tol
+
+
+class NoLodfBackend(PandaPowerBackend):
+    """a backend that cannot compute the line outage distribution factors"""
+    get_lodf = Backend.get_lodf
+
+
+class TestFastCascade(unittest.TestCase):
+    """
+    Test the computation of the cascading failures with the line outage distribution factors
+    """
+    def setUp(self):
+        self.case_file = "test_case14.json"
+        self.lines_flows_init = np.array([  638.28966637,   305.05042301, 17658.9674809 , 26534.04334098,
+                                           10869.23856329,  4686.71726729, 15612.65903298,   300.07915572,
+                                             229.8060832 ,   169.97292682,   100.40192958,   265.47505664,
+                                           21193.86923911, 21216.44452327, 49701.1565287 ,   124.79684388,
+                                              67.59759985,   192.19424706,   666.76961936,  1113.52773632])
+        self.id_first_line_disco = 8  # due to hard overflow
+        self.id_2nd_line_disco = 11  # due to soft overflow
+
+        # once the powerlines 8 and 11 are disconnected, the flow predicted on this powerline is 3.0 times its
+        # initial flow, whereas the flow computed by a powerflow is 2.9 times its initial flow
+        self.id_line_ambiguous = 5
+        # this powerline is the only one connecting substation 7 to the rest of the grid
+        self.id_line_island = 18
+
+    def _make_env(self, backend, fast_cascade, check=False, margin=None):
+        env_params = Parameters()
+        env_params.HARD_OVERFLOW_THRESHOLD = 1.5
+        env_params.NB_TIMESTEP_OVERFLOW_ALLOWED = 0
+        env_params.FAST_CASCADE = fast_cascade
+        env_params.FAST_CASCADE_CHECK = check
+        if margin is not None:
+            env_params.FAST_CASCADE_MARGIN = margin
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            env = Environment(init_grid_path=os.path.join(PATH_DATA_TEST_PP, self.case_file),
+                              backend=backend,
+                              chronics_handler=ChronicsHandler(),
+                              parameters=env_params,
+                              name="test_fast_cascade_env")
+            backend.load_grid(PATH_DATA_TEST_PP, self.case_file)
+        return env
+
+    def _set_thermal_limit(self, backend):
+        thermal_limit = 10 * self.lines_flows_init
+        thermal_limit[self.id_first_line_disco] = self.lines_flows_init[self.id_first_line_disco] / 2
+        thermal_limit[self.id_2nd_line_disco] = 400
+        backend.set_thermal_limit(thermal_limit)
+
+    def _count_runpf(self, backend):
+        nb_runpf = [0]
+        runpf = backend.runpf
+
+        def runpf_counted(is_dc=False):
+            nb_runpf[0] += 1
+            return runpf(is_dc=is_dc)
+        backend.runpf = runpf_counted
+        return nb_runpf
+
+    def _next_grid_state_ambiguous(self, fast_cascade, check=False, margin=None):
+        backend = SparseBackend()
+        env = self._make_env(backend, fast_cascade=fast_cascade, check=check, margin=margin)
+        self._set_thermal_limit(backend)
+        thermal_limit = backend.get_thermal_limit()
+        # the thermal limit is between the predicted and the exact flow after the disconnection of 8 and 11
+        thermal_limit[self.id_line_ambiguous] = 2.95 * self.lines_flows_init[self.id_line_ambiguous]
+        backend.set_thermal_limit(thermal_limit)
+        nb_runpf = self._count_runpf(backend)
+        disco, infos = backend.next_grid_state(env, is_dc=False)
+        return disco, nb_runpf[0]
+
+    def test_same_as_exact(self):
+        backend = SparseBackend()
+        env = self._make_env(backend, fast_cascade=True)
+        self._set_thermal_limit(backend)
+        disco, infos = backend.next_grid_state(env, is_dc=False)
+        assert not infos
+        assert disco[self.id_first_line_disco]
+        assert disco[self.id_2nd_line_disco]
+        assert np.sum(disco) == 2
+        a_or = 1. * backend.get_line_flow()
+
+        backend_exact = SparseBackend()
+        env_exact = self._make_env(backend_exact, fast_cascade=False)
+        self._set_thermal_limit(backend_exact)
+        disco_exact, _ = backend_exact.next_grid_state(env_exact, is_dc=False)
+        assert np.all(disco == disco_exact)
+        # the flows returned are the ones of a powerflow on the final state
+        assert np.allclose(a_or, backend_exact.get_line_flow())
+
+    def test_check(self):
+        backend = SparseBackend()
+        env = self._make_env(backend, fast_cascade=True, check=True)
+        self._set_thermal_limit(backend)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, infos = backend.next_grid_state(env, is_dc=False)
+        assert not [el for el in w if "fast computation" in str(el.message)]
+        assert np.sum(disco) == 2
+
+        # the line outage distribution factors are made wrong to overestimate the flows after the first disconnection
+        backend.load_grid(PATH_DATA_TEST_PP, self.case_file)
+        thermal_limit = 10 * self.lines_flows_init
+        thermal_limit[self.id_first_line_disco] = self.lines_flows_init[self.id_first_line_disco] / 2
+        backend.runpf()
+        lodf = 2. * backend.get_lodf()
+        lodf[np.arange(backend.n_line), np.arange(backend.n_line)] = -1.
+        backend.get_lodf = lambda: lodf
+        p_or, q_or, v_or, a_or = backend.lines_or_info()
+        p_pred = p_or + lodf[:, self.id_first_line_disco] * p_or[self.id_first_line_disco]
+        a_pred = np.sqrt(p_pred ** 2 + q_or ** 2) / (np.sqrt(3.) * v_or) * 1000.
+        backend_cpy = backend.copy()
+        backend_cpy._disconnect_line(self.id_first_line_disco)
+        backend_cpy.runpf()
+        # the thermal limit is set between the predicted and the exact flow
+        thermal_limit[self.id_2nd_line_disco] = 0.5 * (a_pred[self.id_2nd_line_disco] +
+                                                       backend_cpy.get_line_flow()[self.id_2nd_line_disco])
+        backend.set_thermal_limit(thermal_limit)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, infos = backend.next_grid_state(env, is_dc=False)
+        assert len([el for el in w if "fast computation" in str(el.message)]) == 1
+        # the results of the exact computation are kept
+        assert disco[self.id_first_line_disco]
+        assert np.sum(disco) == 1
+
+    def test_margin(self):
+        disco_exact, nb_runpf_exact = self._next_grid_state_ambiguous(fast_cascade=False)
+        assert np.sum(disco_exact) == 2
+        assert not disco_exact[self.id_line_ambiguous]
+        assert nb_runpf_exact == 3
+
+        # without margin, the powerline is disconnected because of the error of the prediction
+        disco, nb_runpf = self._next_grid_state_ambiguous(fast_cascade=True, margin=0.)
+        assert np.all(np.where(disco != disco_exact)[0] == [self.id_line_ambiguous])
+        assert nb_runpf == 2
+
+        # with the default margin, the predicted flow is ambiguous and a powerflow is computed to decide
+        disco, nb_runpf = self._next_grid_state_ambiguous(fast_cascade=True)
+        assert np.all(disco == disco_exact)
+        assert nb_runpf == 2
+
+        # with a huge margin, a powerflow is computed after each round, as in the exact computation
+        disco, nb_runpf = self._next_grid_state_ambiguous(fast_cascade=True, margin=10.)
+        assert np.all(disco == disco_exact)
+        assert nb_runpf == nb_runpf_exact
+
+    def test_check_margin(self):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, _ = self._next_grid_state_ambiguous(fast_cascade=True, check=True, margin=0.)
+        w = [el for el in w if "fast computation" in str(el.message)]
+        assert len(w) == 1
+        assert "[ 5  8 11]" in str(w[0].message)
+        # the results of the exact computation are kept
+        assert not disco[self.id_line_ambiguous]
+        assert np.sum(disco) == 2
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, _ = self._next_grid_state_ambiguous(fast_cascade=True, check=True)
+        assert not [el for el in w if "fast computation" in str(el.message)]
+
+    def test_island(self):
+        backend = SparseBackend()
+        env = self._make_env(backend, fast_cascade=True)
+        backend.runpf()
+        lodf = backend.get_lodf()
+        assert np.all(np.isnan(lodf[:, self.id_line_island]))
+        assert np.sum(np.any(np.isnan(lodf), axis=0)) == 1
+        p_or, q_or, v_or, _ = backend.lines_or_info()
+        status = backend.get_line_status()
+        base = (status, lodf, p_or, q_or, v_or)
+        lines_status = copy.deepcopy(status)
+        lines_status[self.id_first_line_disco] = False
+        assert backend._predict_line_flows(base, lines_status) is not None
+        lines_status[self.id_line_island] = False
+        assert backend._predict_line_flows(base, lines_status) is None
+
+        # the cascading failure disconnects the substation 7: the flows cannot be predicted and a powerflow is
+        # computed, that diverges (as in the exact computation)
+        for fast_cascade in [True, False]:
+            backend = SparseBackend()
+            env = self._make_env(backend, fast_cascade=fast_cascade)
+            self._set_thermal_limit(backend)
+            thermal_limit = backend.get_thermal_limit()
+            thermal_limit[self.id_line_island] = 0.9 * self.lines_flows_init[self.id_line_island]
+            backend.set_thermal_limit(thermal_limit)
+            nb_runpf = self._count_runpf(backend)
+            predicted = []
+            predict_line_flows = backend._predict_line_flows
+
+            def predict_line_flows_recorded(base, lines_status):
+                res = predict_line_flows(base, lines_status)
+                predicted.append(res)
+                return res
+            backend._predict_line_flows = predict_line_flows_recorded
+            with self.assertRaises(DivergingPowerFlow):
+                backend.next_grid_state(env, is_dc=False)
+            assert nb_runpf[0] == 2
+            if fast_cascade:
+                assert len(predicted) == 1
+                assert predicted[0] is None
+            else:
+                assert not predicted
+
+    def test_pandapower(self):
+        backend_exact = PandaPowerBackend()
+        env_exact = self._make_env(backend_exact, fast_cascade=False)
+        self._set_thermal_limit(backend_exact)
+        nb_runpf_exact = self._count_runpf(backend_exact)
+        disco_exact, _ = backend_exact.next_grid_state(env_exact, is_dc=False)
+
+        backend = PandaPowerBackend()
+        env = self._make_env(backend, fast_cascade=True)
+        self._set_thermal_limit(backend)
+        nb_runpf = self._count_runpf(backend)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, infos = backend.next_grid_state(env, is_dc=False)
+        assert not [el for el in w if "outage distribution factors" in str(el.message)]
+        assert np.sum(disco) == 2
+        assert np.all(disco == disco_exact)
+        assert nb_runpf[0] < nb_runpf_exact[0]
+        assert np.allclose(backend.get_line_flow(), backend_exact.get_line_flow())
+
+    def test_lodf_not_implemented(self):
+        backend_exact = NoLodfBackend()
+        env_exact = self._make_env(backend_exact, fast_cascade=False)
+        self._set_thermal_limit(backend_exact)
+        nb_runpf_exact = self._count_runpf(backend_exact)
+        disco_exact, _ = backend_exact.next_grid_state(env_exact, is_dc=False)
+
+        backend = NoLodfBackend()
+        env = self._make_env(backend, fast_cascade=True)
+        self._set_thermal_limit(backend)
+        nb_runpf = self._count_runpf(backend)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, infos = backend.next_grid_state(env, is_dc=False)
+        assert len([el for el in w if "outage distribution factors" in str(el.message)]) == 1
+        assert np.sum(disco) == 2
+        # a powerflow is computed after each round, as in the exact computation
+        assert np.all(disco == disco_exact)
+        assert nb_runpf[0] == nb_runpf_exact[0]
+
+        # the user is warned only once per backend, even after a reset
+        backend.reset(PATH_DATA_TEST_PP, self.case_file)
+        self._set_thermal_limit(backend)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, infos = backend.next_grid_state(env, is_dc=False)
+        assert not [el for el in w if "outage distribution factors" in str(el.message)]
+        assert np.all(disco == disco_exact)
+
+        # backends that do not call Backend.__init__ are supported
+        backend.reset(PATH_DATA_TEST_PP, self.case_file)
+        self._set_thermal_limit(backend)
+        del backend._lodf_warning_issued
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            disco, infos = backend.next_grid_state(env, is_dc=False)
+        assert len([el for el in w if "outage distribution factors" in str(el.message)]) == 1
+        assert np.all(disco == disco_exact)
+
+
+if __name__ == "__main__":
+    unittest.main()